@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+name: fusion_profile
+type: aggregate
+short_description: Summarize Pure Storage Fusion API usage per task
+version_added: '1.7.0'
+description:
+  - Aggregates the API usage Pure Storage Fusion modules report in their results
+    (number of requests per API class, bytes sent, bytes received before and after
+    decompression, operations waited for, time slept between operation polls and
+    retried requests) per task and per playbook.
+  - At the end of the playbook prints a table of the tasks sorted by their API usage and
+    optionally writes the same data to a JSON file.
+  - Results of other modules are ignored.
+author:
+  - Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+requirements:
+  - enable in configuration
+options:
+  output_file:
+    description:
+      - Path of a JSON file the summary is written to.
+      - The JSON file is written in addition to the printed table.
+    type: path
+    env:
+      - name: FUSION_PROFILE_OUTPUT_FILE
+    ini:
+      - section: callback_fusion_profile
+        key: output_file
+  sort_by:
+    description:
+      - Counter the tasks in the table are sorted by, in descending order.
+    type: str
+    default: requests
+    choices: [requests, bytes, operation_waits, poll_sleep, retries]
+    env:
+      - name: FUSION_PROFILE_SORT_BY
+    ini:
+      - section: callback_fusion_profile
+        key: sort_by
+"""
+
+import json
+
+from ansible.module_utils.common.text.converters import to_text
+from ansible.plugins.callback import CallbackBase
+from ansible_collections.purestorage.fusion.plugins.module_utils.api_stats import (
+    RESULT_KEY,
+)
+
+COUNTERS = (
+    "request_count",
+    "bytes_sent",
+    "bytes_received",
+    "bytes_decoded",
+    "operation_waits",
+    "poll_sleep",
+    "retries",
+)
+
+SORT_KEYS = {
+    "requests": lambda task: task["request_count"],
+    "bytes": lambda task: task["bytes_sent"] + task["bytes_received"],
+    "operation_waits": lambda task: task["operation_waits"],
+    "poll_sleep": lambda task: task["poll_sleep"],
+    "retries": lambda task: task["retries"],
+}
+
+
+def _new_totals():
+    totals = dict((counter, 0) for counter in COUNTERS)
+    totals["invocations"] = 0
+    totals["requests"] = {}
+    return totals
+
+
+def _add(totals, stats):
+    totals["invocations"] += 1
+    for counter in COUNTERS:
+        totals[counter] += stats.get(counter, 0)
+    # modules which did not decompress responses report only bytes received
+    if "bytes_decoded" not in stats:
+        totals["bytes_decoded"] += stats.get("bytes_received", 0)
+    for api_class, count in stats.get("requests", {}).items():
+        totals["requests"][api_class] = totals["requests"].get(api_class, 0) + count
+
+
+def _kib(value):
+    return "{0:.1f}".format(value / 1024.0)
+
+
+class CallbackModule(CallbackBase):
+    """
+    Summarizes Pure Storage Fusion API usage reported by modules per task.
+    """
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "purestorage.fusion.fusion_profile"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+        self.tasks = {}
+        self.playbook = None
+
+    def v2_playbook_on_start(self, playbook):
+        self.playbook = to_text(playbook._file_name)
+
+    def _record(self, result):
+        results = result._result.get("results")
+        if not isinstance(results, list):
+            results = [result._result]
+        reported = [
+            item[RESULT_KEY]
+            for item in results
+            if isinstance(item, dict) and isinstance(item.get(RESULT_KEY), dict)
+        ]
+        if not reported:
+            return
+
+        task = result._task
+        if task._uuid not in self.tasks:
+            self.tasks[task._uuid] = dict(
+                _new_totals(),
+                name=to_text(task.get_name()),
+                path=to_text(task.get_path() or ""),
+                action=to_text(task.action),
+                hosts=[],
+            )
+        totals = self.tasks[task._uuid]
+        host = to_text(result._host.get_name())
+        if host not in totals["hosts"]:
+            totals["hosts"].append(host)
+        for stats in reported:
+            _add(totals, stats)
+
+    def v2_runner_on_ok(self, result):
+        self._record(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result)
+
+    def summary(self):
+        """Returns the per-task and per-playbook summary as a dict"""
+        tasks = sorted(
+            self.tasks.values(), key=SORT_KEYS[self.get_option("sort_by")], reverse=True
+        )
+        playbook = _new_totals()
+        for task in tasks:
+            playbook["invocations"] += task["invocations"]
+            for counter in COUNTERS:
+                playbook[counter] += task[counter]
+            for api_class, count in task["requests"].items():
+                playbook["requests"][api_class] = (
+                    playbook["requests"].get(api_class, 0) + count
+                )
+        playbook["playbook"] = self.playbook
+        return {"playbook": playbook, "tasks": tasks}
+
+    def _display_table(self, summary):
+        columns = "{0:<40} {1:>6} {2:>9} {3:>10} {4:>10} {5:>13} {6:>6} {7:>11} {8:>8}"
+        self._display.banner("FUSION API USAGE")
+        self._display.display(
+            columns.format(
+                "TASK",
+                "CALLS",
+                "REQUESTS",
+                "SENT KiB",
+                "RECV KiB",
+                "DECODED KiB",
+                "WAITS",
+                "POLL SLEEP",
+                "RETRIES",
+            )
+        )
+        for row in summary["tasks"] + [dict(summary["playbook"], name="TOTAL")]:
+            self._display.display(
+                columns.format(
+                    row["name"][:40],
+                    row["invocations"],
+                    row["request_count"],
+                    _kib(row["bytes_sent"]),
+                    _kib(row["bytes_received"]),
+                    _kib(row["bytes_decoded"]),
+                    row["operation_waits"],
+                    "{0}s".format(row["poll_sleep"]),
+                    row["retries"],
+                )
+            )
+        by_api = sorted(
+            summary["playbook"]["requests"].items(),
+            key=lambda item: (-item[1], item[0]),
+        )
+        if by_api:
+            self._display.display(
+                "Requests by API: "
+                + ", ".join("{0}={1}".format(api, count) for api, count in by_api)
+            )
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.tasks:
+            return
+        summary = self.summary()
+        self._display_table(summary)
+
+        output_file = self.get_option("output_file")
+        if output_file:
+            try:
+                with open(output_file, "w") as f:
+                    json.dump(summary, f, indent=2, sort_keys=True)
+            except (OSError, IOError) as e:
+                self._display.warning(
+                    "Unable to write Fusion API usage to {0}: {1}".format(
+                        output_file, to_text(e)
+                    )
+                )
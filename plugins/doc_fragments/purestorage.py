@@ -50,6 +50,30 @@ notes:
     if I(issuer_id) and I(private_key_file) arguments are not passed to the module directly
   - If you want to use access token for authentication, you must use C(FUSION_ACCESS_TOKEN) environment variable
     if I(access_token) argument is not passed to the module directly
+  - Requests to Fusion can be limited by C(FUSION_RATE_LIMIT) environment variable to the given number
+    of requests per second, shared by all forks talking to the same API host. Short bursts of up to
+    C(FUSION_RATE_LIMIT_BURST) requests are allowed, by default the burst is the same as the rate
+  - Reads which fail with HTTP status 429, 502, 503 or 504 are retried up to C(FUSION_MAX_RETRIES) times
+    (5 by default, 0 disables retries), number of retries is returned in C(fusion_api_stats)
+  - After C(FUSION_CIRCUIT_BREAKER_THRESHOLD) (5 by default, 0 disables the check) consecutive connection failures
+    to an API host, all tasks fail immediately for C(FUSION_CIRCUIT_BREAKER_COOLDOWN) seconds (30 by default),
+    then a single request probes whether the API is reachable again. The count of failures is shared by all tasks
+    of the same user and forgotten 5 minutes after the cooldown if no other failure happens, so it does not carry
+    over to later runs
+  - If C(FUSION_TRACE_FILE) environment variable is set, a span of every API request, operation poll
+    and wait for an operation is appended to the file as a JSON object per line, spans of one task
+    share the same C(trace_id)
+  - Responses are requested gzip or deflate compressed unless C(FUSION_COMPRESSION) environment variable
+    is set to C(false), for example behind proxies which mishandle compressed responses
+  - If C(FUSION_CACHE_FILE) environment variable is set, regions, availability zones, hardware types,
+    storage services, storage classes and protection policies read by any task are cached in the SQLite file
+    and shared by all tasks talking to the same API host. Cached responses expire after C(FUSION_CACHE_TTL)
+    seconds, either a single number or comma separated C(kind=seconds) pairs, e.g. C(storage_classes=60)
+    (by default 3600 for regions, availability zones and hardware types, 600 for the others). Changes made
+    by the modules invalidate the affected entries, changes made elsewhere are seen once the entries expire
+  - API usage of the task (requests per API class, bytes sent, bytes received before and after decompression,
+    operations waited for, seconds slept between operation polls and retries) is returned in C(fusion_api_stats),
+    which the C(purestorage.fusion.fusion_profile) callback plugin summarizes per task and per playbook
 requirements:
   - python >= 3.8
   - purefusion
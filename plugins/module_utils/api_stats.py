@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+import threading
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.retry import (
+    _find_retrying_call,
+)
+
+# reserved key of module results, read by purestorage.fusion.fusion_profile
+# callback plugin
+RESULT_KEY = "fusion_api_stats"
+
+CLIENT_ATTRIBUTE = "fusion_api_stats"
+OTHER_API = "other"
+
+
+def _api_class(frame):
+    # class of the SDK API method which made the request, e.g. 'VolumesApi'
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith("fusion.api."):
+            instance = frame.f_locals.get("self")
+            if instance is not None:
+                return type(instance).__name__
+        frame = frame.f_back
+    return OTHER_API
+
+
+def _bytes_read(response):
+    # bytes urllib3 read from the connection, i.e. before decompression
+    try:
+        read = response.tell()
+    except (AttributeError, OSError):
+        return None
+    return read if isinstance(read, int) else None
+
+
+def _count_when_read(response, stats):
+    # content is streamed to the caller, it must not be read here
+    read = response.read
+
+    def _read(*args, **kwargs):
+        before = _bytes_read(response)
+        data = read(*args, **kwargs)
+        after = _bytes_read(response)
+        decoded = len(data or b"")
+        stats.add_received(
+            after - before if None not in (before, after) else decoded, decoded
+        )
+        return data
+
+    response.read = _read
+
+
+class ApiStats(object):
+    """Counters of the API usage of a module run"""
+
+    def __init__(self):
+        self.requests = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.operation_waits = 0
+        self.poll_sleep = 0
+        self._lock = threading.Lock()
+
+    def add_request(self, api_class, bytes_sent):
+        with self._lock:
+            self.requests[api_class] = self.requests.get(api_class, 0) + 1
+            self.bytes_sent += bytes_sent
+
+    def add_received(self, bytes_received, bytes_decoded):
+        """Counts response body of `bytes_received` bytes as transferred, which
+        is `bytes_decoded` bytes once decompressed"""
+        with self._lock:
+            self.bytes_received += bytes_received
+            self.bytes_decoded += bytes_decoded
+
+    def add_operation_waits(self, count):
+        with self._lock:
+            self.operation_waits += count
+
+    def add_poll_sleep(self, seconds):
+        with self._lock:
+            self.poll_sleep += seconds
+
+    def as_dict(self, retries=0):
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "request_count": sum(self.requests.values()),
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "bytes_decoded": self.bytes_decoded,
+                "operation_waits": self.operation_waits,
+                "poll_sleep": self.poll_sleep,
+                "retries": retries,
+            }
+
+
+class CountingRequest(object):
+    """Wraps `PoolManager.request()` of the SDK's REST client to count HTTP
+    requests by API class and bytes they transferred. Bytes of streamed
+    responses are counted as the caller reads them."""
+
+    def __init__(self, request, stats):
+        self._request = request
+        self.stats = stats
+
+    def __call__(self, method, url, body=None, **kwargs):
+        api_class = _api_class(sys._getframe(1))
+        response = self._request(method, url, body=body, **kwargs)
+        self.stats.add_request(
+            api_class, len(body) if isinstance(body, (str, bytes)) else 0
+        )
+        if kwargs.get("preload_content", True):
+            decoded = len(response.data or b"")
+            received = _bytes_read(response)
+            self.stats.add_received(decoded if received is None else received, decoded)
+        else:
+            _count_when_read(response, self.stats)
+        return response
+
+
+def install_api_stats(client):
+    """Makes `client` (`fusion.ApiClient`) count its API usage, returns the
+    ApiStats"""
+    stats = get_api_stats(client)
+    if stats is None:
+        stats = ApiStats()
+        pool_manager = client.rest_client.pool_manager
+        pool_manager.request = CountingRequest(pool_manager.request, stats)
+        setattr(client, CLIENT_ATTRIBUTE, stats)
+    return stats
+
+
+def get_api_stats(client):
+    """Returns ApiStats of `client` or None if its usage is not counted"""
+    stats = getattr(client, CLIENT_ATTRIBUTE, None)
+    return stats if isinstance(stats, ApiStats) else None
+
+
+def report_api_stats(module, client):
+    """Adds API usage counters of `client` to the result of `module`"""
+    stats = get_api_stats(client)
+    if stats is None:
+        return
+    retrying = _find_retrying_call(client.call_api)
+
+    def _wrap(original):
+        def _with_stats(*args, **kwargs):
+            kwargs.setdefault(
+                RESULT_KEY, stats.as_dict(retrying.retries if retrying else 0)
+            )
+            return original(*args, **kwargs)
+
+        return _with_stats
+
+    module.exit_json = _wrap(module.exit_json)
+    module.fail_json = _wrap(module.fail_json)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import time
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    CircuitOpenError,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.state_file import (
+    get_state_file,
+    locked_state,
+    read_state,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+urllib3 = lazy_import("urllib3")
+
+ENV_THRESHOLD = "FUSION_CIRCUIT_BREAKER_THRESHOLD"
+ENV_COOLDOWN = "FUSION_CIRCUIT_BREAKER_COOLDOWN"
+DEFAULT_THRESHOLD = 5
+DEFAULT_COOLDOWN = 30
+# seconds after the cooldown the state is kept without a new failure or
+# probe, so that failures of one run are not counted in runs much later
+STATE_LIFETIME = 300
+
+STATE_FILE_PREFIX = "ansible-purefusion-circuit-"
+
+
+def _get_number(environ, name, default, cast):
+    value = environ.get(name)
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise ValueError(
+            "{0} must be a non-negative number, got '{1}'".format(name, value)
+        )
+    return number
+
+
+def get_circuit_breaker_config(environ=os.environ):
+    """Returns (threshold, cooldown) tuple configured by environment variables,
+    or None if the circuit breaker is disabled. Raises ValueError if the
+    configuration is not valid."""
+    threshold = _get_number(environ, ENV_THRESHOLD, DEFAULT_THRESHOLD, int)
+    if threshold == 0:
+        return None
+    return threshold, _get_number(environ, ENV_COOLDOWN, DEFAULT_COOLDOWN, float)
+
+
+def is_connection_failure(exception):
+    """Returns True if the request did not get any response from the API"""
+    if isinstance(exception, purefusion.rest.ApiException):
+        # SSL errors are reported by the SDK as ApiException with status 0
+        return exception.status == 0
+    return isinstance(
+        exception,
+        (
+            urllib3.exceptions.MaxRetryError,
+            urllib3.exceptions.NewConnectionError,
+            urllib3.exceptions.TimeoutError,
+            urllib3.exceptions.ProtocolError,
+            urllib3.exceptions.SSLError,
+        ),
+    )
+
+
+class CircuitBreaker(object):
+    """Counts consecutive connection failures to an API host, shared by all
+    processes using the same state file.
+
+    Once `threshold` failures in a row are reached the circuit opens and
+    requests fail immediately for `cooldown` seconds. Then a single request
+    is let through as a probe while the others keep failing for another
+    cooldown, unless the probe succeeds and closes the circuit.
+
+    The state is forgotten when it has not changed for `cooldown` plus
+    STATE_LIFETIME seconds. While the circuit is closed, requests only read
+    the state file, it is locked and written only to record a failure, a
+    probe or the first success after failures.
+    """
+
+    def __init__(self, host, threshold, cooldown, state_file):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state_file = state_file
+
+    def _read(self, state):
+        try:
+            failures = int(state.get("failures", 0))
+            opened_at = float(state.get("opened_at", 0))
+            updated = float(state.get("updated", 0))
+        except (TypeError, ValueError):
+            return 0, 0.0
+        if time.time() - updated > self.cooldown + STATE_LIFETIME:
+            return 0, 0.0
+        return failures, opened_at
+
+    def before_request(self):
+        """Raises CircuitOpenError if the request should not be sent"""
+        failures, _opened_at = self._read(read_state(self.state_file))
+        if failures < self.threshold:
+            return
+        with locked_state(self.state_file) as state:
+            failures, opened_at = self._read(state)
+            if failures < self.threshold:
+                return
+            now = time.time()
+            remaining = opened_at + self.cooldown - now
+            if remaining <= 0:
+                # this request is the probe, hold off others until it finishes
+                state.update(opened_at=now, updated=now)
+                return
+
+        raise CircuitOpenError(
+            (
+                "Fusion API at '{0}' is considered unavailable after {1} consecutive connection "
+                "failures, not sending requests for {2:.0f} more seconds. Set {3}=0 to disable "
+                "this check."
+            ).format(self.host, failures, remaining, ENV_THRESHOLD)
+        )
+
+    def record_success(self):
+        if not self._read(read_state(self.state_file))[0]:
+            return
+        with locked_state(self.state_file) as state:
+            state.clear()
+
+    def record_failure(self):
+        with locked_state(self.state_file) as state:
+            failures, opened_at = self._read(state)
+            now = time.time()
+            failures += 1
+            state.update(failures=failures, opened_at=opened_at, updated=now)
+            if failures >= self.threshold:
+                state["opened_at"] = now
+
+
+class CircuitBreakerCall(object):
+    """Wraps `ApiClient.call_api()` to consult and update the circuit breaker"""
+
+    def __init__(self, call_api, breaker):
+        self._call_api = call_api
+        self.breaker = breaker
+
+    def __call__(self, *args, **kwargs):
+        self.breaker.before_request()
+        try:
+            response = self._call_api(*args, **kwargs)
+        except Exception as exc:
+            if is_connection_failure(exc):
+                self.breaker.record_failure()
+            else:
+                # any response, even an error one, means the API is reachable
+                self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        return response
+
+
+def install_circuit_breaker(client, threshold, cooldown):
+    """Makes `client` (`fusion.ApiClient`) stop sending requests to an API host
+    which repeatedly cannot be reached"""
+    if not isinstance(client.call_api, CircuitBreakerCall):
+        host = client.configuration.host
+        breaker = CircuitBreaker(
+            host, threshold, cooldown, get_state_file(STATE_FILE_PREFIX, host)
+        )
+        client.call_api = CircuitBreakerCall(client.call_api, breaker)
+    return client
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+def _hashable(value):
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+class CompactTable(object):
+    """
+    Rows of objects with the same fields, serialized as
+
+        {"fields": [...], "shared": [...], "values": [...], "rows": [[...], ...]}
+
+    Fields listed in `shared` hold values repeated by many rows (e.g. names
+    of tenants or placement groups), their cells are indexes to `values`
+    where every distinct value is stored once. None is never shared.
+    """
+
+    def __init__(self, fields, shared=()):
+        self.fields = list(fields)
+        self.shared = [field for field in self.fields if field in shared]
+        self._shared = [field in shared for field in self.fields]
+        self.values = []
+        self._indexes = {}
+        self.rows = []
+
+    def _index(self, value):
+        key = _hashable(value)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def add(self, *row):
+        """Adds row of values in order of `fields`"""
+        if len(row) != len(self.fields):
+            raise ValueError(
+                "Expected {0} values, got {1}".format(len(self.fields), len(row))
+            )
+        self.rows.append(
+            [
+                self._index(value) if shared and value is not None else value
+                for shared, value in zip(self._shared, row)
+            ]
+        )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def as_dict(self):
+        return {
+            "fields": self.fields,
+            "shared": self.shared,
+            "values": self.values,
+            "rows": self.rows,
+        }
+
+
+def expand(table):
+    """Returns rows of serialized CompactTable `table` as dicts of field
+    values"""
+    fields, values = table["fields"], table["values"]
+    shared = [field in table["shared"] for field in fields]
+    return [
+        dict(
+            (field, values[cell] if is_shared and cell is not None else cell)
+            for field, is_shared, cell in zip(fields, shared, row)
+        )
+        for row in table["rows"]
+    ]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+from ansible.module_utils.parsing.convert_bool import boolean
+
+ENV_COMPRESSION = "FUSION_COMPRESSION"
+
+# both are decoded by urllib3 while the response is read
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def get_compression(environ=os.environ):
+    """Returns True if compressed responses should be asked for, as configured
+    by environment variable. Raises ValueError if the configuration is not
+    valid."""
+    value = environ.get(ENV_COMPRESSION)
+    if not value:
+        return True
+    try:
+        return boolean(value)
+    except TypeError:
+        raise ValueError(
+            "{0} must be a boolean, got '{1}'".format(ENV_COMPRESSION, value)
+        )
+
+
+def install_compression(client):
+    """Makes `client` (`fusion.ApiClient`) ask for compressed responses"""
+    client.set_default_header("Accept-Encoding", ACCEPT_ENCODING)
+    return client
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Fusion API client (urllib3 pool manager) is thread-safe, the limit exists
+# to be gentle to the API rather than to protect the client
+DEFAULT_CONCURRENCY = 8
+
+
+def run_concurrently(func, items, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Calls `func(item)` for every item, running at most `concurrency` calls at once.
+
+    :param func: a callable taking a single item
+    :param items: an iterable of items
+    :param concurrency: maximum number of calls running at the same time
+    :returns: list of `(item, result, exception)` tuples in the order of `items`,
+        `exception` is None if the call succeeded and `result` is None if it failed
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def _call(item):
+        try:
+            return item, func(item), None
+        except Exception as exc:
+            return item, None, exc
+
+    # no point in spawning threads for a single call, it also keeps
+    # the traceback of failures simple
+    if len(items) == 1 or concurrency <= 1:
+        return [_call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(_call, items))
+
+
+def _check_cycles(dependencies, dependents):
+    """Raises ValueError if steps cannot be ordered, before any of them runs"""
+    waiting = dict((step_id, len(deps)) for step_id, deps in dependencies.items())
+    ready = [step_id for step_id, count in waiting.items() if count == 0]
+    while ready:
+        step_id = ready.pop()
+        del waiting[step_id]
+        for dependent in dependents[step_id]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.append(dependent)
+    if waiting:
+        raise ValueError(
+            "Steps {0} depend on each other in a cycle".format(
+                ", ".join(sorted(waiting))
+            )
+        )
+
+
+def run_graph(steps, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Runs steps which depend on each other, a step is started as soon as all of
+    its dependencies succeeded, independent steps run concurrently.
+
+    :param steps: dict mapping step id to a `(func, dependencies)` tuple, `func`
+        takes no arguments and `dependencies` is an iterable of step ids
+    :param concurrency: maximum number of steps running at the same time
+    :returns: `(results, failures, skipped)` tuple, dicts mapping ids of finished
+        steps to their results and ids of failed steps to exceptions, and a list
+        of ids of steps which were not run because some dependency failed
+    """
+    dependencies = {}
+    dependents = dict((step_id, []) for step_id in steps)
+    for step_id, (_func, deps) in steps.items():
+        dependencies[step_id] = set(deps)
+        for dep in dependencies[step_id]:
+            if dep not in steps:
+                raise ValueError(
+                    "Step '{0}' depends on unknown step '{1}'".format(step_id, dep)
+                )
+            dependents[dep].append(step_id)
+
+    _check_cycles(dependencies, dependents)
+
+    results = {}
+    failures = {}
+    skipped = []
+    waiting = dict((step_id, len(deps)) for step_id, deps in dependencies.items())
+    ready = [step_id for step_id, count in waiting.items() if count == 0]
+
+    def _skip(step_id):
+        for dependent in dependents[step_id]:
+            if dependent not in skipped:
+                skipped.append(dependent)
+                _skip(dependent)
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        running = {}
+        while ready or running:
+            for step_id in ready:
+                running[executor.submit(steps[step_id][0])] = step_id
+            ready = []
+
+            done, _pending = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                step_id = running.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    failures[step_id] = exc
+                    _skip(step_id)
+                    continue
+                results[step_id] = future.result()
+                for dependent in dependents[step_id]:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0 and dependent not in skipped:
+                        ready.append(dependent)
+
+    return results, failures, skipped
+
+
+def walk_concurrently(func, roots, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Walks a tree which is discovered while it is walked, e.g. a hierarchy of
+    collections, running at most `concurrency` calls at once.
+
+    :param func: a callable taking a node and returning `(result, children)`
+        tuple, `children` is an iterable of nodes to be walked next
+    :param roots: an iterable of nodes to start with
+    :param concurrency: maximum number of calls running at the same time
+    :returns: generator of `(node, result, exception)` tuples in the order the
+        calls finish, children of a failed node are not walked
+    """
+    pending = deque(roots)
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        running = {}
+        while pending or running:
+            # nodes are submitted only as workers free up, so that results
+            # are consumed as they come rather than piling up
+            while pending and len(running) < max(concurrency, 1):
+                node = pending.popleft()
+                running[executor.submit(func, node)] = node
+
+            done, _pending = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    yield node, None, exc
+                    continue
+                result, children = future.result()
+                pending.extend(children)
+                yield node, result, None
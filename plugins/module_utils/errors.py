@@ -7,17 +7,18 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-try:
-    import fusion as purefusion
-    import urllib3
-except ImportError:
-    pass
-
 import sys
 import json
 import re
 import traceback as trace
 
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+urllib3 = lazy_import("urllib3")
+
 
 class OperationException(Exception):
     """Raised if an asynchronous Operation fails."""
@@ -35,6 +36,11 @@ class OperationException(Exception):
         return self._http_error
 
 
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the Fusion API is considered
+    unavailable after repeated connection failures."""
+
+
 def _get_verbosity(module):
     # verbosity is a private member and Ansible does not really allow
     # providing extra information only if the user wants it due to ideological
@@ -48,25 +54,30 @@ def _get_verbosity(module):
     return 0
 
 
+def _rest_call_site(frame):
+    # converts function name of a frame from 'fusion.api.*_api*' from something
+    # like 'get_volume' to 'Get volume' and returns, or None for other frames
+    func_name = frame.f_code.co_name  # contains function name, e.g. 'get_volume'
+    mod_path = frame.f_globals.get(
+        "__name__", ""
+    )  # contains module path, e.g. 'fusion.api.volumes_api'
+    path_segments = mod_path.split(".")
+    if (
+        len(path_segments) > 2
+        and path_segments[0] == "fusion"
+        and path_segments[1] == "api"
+        and "_api" in path_segments[2]
+    ):
+        return func_name.replace("_", " ").capitalize()
+    return None
+
+
 def _extract_rest_call_site(traceback):
-    # extracts first function in traceback that comes from 'fusion.api.*_api*',
-    # converts its name from something like 'get_volume' to 'Get volume' and returns
+    # extracts first function in traceback that comes from 'fusion.api.*_api*'
     while traceback:
         try:
-            frame = traceback.tb_frame
-            func_name = (
-                frame.f_code.co_name
-            )  # contains function name, e.g. 'get_volume'
-            mod_path = frame.f_globals[
-                "__name__"
-            ]  # contains module path, e.g. 'fusion.api.volumes_api'
-            path_segments = mod_path.split(".")
-            if (
-                path_segments[0] == "fusion"
-                and path_segments[1] == "api"
-                and "_api" in path_segments[2]
-            ):
-                call_site = func_name.replace("_", " ").capitalize()
+            call_site = _rest_call_site(traceback.tb_frame)
+            if call_site:
                 return call_site
         except Exception:
             pass
@@ -223,6 +234,22 @@ def format_http_exception(exception, traceback):
     return output
 
 
+def format_fusion_exception(exception):
+    """Formats any exception raised while talking to Fusion into a simple
+    short form, suitable for reporting failures of single items in bulk
+    operations. Returns a `str`."""
+    traceback = exception.__traceback__
+    if isinstance(exception, purefusion.rest.ApiException):
+        return format_fusion_api_exception(exception, traceback)[0]
+    if isinstance(exception, OperationException):
+        return format_failed_fusion_operation_exception(exception)
+    if isinstance(exception, urllib3.exceptions.HTTPError):
+        return format_http_exception(exception, traceback)
+    if isinstance(exception, CircuitOpenError):
+        return str(exception)
+    return "{0}: {1}".format(type(exception).__name__, exception)
+
+
 def _handle_api_exception(
     module,
     exception,
@@ -276,6 +303,8 @@ def _except_hook_callback(module, original_hook, type, value, traceback):
         _handle_operation_exception(module, value, traceback, verbosity)
     elif issubclass(type, urllib3.exceptions.HTTPError):
         _handle_http_exception(module, value, traceback, verbosity)
+    elif type == CircuitOpenError:
+        module.fail_json(msg=str(value))
 
     # if we bubbled here the handlers were not able to process the exception
     original_hook(type, value, traceback)
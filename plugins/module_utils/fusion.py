@@ -32,15 +32,50 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-try:
-    import fusion
-except ImportError:
-    pass
-
 from os import environ
 from urllib.parse import urljoin
 import platform
 
+from ansible_collections.purestorage.fusion.plugins.module_utils.api_stats import (
+    install_api_stats,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.circuit_breaker import (
+    get_circuit_breaker_config,
+    install_circuit_breaker,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.compression import (
+    get_compression,
+    install_compression,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    CircuitOpenError,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.rate_limit import (
+    get_rate_limit,
+    install_rate_limiter,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.request_cache import (
+    install_request_cache,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.retry import (
+    get_max_retries,
+    install_retries,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.shared_cache import (
+    get_shared_cache_config,
+    install_shared_cache,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.tracing import (
+    Tracer,
+    get_trace_file,
+    install_tracing,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+fusion = lazy_import("fusion")
+
 TOKEN_EXCHANGE_URL = "https://api.pure1.purestorage.com/oauth2/1.0/token"
 VERSION = 1.0
 USER_AGENT_BASE = "Ansible"
@@ -137,11 +172,42 @@ def get_fusion(module):
             f"Or module arguments either {PARAM_ISSUER_ID} and {PARAM_PRIVATE_KEY_FILE} or {PARAM_ACCESS_TOKEN}"
         )
 
+    try:
+        rate_limit = get_rate_limit()
+        max_retries = get_max_retries()
+        circuit_breaker = get_circuit_breaker_config()
+        compression = get_compression()
+        shared_cache = get_shared_cache_config()
+        trace_file = get_trace_file()
+        tracer = Tracer(trace_file, module._name) if trace_file else None
+    except ValueError as err:
+        module.fail_json(msg=str(err))
+
     try:
         client = fusion.ApiClient(config)
         client.set_default_header("User-Agent", user_agent)
+        install_api_stats(client)
+        if compression:
+            install_compression(client)
+        if rate_limit is not None:
+            install_rate_limiter(client, *rate_limit)
+        # requests refused by open circuit do not take tokens
+        if circuit_breaker is not None:
+            install_circuit_breaker(client, *circuit_breaker)
+        # every retry takes a token
+        install_retries(client, max_retries)
+        # responses from the shared cache take no tokens and need no retries
+        if shared_cache is not None:
+            install_shared_cache(client, *shared_cache)
+        # cached responses do not count against the rate limit
+        install_request_cache(client)
+        # spans cover the whole time modules wait for requests
+        if tracer is not None:
+            install_tracing(client, tracer)
         api_instance = fusion.DefaultApi(client)
         api_instance.get_version()
+    except CircuitOpenError as err:
+        module.fail_json(msg=str(err))
     except Exception as err:
         module.fail_json(msg="Fusion authentication failed: {0}".format(err))
 
@@ -7,10 +7,11 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
 
 
 def get_array(module, fusion, array_name=None):
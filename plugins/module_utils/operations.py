@@ -10,15 +10,44 @@ __metaclass__ = type
 import time
 import math
 
-try:
-    import fusion as purefusion
-    from urllib3.exceptions import HTTPError
-except ImportError:
-    pass
-
+from ansible_collections.purestorage.fusion.plugins.module_utils.api_stats import (
+    get_api_stats,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
     OperationException,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.shared_cache import (
+    operation_finished,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.tracing import (
+    SPAN_AWAIT,
+    SPAN_POLL,
+    trace_span,
+)
+
+purefusion = lazy_import("fusion")
+urllib3 = lazy_import("urllib3")
+
+
+def _count_operation_waits(fusion, count):
+    stats = get_api_stats(fusion)
+    if stats is not None:
+        stats.add_operation_waits(count)
+
+
+def _sleep_before_poll(fusion, retry_in):
+    seconds = int(math.ceil(retry_in / 1000))
+    stats = get_api_stats(fusion)
+    if stats is not None:
+        stats.add_poll_sleep(seconds)
+    time.sleep(seconds)
 
 
 def await_operation(fusion, operation, fail_playbook_if_operation_fails=True):
@@ -28,15 +57,116 @@ def await_operation(fusion, operation, fail_playbook_if_operation_fails=True):
     """
     op_api = purefusion.OperationsApi(fusion)
     operation_get = None
-    while True:
+    _count_operation_waits(fusion, 1)
+    with trace_span(
+        fusion, SPAN_AWAIT, "Await operation", operation_id=operation.id
+    ) as wait:
+        while True:
+            try:
+                with trace_span(
+                    fusion, SPAN_POLL, "Poll operation", operation_id=operation.id
+                ) as poll:
+                    operation_get = op_api.get_operation(operation.id)
+                    poll["operation_status"] = operation_get.status
+                if operation_get.status in ("Succeeded", "Failed"):
+                    wait["operation_status"] = operation_get.status
+                    operation_finished(fusion, operation)
+                if operation_get.status == "Succeeded":
+                    return operation_get
+                if operation_get.status == "Failed":
+                    if fail_playbook_if_operation_fails:
+                        raise OperationException(operation_get)
+                    return operation_get
+            except urllib3.exceptions.HTTPError as err:
+                raise OperationException(operation, http_error=err)
+            _sleep_before_poll(fusion, operation_get.retry_in)
+
+
+def await_operations(
+    fusion,
+    operations,
+    fail_playbook_if_operation_fails=True,
+    concurrency=DEFAULT_CONCURRENCY,
+):
+    """
+    Waits for all given operations to finish, polling them together.
+    Returns list of finished operations in the same order as `operations`.
+    Throws an exception by default if any of the operations fails.
+    """
+    op_api = purefusion.OperationsApi(fusion)
+    finished = [None] * len(operations)
+    pending = list(enumerate(operations))
+    _count_operation_waits(fusion, len(operations))
+
+    def _poll(item, wait):
+        index, operation = item
         try:
-            operation_get = op_api.get_operation(operation.id)
-            if operation_get.status == "Succeeded":
-                return operation_get
-            if operation_get.status == "Failed":
-                if fail_playbook_if_operation_fails:
-                    raise OperationException(operation_get)
+            # polls run in other threads, the span they belong to is explicit
+            with trace_span(
+                fusion,
+                SPAN_POLL,
+                "Poll operation",
+                parent=wait,
+                operation_id=operation.id,
+            ) as poll:
+                operation_get = op_api.get_operation(operation.id)
+                poll["operation_status"] = operation_get.status
                 return operation_get
-        except HTTPError as err:
+        except urllib3.exceptions.HTTPError as err:
             raise OperationException(operation, http_error=err)
-        time.sleep(int(math.ceil(operation_get.retry_in / 1000)))
+
+    with trace_span(
+        fusion, SPAN_AWAIT, "Await operations", operation_count=len(operations)
+    ) as wait:
+        while pending:
+            still_pending = []
+            retry_in = None
+            for item, operation_get, exc in run_concurrently(
+                lambda item: _poll(item, wait), pending, concurrency
+            ):
+                if exc is not None:
+                    raise exc
+                index, operation = item
+                if operation_get.status in ("Succeeded", "Failed"):
+                    operation_finished(fusion, operation)
+                if operation_get.status == "Succeeded":
+                    finished[index] = operation_get
+                elif operation_get.status == "Failed":
+                    if fail_playbook_if_operation_fails:
+                        raise OperationException(operation_get)
+                    finished[index] = operation_get
+                else:
+                    still_pending.append(item)
+                    if retry_in is None or operation_get.retry_in < retry_in:
+                        retry_in = operation_get.retry_in
+            pending = still_pending
+            if pending:
+                _sleep_before_poll(fusion, retry_in)
+    return finished
+
+
+def submit_and_await(fusion, items, submit, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Calls `submit(item)`, which starts an operation and returns it, for all
+    `items` concurrently, then waits for all started operations together.
+    Returns list of (item, exception) tuples in the same order as `items`,
+    the exception is None if the operation of the item succeeded.
+    """
+    results = []
+    submitted = []
+    for item, op, exc in run_concurrently(submit, items, concurrency):
+        results.append([item, exc])
+        if exc is None:
+            submitted.append((len(results) - 1, op))
+
+    if submitted:
+        finished = await_operations(
+            fusion,
+            [op for _index, op in submitted],
+            fail_playbook_if_operation_fails=False,
+            concurrency=concurrency,
+        )
+        for (index, _op), op in zip(submitted, finished):
+            if op.status == "Failed":
+                results[index][1] = OperationException(op)
+    return [tuple(result) for result in results]
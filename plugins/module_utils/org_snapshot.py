@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import datetime
+import gzip
+import json
+import os
+import tempfile
+import uuid
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.raw_json import (
+    loads,
+)
+
+FORMAT = "purestorage.fusion.org-snapshot"
+FORMAT_VERSION = 1
+
+DEFAULT_CHUNK_SIZE = 500
+
+# kinds of resources by replay level, a kind depends only on kinds of
+# previous levels
+LEVELS = [
+    ["storage_services", "protection_policies", "host_access_policies", "tenants"],
+    ["storage_classes", "tenant_spaces"],
+    ["placement_groups"],
+    ["volumes"],
+    ["role_assignments"],
+]
+
+KINDS = [kind for level in LEVELS for kind in level]
+
+# fields identifying a resource, names of its parents first
+KEY_FIELDS = {
+    "storage_classes": ("storage_service", "name"),
+    "tenant_spaces": ("tenant", "name"),
+    "placement_groups": ("tenant", "tenant_space", "name"),
+    "volumes": ("tenant", "tenant_space", "name"),
+    # names of role assignments are generated by the API
+    "role_assignments": ("role", "principal", "scope"),
+}
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def resource_key(kind, record):
+    """Returns string identifying the resource of `kind`, e.g.
+    'volumes/tenant1/space1/volume1'"""
+    fields = KEY_FIELDS.get(kind, ("name",))
+    return "/".join([kind] + [record[field] for field in fields])
+
+
+def _dumps(line):
+    return json.dumps(line, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class SnapshotWriter(object):
+    """
+    Streams resources to a snapshot file, a JSON document per line:
+
+        {"format": ..., "version": 1, "id": ..., "created_at": ...}
+        {"kind": "volumes", "items": [...]}
+        ...
+        {"end": true, "chunks": 42, "counts": {"volumes": 20000, ...}}
+
+    Resources are written in chunks of at most `chunk_size` items as they are
+    added, so the whole organization is never held in memory. The file is
+    written under a temporary name and renamed when closed, the trailer line
+    tells a complete snapshot from a truncated one. Paths ending with `.gz`
+    are compressed.
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.id = uuid.uuid4().hex
+        self.chunks = 0
+        self.counts = dict((kind, 0) for kind in KINDS)
+        fd, self._tmp_path = tempfile.mkstemp(
+            prefix=".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path))
+        )
+        self._raw = os.fdopen(fd, "wb")
+        self._file = self._raw
+        if path.endswith(".gz"):
+            self._file = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        self._file.write(
+            _dumps(
+                {
+                    "format": FORMAT,
+                    "version": FORMAT_VERSION,
+                    "id": self.id,
+                    "created_at": datetime.datetime.now(datetime.timezone.utc)
+                    .replace(microsecond=0)
+                    .isoformat(),
+                }
+            )
+        )
+
+    def add(self, kind, records):
+        """Writes `records` (list of dicts) of resources of `kind`"""
+        for start in range(0, len(records), self.chunk_size):
+            self._file.write(
+                _dumps(
+                    {"kind": kind, "items": records[start : start + self.chunk_size]}
+                )
+            )
+            self.chunks += 1
+        self.counts[kind] += len(records)
+
+    def close(self):
+        """Finishes the snapshot and moves it to `path`"""
+        self._file.write(
+            _dumps({"end": True, "chunks": self.chunks, "counts": self.counts})
+        )
+        if self._file is not self._raw:
+            self._file.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+        os.chmod(self._tmp_path, 0o600)
+        os.rename(self._tmp_path, self.path)
+
+    def abort(self):
+        """Drops the unfinished snapshot"""
+        try:
+            if self._file is not self._raw:
+                self._file.close()
+            self._raw.close()
+        finally:
+            os.unlink(self._tmp_path)
+
+
+class Snapshot(object):
+    """
+    Snapshot file written by SnapshotWriter. The file is read through once
+    when opened to check it is complete and valid, chunks are then read again
+    by kinds, one at a time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.counts = None
+        # kind of every line, None for header and trailer
+        self._line_kinds = []
+        trailer = None
+        for number, line in enumerate(self._lines(), 1):
+            if trailer is not None:
+                raise ValueError("line {0} follows the end of snapshot".format(number))
+            try:
+                content = loads(line)
+            except ValueError:
+                raise ValueError("line {0} is not valid JSON".format(number))
+            if not isinstance(content, dict):
+                raise ValueError("line {0} is not a JSON object".format(number))
+            if self.header is None:
+                self._check_header(content)
+                self.header = content
+                self._line_kinds.append(None)
+            elif content.get("end") is True:
+                trailer = content
+                self._line_kinds.append(None)
+            elif content.get("kind") in KINDS and isinstance(
+                content.get("items"), list
+            ):
+                self._line_kinds.append(content["kind"])
+            else:
+                raise ValueError("line {0} is not a chunk of resources".format(number))
+
+        chunks = sum(1 for kind in self._line_kinds if kind is not None)
+        if trailer is None or trailer.get("chunks") != chunks:
+            raise ValueError("snapshot is incomplete")
+        self.counts = trailer.get("counts") or {}
+
+    @staticmethod
+    def _check_header(header):
+        if header.get("format") != FORMAT:
+            raise ValueError("not a Fusion organization snapshot")
+        version = header.get("version")
+        if not isinstance(version, int) or version > FORMAT_VERSION:
+            raise ValueError(
+                "snapshot format version {0} is not supported, the newest supported is {1}".format(
+                    version, FORMAT_VERSION
+                )
+            )
+
+    @property
+    def id(self):
+        return self.header.get("id")
+
+    def _lines(self):
+        with open(self.path, "rb") as f:
+            compressed = f.read(2) == GZIP_MAGIC
+        opener = gzip.open if compressed else open
+        with opener(self.path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+    def chunks(self, kinds):
+        """Yields (kind, records) tuples of chunks of resources of `kinds`,
+        only these chunks are parsed"""
+        for line, kind in zip(self._lines(), self._line_kinds):
+            if kind in kinds:
+                yield kind, loads(line)["items"]
+
+
+class Checkpoint(object):
+    """
+    Append-only file recording keys (see resource_key()) of resources
+    replayed from a snapshot, a JSON string per line after a header naming the
+    snapshot. Every batch of keys is flushed to disk, a line cut short by a
+    crash is ignored when the checkpoint is read again.
+    """
+
+    def __init__(self, path, snapshot_id):
+        self.path = path
+        self.done = read_checkpoint(path, snapshot_id)
+        new = not os.path.exists(path)
+        self._file = open(path, "ab")
+        if new:
+            os.chmod(path, 0o600)
+        # an empty file, e.g. left by a crash right after it was created
+        if not self._file.tell():
+            self._file.write(_dumps({"snapshot": snapshot_id}))
+        elif not _ends_with_newline(path):
+            # keys must not be appended to a line cut short
+            self._file.write(b"\n")
+        self._file.flush()
+
+    def add(self, keys):
+        """Records resources as replayed"""
+        if not keys:
+            return
+        self._file.write(b"".join(_dumps(key) for key in keys))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.done.update(keys)
+
+    def remove(self):
+        """Drops the checkpoint once the whole snapshot is replayed"""
+        self._file.close()
+        os.unlink(self.path)
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def read_checkpoint(path, snapshot_id):
+    """Returns set of keys of resources recorded in checkpoint file `path`,
+    empty if it does not exist. Raises ValueError if the checkpoint belongs
+    to another snapshot."""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, "rb") as f:
+        for number, line in enumerate(f):
+            try:
+                content = loads(line)
+            except ValueError:
+                content = None
+            if number == 0:
+                if (
+                    not isinstance(content, dict)
+                    or content.get("snapshot") != snapshot_id
+                ):
+                    raise ValueError(
+                        "checkpoint '{0}' does not belong to snapshot {1}".format(
+                            path, snapshot_id
+                        )
+                    )
+            elif isinstance(content, str):
+                done.add(content)
+    return done
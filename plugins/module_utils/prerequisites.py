@@ -9,7 +9,14 @@ __metaclass__ = type
 
 import re
 import importlib
-import importlib.metadata
+import importlib.util
+import os
+import sys
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.state_file import (
+    get_state_file,
+    locked_state,
+)
 
 # This file exists because Ansible currently cannot declare dependencies on Python modules.
 # see https://github.com/ansible/ansible/issues/62733 for more info about lack of req support
@@ -24,6 +31,39 @@ DEPENDENCIES = [
 
 #############################
 
+STATE_FILE_PREFIX = "ansible-purefusion-dependencies-"
+
+
+class LazyModule:
+    """
+    Stands in for a module which is imported on first attribute access.
+    Importing the Fusion SDK takes most of the module start-up time, so it
+    is deferred until the SDK is used, after arguments have been validated.
+    A missing module raises ImportError at the first use, not at import.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def lazy_import(name):
+    """
+    Returns a stand-in for module `name` which imports it on first use.
+
+    :param name: a string with module name, e.g. "fusion"
+    :returns: a LazyModule instance
+    """
+    return LazyModule(name)
+
+
+#############################
+
 
 def _parse_version(val):
     """
@@ -124,10 +164,78 @@ def _version_satisfied(version, requirements):
     return True
 
 
+def _read_version(package):
+    # importing importlib.metadata and scanning sys.path is slow
+    import importlib.metadata
+
+    return importlib.metadata.version(package)
+
+
+def _find_dist_info(location, package):
+    """
+    Finds the dist-info directory of an installed package next to a module
+    it provides.
+
+    :param location: a string, path of a module file from 'package'
+    :param package: a string, package name
+    :returns: path of the dist-info directory or None if not found
+    """
+    if not location:
+        return None
+    site_dir = os.path.dirname(location)
+    if os.path.basename(location) == "__init__.py":
+        site_dir = os.path.dirname(site_dir)
+    prefix = re.sub(r"[-_.]+", "_", package).lower() + "-"
+    try:
+        for entry in os.listdir(site_dir):
+            if entry.lower().startswith(prefix) and entry.endswith(".dist-info"):
+                return os.path.join(site_dir, entry)
+    except OSError:
+        pass
+    return None
+
+
+def _package_version(location, package):
+    """
+    Returns version of an installed package. The version is cached in a state
+    file per interpreter and read again only when the package's dist-info
+    directory moves or its mtime changes, i.e. when the package is reinstalled.
+
+    :param location: a string, path of a module file from 'package'
+    :param package: a string, package name
+    :returns: a string with the package version
+    """
+    dist_info = _find_dist_info(location, package)
+    if dist_info is None:
+        return _read_version(package)
+    try:
+        mtime = os.stat(dist_info).st_mtime
+        path = get_state_file(STATE_FILE_PREFIX, sys.executable)
+        with locked_state(path) as state:
+            cached = state.get(package)
+            if (
+                isinstance(cached, dict)
+                and cached.get("dist_info") == dist_info
+                and cached.get("mtime") == mtime
+            ):
+                return cached["version"]
+            version = _read_version(package)
+            state[package] = {
+                "dist_info": dist_info,
+                "mtime": mtime,
+                "version": version,
+            }
+            return version
+    except (OSError, KeyError):
+        return _read_version(package)
+
+
 # poor helper to work around the fact Ansible is unable to manage python dependencies
 def _check_import(ansible_module, module, package=None, version_requirements=None):
     """
-    Tries to import a module and optionally validates its package version.
+    Checks that a module can be imported and optionally validates its package
+    version. The module is only looked up, not imported, so that the Fusion
+    SDK is imported on its first use (see lazy_import()).
     Calls AnsibleModule.fail_json() if not satisfied.
 
     :param ansible_module: an AnsibleModule instance
@@ -136,8 +244,10 @@ def _check_import(ansible_module, module, package=None, version_requirements=Non
     :param version_requirements: a string, version requirements for 'package'
     """
     try:
-        importlib.import_module(module)
-    except ImportError:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
         ansible_module.fail_json(
             msg="Error: Python package '{0}' required and missing".format(module)
         )
@@ -146,7 +256,7 @@ def _check_import(ansible_module, module, package=None, version_requirements=Non
         # silently ignore version checks and hope for the best if we can't fetch
         # the package version since we can't know how the user installs packages
         try:
-            version = importlib.metadata.version(package)
+            version = _package_version(spec.origin, package)
             if version and not _version_satisfied(version, version_requirements):
                 ansible_module.fail_json(
                     msg="Error: Python package '{0}' version '{1}' does not satisfy requirements '{2}'".format(
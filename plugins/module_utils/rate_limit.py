@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import time
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.state_file import (
+    get_state_file,
+    locked_state,
+)
+
+ENV_RATE_LIMIT = "FUSION_RATE_LIMIT"
+ENV_RATE_LIMIT_BURST = "FUSION_RATE_LIMIT_BURST"
+
+STATE_FILE_PREFIX = "ansible-purefusion-rate-limit-"
+
+
+def get_rate_limit(environ=os.environ):
+    """Returns (requests per second, burst) tuple configured by environment
+    variables, or None if rate limiting is not enabled. Raises ValueError
+    if the configuration is not valid."""
+    rate = environ.get(ENV_RATE_LIMIT)
+    if not rate:
+        return None
+    try:
+        rate = float(rate)
+    except ValueError:
+        raise ValueError(
+            "{0} must be a number of requests per second, got '{1}'".format(
+                ENV_RATE_LIMIT, rate
+            )
+        )
+    if rate <= 0:
+        return None
+
+    burst = environ.get(ENV_RATE_LIMIT_BURST)
+    if not burst:
+        return rate, max(rate, 1.0)
+    try:
+        burst = float(burst)
+    except ValueError:
+        burst = 0
+    if burst < 1:
+        raise ValueError(
+            "{0} must be a number greater or equal to 1, got '{1}'".format(
+                ENV_RATE_LIMIT_BURST, environ.get(ENV_RATE_LIMIT_BURST)
+            )
+        )
+    return rate, burst
+
+
+class RateLimiter(object):
+    """Token bucket shared by all processes using the same state file, e.g.
+    all forks of a play talking to the same API host.
+
+    Every request takes a token, tokens are refilled at `rate` per second up
+    to `burst`. A request which finds the bucket empty still takes its token
+    (going into debt) and sleeps until the token would be available, so the
+    waiting requests are spread evenly instead of retrying all at once.
+    """
+
+    def __init__(self, rate, burst, state_file):
+        self.rate = rate
+        self.burst = burst
+        self.state_file = state_file
+
+    def acquire(self):
+        """Takes one token, returns number of seconds waited for it"""
+        with locked_state(self.state_file) as state:
+            now = time.time()
+            try:
+                tokens = float(state["tokens"])
+                updated = float(state["updated"])
+            except (KeyError, TypeError, ValueError):
+                # new or corrupted file, start with full bucket
+                tokens, updated = self.burst, now
+            # clock might have been adjusted backwards
+            elapsed = max(now - updated, 0)
+            tokens = min(self.burst, tokens + elapsed * self.rate) - 1
+            state.update(tokens=tokens, updated=now)
+
+        wait = -tokens / self.rate if tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimitedCall(object):
+    """Wraps `ApiClient.call_api()` to take a token before every request"""
+
+    def __init__(self, call_api, limiter):
+        self._call_api = call_api
+        self.limiter = limiter
+
+    def __call__(self, *args, **kwargs):
+        self.limiter.acquire()
+        return self._call_api(*args, **kwargs)
+
+
+def install_rate_limiter(client, rate, burst):
+    """Makes `client` (`fusion.ApiClient`) limit rate of its requests together
+    with all other processes talking to the same API host"""
+    if not isinstance(client.call_api, RateLimitedCall):
+        limiter = RateLimiter(
+            rate, burst, get_state_file(STATE_FILE_PREFIX, client.configuration.host)
+        )
+        client.call_api = RateLimitedCall(client.call_api, limiter)
+    return client
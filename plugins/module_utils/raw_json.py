@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def loads(data):
+    """Parses JSON `data` (bytes or str) with the fastest decoder available"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _is_sdk_method(method):
+    # only methods of the generated SDK API classes accept `_preload_content`
+    instance = getattr(method, "__self__", None)
+    return type(instance).__module__.startswith("fusion.api.")
+
+
+def list_items_raw(list_method, **kwargs):
+    """
+    Calls SDK `list_method` (e.g. `VolumesApi(fusion).list_volumes`) asking for
+    the raw response and returns its items as parsed JSON, without turning
+    them into SDK models. Returns None if the raw response is not available
+    or not a listing, and the caller must use the SDK models instead.
+    """
+    if not _is_sdk_method(list_method):
+        return None
+    response = list_method(_preload_content=False, **kwargs)
+    try:
+        items = loads(response.data)["items"]
+    except (AttributeError, ValueError, TypeError, KeyError):
+        return None
+    finally:
+        release_conn = getattr(response, "release_conn", None)
+        if release_conn is not None:
+            release_conn()
+    return items if isinstance(items, list) else None
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+
+# operations are polled until they finish, they must always be fetched again
+UNCACHED_PATH_PREFIXES = ("/operations",)
+
+
+def _expand_path(resource_path, path_params):
+    """Fills path parameters into resource path template, e.g.
+    '/tenants/{tenant_name}' -> '/tenants/tenant1'"""
+    for name, value in (path_params or {}).items():
+        resource_path = resource_path.replace("{%s}" % name, str(value))
+    return resource_path.rstrip("/")
+
+
+def _paths_related(first, second):
+    """Returns True if one path is the same as or nested under the other one"""
+    return (
+        first == second
+        or first.startswith(second + "/")
+        or second.startswith(first + "/")
+    )
+
+
+class RequestCache(object):
+    """Wraps `ApiClient.call_api()` and memoizes successful GET requests for
+    the lifetime of the client, i.e. for a single module run.
+
+    Any other request invalidates cached responses of the same resource, of
+    resources nested under it and of collections it belongs to.
+    """
+
+    def __init__(self, call_api):
+        self._call_api = call_api
+        self._entries = {}
+        self._lock = threading.Lock()
+        # bumped on every invalidation so that responses of GETs which were
+        # in flight during a write are not stored
+        self._generation = 0
+
+    def __call__(
+        self,
+        resource_path,
+        method,
+        path_params=None,
+        query_params=None,
+        header_params=None,
+        body=None,
+        post_params=None,
+        files=None,
+        response_type=None,
+        auth_settings=None,
+        async_req=None,
+        _return_http_data_only=None,
+        collection_formats=None,
+        _preload_content=True,
+        _request_timeout=None,
+    ):
+        def _call():
+            return self._call_api(
+                resource_path,
+                method,
+                path_params=path_params,
+                query_params=query_params,
+                header_params=header_params,
+                body=body,
+                post_params=post_params,
+                files=files,
+                response_type=response_type,
+                auth_settings=auth_settings,
+                async_req=async_req,
+                _return_http_data_only=_return_http_data_only,
+                collection_formats=collection_formats,
+                _preload_content=_preload_content,
+                _request_timeout=_request_timeout,
+            )
+
+        path = _expand_path(resource_path, path_params)
+
+        if method != "GET":
+            self.invalidate(path)
+            try:
+                return _call()
+            finally:
+                # drop also anything fetched while the request was in flight
+                self.invalidate(path)
+
+        if async_req or not _preload_content or path.startswith(UNCACHED_PATH_PREFIXES):
+            return _call()
+
+        key = (
+            path,
+            tuple((name, str(value)) for name, value in query_params or []),
+            response_type,
+            _return_http_data_only,
+        )
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            generation = self._generation
+
+        response = _call()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = response
+        return response
+
+    def invalidate(self, path=None):
+        """Drops cached responses related to `path`, or all of them"""
+        with self._lock:
+            self._generation += 1
+            if path is None:
+                self._entries.clear()
+                return
+            for key in list(self._entries):
+                if _paths_related(key[0], path):
+                    del self._entries[key]
+
+
+def install_request_cache(client):
+    """Makes `client` (`fusion.ApiClient`) cache its GET requests"""
+    if not isinstance(client.call_api, RequestCache):
+        client.call_api = RequestCache(client.call_api)
+    return client
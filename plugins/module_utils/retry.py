@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import email.utils
+import os
+import random
+import threading
+import time
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+ENV_MAX_RETRIES = "FUSION_MAX_RETRIES"
+DEFAULT_MAX_RETRIES = 5
+
+# transient responses worth retrying
+RETRY_STATUSES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+BACKOFF_BASE = 1
+BACKOFF_MAX = 30
+# do not let the server put us to sleep for too long
+RETRY_AFTER_MAX = 120
+
+
+def get_max_retries(environ=os.environ):
+    """Returns maximum number of retries of a single request configured by
+    environment variable. Raises ValueError if the configuration is not valid."""
+    value = environ.get(ENV_MAX_RETRIES)
+    if not value:
+        return DEFAULT_MAX_RETRIES
+    try:
+        retries = int(value)
+    except ValueError:
+        retries = -1
+    if retries < 0:
+        raise ValueError(
+            "{0} must be a non-negative integer, got '{1}'".format(
+                ENV_MAX_RETRIES, value
+            )
+        )
+    return retries
+
+
+def _get_header(headers, name):
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def parse_retry_after(value):
+    """Parses value of Retry-After header, either number of seconds or
+    HTTP date. Returns number of seconds or None if it cannot be parsed."""
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    return max(date.timestamp() - time.time(), 0)
+
+
+def is_idempotent(method, header_params):
+    """Only reads are safe to repeat, unless the write carries X-Request-ID
+    which makes Fusion process it at most once"""
+    if method in IDEMPOTENT_METHODS:
+        return True
+    return _get_header(header_params, "X-Request-ID") is not None
+
+
+class RetryingCall(object):
+    """Wraps `ApiClient.call_api()` to retry idempotent requests which failed
+    with a transient status, waiting as long as the server asks to by
+    Retry-After header or by capped exponential backoff otherwise. The
+    number of retries is reported in API usage counters, see api_stats."""
+
+    def __init__(self, call_api, max_retries=DEFAULT_MAX_RETRIES):
+        self._call_api = call_api
+        self.max_retries = max_retries
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def _delay(self, attempt, exception):
+        retry_after = parse_retry_after(_get_header(exception.headers, "Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, RETRY_AFTER_MAX)
+        delay = min(BACKOFF_BASE * 2**attempt, BACKOFF_MAX)
+        # jitter keeps forks which failed together from retrying together
+        return random.uniform(delay / 2, delay)
+
+    def __call__(self, resource_path, method, *args, **kwargs):
+        header_params = kwargs.get("header_params")
+        if header_params is None and args:
+            header_params = args[2] if len(args) > 2 else None
+        retryable = is_idempotent(method, header_params)
+
+        attempt = 0
+        while True:
+            try:
+                return self._call_api(resource_path, method, *args, **kwargs)
+            except purefusion.rest.ApiException as exc:
+                if (
+                    not retryable
+                    or exc.status not in RETRY_STATUSES
+                    or attempt >= self.max_retries
+                ):
+                    raise
+                time.sleep(self._delay(attempt, exc))
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+
+
+def install_retries(client, max_retries=DEFAULT_MAX_RETRIES):
+    """Makes `client` (`fusion.ApiClient`) retry transient failures"""
+    if max_retries > 0 and not isinstance(client.call_api, RetryingCall):
+        client.call_api = RetryingCall(client.call_api, max_retries)
+    return client
+
+
+def _find_retrying_call(call_api):
+    while call_api is not None:
+        if isinstance(call_api, RetryingCall):
+            return call_api
+        call_api = getattr(call_api, "_call_api", None)
+    return None
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+
+def user_to_principal(fusion, user_id):
+    """Given a human-readable Fusion user, such as a Pure 1 App ID
+    return the associated principal
+    """
+    id_api_instance = purefusion.IdentityManagerApi(fusion)
+    # let the server do the filtering instead of downloading the whole user directory
+    users = id_api_instance.list_users(name=user_id)
+    for user in users:
+        if user.name == user_id:
+            return user.id
+    return None
+
+
+def apiclient_to_principal(fusion, api_client_key):
+    """Given an API client issuer ID, such as "pure1:apikey:123xXxyYyzYzASDF",
+    return the associated principal
+    """
+    id_api_instance = purefusion.IdentityManagerApi(fusion)
+    api_clients = id_api_instance.list_users(name=api_client_key)
+    if len(api_clients) > 0:
+        return api_clients[0].id
+    return None
+
+
+def get_scope(params):
+    """Given a scope type and associated tenant
+    and tenant_space, return the scope_link
+    """
+    scope_link = None
+    if params["scope"] == "organization":
+        scope_link = "/"
+    elif params["scope"] == "tenant":
+        scope_link = "/tenants/" + params["tenant"]
+    elif params["scope"] == "tenant_space":
+        scope_link = (
+            "/tenants/" + params["tenant"] + "/tenant-spaces/" + params["tenant_space"]
+        )
+    return scope_link
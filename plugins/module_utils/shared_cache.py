@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import threading
+import time
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.request_cache import (
+    _expand_path,
+)
+
+sqlite3 = lazy_import("sqlite3")
+
+ENV_CACHE_FILE = "FUSION_CACHE_FILE"
+ENV_CACHE_TTL = "FUSION_CACHE_TTL"
+
+CLIENT_ATTRIBUTE = "fusion_shared_cache"
+
+# seconds responses of slowly changing resources are served from the cache,
+# by kind of resource, i.e. name of its collection in the API path
+DEFAULT_TTLS = {
+    "regions": 3600,
+    "availability-zones": 3600,
+    "hardware-types": 3600,
+    "storage-services": 600,
+    "storage-classes": 600,
+    "protection-policies": 600,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    host TEXT NOT NULL,
+    path TEXT NOT NULL,
+    query TEXT NOT NULL,
+    expires REAL NOT NULL,
+    headers TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (host, path, query)
+)
+"""
+
+
+def _parse_ttls(value):
+    ttls = dict(DEFAULT_TTLS)
+    if "=" not in value:
+        # a single TTL for all kinds
+        seconds = float(value)
+        if seconds < 0:
+            raise ValueError
+        return dict((kind, seconds) for kind in ttls)
+    for item in value.split(","):
+        kind, _sep, seconds = item.partition("=")
+        kind = kind.strip().replace("_", "-")
+        if kind not in ttls or float(seconds) < 0:
+            raise ValueError
+        ttls[kind] = float(seconds)
+    return ttls
+
+
+def get_shared_cache_config(environ=os.environ):
+    """Returns (path, TTLs by kind) tuple of the shared cache configured by
+    environment variables, or None if it is disabled. Raises ValueError if
+    the configuration is not valid."""
+    path = environ.get(ENV_CACHE_FILE)
+    if not path:
+        return None
+    value = environ.get(ENV_CACHE_TTL)
+    if not value:
+        return path, dict(DEFAULT_TTLS)
+    try:
+        return path, _parse_ttls(value)
+    except ValueError:
+        raise ValueError(
+            "{0} must be a number of seconds or comma separated kind=seconds pairs "
+            "of kinds {1}, got '{2}'".format(
+                ENV_CACHE_TTL, ", ".join(sorted(DEFAULT_TTLS)), value
+            )
+        )
+
+
+def resource_kind(path):
+    """Returns kind of resource or collection at `path`, e.g. 'storage-classes'
+    for '/storage-services/ss1/storage-classes/sc1'"""
+    segments = path.strip("/").split("/")
+    if not segments[0]:
+        return None
+    return segments[-1] if len(segments) % 2 else segments[-2]
+
+
+class _CachedResponse(object):
+    # stands in for RESTResponse when deserializing cached data
+    def __init__(self, data):
+        self.data = data
+
+
+class SharedCache(object):
+    """Wraps `ApiClient.call_api()` and serves GET requests of slowly changing
+    resources (see DEFAULT_TTLS) from an SQLite file shared by all module
+    runs, until their TTL expires.
+
+    Entries are keyed by API host, resource path and query. Any other
+    request invalidates entries of the same resource, of resources nested
+    under it and of collections it belongs to. They are invalidated again
+    when the operation started by the request finishes (see
+    operation_finished()), as other module runs may have cached the old
+    state while it was running. Errors of the cache file are ignored,
+    requests then go to the API.
+    """
+
+    def __init__(self, call_api, client, path, ttls):
+        self._call_api = call_api
+        self._client = client
+        self.path = path
+        self.ttls = ttls
+        self.host = client.configuration.host
+        # SQLite connections cannot be used by other threads than the one
+        # which opened them, requests are sent from worker threads too
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        # paths written by running operations, by operation id
+        self._operation_paths = {}
+
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            try:
+                os.chmod(self.path, 0o600)
+                db.execute(SCHEMA)
+                db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+            except Exception:
+                db.close()
+                raise
+            self._local.db = db
+        return db
+
+    def _get(self, path, query):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT headers, data FROM responses "
+                "WHERE host = ? AND path = ? AND query = ? AND expires > ?",
+                (self.host, path, query, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1].decode("utf-8")
+
+    def _put(self, path, query, ttl, headers, data):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (self.host, path, query, time.time() + ttl, json.dumps(headers), data),
+        )
+
+    def invalidate(self, path):
+        """Drops entries related to `path` (see RequestCache.invalidate())"""
+        try:
+            self._connection().execute(
+                "DELETE FROM responses WHERE host = ? AND (path = ? "
+                "OR substr(path, 1, length(?) + 1) = ? || '/' "
+                "OR substr(?, 1, length(path) + 1) = path || '/')",
+                (self.host, path, path, path, path),
+            )
+        except (sqlite3.Error, OSError):
+            pass
+
+    def operation_finished(self, operation_id):
+        """Invalidates entries of the path written by the operation"""
+        with self._lock:
+            path = self._operation_paths.pop(operation_id, None)
+        if path is not None:
+            self.invalidate(path)
+
+    def __call__(
+        self,
+        resource_path,
+        method,
+        path_params=None,
+        query_params=None,
+        header_params=None,
+        body=None,
+        post_params=None,
+        files=None,
+        response_type=None,
+        auth_settings=None,
+        async_req=None,
+        _return_http_data_only=None,
+        collection_formats=None,
+        _preload_content=True,
+        _request_timeout=None,
+    ):
+        kwargs = dict(
+            path_params=path_params,
+            query_params=query_params,
+            header_params=header_params,
+            body=body,
+            post_params=post_params,
+            files=files,
+            response_type=response_type,
+            auth_settings=auth_settings,
+            async_req=async_req,
+            _return_http_data_only=_return_http_data_only,
+            collection_formats=collection_formats,
+            _preload_content=_preload_content,
+            _request_timeout=_request_timeout,
+        )
+        path = _expand_path(resource_path, path_params)
+
+        if method != "GET":
+            self.invalidate(path)
+            try:
+                result = self._call_api(resource_path, method, **kwargs)
+            finally:
+                self.invalidate(path)
+            operation = result[0] if isinstance(result, tuple) else result
+            operation_id = getattr(operation, "id", None)
+            if isinstance(operation_id, str):
+                with self._lock:
+                    self._operation_paths[operation_id] = path
+            return result
+
+        ttl = self.ttls.get(resource_kind(path))
+        if not ttl or async_req or not _preload_content:
+            return self._call_api(resource_path, method, **kwargs)
+
+        query = json.dumps([[name, str(value)] for name, value in query_params or []])
+        try:
+            cached = self._get(path, query)
+        except (sqlite3.Error, OSError, ValueError):
+            cached = None
+        status = 200
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            headers, data = cached
+        else:
+            # fetched raw to be stored as it came, deserialized below
+            kwargs.update(_preload_content=False, _return_http_data_only=False)
+            response, status, headers = self._call_api(resource_path, method, **kwargs)
+            try:
+                data = response.data
+            finally:
+                release_conn = getattr(response, "release_conn", None)
+                if release_conn is not None:
+                    release_conn()
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            headers = dict(headers or {})
+            try:
+                self._put(path, query, ttl, headers, data.encode("utf-8"))
+            except (sqlite3.Error, OSError):
+                pass
+
+        result = self._client.deserialize(_CachedResponse(data), response_type)
+        if _return_http_data_only:
+            return result
+        return result, status, headers
+
+
+def install_shared_cache(client, path, ttls):
+    """Makes `client` (`fusion.ApiClient`) serve GET requests of slowly
+    changing resources from the shared cache file `path`"""
+    if not isinstance(client.call_api, SharedCache):
+        client.call_api = SharedCache(client.call_api, client, path, ttls)
+        setattr(client, CLIENT_ATTRIBUTE, client.call_api)
+    return client
+
+
+def operation_finished(client, operation):
+    """Tells the shared cache of `client`, if any, that `operation` has
+    succeeded or failed"""
+    cache = getattr(client, CLIENT_ATTRIBUTE, None)
+    if isinstance(cache, SharedCache):
+        cache.operation_finished(operation.id)
@@ -2,28 +2,156 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
-
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
-    await_operation,
+    submit_and_await,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
 )
 
+purefusion = lazy_import("fusion")
+
+
+def _snapshot_name(snap):
+    return snap.name
+
+
+def snapshot_key(snap):
+    """Returns (tenant, tenant space, name) tuple identifying the snapshot"""
+    return snap.tenant.name, snap.tenant_space.name, snap.name
 
-def delete_snapshot(fusion, snap, snapshots_api):
-    patch = purefusion.SnapshotPatch(destroyed=purefusion.NullableBoolean(True))
-    op = snapshots_api.update_snapshot(
-        body=patch,
-        tenant_name=snap.tenant.name,
-        tenant_space_name=snap.tenant_space.name,
-        snapshot_name=snap.name,
+
+def _run_snapshot_phase(
+    fusion, snapshots, submit, concurrency, failures, key=_snapshot_name
+):
+    """Submits an operation for every snapshot concurrently and waits for all
+    of them together. Failures are recorded in `failures` under `key(snap)`,
+    returns snapshots the phase succeeded for."""
+    succeeded = []
+    for snap, exc in submit_and_await(fusion, snapshots, submit, concurrency):
+        if exc is not None:
+            failures[key(snap)] = format_fusion_exception(exc)
+        else:
+            succeeded.append(snap)
+    return succeeded
+
+
+def create_snapshots(fusion, specs, snapshots_api, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Creates snapshots described by `specs`, dicts with `tenant`, `tenant_space`,
+    `name`, `display_name` and either `placement_group` or `volumes` (list of
+    names). Create requests for all snapshots are sent concurrently, then all
+    operations are awaited together.
+
+    :returns: dict mapping (tenant, tenant space, name) tuples of snapshots which
+        failed to be created to error messages
+    """
+
+    def _create(spec):
+        body = purefusion.SnapshotPost(
+            name=spec["name"],
+            display_name=spec.get("display_name") or spec["name"],
+            placement_group=spec.get("placement_group"),
+            volumes=spec.get("volumes"),
+        )
+        return snapshots_api.create_snapshot(
+            body,
+            tenant_name=spec["tenant"],
+            tenant_space_name=spec["tenant_space"],
+        )
+
+    failures = {}
+    _run_snapshot_phase(
+        fusion,
+        specs,
+        _create,
+        concurrency,
+        failures,
+        key=lambda spec: (spec["tenant"], spec["tenant_space"], spec["name"]),
     )
-    await_operation(fusion, op)
-    op = snapshots_api.delete_snapshot(
-        tenant_name=snap.tenant.name,
-        tenant_space_name=snap.tenant_space.name,
-        snapshot_name=snap.name,
+    return failures
+
+
+def recover_snapshots(
+    fusion, snapshots, snapshots_api, concurrency=DEFAULT_CONCURRENCY
+):
+    """
+    Recovers given destroyed snapshots concurrently.
+
+    :returns: dict mapping snapshot_key() of snapshots which failed to be
+        recovered to error messages
+    """
+
+    def _recover(snap):
+        patch = purefusion.SnapshotPatch(destroyed=purefusion.NullableBoolean(False))
+        return snapshots_api.update_snapshot(
+            body=patch,
+            tenant_name=snap.tenant.name,
+            tenant_space_name=snap.tenant_space.name,
+            snapshot_name=snap.name,
+        )
+
+    failures = {}
+    _run_snapshot_phase(
+        fusion, snapshots, _recover, concurrency, failures, key=snapshot_key
+    )
+    return failures
+
+
+def delete_snapshots(
+    fusion,
+    snapshots,
+    snapshots_api,
+    concurrency=DEFAULT_CONCURRENCY,
+    key=_snapshot_name,
+):
+    """
+    Destroys and eradicates given snapshots. Destroy requests for all snapshots
+    are sent concurrently first, then eradications of the destroyed ones.
+
+    :returns: dict mapping `key(snap)`, names by default, of snapshots which
+        failed to be deleted to error messages
+    """
+
+    def _destroy(snap):
+        patch = purefusion.SnapshotPatch(destroyed=purefusion.NullableBoolean(True))
+        return snapshots_api.update_snapshot(
+            body=patch,
+            tenant_name=snap.tenant.name,
+            tenant_space_name=snap.tenant_space.name,
+            snapshot_name=snap.name,
+        )
+
+    def _eradicate(snap):
+        return snapshots_api.delete_snapshot(
+            tenant_name=snap.tenant.name,
+            tenant_space_name=snap.tenant_space.name,
+            snapshot_name=snap.name,
+        )
+
+    failures = {}
+    snapshots = list(snapshots)
+    # snapshots can be already destroyed, e.g. by a previous failed run
+    to_destroy = [snap for snap in snapshots if snap.destroyed is not True]
+    destroyed = [snap for snap in snapshots if snap.destroyed is True]
+    destroyed += _run_snapshot_phase(
+        fusion, to_destroy, _destroy, concurrency, failures, key
+    )
+    _run_snapshot_phase(fusion, destroyed, _eradicate, concurrency, failures, key)
+    return failures
+
+
+def format_snapshot_failures(failures):
+    """Formats result of `delete_snapshots()` into a short message"""
+    return "Failed to delete {0} snapshot(s): {1}".format(
+        len(failures),
+        "; ".join(
+            "'{0}': {1}".format(name, msg) for name, msg in sorted(failures.items())
+        ),
     )
-    await_operation(fusion, op)
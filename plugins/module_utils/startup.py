@@ -7,6 +7,9 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+from ansible_collections.purestorage.fusion.plugins.module_utils.api_stats import (
+    report_api_stats,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
     install_fusion_exception_hook,
 )
@@ -23,4 +26,6 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
 def setup_fusion(module):
     check_dependencies(module)
     install_fusion_exception_hook(module)
-    return get_fusion(module)
+    fusion = get_fusion(module)
+    report_api_stats(module, fusion)
+    return fusion
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def get_state_file(prefix, host):
+    """Returns path of a file in the temp dir holding state shared by all
+    processes of the current user talking to the API `host`"""
+    digest = hashlib.sha256(host.encode("utf-8")).hexdigest()[:16]
+    # the temp dir is shared by all users, who cannot open files of others
+    return os.path.join(
+        tempfile.gettempdir(), "{0}{1}-{2}".format(prefix, os.getuid(), digest)
+    )
+
+
+def _parse(content):
+    try:
+        state = json.loads(content)
+    except ValueError:
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def read_state(path):
+    """Returns content of the state file as a dict without locking it, e.g. to
+    skip taking the lock when there is nothing to update. Missing, unreadable
+    or corrupted file yields an empty dict."""
+    try:
+        with open(path, "rb") as f:
+            return _parse(f.read().decode("utf-8"))
+    except (OSError, UnicodeError):
+        return {}
+
+
+@contextmanager
+def locked_state(path):
+    """Locks the state file exclusively and yields its content as a dict, which
+    is written back when the block finishes without an exception. Missing or
+    corrupted file yields an empty dict. The file is rewritten only if the
+    dict changed. If the file cannot be opened or locked, an empty dict is
+    yielded and changes are not saved, so that the state only stops being
+    shared instead of failing the caller."""
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        f = os.fdopen(fd, "r+b")
+    except OSError:
+        yield {}
+        return
+    with f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        except OSError:
+            yield {}
+            return
+        try:
+            state = _parse(f.read().decode("utf-8", "replace"))
+            content = json.dumps(state)
+
+            yield state
+
+            new_content = json.dumps(state)
+            if new_content == content:
+                return
+            try:
+                f.seek(0)
+                f.truncate()
+                f.write(new_content.encode("utf-8"))
+                f.flush()
+            except OSError:
+                pass
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
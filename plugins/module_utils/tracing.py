@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    _rest_call_site,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+ENV_TRACE_FILE = "FUSION_TRACE_FILE"
+
+SPAN_REQUEST = "request"
+SPAN_POLL = "poll"
+SPAN_AWAIT = "await"
+
+
+def get_trace_file(environ=os.environ):
+    """Returns path of the file spans are appended to, or None if tracing is
+    disabled"""
+    return environ.get(ENV_TRACE_FILE) or None
+
+
+def _expand_path(resource_path, path_params):
+    for name, value in (path_params or {}).items():
+        resource_path = resource_path.replace("{%s}" % name, str(value))
+    return resource_path
+
+
+def _call_site(frame):
+    # name of the SDK method which made the request, e.g. 'Get volume' rather
+    # than 'Get volume with http info' it calls
+    call_site = None
+    while frame is not None:
+        name = _rest_call_site(frame)
+        if name:
+            call_site = name
+        elif call_site:
+            break
+        frame = frame.f_back
+    return call_site
+
+
+class Tracer(object):
+    """Appends spans of a module run to a JSON Lines file, one JSON object per
+    finished span. Spans of one run share `trace_id`, nested spans refer to
+    the span they ran in by `parent_id`.
+
+    Every span is written by a single append, so any number of processes can
+    trace into the same file.
+    """
+
+    def __init__(self, path, module_name=None):
+        try:
+            self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        except OSError as err:
+            raise ValueError(
+                "Cannot open {0} '{1}': {2}".format(ENV_TRACE_FILE, path, err)
+            )
+        self.path = path
+        self.module_name = module_name
+        self.trace_id = uuid.uuid4().hex
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, kind, name, parent=None, **attributes):
+        """Records a span around the block. Yields dict of the span attributes
+        which the block can add to. `parent` is the span (dict) this one runs
+        in, by default the innermost span open in the current thread."""
+        stack = self._stack()
+        if parent is None and stack:
+            parent = stack[-1]
+        span = dict(attributes)
+        span.update(
+            {
+                "trace_id": self.trace_id,
+                "span_id": uuid.uuid4().hex[:16],
+                "parent_id": parent["span_id"] if parent else None,
+                "kind": kind,
+                "name": name,
+                "module": self.module_name,
+                "start": time.time(),
+            }
+        )
+        started = time.monotonic()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.setdefault("error", type(exc).__name__)
+            raise
+        finally:
+            stack.pop()
+            span["duration_ms"] = round((time.monotonic() - started) * 1000, 3)
+            self._write(span)
+
+    def _write(self, span):
+        line = json.dumps(span, sort_keys=True, default=str) + "\n"
+        os.write(self._fd, line.encode("utf-8"))
+
+
+class TracingCall(object):
+    """Wraps `ApiClient.call_api()` to record a span of every request"""
+
+    def __init__(self, call_api, tracer):
+        self._call_api = call_api
+        self.tracer = tracer
+
+    def __call__(
+        self,
+        resource_path,
+        method,
+        path_params=None,
+        query_params=None,
+        header_params=None,
+        body=None,
+        post_params=None,
+        files=None,
+        response_type=None,
+        auth_settings=None,
+        async_req=None,
+        _return_http_data_only=None,
+        collection_formats=None,
+        _preload_content=True,
+        _request_timeout=None,
+    ):
+        name = _call_site(sys._getframe(1)) or "{0} {1}".format(method, resource_path)
+        with self.tracer.span(
+            SPAN_REQUEST,
+            name,
+            method=method,
+            path=_expand_path(resource_path, path_params),
+        ) as span:
+            try:
+                # ask for the status, it is stripped again below
+                result = self._call_api(
+                    resource_path,
+                    method,
+                    path_params=path_params,
+                    query_params=query_params,
+                    header_params=header_params,
+                    body=body,
+                    post_params=post_params,
+                    files=files,
+                    response_type=response_type,
+                    auth_settings=auth_settings,
+                    async_req=async_req,
+                    _return_http_data_only=False,
+                    collection_formats=collection_formats,
+                    _preload_content=_preload_content,
+                    _request_timeout=_request_timeout,
+                )
+            except purefusion.rest.ApiException as exc:
+                span["status"] = exc.status
+                raise
+
+            if not _preload_content:
+                span["status"] = result.status
+                return result
+            data, span["status"], _headers = result
+            if isinstance(data, purefusion.Operation):
+                span["operation_id"] = data.id
+            if _return_http_data_only:
+                return data
+            return result
+
+
+def install_tracing(client, tracer):
+    """Makes `client` (`fusion.ApiClient`) record spans of its requests"""
+    if not isinstance(client.call_api, TracingCall):
+        client.call_api = TracingCall(client.call_api, tracer)
+    return client
+
+
+def get_tracer(client):
+    """Returns Tracer of `client` or None if it is not traced"""
+    call_api = getattr(client, "call_api", None)
+    if isinstance(call_api, TracingCall):
+        return call_api.tracer
+    return None
+
+
+@contextmanager
+def _no_span():
+    yield {}
+
+
+def trace_span(client, kind, name, parent=None, **attributes):
+    """Context manager recording a span of work done with `client` if it is
+    traced, otherwise doing nothing"""
+    tracer = get_tracer(client)
+    if tracer is None:
+        return _no_span()
+    return tracer.span(kind, name, parent=parent, **attributes)
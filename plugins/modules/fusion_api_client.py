@@ -23,8 +23,8 @@ options:
   name:
     description:
     - The name of the client.
+    - Required unless I(clients) is used.
     type: str
-    required: true
   state:
     description:
     - Define whether the client should exist or not.
@@ -35,8 +35,39 @@ options:
     description:
     - The API clients PEM formatted (Base64 encoded) RSA public key.
     - Include the C(—–BEGIN PUBLIC KEY—–) and C(—–END PUBLIC KEY—–) lines.
+    - Required unless I(clients) is used.
     type: str
-    required: true
+  clients:
+    description:
+    - List of API clients to manage in a single task.
+    - API clients are listed only once and the clients are created or deleted concurrently.
+    - Cannot be used together with I(name) and I(public_key).
+    type: list
+    elements: dict
+    version_added: '1.7.0'
+    suboptions:
+      name:
+        description:
+        - The name of the client.
+        type: str
+        required: true
+      public_key:
+        description:
+        - The API clients PEM formatted (Base64 encoded) RSA public key.
+        type: str
+        required: true
+      state:
+        description:
+        - Define whether the client should exist or not.
+        default: present
+        choices: [ present, absent ]
+        type: str
+  concurrency:
+    description:
+    - Maximum number of requests sent to Fusion at the same time when I(clients) is used.
+    type: int
+    default: 8
+    version_added: '1.7.0'
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
 """
@@ -48,39 +79,81 @@ EXAMPLES = r"""
     public_key: "{{lookup('file', 'public_pem_file') }}"
     issuer_id: key_name
     private_key_file: "az-admin-private-key.pem"
+
+- name: Create and delete several API clients at once
+  purestorage.fusion.fusion_api_client:
+    clients:
+      - name: "foo client"
+        public_key: "{{ lookup('file', 'foo_public_pem_file') }}"
+      - name: "bar client"
+        public_key: "{{ lookup('file', 'bar_public_pem_file') }}"
+        state: absent
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
 """
 
 RETURN = r"""
+created:
+  description: API clients which were (or would be in check mode) created, only with I(clients).
+  returned: when I(clients) is used
+  type: list
+  elements: dict
+deleted:
+  description: API clients which were (or would be in check mode) deleted, only with I(clients).
+  returned: when I(clients) is used
+  type: list
+  elements: dict
 """
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
+import hashlib
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+
+def key_fingerprint(public_key):
+    """Return short digest of a PEM public key, ignoring whitespace differences"""
+    if public_key is None:
+        return None
+    return hashlib.sha256("".join(public_key.split()).encode("utf-8")).hexdigest()
+
+
+def index_clients(fusion):
+    """Return dict mapping (display_name, public key fingerprint) to API Client ID"""
+    id_api_instance = purefusion.IdentityManagerApi(fusion)
+    index = {}
+    for client in id_api_instance.list_api_clients():
+        key = (client.display_name, key_fingerprint(client.public_key))
+        # keep the first client in case there are duplicates
+        index.setdefault(key, client.id)
+    return index
 
 
 def get_client_id(module, fusion):
     """Get API Client ID, or None if not available"""
-    id_api_instance = purefusion.IdentityManagerApi(fusion)
     try:
-        clients = id_api_instance.list_api_clients()
-        for client in clients:
-            if (
-                client.public_key == module.params["public_key"]
-                and client.display_name == module.params["name"]
-            ):
-                return client.id
-        return None
+        index = index_clients(fusion)
     except purefusion.rest.ApiException:
         return None
+    key = (module.params["name"], key_fingerprint(module.params["public_key"]))
+    return index.get(key)
 
 
 def delete_client(module, fusion, client_id):
@@ -110,20 +183,117 @@ def create_client(module, fusion):
     module.exit_json(changed=changed, id=id)
 
 
+def reconcile_clients(module, fusion):
+    """Create and delete API Clients given by `clients` parameter"""
+    index = index_clients(fusion)
+
+    to_create = []
+    to_delete = []
+    for client in module.params["clients"]:
+        key = (client["name"], key_fingerprint(client["public_key"]))
+        client_id = index.get(key)
+        if client_id is None and client["state"] == "present":
+            to_create.append(client)
+            # do not create the same client twice if it is listed twice
+            index[key] = None
+        elif client_id is not None and client["state"] == "absent":
+            to_delete.append({"name": client["name"], "id": client_id})
+            index[key] = None
+
+    created = [{"name": client["name"], "id": None} for client in to_create]
+    deleted = to_delete
+    changed = bool(created or deleted)
+
+    if module.check_mode or not changed:
+        module.exit_json(changed=changed, created=created, deleted=deleted)
+
+    id_api_instance = purefusion.IdentityManagerApi(fusion)
+
+    def _apply(change):
+        action, client = change
+        if action == "create":
+            res = id_api_instance.create_api_client(
+                purefusion.APIClientPost(
+                    public_key=client["public_key"],
+                    display_name=client["name"],
+                )
+            )
+            return res.id
+        id_api_instance.delete_api_client(api_client_id=client["id"])
+        return client["id"]
+
+    changes = [("create", client) for client in to_create]
+    changes += [("delete", client) for client in to_delete]
+
+    created = []
+    deleted = []
+    failed = []
+    for (action, client), client_id, exc in run_concurrently(
+        _apply, changes, module.params["concurrency"]
+    ):
+        if exc is not None:
+            failed.append(
+                {
+                    "name": client["name"],
+                    "action": action,
+                    "msg": format_fusion_exception(exc),
+                }
+            )
+        elif action == "create":
+            created.append({"name": client["name"], "id": client_id})
+        else:
+            deleted.append({"name": client["name"], "id": client_id})
+
+    if failed:
+        module.fail_json(
+            msg="Failed to apply {0} of {1} API client changes".format(
+                len(failed), len(changes)
+            ),
+            changed=bool(created or deleted),
+            created=created,
+            deleted=deleted,
+            failed_clients=failed,
+        )
+    module.exit_json(changed=True, created=created, deleted=deleted)
+
+
 def main():
     """Main code"""
     argument_spec = fusion_argument_spec()
     argument_spec.update(
         dict(
-            name=dict(type="str", required=True),
-            public_key=dict(type="str", required=True),
+            name=dict(type="str"),
+            public_key=dict(type="str"),
             state=dict(type="str", default="present", choices=["present", "absent"]),
+            clients=dict(
+                type="list",
+                elements="dict",
+                options=dict(
+                    name=dict(type="str", required=True),
+                    public_key=dict(type="str", required=True),
+                    state=dict(
+                        type="str", default="present", choices=["present", "absent"]
+                    ),
+                ),
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
         )
     )
 
-    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec,
+        supports_check_mode=True,
+        required_one_of=[("name", "clients")],
+        required_together=[("name", "public_key")],
+        mutually_exclusive=[("name", "clients"), ("public_key", "clients")],
+    )
     fusion = setup_fusion(module)
 
+    if module.params["clients"] is not None:
+        if module.params["concurrency"] < 1:
+            module.fail_json(msg="'concurrency' must be a positive number")
+        reconcile_clients(module, fusion)
+
     state = module.params["state"]
     client_id = get_client_id(module, fusion)
     if client_id is None and state == "present":
@@ -66,11 +66,6 @@ EXAMPLES = r"""
 RETURN = r"""
 """
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
-
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
@@ -83,6 +78,11 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.operations impo
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
 
 
 def get_az(module, fusion):
@@ -0,0 +1,645 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_drift
+version_added: '1.7.0'
+short_description:  Compare Pure Storage Fusion with a desired-state document
+description:
+- Report how the live state of Pure Storage Fusion differs from a desired-state document,
+  without changing anything.
+- Every collection declared in the document is listed once, i.e. protection policies and
+  host access policies once each and volumes and placement groups once per tenant space.
+  The number of requests does not grow with the number of resources.
+- Only the fields set in the document are compared, unset fields are not managed.
+- A collection which is not declared in the document is not checked at all, an empty list
+  declares that the collection should be empty.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+options:
+  desired_state:
+    description:
+    - The desired-state document.
+    - Mutually exclusive with I(src).
+    type: dict
+    suboptions:
+      protection_policies:
+        description:
+        - Protection policies.
+        type: list
+        elements: dict
+        suboptions:
+          name:
+            description:
+            - The name of the protection policy.
+            type: str
+            required: true
+          display_name:
+            description:
+            - The human name of the protection policy.
+            type: str
+          local_rpo:
+            description:
+            - Recovery Point Objective for snapshots, see M(purestorage.fusion.fusion_pp).
+            type: str
+          local_retention:
+            description:
+            - Retention Duration for periodic snapshots, see M(purestorage.fusion.fusion_pp).
+            type: str
+      host_access_policies:
+        description:
+        - Host access policies.
+        type: list
+        elements: dict
+        suboptions:
+          name:
+            description:
+            - The name of the host access policy.
+            type: str
+            required: true
+          display_name:
+            description:
+            - The human name of the host access policy.
+            type: str
+          iqn:
+            description:
+            - IQN of the host.
+            type: str
+          personality:
+            description:
+            - Personality of the host.
+            type: str
+            choices: ['linux', 'windows', 'hpux', 'vms', 'aix', 'esxi', 'solaris', 'hitachi-vsp', 'oracle-vm-server']
+      tenant_spaces:
+        description:
+        - Tenant spaces whose placement groups and volumes are compared.
+        type: list
+        elements: dict
+        suboptions:
+          tenant:
+            description:
+            - The name of the tenant.
+            type: str
+            required: true
+          name:
+            description:
+            - The name of the tenant space.
+            type: str
+            required: true
+          placement_groups:
+            description:
+            - Placement groups of the tenant space.
+            type: list
+            elements: dict
+            suboptions:
+              name:
+                description:
+                - The name of the placement group.
+                type: str
+                required: true
+              display_name:
+                description:
+                - The human name of the placement group.
+                type: str
+              availability_zone:
+                description:
+                - The name of the availability zone.
+                type: str
+              storage_service:
+                description:
+                - The name of the storage service.
+                type: str
+              array:
+                description:
+                - The name of the array the placement group is on.
+                type: str
+              placement_engine:
+                description:
+                - The algorithm used to pick the array.
+                type: str
+                choices: [ heuristics, pure1meta ]
+          volumes:
+            description:
+            - Volumes of the tenant space.
+            type: list
+            elements: dict
+            suboptions:
+              name:
+                description:
+                - The name of the volume.
+                type: str
+                required: true
+              display_name:
+                description:
+                - The human name of the volume.
+                type: str
+              size:
+                description:
+                - Volume size in M, G, T or P units.
+                type: str
+              storage_class:
+                description:
+                - The name of the storage class.
+                type: str
+              placement_group:
+                description:
+                - The name of the placement group.
+                type: str
+              protection_policy:
+                description:
+                - The name of the protection policy.
+                type: str
+              host_access_policies:
+                description:
+                - Names of the host access policies the volume is exported to.
+                type: list
+                elements: str
+  src:
+    description:
+    - Path to the desired-state document in YAML or JSON, with the structure of I(desired_state).
+    - Mutually exclusive with I(desired_state).
+    type: path
+  report_extra:
+    description:
+    - Report resources of the declared collections which are not in the document.
+    type: bool
+    default: true
+  concurrency:
+    description:
+    - Maximum number of requests sent to Fusion at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Check drift against the desired state
+  purestorage.fusion.fusion_drift:
+    src: desired-state.yml
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+  register: drift
+
+- name: Check drift of a single tenant space
+  purestorage.fusion.fusion_drift:
+    desired_state:
+      host_access_policies:
+        - name: host1
+          iqn: iqn.2005-03.com.RedHat:linux-host1
+          personality: linux
+      tenant_spaces:
+        - tenant: db_tenant
+          name: tenant_space_one
+          volumes:
+            - name: volume1
+              size: 1G
+              storage_class: db_high_performance
+              placement_group: pg1
+              host_access_policies: [host1]
+    report_extra: false
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+drift:
+  description: Whether the live state differs from the document.
+  returned: always
+  type: bool
+missing:
+  description:
+  - Resources of the document which do not exist, by kind (C(protection_policies),
+    C(host_access_policies), C(placement_groups), C(volumes)).
+  - Resources of tenant spaces are named C(tenant/tenant_space/name).
+  returned: always
+  type: dict
+  sample: {"volumes": ["db_tenant/tenant_space_one/volume2"]}
+extra:
+  description: Resources of the declared collections which are not in the document, by kind.
+  returned: always
+  type: dict
+differences:
+  description:
+  - Resources whose fields differ from the document, by kind and name.
+  - Sizes are in bytes, I(local_rpo) and I(local_retention) in minutes.
+  returned: always
+  type: dict
+  sample: {"volumes": {"db_tenant/tenant_space_one/volume1": {"size": {"desired": 1073741824, "actual": 536870912}}}}
+summary:
+  description: Numbers of missing, extra and different resources and of collections listed.
+  returned: always
+  type: dict
+  sample: {"missing": 1, "extra": 0, "different": 1, "listed": 3}
+"""
+
+import http
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_duration,
+    parse_minutes,
+    parse_number_with_metric_suffix,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.raw_json import (
+    list_items_raw,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+try:
+    import yaml
+
+    HAS_YAML = True
+    PARSE_ERRORS = (ValueError, yaml.YAMLError)
+except ImportError:
+    HAS_YAML = False
+    PARSE_ERRORS = (ValueError,)
+
+purefusion = lazy_import("fusion")
+
+KINDS = ["protection_policies", "host_access_policies", "placement_groups", "volumes"]
+
+# kinds listed once per tenant space, the rest once for all
+TENANT_SPACE_KINDS = ("placement_groups", "volumes")
+
+DOCUMENT_SPEC = dict(
+    protection_policies=dict(
+        type="list",
+        elements="dict",
+        options=dict(
+            name=dict(type="str", required=True),
+            display_name=dict(type="str"),
+            local_rpo=dict(type="str"),
+            local_retention=dict(type="str"),
+        ),
+    ),
+    host_access_policies=dict(
+        type="list",
+        elements="dict",
+        options=dict(
+            name=dict(type="str", required=True),
+            display_name=dict(type="str"),
+            iqn=dict(type="str"),
+            personality=dict(
+                type="str",
+                choices=[
+                    "linux",
+                    "windows",
+                    "hpux",
+                    "vms",
+                    "aix",
+                    "esxi",
+                    "solaris",
+                    "hitachi-vsp",
+                    "oracle-vm-server",
+                ],
+            ),
+        ),
+    ),
+    tenant_spaces=dict(
+        type="list",
+        elements="dict",
+        options=dict(
+            tenant=dict(type="str", required=True),
+            name=dict(type="str", required=True),
+            placement_groups=dict(
+                type="list",
+                elements="dict",
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    availability_zone=dict(type="str"),
+                    storage_service=dict(type="str"),
+                    array=dict(type="str"),
+                    placement_engine=dict(
+                        type="str", choices=["heuristics", "pure1meta"]
+                    ),
+                ),
+            ),
+            volumes=dict(
+                type="list",
+                elements="dict",
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    size=dict(type="str"),
+                    storage_class=dict(type="str"),
+                    placement_group=dict(type="str"),
+                    protection_policy=dict(type="str"),
+                    host_access_policies=dict(type="list", elements="str"),
+                ),
+            ),
+        ),
+    ),
+)
+
+
+def load_document(module):
+    """Returns the desired-state document, read from `src` if given"""
+    if module.params["desired_state"] is not None:
+        return module.params["desired_state"]
+
+    try:
+        with open(module.params["src"]) as src:
+            content = src.read()
+    except (IOError, OSError) as exc:
+        module.fail_json(
+            msg="Cannot read desired state '{0}': {1}".format(module.params["src"], exc)
+        )
+    try:
+        # JSON is YAML too
+        document = yaml.safe_load(content) if HAS_YAML else json.loads(content)
+    except PARSE_ERRORS as exc:
+        module.fail_json(
+            msg="Cannot parse desired state '{0}': {1}".format(
+                module.params["src"], exc
+            )
+        )
+    if not isinstance(document, dict):
+        module.fail_json(
+            msg="Desired state '{0}' must be a mapping".format(module.params["src"])
+        )
+
+    result = ArgumentSpecValidator(DOCUMENT_SPEC).validate(document)
+    if result.error_messages:
+        module.fail_json(
+            msg="Invalid desired state '{0}': {1}".format(
+                module.params["src"], "; ".join(result.error_messages)
+            )
+        )
+    return result.validated_parameters
+
+
+def _iso_minutes(duration):
+    """'PT10M' -> 10, 'P4DT1H' -> 5820"""
+    date, _sep, time = duration.upper().lstrip("P").partition("T")
+    return (parse_duration(date) if date else 0) + (parse_duration(time) if time else 0)
+
+
+def _name(ref):
+    return ref["name"] if ref else None
+
+
+def _live_protection_policy(item):
+    record = {
+        "display_name": item.get("display_name"),
+        "local_rpo": None,
+        "local_retention": None,
+    }
+    for objective in item.get("objectives") or []:
+        try:
+            if objective.get("type") == "RPO":
+                record["local_rpo"] = _iso_minutes(objective["rpo"])
+            elif objective.get("type") == "Retention":
+                record["local_retention"] = _iso_minutes(objective["after"])
+        except (KeyError, ValueError):
+            continue
+    return record
+
+
+def _live_host_access_policy(item):
+    return {
+        "display_name": item.get("display_name"),
+        "iqn": item.get("iqn"),
+        "personality": item.get("personality"),
+    }
+
+
+def _live_placement_group(item):
+    return {
+        "display_name": item.get("display_name"),
+        "availability_zone": _name(item.get("availability_zone")),
+        "storage_service": _name(item.get("storage_service")),
+        "array": _name(item.get("array")),
+        "placement_engine": item.get("placement_engine"),
+    }
+
+
+def _live_volume(item):
+    return {
+        "display_name": item.get("display_name"),
+        "size": item.get("size"),
+        "storage_class": _name(item.get("storage_class")),
+        "placement_group": _name(item.get("placement_group")),
+        "protection_policy": _name(item.get("protection_policy")),
+        "host_access_policies": sorted(
+            _name(hap) for hap in item.get("host_access_policies") or []
+        ),
+        "destroyed": bool(item.get("destroyed")),
+    }
+
+
+LIVE_RECORDS = {
+    "protection_policies": _live_protection_policy,
+    "host_access_policies": _live_host_access_policy,
+    "placement_groups": _live_placement_group,
+    "volumes": _live_volume,
+}
+
+
+def desired_record(module, kind, spec):
+    """Returns fields of `spec` which are set, normalized like live records"""
+    record = dict(
+        (field, value)
+        for field, value in spec.items()
+        if value is not None and field not in ("name", "tenant")
+    )
+    if kind == "protection_policies":
+        for field in ("local_rpo", "local_retention"):
+            if field in record:
+                record[field] = parse_minutes(module, record[field])
+    elif kind == "volumes":
+        if "size" in record:
+            record["size"] = parse_number_with_metric_suffix(module, record["size"])
+        if "host_access_policies" in record:
+            record["host_access_policies"] = sorted(
+                name.strip() for name in record["host_access_policies"]
+            )
+        # a volume in the document is expected to be usable
+        record["destroyed"] = False
+    return record
+
+
+def flatten_document(module, document):
+    """Returns dict of listings, i.e. (kind, tenant, tenant_space) tuples,
+    to dicts of desired records by name"""
+    listings = {}
+
+    def declare(listing, specs):
+        records = listings.setdefault(listing, {})
+        for spec in specs:
+            if spec["name"] in records:
+                module.fail_json(
+                    msg="{0} '{1}' is declared more than once".format(
+                        listing[0], _key(listing, spec["name"])
+                    )
+                )
+            records[spec["name"]] = desired_record(module, listing[0], spec)
+
+    for kind in ("protection_policies", "host_access_policies"):
+        if document.get(kind) is not None:
+            declare((kind, None, None), document[kind])
+    for tenant_space in document.get("tenant_spaces") or []:
+        for kind in TENANT_SPACE_KINDS:
+            if tenant_space[kind] is not None:
+                declare(
+                    (kind, tenant_space["tenant"], tenant_space["name"]),
+                    tenant_space[kind],
+                )
+    return listings
+
+
+def _key(listing, name):
+    _kind, tenant, tenant_space = listing
+    if tenant is None:
+        return name
+    return "{0}/{1}/{2}".format(tenant, tenant_space, name)
+
+
+def list_live(fusion, listing):
+    """Returns dict of normalized live records of `listing` by name"""
+    kind, tenant, tenant_space = listing
+    if kind == "protection_policies":
+        list_method = purefusion.ProtectionPoliciesApi(fusion).list_protection_policies
+        kwargs = {}
+    elif kind == "host_access_policies":
+        list_method = purefusion.HostAccessPoliciesApi(fusion).list_host_access_policies
+        kwargs = {}
+    elif kind == "placement_groups":
+        list_method = purefusion.PlacementGroupsApi(fusion).list_placement_groups
+        kwargs = dict(tenant_name=tenant, tenant_space_name=tenant_space)
+    else:
+        list_method = purefusion.VolumesApi(fusion).list_volumes
+        kwargs = dict(tenant_name=tenant, tenant_space_name=tenant_space)
+
+    try:
+        items = list_items_raw(list_method, **kwargs)
+        if items is None:
+            items = [item.to_dict() for item in list_method(**kwargs).items]
+    except purefusion.rest.ApiException as exc:
+        if tenant is not None and exc.status == http.HTTPStatus.NOT_FOUND:
+            # the tenant space does not exist, so neither do its resources
+            return {}
+        raise
+    normalize = LIVE_RECORDS[kind]
+    return dict((item["name"], normalize(item)) for item in items)
+
+
+def compare(listings, live, report_extra):
+    """Returns (missing, extra, differences) dicts by kind"""
+    missing = dict((kind, []) for kind in KINDS)
+    extra = dict((kind, []) for kind in KINDS)
+    differences = dict((kind, {}) for kind in KINDS)
+    for listing, desired in listings.items():
+        kind = listing[0]
+        actual = live[listing]
+        for name, wanted in desired.items():
+            record = actual.get(name)
+            if record is None:
+                missing[kind].append(_key(listing, name))
+                continue
+            # only the fields set in the document are compared
+            record = dict((field, record.get(field)) for field in wanted)
+            if record == wanted:
+                continue
+            differences[kind][_key(listing, name)] = dict(
+                (field, {"desired": wanted[field], "actual": record[field]})
+                for field in sorted(wanted)
+                if wanted[field] != record[field]
+            )
+        if report_extra:
+            extra[kind].extend(
+                _key(listing, name) for name in actual if name not in desired
+            )
+    for kind in KINDS:
+        missing[kind].sort()
+        extra[kind].sort()
+    return missing, extra, differences
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            desired_state=dict(type="dict", options=DOCUMENT_SPEC),
+            src=dict(type="path"),
+            report_extra=dict(type="bool", default=True),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(
+        argument_spec,
+        mutually_exclusive=[("desired_state", "src")],
+        required_one_of=[("desired_state", "src")],
+        supports_check_mode=True,
+    )
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+
+    document = load_document(module)
+    listings = flatten_document(module, document)
+    fusion = setup_fusion(module)
+
+    live = {}
+    for listing, records, exc in run_concurrently(
+        lambda listing: list_live(fusion, listing),
+        sorted(listings, key=str),
+        module.params["concurrency"],
+    ):
+        if exc is not None:
+            module.fail_json(
+                msg="Failed to list {0}: {1}".format(
+                    listing[0], format_fusion_exception(exc)
+                )
+            )
+        live[listing] = records
+
+    missing, extra, differences = compare(listings, live, module.params["report_extra"])
+    summary = {
+        "missing": sum(len(names) for names in missing.values()),
+        "extra": sum(len(names) for names in extra.values()),
+        "different": sum(len(records) for records in differences.values()),
+        "listed": len(listings),
+    }
+    module.exit_json(
+        changed=False,
+        drift=summary["missing"] + summary["extra"] + summary["different"] != 0,
+        missing=missing,
+        extra=extra,
+        differences=differences,
+        summary=summary,
+    )
+
+
+if __name__ == "__main__":
+    main()
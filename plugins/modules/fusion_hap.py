@@ -113,11 +113,6 @@ EXAMPLES = r"""
 RETURN = r"""
 """
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
-
 import re
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
@@ -130,6 +125,11 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.startup import
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
 
 
 def _check_iqn(module, fusion):
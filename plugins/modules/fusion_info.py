@@ -35,6 +35,22 @@ options:
     elements: str
     required: false
     default: minimum
+  output_format:
+    description:
+      - Format of the C(volumes), C(snapshots) and C(volume_snapshots) information.
+      - C(dict) returns a dict of every object keyed by its path, e.g. C(tenant/tenant_space/volume).
+      - C(compact) returns a table of C(fields) names, C(rows) of values of the objects in
+        the order of C(fields), and C(values) shared by the rows. Cells of C(shared) fields, whose
+        values repeat across objects (names of tenants, tenant spaces, placement groups, protection
+        policies, storage classes, arrays, snapshots, iSCSI targets and time stamps), hold the index
+        of their value in C(values). Volume targets are flattened to C(iscsi_addresses) and C(iscsi_iqn)
+        and protection policies of snapshots are reduced to their names.
+      - C(compact) takes a fraction of the memory and result size of C(dict) for large
+        numbers of volumes and snapshots.
+    type: str
+    choices: [dict, compact]
+    default: dict
+    version_added: '1.7.0'
 extends_documentation_fragment:
   - purestorage.fusion.purestorage.fusion
 """
@@ -60,6 +76,19 @@ EXAMPLES = r"""
 - name: Show all information
   ansible.builtin.debug:
     msg: "{{ fusion_info['fusion_info'] }}"
+
+- name: Collect volumes of a large organization in compact format
+  purestorage.fusion.fusion_info:
+    gather_subset:
+      - volumes
+    output_format: compact
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+  register: fusion_info
+
+- name: Show names of the volumes, the third field of the compact rows
+  ansible.builtin.debug:
+    msg: "{{ fusion_info['fusion_info']['volumes']['rows'] | map(attribute=2) | list }}"
 """
 
 RETURN = r"""
@@ -69,20 +98,29 @@ fusion_info:
   type: dict
 """
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
-
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.compact_table import (
+    CompactTable,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.raw_json import (
+    list_items_raw,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
-import time
+import functools
 import http
+import sys
+import time
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
 
 
 def _convert_microseconds(micros):
@@ -891,10 +929,241 @@ def generate_nigs_dict(module, fusion):
     return nigs_dict
 
 
+VOLUME_FIELDS = (
+    "tenant",
+    "tenant_space",
+    "name",
+    "size",
+    "display_name",
+    "placement_group",
+    "source_volume_snapshot",
+    "protection_policy",
+    "storage_class",
+    "serial_number",
+    "iscsi_addresses",
+    "iscsi_iqn",
+    "array",
+)
+SNAPSHOT_FIELDS = (
+    "tenant",
+    "tenant_space",
+    "name",
+    "display_name",
+    "protection_policy",
+    "time_remaining",
+    "volume_snapshots_link",
+)
+VOLUME_SNAPSHOT_FIELDS = (
+    "tenant",
+    "tenant_space",
+    "snapshot",
+    "name",
+    "size",
+    "display_name",
+    "protection_policy",
+    "serial_number",
+    "created_at",
+    "time_remaining",
+    "placement_group",
+)
+# fields repeated by many objects, stored once in compact output
+SHARED_FIELDS = (
+    "tenant",
+    "tenant_space",
+    "snapshot",
+    "placement_group",
+    "source_volume_snapshot",
+    "protection_policy",
+    "storage_class",
+    "iscsi_addresses",
+    "iscsi_iqn",
+    "array",
+    "created_at",
+    "time_remaining",
+)
+
+
+class _InfoDict(dict):
+    """Info of objects by their 'tenant/tenant_space/.../name' key"""
+
+    def add(self, key, info):
+        self[key] = info
+
+    def result(self):
+        return self
+
+
+class _CompactInfo(object):
+    """Info of objects as rows of CompactTable, `row` turns key and info of
+    an object into the row"""
+
+    def __init__(self, fields, row):
+        self.table = CompactTable(fields, SHARED_FIELDS)
+        self._row = row
+
+    def add(self, key, info):
+        self.table.add(*self._row(key.split("/"), info))
+
+    def result(self):
+        return self.table.as_dict()
+
+
+def _info_collector(compact, fields, row):
+    return _CompactInfo(fields, row) if compact else _InfoDict()
+
+
+def _name_of(ref):
+    # name of a resource reference, either a model or raw JSON
+    if isinstance(ref, dict):
+        return ref.get("name")
+    return getattr(ref, "name", None)
+
+
+def _volume_row(key, info):
+    iscsi = info["target"]["iscsi"]
+    return (
+        info["tenant"],
+        info["tenant_space"],
+        info["name"],
+        info["size"],
+        info["display_name"],
+        info["placement_group"],
+        info["source_volume_snapshot"],
+        info["protection_policy"],
+        info["storage_class"],
+        info["serial_number"],
+        iscsi["addresses"],
+        iscsi["iqn"],
+        info["array"],
+    )
+
+
+def _snapshot_row(key, info):
+    tenant, tenant_space, name = key
+    return (
+        tenant,
+        tenant_space,
+        name,
+        info["display_name"],
+        _name_of(info["protection_policy"]),
+        info["time_remaining"],
+        info["volume_snapshots_link"],
+    )
+
+
+def _volume_snapshot_row(key, info):
+    tenant, tenant_space, snapshot, name = key
+    return (
+        tenant,
+        tenant_space,
+        snapshot,
+        name,
+        info["size"],
+        info["display_name"],
+        _name_of(info["protection_policy"]),
+        info["serial_number"],
+        info["created_at"],
+        info["time_remaining"],
+        info["placement_group"],
+    )
+
+
+def _ref_name(ref):
+    # name of a resource reference in raw JSON, None if not set; interned as
+    # the same names are referenced by many objects
+    return sys.intern(ref["name"]) if ref else None
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_time_remaining(micros):
+    secs, mins, hours = _convert_microseconds(micros)
+    return "{0} hours, {1} mins, {2} secs".format(int(hours), int(mins), int(secs))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_created_at(millis):
+    return time.strftime("%a, %d %b %Y %H:%M:%S %Z", time.localtime(millis / 1000))
+
+
+def _add_raw_snap_dicts(
+    snap_dict, vsnap_dict, vsnap_api_instance, tenant_name, tenant_space_name, snaps
+):
+    """Adds snapshots and their volume snapshots in raw JSON to the collectors"""
+    for snap in snaps:
+        snap_name = tenant_name + "/" + tenant_space_name + "/" + snap["name"]
+        snap_dict.add(
+            snap_name,
+            {
+                "display_name": snap["display_name"],
+                "protection_policy": snap.get("protection_policy"),
+                "time_remaining": _format_time_remaining(snap["time_remaining"]),
+                "volume_snapshots_link": snap["volume_snapshots_link"],
+            },
+        )
+        list_kwargs = dict(
+            tenant_name=tenant_name,
+            tenant_space_name=tenant_space_name,
+            snapshot_name=snap["name"],
+        )
+        vsnaps = list_items_raw(vsnap_api_instance.list_volume_snapshots, **list_kwargs)
+        if vsnaps is None:
+            vsnaps = [
+                vsnap.to_dict()
+                for vsnap in vsnap_api_instance.list_volume_snapshots(
+                    **list_kwargs
+                ).items
+            ]
+        for vsnap in vsnaps:
+            vsnap_dict.add(
+                snap_name + "/" + vsnap["name"],
+                {
+                    "size": vsnap["size"],
+                    "display_name": vsnap["display_name"],
+                    "protection_policy": vsnap.get("protection_policy"),
+                    "serial_number": vsnap["serial_number"],
+                    "created_at": _format_created_at(vsnap["created_at"]),
+                    "time_remaining": _format_time_remaining(vsnap["time_remaining"]),
+                    "placement_group": _ref_name(vsnap["placement_group"]),
+                },
+            )
+
+
+def _raw_volume_dict(tenant_name, tenant_space_name, volume):
+    """Returns info of a volume in raw JSON"""
+    iscsi = volume["target"]["iscsi"]
+    return {
+        "tenant": tenant_name,
+        "tenant_space": tenant_space_name,
+        "name": volume["name"],
+        "size": volume["size"],
+        "display_name": volume["display_name"],
+        "placement_group": _ref_name(volume["placement_group"]),
+        "source_volume_snapshot": _ref_name(volume.get("source_volume_snapshot")),
+        "protection_policy": _ref_name(volume.get("protection_policy")),
+        "storage_class": _ref_name(volume["storage_class"]),
+        "serial_number": volume["serial_number"],
+        "target": {
+            "iscsi": {
+                "addresses": iscsi["addresses"],
+                "iqn": sys.intern(iscsi["iqn"]) if iscsi["iqn"] else iscsi["iqn"],
+            },
+            "nvme": {
+                "addresses": None,
+                "nqn": None,
+            },
+            "fc": {
+                "addresses": None,
+                "wwns": None,
+            },
+        },
+        "array": _ref_name(volume.get("array")),
+    }
+
+
 @_api_permission_denied_handler("snapshots")
-def generate_snap_dicts(module, fusion):
-    snap_dict = {}
-    vsnap_dict = {}
+def generate_snap_dicts(module, fusion, compact=False):
+    snap_dict = _info_collector(compact, SNAPSHOT_FIELDS, _snapshot_row)
+    vsnap_dict = _info_collector(compact, VOLUME_SNAPSHOT_FIELDS, _volume_snapshot_row)
     tenant_api_instance = purefusion.TenantsApi(fusion)
     tenantspace_api_instance = purefusion.TenantSpacesApi(fusion)
     snap_api_instance = purefusion.SnapshotsApi(fusion)
@@ -905,6 +1174,21 @@ def generate_snap_dicts(module, fusion):
             tenant_name=tenant.name
         ).items
         for tenant_space in tenant_spaces:
+            raw_snaps = list_items_raw(
+                snap_api_instance.list_snapshots,
+                tenant_name=tenant.name,
+                tenant_space_name=tenant_space.name,
+            )
+            if raw_snaps is not None:
+                _add_raw_snap_dicts(
+                    snap_dict,
+                    vsnap_dict,
+                    vsnap_api_instance,
+                    tenant.name,
+                    tenant_space.name,
+                    raw_snaps,
+                )
+                continue
             snaps = snap_api_instance.list_snapshots(
                 tenant_name=tenant.name,
                 tenant_space_name=tenant_space.name,
@@ -912,14 +1196,17 @@ def generate_snap_dicts(module, fusion):
             for snap in snaps.items:
                 snap_name = tenant.name + "/" + tenant_space.name + "/" + snap.name
                 secs, mins, hours = _convert_microseconds(snap.time_remaining)
-                snap_dict[snap_name] = {
-                    "display_name": snap.display_name,
-                    "protection_policy": snap.protection_policy,
-                    "time_remaining": "{0} hours, {1} mins, {2} secs".format(
-                        int(hours), int(mins), int(secs)
-                    ),
-                    "volume_snapshots_link": snap.volume_snapshots_link,
-                }
+                snap_dict.add(
+                    snap_name,
+                    {
+                        "display_name": snap.display_name,
+                        "protection_policy": snap.protection_policy,
+                        "time_remaining": "{0} hours, {1} mins, {2} secs".format(
+                            int(hours), int(mins), int(secs)
+                        ),
+                        "volume_snapshots_link": snap.volume_snapshots_link,
+                    },
+                )
                 vsnaps = vsnap_api_instance.list_volume_snapshots(
                     tenant_name=tenant.name,
                     tenant_space_name=tenant_space.name,
@@ -936,26 +1223,29 @@ def generate_snap_dicts(module, fusion):
                         + vsnap.name
                     )
                     secs, mins, hours = _convert_microseconds(vsnap.time_remaining)
-                    vsnap_dict[vsnap_name] = {
-                        "size": vsnap.size,
-                        "display_name": vsnap.display_name,
-                        "protection_policy": vsnap.protection_policy,
-                        "serial_number": vsnap.serial_number,
-                        "created_at": time.strftime(
-                            "%a, %d %b %Y %H:%M:%S %Z",
-                            time.localtime(vsnap.created_at / 1000),
-                        ),
-                        "time_remaining": "{0} hours, {1} mins, {2} secs".format(
-                            int(hours), int(mins), int(secs)
-                        ),
-                        "placement_group": vsnap.placement_group.name,
-                    }
-    return snap_dict, vsnap_dict
+                    vsnap_dict.add(
+                        vsnap_name,
+                        {
+                            "size": vsnap.size,
+                            "display_name": vsnap.display_name,
+                            "protection_policy": vsnap.protection_policy,
+                            "serial_number": vsnap.serial_number,
+                            "created_at": time.strftime(
+                                "%a, %d %b %Y %H:%M:%S %Z",
+                                time.localtime(vsnap.created_at / 1000),
+                            ),
+                            "time_remaining": "{0} hours, {1} mins, {2} secs".format(
+                                int(hours), int(mins), int(secs)
+                            ),
+                            "placement_group": vsnap.placement_group.name,
+                        },
+                    )
+    return snap_dict.result(), vsnap_dict.result()
 
 
 @_api_permission_denied_handler("volumes")
-def generate_volumes_dict(module, fusion):
-    volume_info = {}
+def generate_volumes_dict(module, fusion, compact=False):
+    volume_info = _info_collector(compact, VOLUME_FIELDS, _volume_row)
 
     tenant_api_instance = purefusion.TenantsApi(fusion)
     vol_api_instance = purefusion.VolumesApi(fusion)
@@ -967,13 +1257,28 @@ def generate_volumes_dict(module, fusion):
             tenant_name=tenant.name
         ).items
         for tenant_space in tenant_spaces:
+            raw_volumes = list_items_raw(
+                vol_api_instance.list_volumes,
+                tenant_name=tenant.name,
+                tenant_space_name=tenant_space.name,
+            )
+            if raw_volumes is not None:
+                for volume in raw_volumes:
+                    vol_name = (
+                        tenant.name + "/" + tenant_space.name + "/" + volume["name"]
+                    )
+                    volume_info.add(
+                        vol_name,
+                        _raw_volume_dict(tenant.name, tenant_space.name, volume),
+                    )
+                continue
             volumes = vol_api_instance.list_volumes(
                 tenant_name=tenant.name,
                 tenant_space_name=tenant_space.name,
             )
             for volume in volumes.items:
                 vol_name = tenant.name + "/" + tenant_space.name + "/" + volume.name
-                volume_info[vol_name] = {
+                info = {
                     "tenant": tenant.name,
                     "tenant_space": tenant_space.name,
                     "name": volume.name,
@@ -992,7 +1297,7 @@ def generate_volumes_dict(module, fusion):
                     "array": getattr(volume.array, "name", None),
                 }
 
-                volume_info[vol_name]["target"] = {
+                info["target"] = {
                     "iscsi": {
                         "addresses": volume.target.iscsi.addresses,
                         "iqn": volume.target.iscsi.iqn,
@@ -1006,13 +1311,17 @@ def generate_volumes_dict(module, fusion):
                         "wwns": None,
                     },
                 }
-    return volume_info
+                volume_info.add(vol_name, info)
+    return volume_info.result()
 
 
 def main():
     argument_spec = fusion_argument_spec()
     argument_spec.update(
-        dict(gather_subset=dict(default="minimum", type="list", elements="str"))
+        dict(
+            gather_subset=dict(default="minimum", type="list", elements="str"),
+            output_format=dict(default="dict", choices=["dict", "compact"]),
+        )
     )
 
     module = AnsibleModule(argument_spec, supports_check_mode=True)
@@ -1055,6 +1364,7 @@ def main():
                 msg=f"value gather_subset must be one or more of: {','.join(valid_subsets)}, got: {','.join(subset)}\nvalue {option} is not allowed"
             )
 
+    compact = module.params["output_format"] == "compact"
     info = {}
 
     if "minimum" in subset or "all" in subset:
@@ -1077,7 +1387,7 @@ def main():
     if "storage_services" in subset or "all" in subset:
         info["storage_services"] = generate_storserv_dict(module, fusion)
     if "volumes" in subset or "all" in subset:
-        info["volumes"] = generate_volumes_dict(module, fusion)
+        info["volumes"] = generate_volumes_dict(module, fusion, compact)
     if "protection_policies" in subset or "all" in subset:
         info["protection_policies"] = generate_pp_dict(module, fusion)
     if "placement_groups" in subset or "all" in subset or "placements" in subset:
@@ -1117,7 +1427,7 @@ def main():
                 "The 'nigs' subset is deprecated and will be removed in the version 1.7.0"
             )
     if "snapshots" in subset or "all" in subset:
-        snap_dicts = generate_snap_dicts(module, fusion)
+        snap_dicts = generate_snap_dicts(module, fusion, compact)
         if snap_dicts is not None:
             info["snapshots"], info["volume_snapshots"] = snap_dicts
         else:
@@ -0,0 +1,346 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_org_export
+version_added: '1.7.0'
+short_description:  Export configuration of a Pure Storage Fusion organization to a snapshot file
+description:
+- Write storage services, storage classes, protection policies, host access policies,
+  tenants, tenant spaces, placement groups, volumes and role assignments of the
+  organization to a snapshot file, to be replayed by M(purestorage.fusion.fusion_org_import).
+- The hierarchy is walked concurrently, every collection is listed once and its
+  resources are written in chunks as soon as it is listed.
+- The snapshot is a versioned file of JSON lines, it replaces I(dest) only when it
+  is complete. Snapshots ending with C(.gz) are compressed.
+- Regions, availability zones, arrays and other infrastructure are not exported,
+  the target organization must provide them. Destroyed volumes, data and snapshots
+  of volumes are not exported either.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode), the organization is walked but no file is written.
+options:
+  dest:
+    description:
+    - Path of the snapshot file.
+    type: path
+    required: true
+  chunk_size:
+    description:
+    - Maximum number of resources in a chunk, i.e. a line of the snapshot.
+    type: int
+    default: 500
+  concurrency:
+    description:
+    - Maximum number of requests sent to Fusion at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Export organization
+  purestorage.fusion.fusion_org_export:
+    dest: /backup/fusion-org.jsonl.gz
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+dest:
+  description: Path of the snapshot file.
+  returned: always
+  type: str
+id:
+  description: Unique identifier of the snapshot. Not returned in check mode.
+  returned: success
+  type: str
+counts:
+  description: Numbers of exported resources by kind.
+  returned: always
+  type: dict
+  sample: {"tenants": 2, "tenant_spaces": 5, "volumes": 120}
+chunks:
+  description: Number of chunks written.
+  returned: always
+  type: int
+listed:
+  description: Number of collections listed.
+  returned: always
+  type: int
+"""
+
+import re
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    walk_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.org_snapshot import (
+    DEFAULT_CHUNK_SIZE,
+    KINDS,
+    SnapshotWriter,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.raw_json import (
+    list_items_raw,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+ROOTS = [
+    ("storage_services", ()),
+    ("protection_policies", ()),
+    ("host_access_policies", ()),
+    ("tenants", ()),
+    # roles are built in, they are listed only to reach their assignments
+    ("roles", ()),
+]
+
+# collections nested under resources of a kind
+CHILDREN = {
+    "storage_services": ("storage_classes",),
+    "tenants": ("tenant_spaces",),
+    "tenant_spaces": ("placement_groups", "volumes"),
+    "roles": ("role_assignments",),
+}
+
+# collections listed as bare arrays rather than paged lists
+PLAIN_LISTS = ("roles", "role_assignments")
+
+REGION_RE = re.compile(r"/regions/([^/]+)/availability-zones/")
+
+
+def _list_method(fusion, kind, parents):
+    """Returns (SDK list method, its arguments) of collection `kind` under
+    resources named `parents`"""
+    if kind == "storage_services":
+        return purefusion.StorageServicesApi(fusion).list_storage_services, {}
+    if kind == "storage_classes":
+        return purefusion.StorageClassesApi(fusion).list_storage_classes, dict(
+            storage_service_name=parents[0]
+        )
+    if kind == "protection_policies":
+        return purefusion.ProtectionPoliciesApi(fusion).list_protection_policies, {}
+    if kind == "host_access_policies":
+        return purefusion.HostAccessPoliciesApi(fusion).list_host_access_policies, {}
+    if kind == "tenants":
+        return purefusion.TenantsApi(fusion).list_tenants, {}
+    if kind == "tenant_spaces":
+        return purefusion.TenantSpacesApi(fusion).list_tenant_spaces, dict(
+            tenant_name=parents[0]
+        )
+    if kind == "roles":
+        return purefusion.RolesApi(fusion).list_roles, {}
+    if kind == "role_assignments":
+        return purefusion.RoleAssignmentsApi(fusion).list_role_assignments, dict(
+            role_name=parents[0]
+        )
+    location = dict(tenant_name=parents[0], tenant_space_name=parents[1])
+    if kind == "placement_groups":
+        return purefusion.PlacementGroupsApi(fusion).list_placement_groups, location
+    return purefusion.VolumesApi(fusion).list_volumes, location
+
+
+def list_collection(fusion, kind, parents):
+    """Returns items of the collection as dicts of their JSON fields"""
+    list_method, kwargs = _list_method(fusion, kind, parents)
+    if kind in PLAIN_LISTS:
+        return [item.to_dict() for item in list_method(**kwargs)]
+    items = list_items_raw(list_method, **kwargs)
+    if items is None:
+        items = [item.to_dict() for item in list_method(**kwargs).items]
+    return items
+
+
+def _name(ref):
+    return ref["name"] if ref else None
+
+
+def _region(az):
+    match = REGION_RE.search(az.get("self_link") or "") if az else None
+    return match.group(1) if match else None
+
+
+def export_record(kind, item, parents):
+    """Returns fields of `item` needed to create it again, or None if it is
+    not exported"""
+    record = {"name": item["name"], "display_name": item.get("display_name")}
+    if kind == "storage_services":
+        record["hardware_types"] = [
+            _name(hw_type) for hw_type in item.get("hardware_types") or []
+        ]
+    elif kind == "storage_classes":
+        record["storage_service"] = parents[0]
+        for field in ("size_limit", "iops_limit", "bandwidth_limit"):
+            record[field] = item.get(field)
+    elif kind == "protection_policies":
+        record["objectives"] = item.get("objectives") or []
+    elif kind == "host_access_policies":
+        record["iqn"] = item.get("iqn")
+        record["personality"] = item.get("personality")
+    elif kind == "tenant_spaces":
+        record["tenant"] = parents[0]
+    elif kind == "placement_groups":
+        record.update(tenant=parents[0], tenant_space=parents[1])
+        record["region"] = _region(item.get("availability_zone"))
+        record["availability_zone"] = _name(item.get("availability_zone"))
+        record["storage_service"] = _name(item.get("storage_service"))
+    elif kind == "volumes":
+        if item.get("destroyed"):
+            return None
+        record.update(tenant=parents[0], tenant_space=parents[1])
+        record["size"] = item.get("size")
+        for field in ("storage_class", "placement_group", "protection_policy"):
+            record[field] = _name(item.get(field))
+        record["host_access_policies"] = [
+            _name(hap) for hap in item.get("host_access_policies") or []
+        ]
+    elif kind == "role_assignments":
+        return {
+            "role": parents[0],
+            "principal": item.get("principal"),
+            "scope": (item.get("scope") or {}).get("self_link"),
+        }
+    return record
+
+
+class ExportError(Exception):
+    """Organization cannot be exported"""
+
+
+def _collection(kind, parents):
+    return kind + (" of " + "/".join(parents) if parents else "")
+
+
+def walk_organization(module, fusion):
+    """Yields (kind, records) tuples of listed collections"""
+
+    def _walk(node):
+        kind, parents = node
+        items = list_collection(fusion, kind, parents)
+        records = []
+        if kind in KINDS:
+            for item in items:
+                record = export_record(kind, item, parents)
+                if record is not None:
+                    records.append(record)
+        children = [
+            (child, parents + (item["name"],))
+            for item in items
+            for child in CHILDREN.get(kind, ())
+        ]
+        return records, children
+
+    for (kind, parents), records, exc in walk_concurrently(
+        _walk, ROOTS, module.params["concurrency"]
+    ):
+        if exc is not None:
+            raise ExportError(
+                "Failed to list {0}: {1}".format(
+                    _collection(kind, parents), format_fusion_exception(exc)
+                )
+            )
+        for record in records:
+            # placement groups cannot be created again without their region
+            if kind == "placement_groups" and record["region"] is None:
+                raise ExportError(
+                    "Cannot determine region of placement group '{0}' of {1}".format(
+                        record["name"], "/".join(parents)
+                    )
+                )
+        yield kind, records
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            dest=dict(type="path", required=True),
+            chunk_size=dict(type="int", default=DEFAULT_CHUNK_SIZE),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+    if module.params["chunk_size"] < 1:
+        module.fail_json(msg="'chunk_size' must be a positive number")
+
+    fusion = setup_fusion(module)
+
+    chunk_size = module.params["chunk_size"]
+    writer = None
+    if not module.check_mode:
+        try:
+            writer = SnapshotWriter(module.params["dest"], chunk_size)
+        except (IOError, OSError) as exc:
+            module.fail_json(
+                msg="Cannot write snapshot '{0}': {1}".format(
+                    module.params["dest"], exc
+                )
+            )
+
+    counts = dict((kind, 0) for kind in KINDS)
+    chunks = 0
+    listed = 0
+    try:
+        for kind, records in walk_organization(module, fusion):
+            listed += 1
+            if kind not in counts:
+                continue
+            counts[kind] += len(records)
+            chunks += (len(records) + chunk_size - 1) // chunk_size
+            if writer is not None:
+                writer.add(kind, records)
+        if writer is not None:
+            writer.close()
+    except (ExportError, IOError, OSError) as exc:
+        if writer is not None:
+            writer.abort()
+        module.fail_json(msg=str(exc))
+    except BaseException:
+        # no unfinished snapshot may be left behind whatever went wrong
+        if writer is not None:
+            writer.abort()
+        raise
+
+    result = dict(
+        changed=writer is not None,
+        dest=module.params["dest"],
+        counts=counts,
+        chunks=chunks,
+        listed=listed,
+    )
+    if writer is not None:
+        result["id"] = writer.id
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
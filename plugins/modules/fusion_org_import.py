@@ -0,0 +1,389 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_org_import
+version_added: '1.7.0'
+short_description:  Replay a snapshot of a Pure Storage Fusion organization
+description:
+- Create resources of a snapshot written by M(purestorage.fusion.fusion_org_export).
+- Resources are replayed in dependency order, storage services, protection policies,
+  host access policies and tenants first, then storage classes and tenant spaces,
+  placement groups, volumes and role assignments last. Resources of the same level
+  are created concurrently, a chunk of the snapshot at a time.
+- Resources which already exist are left untouched. Role assignments are replayed
+  with the principals of the snapshot, which must exist in the target organization.
+- Replay stops after the level where some resource failed, as the next levels
+  depend on it.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode), resources which are not recorded in the I(checkpoint)
+  are reported as created whether they exist or not.
+options:
+  src:
+    description:
+    - Path of the snapshot file.
+    - The whole snapshot is checked before anything is replayed.
+    type: path
+    required: true
+  checkpoint:
+    description:
+    - Path of a file recording resources which were replayed.
+    - If the file exists, the replay resumes after the recorded resources.
+      It is deleted when the whole snapshot is replayed.
+    type: path
+  concurrency:
+    description:
+    - Maximum number of resources created at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Replay organization in staging
+  purestorage.fusion.fusion_org_import:
+    src: /backup/fusion-org.jsonl.gz
+    checkpoint: /backup/fusion-org.checkpoint
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+resources:
+  description:
+  - Numbers of C(created), C(existing), C(resumed) (recorded in the checkpoint)
+    and C(failed) resources by kind.
+  returned: always
+  type: dict
+  sample: {"volumes": {"created": 118, "existing": 2, "resumed": 0, "failed": 0}}
+failed_resources:
+  description: Resources which failed to be created.
+  returned: failure
+  type: list
+  elements: dict
+  contains:
+    kind:
+      description: Kind of the resource, e.g. C(volumes).
+      type: str
+    key:
+      description: Identifier of the resource, e.g. C(volumes/tenant1/space1/volume1).
+      type: str
+    msg:
+      description: Error message.
+      type: str
+"""
+
+import http
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.org_snapshot import (
+    KINDS,
+    LEVELS,
+    Checkpoint,
+    Snapshot,
+    read_checkpoint,
+    resource_key,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+
+def _objectives(objectives):
+    models = []
+    for objective in objectives:
+        if objective.get("type") == "RPO":
+            models.append(purefusion.RPO(type="RPO", rpo=objective["rpo"]))
+        elif objective.get("type") == "Retention":
+            models.append(
+                purefusion.Retention(type="Retention", after=objective["after"])
+            )
+    return models
+
+
+def create_resource(fusion, kind, record):
+    """Submits creation of the resource, returns the operation"""
+    if kind == "storage_services":
+        return purefusion.StorageServicesApi(fusion).create_storage_service(
+            purefusion.StorageServicePost(
+                name=record["name"],
+                display_name=record["display_name"],
+                hardware_types=record["hardware_types"],
+            )
+        )
+    if kind == "storage_classes":
+        return purefusion.StorageClassesApi(fusion).create_storage_class(
+            purefusion.StorageClassPost(
+                name=record["name"],
+                display_name=record["display_name"],
+                size_limit=record["size_limit"],
+                iops_limit=record["iops_limit"],
+                bandwidth_limit=record["bandwidth_limit"],
+            ),
+            storage_service_name=record["storage_service"],
+        )
+    if kind == "protection_policies":
+        return purefusion.ProtectionPoliciesApi(fusion).create_protection_policy(
+            purefusion.ProtectionPolicyPost(
+                name=record["name"],
+                display_name=record["display_name"],
+                objectives=_objectives(record["objectives"]),
+            )
+        )
+    if kind == "host_access_policies":
+        return purefusion.HostAccessPoliciesApi(fusion).create_host_access_policy(
+            purefusion.HostAccessPoliciesPost(
+                name=record["name"],
+                display_name=record["display_name"],
+                iqn=record["iqn"],
+                personality=record["personality"],
+            )
+        )
+    if kind == "tenants":
+        return purefusion.TenantsApi(fusion).create_tenant(
+            purefusion.TenantPost(
+                name=record["name"], display_name=record["display_name"]
+            )
+        )
+    if kind == "tenant_spaces":
+        return purefusion.TenantSpacesApi(fusion).create_tenant_space(
+            purefusion.TenantSpacePost(
+                name=record["name"], display_name=record["display_name"]
+            ),
+            tenant_name=record["tenant"],
+        )
+    if kind == "role_assignments":
+        return purefusion.RoleAssignmentsApi(fusion).create_role_assignment(
+            purefusion.RoleAssignmentPost(
+                scope=record["scope"], principal=record["principal"]
+            ),
+            role_name=record["role"],
+        )
+
+    location = dict(
+        tenant_name=record["tenant"], tenant_space_name=record["tenant_space"]
+    )
+    if kind == "placement_groups":
+        return purefusion.PlacementGroupsApi(fusion).create_placement_group(
+            purefusion.PlacementGroupPost(
+                name=record["name"],
+                display_name=record["display_name"],
+                region=record["region"],
+                availability_zone=record["availability_zone"],
+                storage_service=record["storage_service"],
+            ),
+            **location
+        )
+    return purefusion.VolumesApi(fusion).create_volume(
+        purefusion.VolumePost(
+            name=record["name"],
+            display_name=record["display_name"],
+            size=record["size"],
+            storage_class=record["storage_class"],
+            placement_group=record["placement_group"],
+            protection_policy=record["protection_policy"],
+        ),
+        **location
+    )
+
+
+def replay(fusion, kind, record):
+    """Creates the resource, returns 'created' or 'existing'"""
+    try:
+        op = create_resource(fusion, kind, record)
+    except purefusion.rest.ApiException as exc:
+        if exc.status == http.HTTPStatus.CONFLICT:
+            return "existing"
+        raise
+    await_operation(fusion, op)
+
+    if kind == "volumes" and record["host_access_policies"]:
+        # volumes are created without host access policies
+        op = purefusion.VolumesApi(fusion).update_volume(
+            purefusion.VolumePatch(
+                host_access_policies=purefusion.NullableString(
+                    ",".join(record["host_access_policies"])
+                )
+            ),
+            tenant_name=record["tenant"],
+            tenant_space_name=record["tenant_space"],
+            volume_name=record["name"],
+        )
+        await_operation(fusion, op)
+    return "created"
+
+
+def list_role_assignments(fusion, role):
+    """Returns set of (principal, scope link) tuples of assignments of `role`,
+    creating an assignment twice does not fail but duplicates it"""
+    assignments = purefusion.RoleAssignmentsApi(fusion).list_role_assignments(
+        role_name=role
+    )
+    return set(
+        (assignment.principal, assignment.scope.self_link) for assignment in assignments
+    )
+
+
+def replay_chunk(module, fusion, kind, todo, resources, failed, assigned):
+    """Replays (key, record) tuples of resources of `kind` concurrently,
+    returns keys of the replayed ones"""
+    replayed = []
+    if kind == "role_assignments":
+        failed_roles = {}
+        roles = sorted(set(record["role"] for _key, record in todo) - set(assigned))
+        for role, assignments, exc in run_concurrently(
+            lambda role: list_role_assignments(fusion, role),
+            roles,
+            module.params["concurrency"],
+        ):
+            if exc is not None:
+                failed_roles[role] = format_fusion_exception(exc)
+            else:
+                assigned[role] = assignments
+        remaining = []
+        for key, record in todo:
+            if record["role"] in failed_roles:
+                resources[kind]["failed"] += 1
+                failed.append(
+                    {"kind": kind, "key": key, "msg": failed_roles[record["role"]]}
+                )
+            elif (record["principal"], record["scope"]) in assigned[record["role"]]:
+                resources[kind]["existing"] += 1
+                replayed.append(key)
+            else:
+                remaining.append((key, record))
+        todo = remaining
+
+    for (key, _record), outcome, exc in run_concurrently(
+        lambda item: replay(fusion, kind, item[1]),
+        todo,
+        module.params["concurrency"],
+    ):
+        if exc is not None:
+            resources[kind]["failed"] += 1
+            failed.append(
+                {"kind": kind, "key": key, "msg": format_fusion_exception(exc)}
+            )
+        else:
+            resources[kind][outcome] += 1
+            replayed.append(key)
+    return replayed
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            src=dict(type="path", required=True),
+            checkpoint=dict(type="path"),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+
+    try:
+        snapshot = Snapshot(module.params["src"])
+    except (IOError, OSError, ValueError) as exc:
+        module.fail_json(
+            msg="Cannot read snapshot '{0}': {1}".format(module.params["src"], exc)
+        )
+
+    checkpoint = None
+    try:
+        if module.params["checkpoint"] is None:
+            done = set()
+        elif module.check_mode:
+            done = read_checkpoint(module.params["checkpoint"], snapshot.id)
+        else:
+            checkpoint = Checkpoint(module.params["checkpoint"], snapshot.id)
+            done = checkpoint.done
+    except (IOError, OSError, ValueError) as exc:
+        module.fail_json(msg="Cannot use checkpoint: {0}".format(exc))
+
+    fusion = setup_fusion(module)
+
+    resources = dict(
+        (kind, {"created": 0, "existing": 0, "resumed": 0, "failed": 0})
+        for kind in KINDS
+    )
+    failed = []
+    # existing role assignments by role, listed when first needed
+    assigned = {}
+    for level in LEVELS:
+        for kind, records in snapshot.chunks(level):
+            todo = []
+            for record in records:
+                key = resource_key(kind, record)
+                if key in done:
+                    resources[kind]["resumed"] += 1
+                else:
+                    todo.append((key, record))
+            if module.check_mode:
+                resources[kind]["created"] += len(todo)
+                continue
+
+            replayed = replay_chunk(
+                module, fusion, kind, todo, resources, failed, assigned
+            )
+            if checkpoint is not None:
+                checkpoint.add(replayed)
+
+        if failed:
+            # resources of next levels may depend on the failed ones
+            module.fail_json(
+                msg="Failed to create {0} resources: {1}".format(
+                    len(failed),
+                    "; ".join(
+                        "{0}: {1}".format(failure["key"], failure["msg"])
+                        for failure in failed[:10]
+                    ),
+                ),
+                changed=any(counts["created"] for counts in resources.values()),
+                resources=resources,
+                failed_resources=failed,
+            )
+
+    if checkpoint is not None:
+        checkpoint.remove()
+    module.exit_json(
+        changed=any(counts["created"] for counts in resources.values()),
+        resources=resources,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -105,11 +105,6 @@ EXAMPLES = r"""
 RETURN = r"""
 """
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
-
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
@@ -122,9 +117,15 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.operations impo
     await_operation,
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.snapshots import (
-    delete_snapshot,
+    delete_snapshots,
+    format_snapshot_failures,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
 )
 
+purefusion = lazy_import("fusion")
+
 
 def get_pg(module, fusion):
     """Return Placement Group or None"""
@@ -229,8 +230,11 @@ def delete_pg(module, fusion):
                 tenant_name=module.params["tenant"],
                 tenant_space_name=module.params["tenant_space"],
             )
-            for snap in snapshots.items:
-                delete_snapshot(fusion, snap, snapshots_api)
+            failures = delete_snapshots(fusion, snapshots.items, snapshots_api)
+            if failures:
+                module.fail_json(
+                    msg=format_snapshot_failures(failures), failed_snapshots=failures
+                )
 
         op = pg_api_instance.delete_placement_group(
             placement_group_name=module.params["name"],
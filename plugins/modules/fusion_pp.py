@@ -82,11 +82,6 @@ EXAMPLES = r"""
 RETURN = r"""
 """
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
-
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
@@ -103,9 +98,15 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.operations impo
     await_operation,
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.snapshots import (
-    delete_snapshot,
+    delete_snapshots,
+    format_snapshot_failures,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
 )
 
+purefusion = lazy_import("fusion")
+
 
 def get_pp(module, fusion):
     """Return Protection Policy or None"""
@@ -165,8 +166,11 @@ def delete_pp(module, fusion):
             snapshots = snapshots_api.query_snapshots(
                 protection_policy_id=protection_policy.id
             )
-            for snap in snapshots.items:
-                delete_snapshot(fusion, snap, snapshots_api)
+            failures = delete_snapshots(fusion, snapshots.items, snapshots_api)
+            if failures:
+                module.fail_json(
+                    msg=format_snapshot_failures(failures), failed_snapshots=failures
+                )
 
         op = pp_api_instance.delete_protection_policy(
             protection_policy_name=module.params["name"],
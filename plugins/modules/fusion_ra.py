@@ -87,11 +87,6 @@ EXAMPLES = r"""
 RETURN = r"""
 """
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
-
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
@@ -100,9 +95,19 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.role_assignments import (
+    apiclient_to_principal,
+    get_scope,
+    user_to_principal,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
 
 
 def get_principal(module, fusion):
@@ -126,56 +131,16 @@ def get_principal(module, fusion):
         return principal
 
 
-def user_to_principal(fusion, user_id):
-    """Given a human-readable Fusion user, such as a Pure 1 App ID
-    return the associated principal
-    """
-    id_api_instance = purefusion.IdentityManagerApi(fusion)
-    users = id_api_instance.list_users()
-    for user in users:
-        if user.name == user_id:
-            return user.id
-    return None
-
-
-def apiclient_to_principal(fusion, api_client_key):
-    """Given an API client issuer ID, such as "pure1:apikey:123xXxyYyzYzASDF",
-    return the associated principal
-    """
-    id_api_instance = purefusion.IdentityManagerApi(fusion)
-    api_clients = id_api_instance.list_users(name=api_client_key)
-    if len(api_clients) > 0:
-        return api_clients[0].id
-    return None
-
-
-def get_scope(params):
-    """Given a scope type and associated tenant
-    and tenant_space, return the scope_link
-    """
-    scope_link = None
-    if params["scope"] == "organization":
-        scope_link = "/"
-    elif params["scope"] == "tenant":
-        scope_link = "/tenants/" + params["tenant"]
-    elif params["scope"] == "tenant_space":
-        scope_link = (
-            "/tenants/" + params["tenant"] + "/tenant-spaces/" + params["tenant_space"]
-        )
-    return scope_link
-
-
-def get_ra(module, fusion):
+def get_ra(module, fusion, principal):
     """Return Role Assignment or None"""
     ra_api_instance = purefusion.RoleAssignmentsApi(fusion)
     try:
-        principal = get_principal(module, fusion)
         assignments = ra_api_instance.list_role_assignments(
             role_name=module.params["role"],
             principal=principal,
         )
+        scope = get_scope(module.params)
         for assign in assignments:
-            scope = get_scope(module.params)
             if assign.scope.self_link == scope:
                 return assign
         return None
@@ -183,7 +148,7 @@ def get_ra(module, fusion):
         return None
 
 
-def create_ra(module, fusion):
+def create_ra(module, fusion, principal):
     """Create Role Assignment"""
 
     ra_api_instance = purefusion.RoleAssignmentsApi(fusion)
@@ -191,7 +156,6 @@ def create_ra(module, fusion):
     changed = True
     id = None
     if not module.check_mode:
-        principal = get_principal(module, fusion)
         scope = get_scope(module.params)
         assignment = purefusion.RoleAssignmentPost(scope=scope, principal=principal)
         op = ra_api_instance.create_role_assignment(
@@ -203,14 +167,14 @@ def create_ra(module, fusion):
     module.exit_json(changed=changed, id=id)
 
 
-def delete_ra(module, fusion):
+def delete_ra(module, fusion, role_assignment):
     """Delete Role Assignment"""
     changed = True
     ra_api_instance = purefusion.RoleAssignmentsApi(fusion)
     if not module.check_mode:
-        ra_name = get_ra(module, fusion).name
         op = ra_api_instance.delete_role_assignment(
-            role_name=module.params["role"], role_assignment_name=ra_name
+            role_name=module.params["role"],
+            role_assignment_name=role_assignment.name,
         )
         await_operation(fusion, op)
 
@@ -268,12 +232,14 @@ def main():
     fusion = setup_fusion(module)
 
     state = module.params["state"]
-    role_assignment = get_ra(module, fusion)
+    # principal lookup may require listing users, so resolve it only once
+    principal = get_principal(module, fusion)
+    role_assignment = get_ra(module, fusion, principal)
 
     if not role_assignment and state == "present":
-        create_ra(module, fusion)
+        create_ra(module, fusion, principal)
     elif role_assignment and state == "absent":
-        delete_ra(module, fusion)
+        delete_ra(module, fusion, role_assignment)
     else:
         module.exit_json(changed=False)
 
@@ -0,0 +1,361 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_ra_bulk
+version_added: '1.7.0'
+short_description:  Reconcile many role assignments in Pure Storage Fusion at once
+description:
+- Create or delete many role assignments in Pure Storage Fusion in a single task.
+- Role assignments are listed once per role and compared with the desired
+  assignments, only the differences are created or deleted, concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+options:
+  assignments:
+    description:
+    - List of role assignments to reconcile.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      role:
+        description:
+        - The name of the role to be assigned/unassigned.
+        type: str
+        required: true
+      state:
+        description:
+        - Define whether the role assignment should exist or not.
+        type: str
+        default: present
+        choices: [ absent, present ]
+      user:
+        description:
+        - The username to assign the role to.
+        type: str
+      principal:
+        description:
+        - The unique ID of the principal (User or API Client) to assign to the role.
+        type: str
+      api_client_key:
+        description:
+        - The issuer ID of the API client to assign the role to.
+        type: str
+      scope:
+        description:
+        - The level to which the role is assigned.
+        choices: [ organization, tenant, tenant_space ]
+        default: organization
+        type: str
+      tenant:
+        description:
+        - The name of the tenant the user has the role applied to.
+        - Must be provided if I(scope) is set to either C(tenant) or C(tenant_space).
+        type: str
+      tenant_space:
+        description:
+        - The name of the tenant_space the user has the role applied to.
+        - Must be provided if I(scope) is set to C(tenant_space).
+        type: str
+  exclusive:
+    description:
+    - If C(true), role assignments of the reconciled roles which are not
+      declared in I(assignments) are deleted.
+    type: bool
+    default: false
+  roles:
+    description:
+    - Names of additional roles whose role assignments are reconciled.
+    - Roles referenced in I(assignments) are always reconciled. Use this together
+      with I(exclusive=true) to remove all assignments of a role.
+    type: list
+    elements: str
+  concurrency:
+    description:
+    - Maximum number of requests sent to Fusion at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Make sure users have their roles
+  purestorage.fusion.fusion_ra_bulk:
+    assignments:
+      - role: tenant-admin
+        user: alice
+        scope: tenant
+        tenant: foo
+      - role: tenant-space-admin
+        api_client_key: "pure1:apikey:123xXxyYyzYzASDF"
+        scope: tenant_space
+        tenant: foo
+        tenant_space: bar
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+
+- name: Make sure only the listed users are tenant admins
+  purestorage.fusion.fusion_ra_bulk:
+    assignments: "{{ tenant_admins }}"
+    roles:
+      - tenant-admin
+    exclusive: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+created:
+  description: Role assignments which were (or would be in check mode) created.
+  returned: always
+  type: list
+  elements: dict
+deleted:
+  description: Role assignments which were (or would be in check mode) deleted.
+  returned: always
+  type: list
+  elements: dict
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.role_assignments import (
+    apiclient_to_principal,
+    get_scope,
+    user_to_principal,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+
+def resolve_principals(module, fusion):
+    """Return dict mapping ("user" | "api_client_key", name) to principal id,
+    every distinct name is looked up exactly once"""
+    names = set()
+    for assignment in module.params["assignments"]:
+        if assignment["user"] is not None:
+            names.add(("user", assignment["user"]))
+        elif assignment["api_client_key"] is not None:
+            names.add(("api_client_key", assignment["api_client_key"]))
+
+    def _resolve(key):
+        kind, name = key
+        if kind == "user":
+            return user_to_principal(fusion, name)
+        return apiclient_to_principal(fusion, name)
+
+    principals = {}
+    for key, principal, exc in run_concurrently(
+        _resolve, sorted(names), module.params["concurrency"]
+    ):
+        if exc is not None:
+            raise exc
+        if principal is None:
+            if key[0] == "user":
+                module.fail_json(msg="User {0} does not exist".format(key[1]))
+            module.fail_json(
+                msg="API Client with key {0} does not exist".format(key[1])
+            )
+        principals[key] = principal
+    return principals
+
+
+def get_wanted(module, principals):
+    """Return (present, absent) sets of (role, principal, scope_link) tuples"""
+    present = set()
+    absent = set()
+    for assignment in module.params["assignments"]:
+        if assignment["principal"] is not None:
+            principal = assignment["principal"]
+        elif assignment["user"] is not None:
+            principal = principals[("user", assignment["user"])]
+        else:
+            principal = principals[("api_client_key", assignment["api_client_key"])]
+        key = (assignment["role"], principal, get_scope(assignment))
+        if assignment["state"] == "present":
+            present.add(key)
+        else:
+            absent.add(key)
+
+    conflicting = present & absent
+    if conflicting:
+        role, principal, scope = sorted(conflicting)[0]
+        module.fail_json(
+            msg="Role assignment of role '{0}' to principal '{1}' on scope '{2}' is declared both present and absent".format(
+                role, principal, scope
+            )
+        )
+    return present, absent
+
+
+def get_current(module, fusion, roles):
+    """Return dict mapping (role, principal, scope_link) to Role Assignment name,
+    role assignments are listed once per role"""
+    ra_api_instance = purefusion.RoleAssignmentsApi(fusion)
+
+    def _list(role):
+        return ra_api_instance.list_role_assignments(role_name=role)
+
+    current = {}
+    for role, assignments, exc in run_concurrently(
+        _list, sorted(roles), module.params["concurrency"]
+    ):
+        if exc is not None:
+            raise exc
+        for assignment in assignments:
+            key = (role, assignment.principal, assignment.scope.self_link)
+            current[key] = assignment.name
+    return current
+
+
+def _to_dict(key):
+    role, principal, scope = key
+    return {"role": role, "principal": principal, "scope": scope}
+
+
+def apply_changes(module, fusion, to_create, to_delete):
+    """Create and delete role assignments concurrently, returns list of failures"""
+    ra_api_instance = purefusion.RoleAssignmentsApi(fusion)
+
+    def _apply(change):
+        action, key, ra_name = change
+        role, principal, scope = key
+        if action == "create":
+            assignment = purefusion.RoleAssignmentPost(scope=scope, principal=principal)
+            op = ra_api_instance.create_role_assignment(assignment, role_name=role)
+        else:
+            op = ra_api_instance.delete_role_assignment(
+                role_name=role, role_assignment_name=ra_name
+            )
+        await_operation(fusion, op)
+
+    changes = [("create", key, None) for key in to_create]
+    changes += [("delete", key, ra_name) for key, ra_name in to_delete]
+
+    failed = []
+    for change, _result, exc in run_concurrently(
+        _apply, changes, module.params["concurrency"]
+    ):
+        if exc is not None:
+            failure = _to_dict(change[1])
+            failure["action"] = change[0]
+            failure["msg"] = format_fusion_exception(exc)
+            failed.append(failure)
+    return failed
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            assignments=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    role=dict(type="str", required=True),
+                    state=dict(
+                        type="str", default="present", choices=["present", "absent"]
+                    ),
+                    user=dict(type="str"),
+                    principal=dict(type="str"),
+                    api_client_key=dict(type="str", no_log=True),
+                    scope=dict(
+                        type="str",
+                        default="organization",
+                        choices=["organization", "tenant", "tenant_space"],
+                    ),
+                    tenant=dict(type="str"),
+                    tenant_space=dict(type="str"),
+                ),
+                required_if=[
+                    ["scope", "tenant", ["tenant"]],
+                    ["scope", "tenant_space", ["tenant", "tenant_space"]],
+                ],
+                mutually_exclusive=[("user", "principal", "api_client_key")],
+                required_one_of=[("user", "principal", "api_client_key")],
+            ),
+            exclusive=dict(type="bool", default=False),
+            roles=dict(type="list", elements="str"),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+
+    principals = resolve_principals(module, fusion)
+    present, absent = get_wanted(module, principals)
+
+    roles = set(role for role, _principal, _scope in present | absent)
+    if module.params["roles"]:
+        roles |= set(module.params["roles"])
+
+    current = get_current(module, fusion, roles)
+
+    to_create = sorted(present - set(current))
+    if module.params["exclusive"]:
+        to_delete = sorted(key for key in current if key not in present)
+    else:
+        to_delete = sorted(key for key in current if key in absent)
+
+    created = [_to_dict(key) for key in to_create]
+    deleted = [_to_dict(key) for key in to_delete]
+    changed = bool(created or deleted)
+
+    if not module.check_mode and changed:
+        failed = apply_changes(
+            module,
+            fusion,
+            to_create,
+            [(key, current[key]) for key in to_delete],
+        )
+        if failed:
+            total = len(created) + len(deleted)
+            module.fail_json(
+                msg="Failed to reconcile {0} of {1} role assignments".format(
+                    len(failed), total
+                ),
+                changed=len(failed) < total,
+                failed_assignments=failed,
+            )
+
+    module.exit_json(changed=changed, created=created, deleted=deleted)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_snapshot
+version_added: '1.7.0'
+short_description:  Manage many snapshots in Pure Storage Fusion at once
+description:
+- Create or delete snapshots of placement groups or lists of volumes in a single task.
+- Snapshots are listed once per tenant space and matched by name, only missing
+  snapshots are created and only existing ones are deleted. Existing snapshots
+  are not compared with the declared source.
+- Requests for all snapshots are sent concurrently and their operations are
+  awaited together.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+options:
+  snapshots:
+    description:
+    - List of snapshots to manage.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the snapshot.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the snapshot.
+        - If not provided, defaults to I(name).
+        type: str
+      tenant:
+        description:
+        - The name of the tenant.
+        type: str
+        required: true
+      tenant_space:
+        description:
+        - The name of the tenant space.
+        type: str
+        required: true
+      placement_group:
+        description:
+        - The name of the placement group whose volumes are snapshotted.
+        - Mutually exclusive with I(volumes).
+        type: str
+      volumes:
+        description:
+        - Names of the volumes to snapshot.
+        - Mutually exclusive with I(placement_group).
+        type: list
+        elements: str
+      state:
+        description:
+        - Define whether the snapshot should exist or not.
+        - A destroyed snapshot which should exist is recovered.
+        - I(placement_group) or I(volumes) is required when C(present).
+        type: str
+        default: present
+        choices: [ absent, present ]
+  concurrency:
+    description:
+    - Maximum number of requests sent to Fusion at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Snapshot placement groups before backup
+  purestorage.fusion.fusion_snapshot:
+    snapshots: "{{ placement_groups | map('combine', {'name': 'backup-' ~ ansible_date_time.date}) | list }}"
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+
+- name: Snapshot two volumes and delete an old snapshot
+  purestorage.fusion.fusion_snapshot:
+    snapshots:
+      - name: db-before-upgrade
+        tenant: foo
+        tenant_space: bar
+        volumes:
+          - db-data
+          - db-log
+      - name: db-last-month
+        tenant: foo
+        tenant_space: bar
+        state: absent
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+created:
+  description: Snapshots which were (or would be in check mode) created.
+  returned: always
+  type: list
+  elements: dict
+  sample: [{"tenant": "foo", "tenant_space": "bar", "name": "db-before-upgrade"}]
+recovered:
+  description: Destroyed snapshots which were (or would be in check mode) recovered.
+  returned: always
+  type: list
+  elements: dict
+deleted:
+  description: Snapshots which were (or would be in check mode) deleted.
+  returned: always
+  type: list
+  elements: dict
+failed_snapshots:
+  description: Snapshots which failed to be created, recovered or deleted.
+  returned: failure
+  type: list
+  elements: dict
+  contains:
+    tenant:
+      description: Name of the tenant.
+      type: str
+    tenant_space:
+      description: Name of the tenant space.
+      type: str
+    name:
+      description: Name of the snapshot.
+      type: str
+    msg:
+      description: Error message.
+      type: str
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.snapshots import (
+    create_snapshots,
+    delete_snapshots,
+    recover_snapshots,
+    snapshot_key,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+
+def _key(spec):
+    return spec["tenant"], spec["tenant_space"], spec["name"]
+
+
+def _to_dict(key):
+    tenant, tenant_space, name = key
+    return {"tenant": tenant, "tenant_space": tenant_space, "name": name}
+
+
+def get_current(module, fusion, snapshots_api):
+    """Return dict mapping (tenant, tenant space, name) to Snapshot, snapshots
+    are listed once per tenant space"""
+    spaces = set(
+        (spec["tenant"], spec["tenant_space"]) for spec in module.params["snapshots"]
+    )
+
+    def _list(space):
+        tenant, tenant_space = space
+        return snapshots_api.list_snapshots(
+            tenant_name=tenant, tenant_space_name=tenant_space
+        ).items
+
+    current = {}
+    for (tenant, tenant_space), snaps, exc in run_concurrently(
+        _list, sorted(spaces), module.params["concurrency"]
+    ):
+        if exc is not None:
+            module.fail_json(
+                msg="Failed to list snapshots of {0}/{1}: {2}".format(
+                    tenant, tenant_space, format_fusion_exception(exc)
+                )
+            )
+        for snap in snaps:
+            current[snapshot_key(snap)] = snap
+    return current
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            snapshots=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    tenant=dict(type="str", required=True),
+                    tenant_space=dict(type="str", required=True),
+                    placement_group=dict(type="str"),
+                    volumes=dict(type="list", elements="str"),
+                    state=dict(
+                        type="str", default="present", choices=["present", "absent"]
+                    ),
+                ),
+                mutually_exclusive=[("placement_group", "volumes")],
+                required_if=[
+                    ["state", "present", ["placement_group", "volumes"], True]
+                ],
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+
+    declared = set()
+    for spec in module.params["snapshots"]:
+        if _key(spec) in declared:
+            module.fail_json(
+                msg="Snapshot '{0}' is declared more than once".format(
+                    "/".join(_key(spec))
+                )
+            )
+        declared.add(_key(spec))
+
+    fusion = setup_fusion(module)
+    snapshots_api = purefusion.SnapshotsApi(fusion)
+    current = get_current(module, fusion, snapshots_api)
+
+    to_create = []
+    to_recover = []
+    to_delete = []
+    for spec in module.params["snapshots"]:
+        snap = current.get(_key(spec))
+        if spec["state"] == "absent":
+            if snap is not None:
+                to_delete.append(snap)
+        elif snap is None:
+            to_create.append(spec)
+        elif snap.destroyed:
+            to_recover.append(snap)
+
+    created = [_to_dict(_key(spec)) for spec in to_create]
+    recovered = [_to_dict(snapshot_key(snap)) for snap in to_recover]
+    deleted = [_to_dict(snapshot_key(snap)) for snap in to_delete]
+    changed = bool(created or recovered or deleted)
+
+    if not module.check_mode and changed:
+        concurrency = module.params["concurrency"]
+        failures = create_snapshots(fusion, to_create, snapshots_api, concurrency)
+        failures.update(
+            recover_snapshots(fusion, to_recover, snapshots_api, concurrency)
+        )
+        failures.update(
+            delete_snapshots(
+                fusion, to_delete, snapshots_api, concurrency, key=snapshot_key
+            )
+        )
+        if failures:
+            total = len(created) + len(recovered) + len(deleted)
+            failed = []
+            for key, msg in sorted(failures.items()):
+                failure = _to_dict(key)
+                failure["msg"] = msg
+                failed.append(failure)
+            module.fail_json(
+                msg="Failed to manage {0} of {1} snapshots: {2}".format(
+                    len(failed),
+                    total,
+                    "; ".join(
+                        "'{0}': {1}".format("/".join(key), msg)
+                        for key, msg in sorted(failures.items())[:10]
+                    ),
+                ),
+                changed=len(failed) < total,
+                failed_snapshots=failed,
+            )
+
+    module.exit_json(
+        changed=changed, created=created, recovered=recovered, deleted=deleted
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_snapshot_sweep
+version_added: '1.7.0'
+short_description:  Delete snapshots selected by age, name or placement group in Pure Storage Fusion
+description:
+- Destroy and eradicate snapshots which are not removed by protection policies,
+  e.g. snapshots taken by M(purestorage.fusion.fusion_snapshot) or left behind
+  by deleted workloads.
+- Snapshots are listed once per tenant space, or once per tenant space and
+  placement group when I(placement_groups) are given. A snapshot is selected when
+  it matches all given filters.
+- Selected snapshots are destroyed concurrently, then eradicated concurrently.
+  Snapshots which are already destroyed are only eradicated.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode), the selected snapshots are returned as a plan and nothing is deleted.
+- Age of a snapshot is the creation time of its volume snapshots, it is looked up
+  only if I(older_than) or I(max_deletions) is set and only for snapshots matching
+  the other filters.
+options:
+  tenant:
+    description:
+    - The name of the tenant whose snapshots are swept.
+    - All tenants are swept if not provided.
+    type: str
+  tenant_space:
+    description:
+    - The name of the tenant space whose snapshots are swept.
+    - All tenant spaces of I(tenant) are swept if not provided.
+    type: str
+  older_than:
+    description:
+    - Select snapshots older than this period.
+    - Use combination of time units (Y, W, D, H, M), e.g. C(4W3D), C(1Y), C(36H).
+    - Snapshots without volume snapshots have no age and are not selected.
+    type: str
+  name_pattern:
+    description:
+    - Select snapshots whose whole name matches this Python regular expression.
+    type: str
+  placement_groups:
+    description:
+    - Select snapshots of these placement groups.
+    type: list
+    elements: str
+  max_deletions:
+    description:
+    - Maximum number of snapshots deleted in a single run, the oldest ones first.
+    - Snapshots without volume snapshots have no age and are deleted last.
+    - Other selected snapshots are left for the next run and counted in C(deferred).
+    type: int
+  concurrency:
+    description:
+    - Maximum number of requests sent to Fusion at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Plan deletion of backup snapshots older than 2 weeks
+  purestorage.fusion.fusion_snapshot_sweep:
+    tenant: foo
+    older_than: 2W
+    name_pattern: "backup-.*"
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+  check_mode: true
+  register: plan
+
+- name: Delete at most 500 snapshots of decommissioned placement groups
+  purestorage.fusion.fusion_snapshot_sweep:
+    tenant: foo
+    tenant_space: bar
+    placement_groups:
+      - old-db
+      - old-web
+    max_deletions: 500
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+snapshots:
+  description:
+  - Snapshots which were (or would be in check mode) deleted.
+  - Sorted the oldest first if I(older_than) or I(max_deletions) is set, by name otherwise.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    tenant:
+      description: Name of the tenant.
+      type: str
+    tenant_space:
+      description: Name of the tenant space.
+      type: str
+    name:
+      description: Name of the snapshot.
+      type: str
+    created_at:
+      description: Creation time of the snapshot in ISO 8601 format, null if unknown.
+      type: str
+    destroyed:
+      description: Whether the snapshot was already destroyed.
+      type: bool
+listed:
+  description: Number of snapshots listed.
+  returned: always
+  type: int
+matched:
+  description: Number of snapshots matching the filters.
+  returned: always
+  type: int
+deferred:
+  description: Number of matching snapshots left for the next run because of I(max_deletions).
+  returned: always
+  type: int
+failed_snapshots:
+  description: Snapshots which failed to be deleted.
+  returned: failure
+  type: list
+  elements: dict
+  contains:
+    tenant:
+      description: Name of the tenant.
+      type: str
+    tenant_space:
+      description: Name of the tenant space.
+      type: str
+    name:
+      description: Name of the snapshot.
+      type: str
+    msg:
+      description: Error message.
+      type: str
+"""
+
+import datetime
+import re
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_minutes,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.snapshots import (
+    delete_snapshots,
+    snapshot_key,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+
+def list_tenant_spaces(module, fusion):
+    """Return list of (tenant, tenant space) tuples to sweep"""
+    if module.params["tenant_space"] is not None:
+        return [(module.params["tenant"], module.params["tenant_space"])]
+    if module.params["tenant"] is not None:
+        tenants = [module.params["tenant"]]
+    else:
+        tenants = [
+            tenant.name for tenant in purefusion.TenantsApi(fusion).list_tenants().items
+        ]
+
+    ts_api_instance = purefusion.TenantSpacesApi(fusion)
+
+    def _list(tenant):
+        return ts_api_instance.list_tenant_spaces(tenant_name=tenant).items
+
+    spaces = []
+    for tenant, tenant_spaces, exc in run_concurrently(
+        _list, tenants, module.params["concurrency"]
+    ):
+        if exc is not None:
+            module.fail_json(
+                msg="Failed to list tenant spaces of {0}: {1}".format(
+                    tenant, format_fusion_exception(exc)
+                )
+            )
+        spaces += [(tenant, tenant_space.name) for tenant_space in tenant_spaces]
+    return spaces
+
+
+def list_snapshots(module, snapshots_api, spaces):
+    """Return dict mapping snapshot_key() to Snapshot of all snapshots in
+    `spaces`, of the selected placement groups only if there are any"""
+    placement_groups = module.params["placement_groups"] or [None]
+    queries = [
+        (tenant, tenant_space, placement_group)
+        for tenant, tenant_space in spaces
+        for placement_group in placement_groups
+    ]
+
+    def _list(query):
+        tenant, tenant_space, placement_group = query
+        kwargs = dict(tenant_name=tenant, tenant_space_name=tenant_space)
+        if placement_group is not None:
+            kwargs["placement_group"] = placement_group
+        return snapshots_api.list_snapshots(**kwargs).items
+
+    snapshots = {}
+    for (tenant, tenant_space, _pg), snaps, exc in run_concurrently(
+        _list, queries, module.params["concurrency"]
+    ):
+        if exc is not None:
+            module.fail_json(
+                msg="Failed to list snapshots of {0}/{1}: {2}".format(
+                    tenant, tenant_space, format_fusion_exception(exc)
+                )
+            )
+        for snap in snaps:
+            # a snapshot of volumes can belong to several placement groups
+            snapshots[snapshot_key(snap)] = snap
+    return snapshots
+
+
+def get_created_at(module, fusion, snapshots):
+    """Return dict mapping snapshot_key() to creation time of the snapshot in
+    milliseconds, None if it has no volume snapshots"""
+    vs_api_instance = purefusion.VolumeSnapshotsApi(fusion)
+
+    def _created_at(snap):
+        # volume snapshots of a snapshot are taken together
+        volume_snapshots = vs_api_instance.list_volume_snapshots(
+            tenant_name=snap.tenant.name,
+            tenant_space_name=snap.tenant_space.name,
+            snapshot_name=snap.name,
+            limit=1,
+        ).items
+        return volume_snapshots[0].created_at if volume_snapshots else None
+
+    created_at = {}
+    for snap, millis, exc in run_concurrently(
+        _created_at, snapshots, module.params["concurrency"]
+    ):
+        if exc is not None:
+            module.fail_json(
+                msg="Failed to get age of snapshot {0}: {1}".format(
+                    "/".join(snapshot_key(snap)), format_fusion_exception(exc)
+                )
+            )
+        created_at[snapshot_key(snap)] = millis
+    return created_at
+
+
+def _iso(millis):
+    if millis is None:
+        return None
+    return datetime.datetime.fromtimestamp(
+        millis / 1000, datetime.timezone.utc
+    ).isoformat()
+
+
+def _to_dict(key):
+    tenant, tenant_space, name = key
+    return {"tenant": tenant, "tenant_space": tenant_space, "name": name}
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            tenant=dict(type="str"),
+            tenant_space=dict(type="str"),
+            older_than=dict(type="str"),
+            name_pattern=dict(type="str"),
+            placement_groups=dict(type="list", elements="str"),
+            max_deletions=dict(type="int"),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(
+        argument_spec,
+        supports_check_mode=True,
+        # never sweep every snapshot of the organization by mistake
+        required_one_of=[("older_than", "name_pattern", "placement_groups")],
+        required_by={"tenant_space": "tenant"},
+    )
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+    if (
+        module.params["max_deletions"] is not None
+        and module.params["max_deletions"] < 0
+    ):
+        module.fail_json(msg="'max_deletions' must not be negative")
+
+    min_age = None
+    if module.params["older_than"] is not None:
+        min_age = parse_minutes(module, module.params["older_than"])
+    name_pattern = None
+    if module.params["name_pattern"] is not None:
+        try:
+            name_pattern = re.compile(module.params["name_pattern"])
+        except re.error as exc:
+            module.fail_json(
+                msg="'name_pattern' is not a valid regular expression: {0}".format(exc)
+            )
+
+    fusion = setup_fusion(module)
+    snapshots_api = purefusion.SnapshotsApi(fusion)
+
+    spaces = list_tenant_spaces(module, fusion)
+    snapshots = list_snapshots(module, snapshots_api, spaces)
+
+    matched = [
+        snap
+        for _key, snap in sorted(snapshots.items())
+        if name_pattern is None or name_pattern.fullmatch(snap.name)
+    ]
+    created_at = {}
+    if min_age is not None or module.params["max_deletions"] is not None:
+        created_at = get_created_at(module, fusion, matched)
+        # snapshots without age are deleted last
+        matched.sort(
+            key=lambda snap: (
+                created_at[snapshot_key(snap)] is None,
+                created_at[snapshot_key(snap)] or 0,
+            )
+        )
+    if min_age is not None:
+        cutoff = (time.time() - min_age * 60) * 1000
+        matched = [
+            snap
+            for snap in matched
+            if created_at[snapshot_key(snap)] is not None
+            and created_at[snapshot_key(snap)] < cutoff
+        ]
+
+    selected = matched
+    if module.params["max_deletions"] is not None:
+        selected = matched[: module.params["max_deletions"]]
+
+    result = dict(
+        changed=bool(selected),
+        snapshots=[
+            dict(
+                _to_dict(snapshot_key(snap)),
+                created_at=_iso(created_at.get(snapshot_key(snap))),
+                destroyed=bool(snap.destroyed),
+            )
+            for snap in selected
+        ],
+        listed=len(snapshots),
+        matched=len(matched),
+        deferred=len(matched) - len(selected),
+    )
+
+    if not module.check_mode and selected:
+        failures = delete_snapshots(
+            fusion,
+            selected,
+            snapshots_api,
+            module.params["concurrency"],
+            key=snapshot_key,
+        )
+        if failures:
+            failed = []
+            for key, msg in sorted(failures.items()):
+                failure = _to_dict(key)
+                failure["msg"] = msg
+                failed.append(failure)
+            result["changed"] = len(failed) < len(selected)
+            module.fail_json(
+                msg="Failed to delete {0} of {1} snapshots: {2}".format(
+                    len(failed),
+                    len(selected),
+                    "; ".join(
+                        "'{0}': {1}".format("/".join(key), msg)
+                        for key, msg in sorted(failures.items())[:10]
+                    ),
+                ),
+                failed_snapshots=failed,
+                **result
+            )
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,896 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_tenant_space_state
+version_added: '1.7.0'
+short_description:  Reconcile contents of a tenant space in Pure Storage Fusion
+description:
+- Make placement groups, volumes, their host access policy attachments and
+  protection policies of a tenant space match a single desired state document.
+- Current state is read with a few list requests, the differences are turned into
+  create, update and delete steps ordered by their dependencies (e.g. placement
+  groups are created before their volumes, host access policies are detached before
+  a volume is destroyed) and independent steps run concurrently.
+- Host access policies must already exist, use M(purestorage.fusion.fusion_hap) to create them.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode), the steps which would be run are returned in RV(plan).
+options:
+  tenant:
+    description:
+    - The name of the tenant.
+    type: str
+    required: true
+  tenant_space:
+    description:
+    - The name of the tenant space.
+    type: str
+    required: true
+  placement_groups:
+    description:
+    - Placement groups of the tenant space.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the placement group.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the placement group.
+        - If not provided, defaults to I(name).
+        type: str
+      state:
+        description:
+        - Define whether the placement group should exist or not.
+        type: str
+        default: present
+        choices: [ absent, present ]
+      region:
+        description:
+        - The name of the region the availability zone is in.
+        - Required when the placement group is created.
+        type: str
+      availability_zone:
+        description:
+        - The name of the availability zone the placement group is in.
+        - Required when the placement group is created.
+        type: str
+      storage_service:
+        description:
+        - The name of the storage service to create the placement group for.
+        - Required when the placement group is created.
+        type: str
+  volumes:
+    description:
+    - Volumes of the tenant space.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the volume.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the volume.
+        - If not provided, defaults to I(name).
+        type: str
+      state:
+        description:
+        - Define whether the volume should exist or not.
+        type: str
+        default: present
+        choices: [ absent, present ]
+      size:
+        description:
+        - Volume size in M, G, T or P units.
+        - Required when the volume is created.
+        type: str
+      storage_class:
+        description:
+        - The name of the storage class.
+        - Required when the volume is created.
+        type: str
+      placement_group:
+        description:
+        - The name of the placement group.
+        - Required when the volume is created.
+        type: str
+      protection_policy:
+        description:
+        - The name of the protection policy.
+        type: str
+      host_access_policies:
+        description:
+        - A list of host access policies to connect the volume to.
+        - To clear, assign empty list.
+        type: list
+        elements: str
+  protection_policies:
+    description:
+    - Protection policies used by the volumes.
+    - Protection policies are not bound to the tenant space, they are never
+      deleted unless declared with I(state=absent).
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the protection policy.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the protection policy.
+        - If not provided, defaults to I(name).
+        type: str
+      state:
+        description:
+        - Define whether the protection policy should exist or not.
+        type: str
+        default: present
+        choices: [ absent, present ]
+      local_rpo:
+        description:
+        - Recovery Point Objective for snapshots.
+        - Value should be specified in minutes.
+        - Minimum value is 10 minutes.
+        - Required when the protection policy is created.
+        type: str
+      local_retention:
+        description:
+        - Retention Duration for periodic snapshots.
+        - Minimum value is 10 minutes.
+        - Value can be provided as m(inutes), h(ours),
+          d(ays), w(eeks), or y(ears).
+        - If no unit is provided, minutes are assumed.
+        - Required when the protection policy is created.
+        type: str
+  exclusive:
+    description:
+    - If C(true), placement groups and volumes of the tenant space which are not
+      declared are deleted.
+    type: bool
+    default: false
+  eradicate:
+    description:
+    - Wipe volumes which should not exist immediately instead of only destroying them.
+    - Required to delete placement groups which still contain volumes.
+    type: bool
+    default: false
+  concurrency:
+    description:
+    - Maximum number of steps running at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Reconcile tenant space
+  purestorage.fusion.fusion_tenant_space_state:
+    tenant: db_tenant
+    tenant_space: production
+    protection_policies:
+      - name: hourly
+        local_rpo: 60
+        local_retention: 1d
+    placement_groups:
+      - name: pg1
+        region: pure-us-west
+        availability_zone: az1
+        storage_service: db_high_performance
+    volumes:
+      - name: data1
+        size: 1T
+        storage_class: db_high_performance
+        placement_group: pg1
+        protection_policy: hourly
+        host_access_policies:
+          - db_host1
+      - name: scratch
+        state: absent
+    eradicate: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+plan:
+  description:
+  - Steps which were (or would be in check mode) run, in the order they were planned.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    id:
+      description: Unique identifier of the step.
+      type: str
+      sample: volume:create:data1
+    kind:
+      description: Kind of the resource.
+      type: str
+      sample: volume
+    action:
+      description: One of C(create), C(update), C(destroy), C(delete).
+      type: str
+      sample: create
+    name:
+      description: Name of the resource.
+      type: str
+      sample: data1
+    changes:
+      description: Properties which are set by the step.
+      type: dict
+    depends_on:
+      description: Identifiers of the steps which must succeed before this step runs.
+      type: list
+      elements: str
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+    run_graph,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_minutes,
+    parse_number_with_metric_suffix,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+
+class Plan(object):
+    """Ordered collection of steps and their dependencies"""
+
+    def __init__(self):
+        self.steps = []
+        self._funcs = {}
+
+    def add(self, kind, action, name, func, changes=None, depends_on=()):
+        step_id = "{0}:{1}:{2}".format(kind, action, name)
+        self.steps.append(
+            {
+                "id": step_id,
+                "kind": kind,
+                "action": action,
+                "name": name,
+                "changes": changes or {},
+                "depends_on": sorted(set(dep for dep in depends_on if dep)),
+            }
+        )
+        self._funcs[step_id] = func
+        return step_id
+
+    def ids(self, kind, name, actions=None):
+        """Returns ids of steps of given resource"""
+        return [
+            step["id"]
+            for step in self.steps
+            if step["kind"] == kind
+            and step["name"] == name
+            and (actions is None or step["action"] in actions)
+        ]
+
+    def run(self, concurrency):
+        return run_graph(
+            dict(
+                (step["id"], (self._funcs[step["id"]], step["depends_on"]))
+                for step in self.steps
+            ),
+            concurrency,
+        )
+
+
+def get_current_state(module, fusion):
+    """Returns dicts of current placement groups, volumes and protection
+    policies, keyed by their names"""
+    tenant = module.params["tenant"]
+    tenant_space = module.params["tenant_space"]
+
+    listings = {
+        "placement_groups": lambda: purefusion.PlacementGroupsApi(
+            fusion
+        ).list_placement_groups(tenant_name=tenant, tenant_space_name=tenant_space),
+        "volumes": lambda: purefusion.VolumesApi(fusion).list_volumes(
+            tenant_name=tenant, tenant_space_name=tenant_space
+        ),
+    }
+    if module.params["protection_policies"]:
+        listings["protection_policies"] = lambda: purefusion.ProtectionPoliciesApi(
+            fusion
+        ).list_protection_policies()
+
+    current = {"placement_groups": {}, "volumes": {}, "protection_policies": {}}
+    for kind, response, exc in run_concurrently(
+        lambda kind: listings[kind](), sorted(listings), module.params["concurrency"]
+    ):
+        if exc is not None:
+            raise exc
+        current[kind] = dict((item.name, item) for item in response.items)
+    return current
+
+
+def _wanted_by_name(module, kind):
+    wanted = {}
+    for item in module.params[kind]:
+        if item["name"] in wanted:
+            module.fail_json(
+                msg="{0} '{1}' is declared more than once".format(kind, item["name"])
+            )
+        wanted[item["name"]] = item
+    return wanted
+
+
+def _absent(name):
+    return {"name": name, "state": "absent"}
+
+
+def _ref_name(ref):
+    return ref.name if ref else None
+
+
+def plan_protection_policy_creation(module, fusion, plan, wanted, current):
+    pp_api_instance = purefusion.ProtectionPoliciesApi(fusion)
+    for name, pp in sorted(wanted.items()):
+        if pp["state"] != "present" or name in current:
+            continue
+        if pp["local_rpo"] is None or pp["local_retention"] is None:
+            module.fail_json(
+                msg="'local_rpo' and 'local_retention' are required to create protection policy '{0}'".format(
+                    name
+                )
+            )
+        local_rpo = parse_minutes(module, pp["local_rpo"])
+        local_retention = parse_minutes(module, pp["local_retention"])
+        if local_retention < 10:
+            module.fail_json(msg="Local Retention must be a minimum of 10 minutes")
+        if local_rpo < 10:
+            module.fail_json(msg="Local RPO must be a minimum of 10 minutes")
+        body = purefusion.ProtectionPolicyPost(
+            name=name,
+            display_name=pp["display_name"] or name,
+            objectives=[
+                purefusion.RPO(type="RPO", rpo="PT" + str(local_rpo) + "M"),
+                purefusion.Retention(
+                    type="Retention", after="PT" + str(local_retention) + "M"
+                ),
+            ],
+        )
+
+        def _create(body=body):
+            await_operation(fusion, pp_api_instance.create_protection_policy(body))
+
+        plan.add(
+            "protection_policy",
+            "create",
+            name,
+            _create,
+            changes={"local_rpo": local_rpo, "local_retention": local_retention},
+        )
+
+
+def plan_placement_groups(module, fusion, plan, wanted, current):
+    """Plans creation and update of placement groups, deletions are planned
+    after volumes as they depend on them"""
+    pg_api_instance = purefusion.PlacementGroupsApi(fusion)
+    tenant = module.params["tenant"]
+    tenant_space = module.params["tenant_space"]
+
+    for name, pg in sorted(wanted.items()):
+        if pg["state"] != "present":
+            continue
+        display_name = pg["display_name"] or name
+
+        if name not in current:
+            missing = [
+                param
+                for param in ("region", "availability_zone", "storage_service")
+                if not pg[param]
+            ]
+            if missing:
+                module.fail_json(
+                    msg="missing required arguments to create placement group '{0}': {1}".format(
+                        name, ", ".join(missing)
+                    )
+                )
+            body = purefusion.PlacementGroupPost(
+                name=name,
+                display_name=display_name,
+                region=pg["region"],
+                availability_zone=pg["availability_zone"],
+                storage_service=pg["storage_service"],
+            )
+
+            def _create(body=body):
+                op = pg_api_instance.create_placement_group(
+                    body, tenant_name=tenant, tenant_space_name=tenant_space
+                )
+                await_operation(fusion, op)
+
+            plan.add(
+                "placement_group",
+                "create",
+                name,
+                _create,
+                changes={
+                    "display_name": display_name,
+                    "region": pg["region"],
+                    "availability_zone": pg["availability_zone"],
+                    "storage_service": pg["storage_service"],
+                },
+            )
+        elif pg["display_name"] and pg["display_name"] != current[name].display_name:
+            patch = purefusion.PlacementGroupPatch(
+                display_name=purefusion.NullableString(pg["display_name"])
+            )
+
+            def _update(name=name, patch=patch):
+                op = pg_api_instance.update_placement_group(
+                    patch,
+                    tenant_name=tenant,
+                    tenant_space_name=tenant_space,
+                    placement_group_name=name,
+                )
+                await_operation(fusion, op)
+
+            plan.add(
+                "placement_group",
+                "update",
+                name,
+                _update,
+                changes={"display_name": pg["display_name"]},
+            )
+
+
+def _volume_patches(module, volume, current):
+    """Returns list of (property, value, patch) tuples, the order matters as
+    most properties of destroyed volumes cannot be changed"""
+    changes = []
+    if current.destroyed:
+        changes.append(
+            ("destroyed", False, dict(destroyed=purefusion.NullableBoolean(False)))
+        )
+    if volume["size"] is not None:
+        size = parse_number_with_metric_suffix(module, volume["size"])
+        if size != current.size:
+            changes.append(("size", size, dict(size=purefusion.NullableSize(size))))
+    if volume["protection_policy"] is not None and volume["protection_policy"] != (
+        _ref_name(current.protection_policy) or ""
+    ):
+        changes.append(
+            (
+                "protection_policy",
+                volume["protection_policy"],
+                dict(
+                    protection_policy=purefusion.NullableString(
+                        volume["protection_policy"]
+                    )
+                ),
+            )
+        )
+    if volume["display_name"] and volume["display_name"] != current.display_name:
+        changes.append(
+            (
+                "display_name",
+                volume["display_name"],
+                dict(display_name=purefusion.NullableString(volume["display_name"])),
+            )
+        )
+    if volume["storage_class"] and volume["storage_class"] != _ref_name(
+        current.storage_class
+    ):
+        changes.append(
+            (
+                "storage_class",
+                volume["storage_class"],
+                dict(storage_class=purefusion.NullableString(volume["storage_class"])),
+            )
+        )
+    if volume["placement_group"] and volume["placement_group"] != _ref_name(
+        current.placement_group
+    ):
+        changes.append(
+            (
+                "placement_group",
+                volume["placement_group"],
+                dict(
+                    placement_group=purefusion.NullableString(volume["placement_group"])
+                ),
+            )
+        )
+    if volume["host_access_policies"] is not None:
+        wanted_haps = sorted(set(hap.strip() for hap in volume["host_access_policies"]))
+        current_haps = sorted(
+            set(hap.name for hap in current.host_access_policies or [])
+        )
+        if wanted_haps != current_haps:
+            changes.append(
+                (
+                    "host_access_policies",
+                    wanted_haps,
+                    dict(
+                        host_access_policies=purefusion.NullableString(
+                            ",".join(wanted_haps)
+                        )
+                    ),
+                )
+            )
+    return changes
+
+
+def plan_volumes(module, fusion, plan, wanted, current):
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    tenant = module.params["tenant"]
+    tenant_space = module.params["tenant_space"]
+
+    def _patch(name, changes):
+        for _prop, _value, fields in changes:
+            op = volume_api_instance.update_volume(
+                purefusion.VolumePatch(**fields),
+                tenant_name=tenant,
+                tenant_space_name=tenant_space,
+                volume_name=name,
+            )
+            await_operation(fusion, op)
+
+    def _depends_on(volume):
+        return plan.ids(
+            "placement_group", volume["placement_group"], ["create"]
+        ) + plan.ids("protection_policy", volume["protection_policy"], ["create"])
+
+    for name, volume in sorted(wanted.items()):
+        if volume["state"] == "present" and name not in current:
+            missing = [
+                param
+                for param in ("size", "storage_class", "placement_group")
+                if not volume[param]
+            ]
+            if missing:
+                module.fail_json(
+                    msg="missing required arguments to create volume '{0}': {1}".format(
+                        name, ", ".join(missing)
+                    )
+                )
+            size = parse_number_with_metric_suffix(module, volume["size"])
+            if size < 1048576 or size > 4503599627370496:  # 1MB to 4PB
+                module.fail_json(
+                    msg="Size of volume '{0}' is not within the required range, size must be between 1MB and 4PB".format(
+                        name
+                    )
+                )
+            body = purefusion.VolumePost(
+                name=name,
+                display_name=volume["display_name"] or name,
+                size=size,
+                storage_class=volume["storage_class"],
+                placement_group=volume["placement_group"],
+                protection_policy=volume["protection_policy"],
+            )
+            haps = sorted(
+                set(hap.strip() for hap in volume["host_access_policies"] or [])
+            )
+            hap_changes = []
+            if haps:
+                hap_changes.append(
+                    (
+                        "host_access_policies",
+                        haps,
+                        dict(
+                            host_access_policies=purefusion.NullableString(
+                                ",".join(haps)
+                            )
+                        ),
+                    )
+                )
+
+            def _create(name=name, body=body, hap_changes=hap_changes):
+                op = volume_api_instance.create_volume(
+                    body, tenant_name=tenant, tenant_space_name=tenant_space
+                )
+                await_operation(fusion, op)
+                # host access policies can only be attached to existing volume
+                _patch(name, hap_changes)
+
+            changes = {
+                "display_name": body.display_name,
+                "size": size,
+                "storage_class": volume["storage_class"],
+                "placement_group": volume["placement_group"],
+                "protection_policy": volume["protection_policy"],
+            }
+            if haps:
+                changes["host_access_policies"] = haps
+            plan.add(
+                "volume",
+                "create",
+                name,
+                _create,
+                changes=changes,
+                depends_on=_depends_on(volume),
+            )
+
+        elif volume["state"] == "present":
+            changes = _volume_patches(module, volume, current[name])
+            if changes:
+                plan.add(
+                    "volume",
+                    "update",
+                    name,
+                    lambda name=name, changes=changes: _patch(name, changes),
+                    changes=dict((prop, value) for prop, value, _fields in changes),
+                    depends_on=_depends_on(volume),
+                )
+
+        elif name in current:
+            if volume["host_access_policies"]:
+                module.fail_json(
+                    msg="Volume '{0}' must have no host access policies when destroyed".format(
+                        name
+                    )
+                )
+            destroy_id = None
+            if not current[name].destroyed:
+                # host access policies have to be detached before volume is destroyed
+                changes = []
+                if current[name].host_access_policies:
+                    changes.append(
+                        (
+                            "host_access_policies",
+                            [],
+                            dict(host_access_policies=purefusion.NullableString("")),
+                        )
+                    )
+                changes.append(
+                    (
+                        "destroyed",
+                        True,
+                        dict(destroyed=purefusion.NullableBoolean(True)),
+                    )
+                )
+                destroy_id = plan.add(
+                    "volume",
+                    "destroy",
+                    name,
+                    lambda name=name, changes=changes: _patch(name, changes),
+                    changes=dict((prop, value) for prop, value, _fields in changes),
+                )
+            if module.params["eradicate"]:
+
+                def _delete(name=name):
+                    op = volume_api_instance.delete_volume(
+                        tenant_name=tenant,
+                        tenant_space_name=tenant_space,
+                        volume_name=name,
+                    )
+                    await_operation(fusion, op)
+
+                plan.add("volume", "delete", name, _delete, depends_on=[destroy_id])
+
+
+def plan_placement_group_deletion(module, fusion, plan, wanted, current, volumes):
+    pg_api_instance = purefusion.PlacementGroupsApi(fusion)
+    tenant = module.params["tenant"]
+    tenant_space = module.params["tenant_space"]
+
+    for name, pg in sorted(wanted.items()):
+        if pg["state"] != "absent" or name not in current:
+            continue
+
+        depends_on = []
+        for volume in volumes.values():
+            if _ref_name(volume.placement_group) != name:
+                continue
+            moved = [
+                step["id"]
+                for step in plan.steps
+                if step["kind"] == "volume"
+                and step["name"] == volume.name
+                and step["action"] == "update"
+                and "placement_group" in step["changes"]
+            ]
+            deleted = plan.ids("volume", volume.name, ["delete"])
+            if not moved and not deleted:
+                module.fail_json(
+                    msg="Placement group '{0}' cannot be deleted, volume '{1}' is still placed in it".format(
+                        name, volume.name
+                    )
+                )
+            depends_on += moved + deleted
+
+        def _delete(name=name):
+            op = pg_api_instance.delete_placement_group(
+                tenant_name=tenant,
+                tenant_space_name=tenant_space,
+                placement_group_name=name,
+            )
+            await_operation(fusion, op)
+
+        plan.add("placement_group", "delete", name, _delete, depends_on=depends_on)
+
+
+def plan_protection_policy_deletion(module, fusion, plan, wanted, current, volumes):
+    pp_api_instance = purefusion.ProtectionPoliciesApi(fusion)
+
+    for name, pp in sorted(wanted.items()):
+        if pp["state"] != "absent" or name not in current:
+            continue
+
+        depends_on = []
+        for volume in volumes.values():
+            if _ref_name(volume.protection_policy) == name:
+                depends_on += plan.ids("volume", volume.name)
+
+        def _delete(name=name):
+            op = pp_api_instance.delete_protection_policy(protection_policy_name=name)
+            await_operation(fusion, op)
+
+        plan.add("protection_policy", "delete", name, _delete, depends_on=depends_on)
+
+
+def build_plan(module, fusion, current):
+    wanted_pgs = _wanted_by_name(module, "placement_groups")
+    wanted_volumes = _wanted_by_name(module, "volumes")
+    wanted_pps = _wanted_by_name(module, "protection_policies")
+
+    if module.params["exclusive"]:
+        for name in current["placement_groups"]:
+            wanted_pgs.setdefault(name, _absent(name))
+        for name in current["volumes"]:
+            if name not in wanted_volumes:
+                wanted_volumes[name] = dict(
+                    _absent(name),
+                    host_access_policies=None,
+                )
+
+    plan = Plan()
+    plan_protection_policy_creation(
+        module, fusion, plan, wanted_pps, current["protection_policies"]
+    )
+    plan_placement_groups(module, fusion, plan, wanted_pgs, current["placement_groups"])
+    plan_volumes(module, fusion, plan, wanted_volumes, current["volumes"])
+    plan_placement_group_deletion(
+        module,
+        fusion,
+        plan,
+        wanted_pgs,
+        current["placement_groups"],
+        current["volumes"],
+    )
+    plan_protection_policy_deletion(
+        module,
+        fusion,
+        plan,
+        wanted_pps,
+        current["protection_policies"],
+        current["volumes"],
+    )
+    return plan
+
+
+def main():
+    """Main code"""
+    state = dict(type="str", default="present", choices=["present", "absent"])
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            tenant=dict(type="str", required=True),
+            tenant_space=dict(type="str", required=True),
+            placement_groups=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    state=state,
+                    region=dict(type="str"),
+                    availability_zone=dict(type="str"),
+                    storage_service=dict(type="str"),
+                ),
+            ),
+            volumes=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    state=state,
+                    size=dict(type="str"),
+                    storage_class=dict(type="str"),
+                    placement_group=dict(type="str"),
+                    protection_policy=dict(type="str"),
+                    host_access_policies=dict(type="list", elements="str"),
+                ),
+            ),
+            protection_policies=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    state=state,
+                    local_rpo=dict(type="str"),
+                    local_retention=dict(type="str"),
+                ),
+            ),
+            exclusive=dict(type="bool", default=False),
+            eradicate=dict(type="bool", default=False),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+
+    current = get_current_state(module, fusion)
+    plan = build_plan(module, fusion, current)
+    changed = len(plan.steps) != 0
+
+    if not module.check_mode and changed:
+        results, failures, skipped = plan.run(module.params["concurrency"])
+        if failures:
+            failed_steps = [
+                {"id": step_id, "msg": format_fusion_exception(exc)}
+                for step_id, exc in sorted(failures.items())
+            ]
+            module.fail_json(
+                msg="Failed {0} of {1} steps: {2}".format(
+                    len(failures),
+                    len(plan.steps),
+                    "; ".join(
+                        "'{0}': {1}".format(step["id"], step["msg"])
+                        for step in failed_steps
+                    ),
+                ),
+                changed=len(results) != 0,
+                plan=plan.steps,
+                failed_steps=failed_steps,
+                skipped_steps=sorted(skipped),
+            )
+
+    module.exit_json(changed=changed, plan=plan.steps)
+
+
+if __name__ == "__main__":
+    main()
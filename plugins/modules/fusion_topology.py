@@ -0,0 +1,670 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_topology
+version_added: '1.7.0'
+short_description:  Bootstrap regions, availability zones, arrays, network interface groups and storage endpoints in Pure Storage Fusion
+description:
+- Make sure the whole infrastructure topology exists in Pure Storage Fusion.
+- Resources are created level by level, regions first, then availability zones,
+  then arrays and network interface groups and storage endpoints last. Every level
+  is listed once, missing resources of the level are created concurrently and their
+  operations are awaited together.
+- Resources which already exist are left untouched, use the dedicated modules
+  (e.g. M(purestorage.fusion.fusion_array)) to update or delete them.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+options:
+  regions:
+    description:
+    - Regions of the topology.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the region.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the region.
+        - If not provided, defaults to I(name).
+        type: str
+      availability_zones:
+        description:
+        - Availability zones in the region.
+        type: list
+        elements: dict
+        default: []
+        suboptions:
+          name:
+            description:
+            - The name of the availability zone.
+            type: str
+            required: true
+          display_name:
+            description:
+            - The human name of the availability zone.
+            - If not provided, defaults to I(name).
+            type: str
+          arrays:
+            description:
+            - Arrays in the availability zone.
+            type: list
+            elements: dict
+            default: []
+            suboptions:
+              name:
+                description:
+                - The name of the array.
+                type: str
+                required: true
+              display_name:
+                description:
+                - The human name of the array.
+                - If not provided, defaults to I(name).
+                type: str
+              hardware_type:
+                description:
+                - Hardware type to which the storage class applies.
+                choices: [ flash-array-x, flash-array-c, flash-array-x-optane, flash-array-xl ]
+                type: str
+                required: true
+              host_name:
+                description:
+                - Management IP address of the array, or FQDN.
+                type: str
+                required: true
+              appliance_id:
+                description:
+                - Appliance ID of the array.
+                type: str
+                required: true
+              apartment_id:
+                description:
+                - The Apartment ID of the Array.
+                type: str
+          network_interface_groups:
+            description:
+            - Network interface groups in the availability zone.
+            type: list
+            elements: dict
+            default: []
+            suboptions:
+              name:
+                description:
+                - The name of the network interface group.
+                type: str
+                required: true
+              display_name:
+                description:
+                - The human name of the network interface group.
+                - If not provided, defaults to I(name).
+                type: str
+              prefix:
+                description:
+                - Network prefix in CIDR notation.
+                type: str
+                required: true
+              gateway:
+                description:
+                - Address of the subnet gateway.
+                type: str
+              mtu:
+                description:
+                - MTU setting for the subnet.
+                default: 1500
+                type: int
+          storage_endpoints:
+            description:
+            - Storage endpoints in the availability zone.
+            type: list
+            elements: dict
+            default: []
+            suboptions:
+              name:
+                description:
+                - The name of the storage endpoint.
+                type: str
+                required: true
+              display_name:
+                description:
+                - The human name of the storage endpoint.
+                - If not provided, defaults to I(name).
+                type: str
+              iscsi:
+                description:
+                - List of discovery interfaces.
+                type: list
+                elements: dict
+                suboptions:
+                  address:
+                    description:
+                    - IP address to be used in the subnet of the storage endpoint.
+                    - IP address must include a CIDR notation.
+                    type: str
+                  gateway:
+                    description:
+                    - Address of the subnet gateway.
+                    type: str
+                  network_interface_groups:
+                    description:
+                    - List of network interface groups to assign to the address.
+                    type: list
+                    elements: str
+              cbs_azure_iscsi:
+                description:
+                - CBS Azure iSCSI
+                type: dict
+                suboptions:
+                  storage_endpoint_collection_identity:
+                    description:
+                    - The Storage Endpoint Collection Identity which belongs to the Azure entities.
+                    type: str
+                  load_balancer:
+                    description:
+                    - The Load Balancer id which gives permissions to CBS array applications to modify the Load Balancer.
+                    type: str
+                  load_balancer_addresses:
+                    description:
+                    - The IPv4 addresses of the Load Balancer.
+                    type: list
+                    elements: str
+  concurrency:
+    description:
+    - Maximum number of requests sent to Fusion at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Bootstrap new site
+  purestorage.fusion.fusion_topology:
+    regions:
+      - name: region1
+        availability_zones:
+          - name: az1
+            arrays:
+              - name: flasharray1
+                hardware_type: flash-array-x
+                host_name: flasharray1
+                appliance_id: 1187351-242133817-5976825671211737520
+            network_interface_groups:
+              - name: interface_group1
+                prefix: 172.17.1.0/24
+                gateway: 172.17.1.1
+            storage_endpoints:
+              - name: default
+                iscsi:
+                  - address: "172.17.1.2/24"
+                    gateway: "172.17.1.1"
+                    network_interface_groups: ["interface_group1"]
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+created:
+  description: Resources which were (or would be in check mode) created, in the order of creation.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    kind:
+      description: One of C(region), C(availability_zone), C(array), C(network_interface_group), C(storage_endpoint).
+      type: str
+    name:
+      description: Name of the resource.
+      type: str
+    region:
+      description: Name of the region the resource is in. Not returned for regions.
+      type: str
+    availability_zone:
+      description: Name of the availability zone the resource is in. Not returned for regions and availability zones.
+      type: str
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    OperationException,
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.networking import (
+    is_address_in_network,
+    is_valid_network,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operations,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+# resources of a level depend only on resources of previous levels
+LEVELS = [
+    ["region"],
+    ["availability_zone"],
+    ["array", "network_interface_group"],
+    ["storage_endpoint"],
+]
+
+
+def flatten_topology(module):
+    """Returns list of (kind, region, availability_zone, spec) tuples"""
+    resources = []
+    for region in module.params["regions"]:
+        resources.append(("region", None, None, region))
+        for az in region["availability_zones"]:
+            resources.append(("availability_zone", region["name"], None, az))
+            for kind, key in (
+                ("array", "arrays"),
+                ("network_interface_group", "network_interface_groups"),
+                ("storage_endpoint", "storage_endpoints"),
+            ):
+                for spec in az[key]:
+                    resources.append((kind, region["name"], az["name"], spec))
+    return resources
+
+
+def _parent(resource):
+    """Returns key of the resource the given one is listed under"""
+    kind, region, az, _spec = resource
+    if kind == "region":
+        return None
+    if kind == "availability_zone":
+        return ("region", None, None, region)
+    return ("availability_zone", region, None, az)
+
+
+def _key(resource):
+    kind, region, az, spec = resource
+    return (kind, region, az, spec["name"])
+
+
+def validate_topology(module, resources):
+    seen = set()
+    for resource in resources:
+        kind, region, az, spec = resource
+        if _key(resource) in seen:
+            module.fail_json(
+                msg="{0} '{1}' is declared more than once".format(kind, spec["name"])
+            )
+        seen.add(_key(resource))
+
+        if kind == "network_interface_group":
+            if not is_valid_network(spec["prefix"]):
+                module.fail_json(
+                    msg="`prefix` '{0}' of network interface group '{1}' must be a valid IPv4 network in CIDR notation".format(
+                        spec["prefix"], spec["name"]
+                    )
+                )
+            if spec["gateway"] and not is_address_in_network(
+                spec["gateway"], spec["prefix"]
+            ):
+                module.fail_json(
+                    msg="`gateway` of network interface group '{0}' must be an address in subnet `prefix`".format(
+                        spec["name"]
+                    )
+                )
+        elif kind == "storage_endpoint":
+            if (spec["iscsi"] is None) == (spec["cbs_azure_iscsi"] is None):
+                module.fail_json(
+                    msg="Exactly one of `iscsi` and `cbs_azure_iscsi` must be provided for storage endpoint '{0}'".format(
+                        spec["name"]
+                    )
+                )
+
+
+def list_existing(fusion, kind, parent):
+    """Returns set of names of existing resources of `kind` under `parent`"""
+    if kind == "region":
+        items = purefusion.RegionsApi(fusion).list_regions().items
+    elif kind == "availability_zone":
+        items = (
+            purefusion.AvailabilityZonesApi(fusion)
+            .list_availability_zones(region_name=parent[3])
+            .items
+        )
+    else:
+        location = dict(region_name=parent[1], availability_zone_name=parent[3])
+        if kind == "array":
+            items = purefusion.ArraysApi(fusion).list_arrays(**location).items
+        elif kind == "network_interface_group":
+            items = (
+                purefusion.NetworkInterfaceGroupsApi(fusion)
+                .list_network_interface_groups(**location)
+                .items
+            )
+        else:
+            items = (
+                purefusion.StorageEndpointsApi(fusion)
+                .list_storage_endpoints(**location)
+                .items
+            )
+    return set(item.name for item in items)
+
+
+def create_resource(fusion, resource):
+    """Submits creation of the resource, returns the operation"""
+    kind, region, az, spec = resource
+    display_name = spec["display_name"] or spec["name"]
+
+    if kind == "region":
+        return purefusion.RegionsApi(fusion).create_region(
+            purefusion.RegionPost(name=spec["name"], display_name=display_name)
+        )
+    if kind == "availability_zone":
+        return purefusion.AvailabilityZonesApi(fusion).create_availability_zone(
+            purefusion.AvailabilityZonePost(
+                name=spec["name"], display_name=display_name
+            ),
+            region_name=region,
+        )
+
+    location = dict(region_name=region, availability_zone_name=az)
+    if kind == "array":
+        return purefusion.ArraysApi(fusion).create_array(
+            purefusion.ArrayPost(
+                name=spec["name"],
+                display_name=display_name,
+                hardware_type=spec["hardware_type"],
+                host_name=spec["host_name"],
+                appliance_id=spec["appliance_id"],
+                apartment_id=spec["apartment_id"],
+            ),
+            **location
+        )
+    if kind == "network_interface_group":
+        if spec["gateway"]:
+            eth = purefusion.NetworkInterfaceGroupEthPost(
+                prefix=spec["prefix"], gateway=spec["gateway"], mtu=spec["mtu"]
+            )
+        else:
+            eth = purefusion.NetworkInterfaceGroupEthPost(
+                prefix=spec["prefix"], mtu=spec["mtu"]
+            )
+        return purefusion.NetworkInterfaceGroupsApi(
+            fusion
+        ).create_network_interface_group(
+            purefusion.NetworkInterfaceGroupPost(
+                group_type="eth",
+                eth=eth,
+                name=spec["name"],
+                display_name=display_name,
+            ),
+            **location
+        )
+
+    iscsi = None
+    cbs_azure_iscsi = None
+    if spec["iscsi"] is not None:
+        endpoint_type = "iscsi"
+        iscsi = purefusion.StorageEndpointIscsiPost(
+            discovery_interfaces=[
+                purefusion.StorageEndpointIscsiDiscoveryInterfacePost(**endpoint)
+                for endpoint in spec["iscsi"]
+            ]
+        )
+    else:
+        endpoint_type = "cbs-azure-iscsi"
+        cbs_azure_iscsi = purefusion.StorageEndpointCbsAzureIscsiPost(
+            **spec["cbs_azure_iscsi"]
+        )
+    return purefusion.StorageEndpointsApi(fusion).create_storage_endpoint(
+        purefusion.StorageEndpointPost(
+            name=spec["name"],
+            display_name=display_name,
+            endpoint_type=endpoint_type,
+            iscsi=iscsi,
+            cbs_azure_iscsi=cbs_azure_iscsi,
+        ),
+        **location
+    )
+
+
+def _to_dict(resource):
+    kind, region, az, spec = resource
+    result = {"kind": kind, "name": spec["name"]}
+    if region is not None:
+        result["region"] = region
+    if az is not None:
+        result["availability_zone"] = az
+    return result
+
+
+def find_missing(module, fusion, resources, new):
+    """Returns resources which do not exist yet. Resources whose parent is
+    being created are missing for sure, the rest is compared with one
+    listing per parent"""
+    listings = sorted(
+        set(
+            (resource[0], _parent(resource))
+            for resource in resources
+            if _parent(resource) not in new
+        ),
+        key=str,
+    )
+    existing = {}
+    for listing, names, exc in run_concurrently(
+        lambda listing: list_existing(fusion, *listing),
+        listings,
+        module.params["concurrency"],
+    ):
+        if exc is not None:
+            raise exc
+        existing[listing] = names
+
+    return [
+        resource
+        for resource in resources
+        if _parent(resource) in new
+        or resource[3]["name"] not in existing[(resource[0], _parent(resource))]
+    ]
+
+
+def create_level(module, fusion, missing):
+    """Creates resources concurrently and waits for all their operations at
+    once, returns list of (resource, error message) tuples of failed ones"""
+    failed = []
+    submitted = []
+    for resource, op, exc in run_concurrently(
+        lambda resource: create_resource(fusion, resource),
+        missing,
+        module.params["concurrency"],
+    ):
+        if exc is not None:
+            failed.append((resource, format_fusion_exception(exc)))
+        else:
+            submitted.append((resource, op))
+
+    if submitted:
+        finished = await_operations(
+            fusion,
+            [op for _resource, op in submitted],
+            fail_playbook_if_operation_fails=False,
+            concurrency=module.params["concurrency"],
+        )
+        for (resource, _op), op in zip(submitted, finished):
+            if op.status == "Failed":
+                failed.append(
+                    (resource, format_fusion_exception(OperationException(op)))
+                )
+    return failed
+
+
+def main():
+    """Main code"""
+    display_name = dict(type="str")
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            regions=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=display_name,
+                    availability_zones=dict(
+                        type="list",
+                        elements="dict",
+                        default=[],
+                        options=dict(
+                            name=dict(type="str", required=True),
+                            display_name=display_name,
+                            arrays=dict(
+                                type="list",
+                                elements="dict",
+                                default=[],
+                                options=dict(
+                                    name=dict(type="str", required=True),
+                                    display_name=display_name,
+                                    hardware_type=dict(
+                                        type="str",
+                                        required=True,
+                                        choices=[
+                                            "flash-array-x",
+                                            "flash-array-c",
+                                            "flash-array-x-optane",
+                                            "flash-array-xl",
+                                        ],
+                                    ),
+                                    host_name=dict(type="str", required=True),
+                                    appliance_id=dict(type="str", required=True),
+                                    apartment_id=dict(type="str"),
+                                ),
+                            ),
+                            network_interface_groups=dict(
+                                type="list",
+                                elements="dict",
+                                default=[],
+                                options=dict(
+                                    name=dict(type="str", required=True),
+                                    display_name=display_name,
+                                    prefix=dict(type="str", required=True),
+                                    gateway=dict(type="str"),
+                                    mtu=dict(type="int", default=1500),
+                                ),
+                            ),
+                            storage_endpoints=dict(
+                                type="list",
+                                elements="dict",
+                                default=[],
+                                options=dict(
+                                    name=dict(type="str", required=True),
+                                    display_name=display_name,
+                                    iscsi=dict(
+                                        type="list",
+                                        elements="dict",
+                                        options=dict(
+                                            address=dict(type="str"),
+                                            gateway=dict(type="str"),
+                                            network_interface_groups=dict(
+                                                type="list", elements="str"
+                                            ),
+                                        ),
+                                    ),
+                                    cbs_azure_iscsi=dict(
+                                        type="dict",
+                                        options=dict(
+                                            storage_endpoint_collection_identity=dict(
+                                                type="str"
+                                            ),
+                                            load_balancer=dict(type="str"),
+                                            load_balancer_addresses=dict(
+                                                type="list", elements="str"
+                                            ),
+                                        ),
+                                    ),
+                                ),
+                            ),
+                        ),
+                    ),
+                ),
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+
+    resources = flatten_topology(module)
+    validate_topology(module, resources)
+
+    created = []
+    # keys of resources which were (or would be) created by this task
+    new = set()
+    for kinds in LEVELS:
+        level = [resource for resource in resources if resource[0] in kinds]
+        if not level:
+            continue
+        missing = find_missing(module, fusion, level, new)
+        new.update(_key(resource) for resource in missing)
+        if not missing:
+            continue
+
+        if not module.check_mode:
+            failed = create_level(module, fusion, missing)
+            if failed:
+                # resources of next levels depend on this one, do not continue
+                failed_keys = set(_key(resource) for resource, _msg in failed)
+                created += [
+                    _to_dict(resource)
+                    for resource in missing
+                    if _key(resource) not in failed_keys
+                ]
+                module.fail_json(
+                    msg="Failed to create {0} of {1} resources: {2}".format(
+                        len(failed),
+                        len(missing),
+                        "; ".join(
+                            "{0} '{1}': {2}".format(
+                                resource[0], resource[3]["name"], msg
+                            )
+                            for resource, msg in failed
+                        ),
+                    ),
+                    changed=len(created) != 0,
+                    created=created,
+                    failed_resources=[
+                        dict(_to_dict(resource), msg=msg) for resource, msg in failed
+                    ],
+                )
+        created += [_to_dict(resource) for resource in missing]
+
+    module.exit_json(changed=len(created) != 0, created=created)
+
+
+if __name__ == "__main__":
+    main()
@@ -170,11 +170,11 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
 )
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
 
-try:
-    import fusion as purefusion
-except ImportError:
-    pass
+purefusion = lazy_import("fusion")
 
 
 def get_volume(module, fusion):
@@ -213,9 +213,11 @@ def create_volume(module, fusion):
         volume_api_instance = purefusion.VolumesApi(fusion)
         source_link = get_source_link_from_parameters(module.params)
         volume = purefusion.VolumePost(
-            size=None  # when cloning a volume, size is not required
-            if source_link
-            else parse_number_with_metric_suffix(module, module.params["size"]),
+            size=(
+                None  # when cloning a volume, size is not required
+                if source_link
+                else parse_number_with_metric_suffix(module, module.params["size"])
+            ),
             storage_class=module.params["storage_class"],
             placement_group=module.params["placement_group"],
             name=module.params["name"],
@@ -339,9 +341,8 @@ def apply_patches(module, fusion, patches):
         await_operation(fusion, op)
 
 
-def update_volume(module, fusion):
+def update_volume(module, fusion, current):
     """Update Volume size, placement group, protection policy, storage class, HAPs"""
-    current = get_volume(module, fusion)
     patches = []
 
     if not current:
@@ -385,9 +386,8 @@ def update_volume(module, fusion):
     return changed
 
 
-def eradicate_volume(module, fusion):
+def eradicate_volume(module, fusion, current):
     """Eradicate Volume"""
-    current = get_volume(module, fusion)
     if module.check_mode:
         return current or module.params["state"] == "present"
     if not current:
@@ -543,10 +543,17 @@ def main():
         id = volume.id
     if state == "present" and not volume:
         changed, id = create_volume(module, fusion)
+        if not module.check_mode:
+            volume = get_volume(module, fusion)
     # volume might exist even if soft-deleted, so we still have to update it
-    changed = changed | update_volume(module, fusion)
+    updated = update_volume(module, fusion, volume)
+    changed = changed | updated
     if module.params["eradicate"]:
-        changed = changed | eradicate_volume(module, fusion)
+        # eradication needs the volume as left by the update, fetch it only
+        # if the update changed it
+        if updated and not module.check_mode:
+            volume = get_volume(module, fusion)
+        changed = changed | eradicate_volume(module, fusion, volume)
         module.exit_json(changed=changed)
 
     if id is not None:
@@ -0,0 +1,308 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_volume_clone
+version_added: '1.7.0'
+short_description:  Clone one volume or volume snapshot to many volumes in Pure Storage Fusion
+description:
+- Create many volumes from a single source volume or volume snapshot in a single task,
+  e.g. to refresh test environments.
+- Volumes of the tenant space are listed once. Target volumes which do not exist
+  are created from the source, existing ones are re-pointed to the source if
+  I(refresh) is set.
+- Requests for all target volumes are sent concurrently and their operations are
+  awaited together.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+options:
+  tenant:
+    description:
+    - The name of the tenant.
+    type: str
+    required: true
+  tenant_space:
+    description:
+    - The name of the tenant space of the source and target volumes.
+    type: str
+    required: true
+  names:
+    description:
+    - Names of the target volumes.
+    type: list
+    elements: str
+    required: true
+  source_volume:
+    description:
+    - The source volume name.
+    - Cannot be used together with I(source_snapshot) or I(source_volume_snapshot).
+    type: str
+  source_snapshot:
+    description:
+    - The source snapshot name.
+    - Must be used together with I(source_volume_snapshot).
+    type: str
+  source_volume_snapshot:
+    description:
+    - The source volume snapshot name.
+    - Must be used together with I(source_snapshot).
+    type: str
+  storage_class:
+    description:
+    - The name of the storage class of created volumes.
+    - Required if any target volume does not exist.
+    type: str
+  placement_group:
+    description:
+    - The name of the placement group of created volumes.
+    - Required if any target volume does not exist.
+    type: str
+  protection_policy:
+    description:
+    - The name of the protection policy of created volumes.
+    type: str
+  refresh:
+    description:
+    - If C(true), existing target volumes are re-pointed to the source, which
+      replaces their data. Volumes already linked to the source are left untouched.
+    - If C(false), existing target volumes are left untouched.
+    type: bool
+    default: false
+  concurrency:
+    description:
+    - Maximum number of requests sent to Fusion at the same time.
+    type: int
+    default: 8
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+"""
+
+EXAMPLES = r"""
+- name: Refresh test volumes from last night's snapshot
+  purestorage.fusion.fusion_volume_clone:
+    tenant: test
+    tenant_space: space_1
+    source_snapshot: "nightly-2024-05-01"
+    source_volume_snapshot: "db-data"
+    names: "{{ query('sequence', 'start=1 end=100 format=db-test-%03d') }}"
+    storage_class: fred
+    placement_group: pg
+    refresh: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+created:
+  description: Names of volumes which were (or would be in check mode) created.
+  returned: always
+  type: list
+  elements: str
+refreshed:
+  description: Names of volumes which were (or would be in check mode) re-pointed to the source.
+  returned: always
+  type: list
+  elements: str
+failed_volumes:
+  description: Volumes which failed to be created or re-pointed.
+  returned: failure
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: Name of the volume.
+      type: str
+    msg:
+      description: Error message.
+      type: str
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    format_fusion_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    submit_and_await,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.raw_json import (
+    list_items_raw,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    lazy_import,
+)
+
+purefusion = lazy_import("fusion")
+
+
+def get_source_link(module):
+    tenant_space_link = "/tenants/{0}/tenant-spaces/{1}".format(
+        module.params["tenant"], module.params["tenant_space"]
+    )
+    if module.params["source_volume"] is not None:
+        return "{0}/volumes/{1}".format(
+            tenant_space_link, module.params["source_volume"]
+        )
+    return "{0}/snapshots/{1}/volume-snapshots/{2}".format(
+        tenant_space_link,
+        module.params["source_snapshot"],
+        module.params["source_volume_snapshot"],
+    )
+
+
+def get_current(module, volumes_api):
+    """Return dict mapping volume name to its JSON fields, volumes of the
+    tenant space are listed once"""
+    kwargs = dict(
+        tenant_name=module.params["tenant"],
+        tenant_space_name=module.params["tenant_space"],
+    )
+    try:
+        volumes = list_items_raw(volumes_api.list_volumes, **kwargs)
+        if volumes is None:
+            volumes = [
+                volume.to_dict() for volume in volumes_api.list_volumes(**kwargs).items
+            ]
+    except purefusion.rest.ApiException as exc:
+        module.fail_json(
+            msg="Failed to list volumes of {0}/{1}: {2}".format(
+                module.params["tenant"],
+                module.params["tenant_space"],
+                format_fusion_exception(exc),
+            )
+        )
+    return dict((volume["name"], volume) for volume in volumes)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            tenant=dict(type="str", required=True),
+            tenant_space=dict(type="str", required=True),
+            names=dict(type="list", elements="str", required=True),
+            source_volume=dict(type="str"),
+            source_snapshot=dict(type="str"),
+            source_volume_snapshot=dict(type="str"),
+            storage_class=dict(type="str"),
+            placement_group=dict(type="str"),
+            protection_policy=dict(type="str"),
+            refresh=dict(type="bool", default=False),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(
+        argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[
+            ("source_volume", "source_snapshot"),
+            ("source_volume", "source_volume_snapshot"),
+        ],
+        required_together=[("source_snapshot", "source_volume_snapshot")],
+        required_one_of=[("source_volume", "source_snapshot")],
+    )
+
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="'concurrency' must be a positive number")
+    names = module.params["names"]
+    if len(set(names)) != len(names):
+        module.fail_json(msg="'names' must not contain duplicates")
+
+    fusion = setup_fusion(module)
+    volumes_api = purefusion.VolumesApi(fusion)
+    source_link = get_source_link(module)
+    current = get_current(module, volumes_api)
+
+    to_create = [name for name in names if name not in current]
+    to_refresh = []
+    if module.params["refresh"]:
+        for name in names:
+            if name not in current:
+                continue
+            current_source = (current[name].get("source") or {}).get("self_link")
+            if current_source != source_link:
+                to_refresh.append(name)
+
+    if to_create:
+        module.fail_on_missing_params(["storage_class", "placement_group"])
+
+    changed = bool(to_create or to_refresh)
+    if not module.check_mode and changed:
+        location = dict(
+            tenant_name=module.params["tenant"],
+            tenant_space_name=module.params["tenant_space"],
+        )
+
+        def _submit(change):
+            action, name = change
+            if action == "create":
+                return volumes_api.create_volume(
+                    purefusion.VolumePost(
+                        name=name,
+                        display_name=name,
+                        storage_class=module.params["storage_class"],
+                        placement_group=module.params["placement_group"],
+                        protection_policy=module.params["protection_policy"],
+                        source_link=source_link,
+                    ),
+                    **location
+                )
+            return volumes_api.update_volume(
+                purefusion.VolumePatch(
+                    source_link=purefusion.NullableString(source_link)
+                ),
+                volume_name=name,
+                **location
+            )
+
+        changes = [("create", name) for name in to_create]
+        changes += [("refresh", name) for name in to_refresh]
+        failed = [
+            {"name": name, "msg": format_fusion_exception(exc)}
+            for (_action, name), exc in submit_and_await(
+                fusion, changes, _submit, module.params["concurrency"]
+            )
+            if exc is not None
+        ]
+        if failed:
+            failed_names = set(failure["name"] for failure in failed)
+            module.fail_json(
+                msg="Failed to clone {0} of {1} volumes: {2}".format(
+                    len(failed),
+                    len(changes),
+                    "; ".join(
+                        "'{0}': {1}".format(failure["name"], failure["msg"])
+                        for failure in failed[:10]
+                    ),
+                ),
+                changed=len(failed) < len(changes),
+                created=[name for name in to_create if name not in failed_names],
+                refreshed=[name for name in to_refresh if name not in failed_names],
+                failed_volumes=failed,
+            )
+
+    module.exit_json(changed=changed, created=to_create, refreshed=to_refresh)
+
+
+if __name__ == "__main__":
+    main()
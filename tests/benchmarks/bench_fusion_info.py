@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Scale benchmark of fusion_info.
+
+Generates a synthetic org in the mock Fusion API, runs fusion_info for each
+subset in a separate process the same way Ansible does and records wall time,
+number of API requests, peak RSS and output size. Exits with non-zero status
+if any of the measurements exceeds its threshold for the profile.
+
+    python tests/benchmarks/bench_fusion_info.py --profile smoke
+    python tests/benchmarks/bench_fusion_info.py --profile full --json results.json
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ansible_collections.purestorage.fusion.tests.mock_server import (
+    MockFusionServer,
+)
+
+MODULE = "ansible_collections.purestorage.fusion.plugins.modules.fusion_info"
+THRESHOLDS_FILE = os.path.join(os.path.dirname(__file__), "thresholds.json")
+
+PROFILES = {
+    "smoke": {
+        "tenants": 2,
+        "tenant_spaces": 10,
+        "volumes": 200,
+        "volume_snapshots": 1000,
+    },
+    "medium": {
+        "tenants": 10,
+        "tenant_spaces": 100,
+        "volumes": 10000,
+        "volume_snapshots": 50000,
+    },
+    "full": {
+        "tenants": 50,
+        "tenant_spaces": 1000,
+        "volumes": 100000,
+        "volume_snapshots": 500000,
+    },
+}
+
+SUBSETS = [
+    "minimum",
+    "tenants",
+    "tenant_spaces",
+    "placement_groups",
+    "volumes",
+    "snapshots",
+]
+
+METRICS = ("wall_time", "requests", "received_bytes", "peak_rss_mb", "output_bytes")
+
+# Runs the module the way `python -m` would and reports its peak RSS on exit.
+# VmHWM is per address space, unlike ru_maxrss which a child inherits from
+# the (large) benchmark process it was forked from.
+BOOTSTRAP = """
+import atexit, resource, runpy, sys
+
+def report():
+    try:
+        with open("/proc/self/status") as f:
+            kib = [int(l.split()[1]) for l in f if l.startswith("VmHWM:")][0]
+    except (OSError, IndexError):
+        kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    sys.stderr.write("\\npeak_rss_kib=%d\\n" % kib)
+
+atexit.register(report)
+sys.argv = sys.argv[1:]
+runpy.run_module(sys.argv[0], run_name="__main__", alter_sys=True)
+"""
+
+
+def generate_org(server, tenants, tenant_spaces, volumes, volume_snapshots):
+    """Fills the server with evenly spread tenant spaces, volumes and
+    snapshots of placement groups taking all volumes of a tenant space"""
+    server.add("/storage-services/ss1")
+    server.add("/storage-services/ss1/storage-classes/sc1")
+    server.add("/regions/r1")
+    server.add("/regions/r1/availability-zones/az1")
+
+    volumes_per_ts = max(volumes // tenant_spaces, 1)
+    snapshots_per_ts = max(volume_snapshots // (volumes_per_ts * tenant_spaces), 1)
+    for t in range(tenants):
+        server.add("/tenants/tenant{0}".format(t))
+    for ts in range(tenant_spaces):
+        path = "/tenants/tenant{0}/tenant-spaces/ts{1}".format(ts % tenants, ts)
+        server.add(path)
+        server.add(path + "/placement-groups/pg", availability_zone="az1")
+        for v in range(volumes_per_ts):
+            server.add(
+                path + "/volumes/vol{0}".format(v),
+                size=1048576,
+                storage_class="sc1",
+                placement_group="pg",
+            )
+        for s in range(snapshots_per_ts):
+            server.add(path + "/snapshots/snap{0}".format(s), placement_group="pg")
+
+
+def run_subset(server, subset, output_format="dict"):
+    """Runs fusion_info with `subset` in a new process, returns measurements"""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as args_file:
+        json.dump(
+            {
+                "ANSIBLE_MODULE_ARGS": {
+                    "gather_subset": [subset],
+                    "output_format": output_format,
+                    "access_token": "mock-token",
+                }
+            },
+            args_file,
+        )
+    env = dict(
+        os.environ,
+        FUSION_API_HOST=server.url,
+        PYTHONPATH=os.pathsep.join(sys.path),
+    )
+    requests_before = len(server.requests)
+    start = time.monotonic()
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(
+            [sys.executable, "-c", BOOTSTRAP, MODULE, args_file.name],
+            stdout=subprocess.PIPE,
+            stderr=errors,
+            env=env,
+        )
+        output = process.stdout.read()
+        process.wait()
+        wall_time = time.monotonic() - start
+        errors.seek(0)
+        stderr = errors.read().decode(errors="replace")
+    os.unlink(args_file.name)
+
+    if process.returncode != 0:
+        raise RuntimeError(
+            "fusion_info {0} failed: {1}{2}".format(
+                subset, output.decode(errors="replace"), stderr
+            )
+        )
+    peak_rss_kib = int(stderr.rsplit("peak_rss_kib=", 1)[1])
+    # the SDK prints notes before the result, which is the last line
+    result = json.loads(output.strip().rsplit(b"\n", 1)[-1])
+    api_stats = result["fusion_api_stats"]
+    return {
+        "wall_time": round(wall_time, 3),
+        "requests": len(server.requests) - requests_before,
+        "received_bytes": api_stats["bytes_received"],
+        "peak_rss_mb": round(peak_rss_kib / 1024, 1),
+        "output_bytes": len(output),
+    }
+
+
+def check_thresholds(results, thresholds):
+    """Returns list of messages describing measurements over thresholds"""
+    violations = []
+    for subset, measured in results.items():
+        for metric, limit in thresholds.get(subset, {}).items():
+            if measured[metric] > limit:
+                violations.append(
+                    "{0}: {1} {2} exceeds threshold {3}".format(
+                        subset, metric, measured[metric], limit
+                    )
+                )
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="smoke")
+    parser.add_argument("--subset", action="append", choices=SUBSETS)
+    parser.add_argument("--latency", type=float, default=0, help="seconds")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument(
+        "--output-format",
+        choices=["dict", "compact"],
+        default="dict",
+        help="output_format of fusion_info, thresholds are for 'dict'",
+    )
+    args = parser.parse_args()
+
+    with open(args.thresholds) as f:
+        thresholds = json.load(f).get(args.profile, {})
+
+    with MockFusionServer() as server:
+        start = time.monotonic()
+        generate_org(server, **PROFILES[args.profile])
+        print(
+            "Generated {0} resources in {1:.1f}s".format(
+                len(server.resources), time.monotonic() - start
+            )
+        )
+        server.latency = args.latency
+
+        results = {}
+        print(
+            "{0:<18}".format("subset") + "".join("{0:>16}".format(m) for m in METRICS)
+        )
+        for subset in args.subset or SUBSETS:
+            results[subset] = run_subset(server, subset, args.output_format)
+            print(
+                "{0:<18}".format(subset)
+                + "".join("{0:>16}".format(results[subset][m]) for m in METRICS)
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"profile": args.profile, "results": results}, f, indent=2)
+
+    violations = check_thresholds(results, thresholds)
+    for violation in violations:
+        print("REGRESSION " + violation)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
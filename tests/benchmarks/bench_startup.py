@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Cold-start benchmark of modules.
+
+Starts every module in a new process the same way Ansible does and records the
+fixed cost each task pays before doing its job: importing the module, and
+validating arguments, checking dependencies and connecting to the API in
+`setup_fusion()`. The dependency check of `setup_fusion()` is also measured
+on its own, and must not import the Fusion SDK. The API is the mock Fusion API, so the numbers do not
+include network latency. Exits with non-zero status if the median of any
+measurement exceeds its threshold.
+
+    python tests/benchmarks/bench_startup.py
+    python tests/benchmarks/bench_startup.py --module fusion_volume --repeat 20
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from ansible_collections.purestorage.fusion.tests.mock_server import (
+    MockFusionServer,
+)
+
+MODULES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "plugins",
+    "modules",
+)
+MODULE_PACKAGE = "ansible_collections.purestorage.fusion.plugins.modules"
+THRESHOLDS_FILE = os.path.join(os.path.dirname(__file__), "thresholds.json")
+
+METRICS = ("import_ms", "check_ms", "setup_ms", "total_ms")
+
+# Imports the module and runs `setup_fusion()` with common arguments only,
+# i.e. what a task doing nothing costs. Its dependency check runs first on
+# its own, the check done again by `setup_fusion()` is then served from the
+# version cache.
+BOOTSTRAP = """
+import json, sys, time
+start = time.perf_counter()
+import importlib
+importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    check_dependencies,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+basic._ANSIBLE_ARGS = json.dumps(
+    {"ANSIBLE_MODULE_ARGS": {"access_token": "mock-token"}}
+).encode("utf-8")
+module = basic.AnsibleModule(argument_spec=fusion_argument_spec())
+check_start = time.perf_counter()
+check_dependencies(module)
+checked = time.perf_counter()
+if "fusion" in sys.modules:
+    sys.exit("the Fusion SDK is imported before its first use")
+setup_fusion(module)
+done = time.perf_counter()
+sys.stderr.write(
+    "\\nimport_ms=%f check_ms=%f setup_ms=%f\\n"
+    % ((imported - start) * 1000, (checked - check_start) * 1000, (done - imported) * 1000)
+)
+"""
+
+
+def list_modules():
+    return sorted(
+        name[:-3]
+        for name in os.listdir(MODULES_DIR)
+        if name.startswith("fusion_") and name.endswith(".py")
+    )
+
+
+def run_module(server, module):
+    """Starts `module` in a new process, returns measurements in milliseconds"""
+    env = dict(
+        os.environ,
+        FUSION_API_HOST=server.url,
+        PYTHONPATH=os.pathsep.join(sys.path),
+    )
+    start = time.monotonic()
+    process = subprocess.run(
+        [sys.executable, "-c", BOOTSTRAP, MODULE_PACKAGE + "." + module],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    total_ms = (time.monotonic() - start) * 1000
+    stderr = process.stderr.decode(errors="replace")
+    if process.returncode != 0 or "import_ms=" not in stderr:
+        raise RuntimeError(
+            "{0} failed: {1}{2}".format(
+                module, process.stdout.decode(errors="replace"), stderr
+            )
+        )
+    measured = dict(item.split("=") for item in stderr.rsplit("\n", 2)[-2].split())
+    return {
+        "import_ms": float(measured["import_ms"]),
+        "check_ms": float(measured["check_ms"]),
+        "setup_ms": float(measured["setup_ms"]),
+        "total_ms": total_ms,
+    }
+
+
+def measure(server, module, repeat):
+    """Returns median of each measurement over `repeat` runs"""
+    runs = [run_module(server, module) for dummy in range(repeat)]
+    return {
+        metric: round(statistics.median(run[metric] for run in runs), 1)
+        for metric in METRICS
+    }
+
+
+def check_thresholds(results, thresholds):
+    """Returns list of messages describing measurements over thresholds,
+    which are the same for every module"""
+    violations = []
+    for module, measured in results.items():
+        for metric, limit in thresholds.items():
+            if measured[metric] > limit:
+                violations.append(
+                    "{0}: {1} {2} exceeds threshold {3}".format(
+                        module, metric, measured[metric], limit
+                    )
+                )
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append", choices=list_modules())
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with open(args.thresholds) as f:
+        thresholds = json.load(f).get("startup", {})
+
+    results = {}
+    with MockFusionServer() as server:
+        print(
+            "{0:<28}".format("module") + "".join("{0:>12}".format(m) for m in METRICS)
+        )
+        for module in args.module or list_modules():
+            results[module] = measure(server, module, args.repeat)
+            print(
+                "{0:<28}".format(module)
+                + "".join("{0:>12}".format(results[module][m]) for m in METRICS)
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"repeat": args.repeat, "results": results}, f, indent=2)
+
+    violations = check_thresholds(results, thresholds)
+    for violation in violations:
+        print("REGRESSION " + violation)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
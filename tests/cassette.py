@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Record/replay of Fusion API requests at `ApiClient.call_api()`.
+
+A cassette is a JSON file with the sequence of requests a scenario made and
+the responses it got. In replay mode every request must match the next
+recorded one, so an extra or a missing request fails the test, and a change
+of the request sequence shows up as a diff of the cassette when re-recorded.
+
+Cassettes are recorded against the mock Fusion API by running the tests with
+FUSION_RECORD_CASSETTES=1, and replayed without any server otherwise.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import fusion as purefusion
+
+from ansible_collections.purestorage.fusion.tests.mock_server import (
+    original_call_api,
+)
+
+ENV_RECORD = "FUSION_RECORD_CASSETTES"
+CASSETTE_VERSION = 1
+
+
+def recording():
+    return os.environ.get(ENV_RECORD, "") not in ("", "0")
+
+
+def _expand_path(resource_path, path_params):
+    for name, value in (path_params or {}).items():
+        resource_path = resource_path.replace("{%s}" % name, str(value))
+    return resource_path
+
+
+class RawResponse:
+    """Stands in for `urllib3.HTTPResponse` returned with `_preload_content=False`"""
+
+    def __init__(self, status, headers, data):
+        self.status = status
+        self.headers = headers
+        self.data = data.encode("utf-8")
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+class _Data:
+    # what `ApiClient.deserialize()` expects
+    def __init__(self, data):
+        self.data = data
+
+
+class CassetteMismatch(AssertionError):
+    pass
+
+
+class Cassette:
+    """Records or replays requests made through `fusion.ApiClient.call_api()`.
+
+    Requests running concurrently are not made in a stable order, such
+    scenarios need `ordered=False` which matches every request to the first
+    unused recorded request equal to it.
+    """
+
+    def __init__(self, path, record=False, ordered=True):
+        self.path = path
+        self.record = record
+        self.ordered = ordered
+        self.interactions = []
+        self.requests = []
+        self.errors = []
+        self._used = []
+        self._lock = threading.Lock()
+        if not record:
+            with open(path) as f:
+                content = json.load(f)
+            self.interactions = content["interactions"]
+            self._used = [False] * len(self.interactions)
+
+    def request_count(self, method=None):
+        return sum(1 for m, _path in self.requests if method is None or m == method)
+
+    @contextmanager
+    def patch(self):
+        cassette = self
+
+        def call_api(client, resource_path, method, *args, **kwargs):
+            return cassette.call(client, resource_path, method, *args, **kwargs)
+
+        with patch.object(purefusion.api_client.ApiClient, "call_api", call_api):
+            yield self
+
+    def call(
+        self,
+        client,
+        resource_path,
+        method,
+        path_params=None,
+        query_params=None,
+        header_params=None,
+        body=None,
+        post_params=None,
+        files=None,
+        response_type=None,
+        auth_settings=None,
+        async_req=None,
+        _return_http_data_only=None,
+        collection_formats=None,
+        _preload_content=True,
+        _request_timeout=None,
+    ):
+        request = {
+            "method": method,
+            "path": _expand_path(resource_path, path_params),
+            "query": [[name, str(value)] for name, value in query_params or []],
+            "body": client.sanitize_for_serialization(body),
+        }
+        with self._lock:
+            self.requests.append((method, request["path"]))
+
+        if self.record:
+            return self._record(
+                client,
+                request,
+                (resource_path, method),
+                dict(
+                    path_params=path_params,
+                    query_params=query_params,
+                    header_params=header_params,
+                    body=body,
+                    post_params=post_params,
+                    files=files,
+                    response_type=response_type,
+                    auth_settings=auth_settings,
+                    async_req=async_req,
+                    _return_http_data_only=_return_http_data_only,
+                    collection_formats=collection_formats,
+                    _preload_content=_preload_content,
+                    _request_timeout=_request_timeout,
+                ),
+            )
+        return self._replay(
+            client, request, response_type, _return_http_data_only, _preload_content
+        )
+
+    def _record(self, client, request, args, kwargs):
+        interaction = {"request": request}
+        with self._lock:
+            self.interactions.append(interaction)
+        try:
+            result = original_call_api()(client, *args, **kwargs)
+        except purefusion.rest.ApiException as exc:
+            interaction["error"] = {
+                "status": exc.status,
+                "reason": exc.reason,
+                "headers": dict(exc.headers or {}),
+                "body": (
+                    exc.body.decode("utf-8")
+                    if isinstance(exc.body, bytes)
+                    else exc.body
+                ),
+            }
+            raise
+
+        if not kwargs["_preload_content"]:
+            data = result.data.decode("utf-8")
+            interaction["response"] = {
+                "status": result.status,
+                "headers": dict(result.getheaders()),
+                "raw": data,
+            }
+            # the body was consumed, hand out a fresh copy
+            return RawResponse(result.status, dict(result.getheaders()), data)
+
+        if kwargs["_return_http_data_only"]:
+            data, status = result, 200
+        else:
+            data, status, _headers = result
+        interaction["response"] = {
+            "status": status,
+            "body": client.sanitize_for_serialization(data),
+        }
+        return result
+
+    def _match(self, request):
+        with self._lock:
+            for index, interaction in enumerate(self.interactions):
+                if self._used[index]:
+                    continue
+                if interaction["request"] == request:
+                    self._used[index] = True
+                    return interaction
+                if self.ordered:
+                    break
+            message = "Unexpected request {0} {1}".format(
+                request["method"], request["path"]
+            )
+            if self.ordered and not all(self._used):
+                expected = self.interactions[self._used.index(False)]["request"]
+                message += ", expected {0} {1}".format(
+                    expected["method"], expected["path"]
+                )
+                if expected["method"] == request["method"] and (
+                    expected["path"] == request["path"]
+                ):
+                    message += " with {0}, got {1}".format(
+                        json.dumps(expected), json.dumps(request)
+                    )
+            self.errors.append(message)
+            raise CassetteMismatch(message)
+
+    def _replay(
+        self, client, request, response_type, return_http_data_only, preload_content
+    ):
+        interaction = self._match(request)
+        if "error" in interaction:
+            error = interaction["error"]
+            exc = purefusion.rest.ApiException(
+                status=error["status"], reason=error["reason"]
+            )
+            exc.headers = error["headers"]
+            exc.body = error["body"]
+            raise exc
+
+        response = interaction["response"]
+        if not preload_content:
+            return RawResponse(response["status"], response["headers"], response["raw"])
+        data = None
+        if response_type:
+            data = client.deserialize(
+                _Data(json.dumps(response["body"])), response_type
+            )
+        if return_http_data_only:
+            return data
+        return data, response["status"], {}
+
+    def check(self):
+        """Raises CassetteMismatch if the replay did not go as recorded"""
+        if self.errors:
+            raise CassetteMismatch("; ".join(self.errors))
+        unused = [
+            "{0} {1}".format(i["request"]["method"], i["request"]["path"])
+            for i, used in zip(self.interactions, self._used)
+            if not used
+        ]
+        if unused:
+            raise CassetteMismatch(
+                "Recorded requests were not made: {0}".format(", ".join(unused))
+            )
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump(
+                {"version": CASSETTE_VERSION, "interactions": self.interactions},
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+            f.write("\n")
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import patch
+
+import fusion as purefusion
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils import startup
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    add_base_organization,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.mock_server import (
+    MockFusionServer,
+    original_call_api,
+)
+
+
+@pytest.fixture
+def server():
+    """Mock Fusion API serving the base organization, test modules add their
+    own resources by overriding this fixture"""
+    with MockFusionServer() as mock:
+        add_base_organization(mock)
+        yield mock
+
+
+@pytest.fixture
+def run_module(server, monkeypatch):
+    """Runs `module` with `args` through the real `setup_fusion()` against
+    `server`, or against `mock_server` if given"""
+    monkeypatch.setenv("FUSION_CIRCUIT_BREAKER_THRESHOLD", "0")
+
+    def _run(module, args, mock_server=None):
+        if mock_server is None:
+            mock_server = server
+        monkeypatch.setenv("FUSION_API_HOST", mock_server.url)
+        set_module_args(dict(args, access_token="mock-token"))
+        with patch.object(
+            purefusion.api_client.ApiClient, "call_api", original_call_api()
+        ), patch.object(module, "setup_fusion", startup.setup_fusion):
+            module.main()
+
+    return _run
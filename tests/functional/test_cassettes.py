@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+from unittest.mock import patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.module_utils import startup
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_pg,
+    fusion_volume,
+)
+from ansible_collections.purestorage.fusion.tests.cassette import (
+    Cassette,
+    CassetteMismatch,
+    recording,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.mock_server import (
+    MockFusionServer,
+)
+
+# GLOBAL MOCKS
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+CASSETTES = os.path.join(os.path.dirname(__file__), "cassettes")
+TENANT_SPACE = "/tenants/t1/tenant-spaces/ts1"
+# recorded responses do not change between recordings
+RECORDING_TIME = 1700000000
+
+
+def seed_tenant_space(server):
+    server.add("/storage-services/ss1")
+    server.add("/storage-services/ss1/storage-classes/sc1")
+    server.add("/regions/r1")
+    server.add("/regions/r1/availability-zones/az1")
+    server.add("/tenants/t1")
+    server.add(TENANT_SPACE)
+    server.add(TENANT_SPACE + "/placement-groups/pg1", availability_zone="az1")
+    server.add(
+        TENANT_SPACE + "/volumes/v1",
+        size=1048576,
+        storage_class="sc1",
+        placement_group="pg1",
+    )
+
+
+def seed_snapshots(server):
+    seed_tenant_space(server)
+    for name in ("s1", "s2", "s3"):
+        server.add(TENANT_SPACE + "/snapshots/" + name, placement_group="pg1")
+
+
+@pytest.fixture
+def run_scenario(monkeypatch):
+    """Runs module replaying its cassette, or records the cassette against
+    a seeded mock server if FUSION_RECORD_CASSETTES is set"""
+    # no state shared between runs through temp files
+    monkeypatch.setenv("FUSION_CIRCUIT_BREAKER_THRESHOLD", "0")
+    monkeypatch.delenv("FUSION_RATE_LIMIT", raising=False)
+    servers = []
+
+    def _run(name, module, args, seed, ordered=True):
+        cassette = Cassette(
+            os.path.join(CASSETTES, name + ".json"), record=recording(), ordered=ordered
+        )
+        if cassette.record:
+            server = MockFusionServer(clock=lambda: RECORDING_TIME).start()
+            servers.append(server)
+            seed(server)
+            monkeypatch.setenv("FUSION_API_HOST", server.url)
+        else:
+            monkeypatch.setenv("FUSION_API_HOST", "http://fusion.invalid")
+
+        set_module_args(dict(args, access_token="mock-token"))
+        with cassette.patch(), patch.object(
+            module, "setup_fusion", startup.setup_fusion
+        ), pytest.raises((AnsibleExitJson, AnsibleFailJson)) as excinfo:
+            module.main()
+
+        if cassette.record:
+            cassette.save()
+        else:
+            cassette.check()
+        return cassette, excinfo.value
+
+    yield _run
+    for server in servers:
+        server.stop()
+
+
+def test_volume_create_clone(run_scenario):
+    cassette, result = run_scenario(
+        "volume_create_clone",
+        fusion_volume,
+        {
+            "name": "v2",
+            "tenant": "t1",
+            "tenant_space": "ts1",
+            "storage_class": "sc1",
+            "placement_group": "pg1",
+            "source_volume": "v1",
+            "state": "present",
+        },
+        seed_tenant_space,
+    )
+
+    assert isinstance(result, AnsibleExitJson)
+    assert result.changed is True
+    assert cassette.request_count("POST") == 1
+    assert cassette.request_count("PATCH") == 0
+
+
+def test_volume_present_unchanged(run_scenario):
+    cassette, result = run_scenario(
+        "volume_present_unchanged",
+        fusion_volume,
+        {
+            "name": "v1",
+            "tenant": "t1",
+            "tenant_space": "ts1",
+            "storage_class": "sc1",
+            "placement_group": "pg1",
+            "size": "1M",
+            "state": "present",
+        },
+        seed_tenant_space,
+    )
+
+    assert isinstance(result, AnsibleExitJson)
+    assert result.changed is False
+    assert cassette.request_count() == cassette.request_count("GET")
+
+
+def test_pg_delete_with_snapshots(run_scenario):
+    cassette, result = run_scenario(
+        "pg_delete_with_snapshots",
+        fusion_pg,
+        {
+            "name": "pg1",
+            "tenant": "t1",
+            "tenant_space": "ts1",
+            "destroy_snapshots_on_delete": True,
+            "state": "absent",
+        },
+        seed_snapshots,
+        # snapshots are deleted concurrently
+        ordered=False,
+    )
+
+    assert isinstance(result, AnsibleExitJson)
+    assert result.changed is True
+    assert cassette.request_count("PATCH") == 3
+    assert cassette.request_count("DELETE") == 4
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "version": 1,
+                "interactions": [
+                    {
+                        "request": {
+                            "method": "GET",
+                            "path": "/tenants/t1",
+                            "query": [],
+                            "body": None,
+                        },
+                        "response": {
+                            "status": 200,
+                            "body": {"id": "1", "name": "t1", "self_link": "/t1"},
+                        },
+                    },
+                    {
+                        "request": {
+                            "method": "GET",
+                            "path": "/tenants/t2",
+                            "query": [],
+                            "body": None,
+                        },
+                        "error": {
+                            "status": 404,
+                            "reason": "Not Found",
+                            "headers": {},
+                            "body": "{}",
+                        },
+                    },
+                ],
+            },
+            f,
+        )
+    return path
+
+
+def test_replay(recorded):
+    cassette = Cassette(recorded)
+    client = purefusion.ApiClient()
+
+    with cassette.patch():
+        tenant = purefusion.TenantsApi(client).get_tenant("t1")
+        with pytest.raises(purefusion.rest.ApiException) as excinfo:
+            purefusion.TenantsApi(client).get_tenant("t2")
+
+    assert tenant.name == "t1"
+    assert excinfo.value.status == 404
+    cassette.check()
+
+
+def test_replay_extra_request_fails(recorded):
+    cassette = Cassette(recorded)
+    client = purefusion.ApiClient()
+
+    with cassette.patch(), pytest.raises(CassetteMismatch) as excinfo:
+        purefusion.TenantsApi(client).get_tenant("t2")
+
+    assert "expected GET /tenants/t1" in str(excinfo.value)
+    with pytest.raises(CassetteMismatch):
+        cassette.check()
+
+
+def test_replay_missing_request_fails(recorded):
+    cassette = Cassette(recorded)
+    client = purefusion.ApiClient()
+
+    with cassette.patch():
+        purefusion.TenantsApi(client).get_tenant("t1")
+
+    with pytest.raises(CassetteMismatch) as excinfo:
+        cassette.check()
+    assert "GET /tenants/t2" in str(excinfo.value)
+
+
+def test_replay_unordered(recorded):
+    cassette = Cassette(recorded, ordered=False)
+    client = purefusion.ApiClient()
+
+    with cassette.patch():
+        with pytest.raises(purefusion.rest.ApiException):
+            purefusion.TenantsApi(client).get_tenant("t2")
+        purefusion.TenantsApi(client).get_tenant("t1")
+
+    cassette.check()
+
+
+def test_record(tmp_path):
+    cassette = Cassette(str(tmp_path / "new.json"), record=True)
+    with MockFusionServer() as server:
+        server.add("/tenants/t1")
+        config = purefusion.Configuration()
+        config.host = server.host
+        config.access_token = "mock-token"
+        client = purefusion.ApiClient(config)
+        with cassette.patch():
+            purefusion.TenantsApi(client).get_tenant("t1")
+    cassette.save()
+
+    replayed = Cassette(str(tmp_path / "new.json"))
+    with replayed.patch():
+        tenant = purefusion.TenantsApi(purefusion.ApiClient()).get_tenant("t1")
+    assert tenant.name == "t1"
+    replayed.check()
@@ -372,3 +372,199 @@ def test_api_client_delete_exception(
     api_obj.delete_api_client.assert_called_once_with(
         api_client_id=current_api_client.id
     )
+
+
+@patch("fusion.IdentityManagerApi")
+def test_api_client_present_whitespace_not_changed(m_im_api, current_clients):
+    current_api_client = current_clients[0]
+    module_args = {
+        "state": "present",
+        "name": current_api_client.display_name,
+        "public_key": "01234\n56789\n",
+        "app_id": "ABCD1234",
+        "key_file": "private-key.pem",
+    }
+    set_module_args(module_args)
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=current_clients)
+    api_obj.create_api_client = MagicMock()
+    api_obj.delete_api_client = MagicMock()
+    m_im_api.return_value = api_obj
+
+    # run module
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_api_client.main()
+
+    assert exc.value.changed is False
+    assert exc.value.id == current_api_client.id
+
+    # check api was called correctly
+    api_obj.list_api_clients.assert_called_once_with()
+    api_obj.create_api_client.assert_not_called()
+    api_obj.delete_api_client.assert_not_called()
+
+
+@patch("fusion.IdentityManagerApi")
+@pytest.mark.parametrize(
+    "module_args",
+    [
+        # 'clients' together with 'name'
+        {
+            "name": "client1",
+            "public_key": "0123456789",
+            "clients": [{"name": "client2", "public_key": "0123456789"}],
+        },
+        # 'public_key' missing in 'clients'
+        {
+            "clients": [{"name": "client2"}],
+        },
+        # 'state' in 'clients' has incorrect value
+        {
+            "clients": [
+                {"name": "client2", "public_key": "0123456789", "state": "cool"}
+            ],
+        },
+    ],
+)
+def test_api_client_bulk_fails_on_wrong_parameters(
+    m_im_api, module_args, current_clients
+):
+    set_module_args(module_args)
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=current_clients)
+    m_im_api.return_value = api_obj
+
+    # run module
+    with pytest.raises(AnsibleFailJson):
+        fusion_api_client.main()
+
+    api_obj.list_api_clients.assert_not_called()
+
+
+@patch("fusion.IdentityManagerApi")
+def test_api_client_bulk(m_im_api, current_clients):
+    module_args = {
+        "clients": [
+            # exists
+            {"name": "client1", "public_key": "0123456789"},
+            # exists, to be deleted
+            {"name": "client2", "public_key": "0123456789", "state": "absent"},
+            # same name, different key
+            {"name": "client3", "public_key": "9876543210"},
+            # does not exist
+            {"name": "client4", "public_key": "0123456789", "state": "absent"},
+        ],
+        "app_id": "ABCD1234",
+        "key_file": "private-key.pem",
+    }
+    set_module_args(module_args)
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=current_clients)
+    api_obj.create_api_client = MagicMock(
+        return_value=FakeApiClient(
+            "4",
+            "self_link_value",
+            "client3",
+            "client3",
+            "apikey:name:thisisnotreal",
+            "9876543210",
+            12345,
+            12345,
+            "1234",
+        )
+    )
+    api_obj.delete_api_client = MagicMock()
+    m_im_api.return_value = api_obj
+
+    # run module
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_api_client.main()
+
+    assert exc.value.changed is True
+    assert exc.value.kwargs["created"] == [{"name": "client3", "id": "4"}]
+    assert exc.value.kwargs["deleted"] == [{"name": "client2", "id": "2"}]
+
+    # check api was called correctly
+    api_obj.list_api_clients.assert_called_once_with()
+    api_obj.create_api_client.assert_called_once_with(
+        purefusion.APIClientPost(
+            public_key="9876543210",
+            display_name="client3",
+        )
+    )
+    api_obj.delete_api_client.assert_called_once_with(api_client_id="2")
+
+
+@patch("fusion.IdentityManagerApi")
+def test_api_client_bulk_check_mode(m_im_api, current_clients):
+    module_args = {
+        "clients": [
+            {"name": "client2", "public_key": "0123456789", "state": "absent"},
+            {"name": "client4", "public_key": "0123456789"},
+        ],
+        "app_id": "ABCD1234",
+        "key_file": "private-key.pem",
+        "_ansible_check_mode": True,
+    }
+    set_module_args(module_args)
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=current_clients)
+    api_obj.create_api_client = MagicMock()
+    api_obj.delete_api_client = MagicMock()
+    m_im_api.return_value = api_obj
+
+    # run module
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_api_client.main()
+
+    assert exc.value.changed is True
+    assert exc.value.kwargs["created"] == [{"name": "client4", "id": None}]
+    assert exc.value.kwargs["deleted"] == [{"name": "client2", "id": "2"}]
+
+    api_obj.list_api_clients.assert_called_once_with()
+    api_obj.create_api_client.assert_not_called()
+    api_obj.delete_api_client.assert_not_called()
+
+
+@patch("fusion.IdentityManagerApi")
+def test_api_client_bulk_exception(m_im_api, current_clients):
+    module_args = {
+        "clients": [
+            {"name": "client1", "public_key": "0123456789", "state": "absent"},
+            {"name": "client2", "public_key": "0123456789", "state": "absent"},
+        ],
+        "app_id": "ABCD1234",
+        "key_file": "private-key.pem",
+    }
+    set_module_args(module_args)
+
+    def delete_api_client(api_client_id):
+        if api_client_id == "1":
+            raise purefusion.rest.ApiException(status=409, reason="Conflict")
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=current_clients)
+    api_obj.create_api_client = MagicMock()
+    api_obj.delete_api_client = MagicMock(side_effect=delete_api_client)
+    m_im_api.return_value = api_obj
+
+    # run module
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_api_client.main()
+
+    assert exc.value.kwargs["changed"] is True
+    assert exc.value.kwargs["deleted"] == [{"name": "client2", "id": "2"}]
+    assert len(exc.value.kwargs["failed_clients"]) == 1
+    assert exc.value.kwargs["failed_clients"][0]["name"] == "client1"
+
+    api_obj.list_api_clients.assert_called_once_with()
+    assert api_obj.delete_api_client.call_count == 2
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_drift
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    exit_json,
+    fail_json,
+)
+
+# GLOBAL MOCKS
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+TENANT_SPACE = "/tenants/t1/tenant-spaces/ts1"
+# requests of resources, not of the API version
+RESOURCES = "^/(?!info/)"
+
+
+@pytest.fixture
+def server(server):
+    server.add(
+        "/protection-policies/pp1",
+        objectives=[
+            {"type": "RPO", "rpo": "PT10M"},
+            {"type": "Retention", "after": "P1DT1H"},
+        ],
+    )
+    server.add("/host-access-policies/h1", iqn="iqn.h1", personality="linux")
+    server.add("/host-access-policies/h2", iqn="iqn.h2", personality="esxi")
+    server.add(
+        TENANT_SPACE + "/placement-groups/pg1",
+        availability_zone="az1",
+        storage_service="ss1",
+    )
+    for name in ("v1", "v2"):
+        server.add(
+            TENANT_SPACE + "/volumes/" + name,
+            size=1073741824,
+            storage_class="sc1",
+            placement_group="pg1",
+            protection_policy="pp1",
+            host_access_policies=["h1"],
+        )
+    return server
+
+
+def desired_state():
+    return {
+        "protection_policies": [
+            {"name": "pp1", "local_rpo": "10M", "local_retention": "1D1H"}
+        ],
+        "host_access_policies": [
+            {"name": "h1", "iqn": "iqn.h1", "personality": "linux"},
+            {"name": "h2", "personality": "esxi"},
+        ],
+        "tenant_spaces": [
+            {
+                "tenant": "t1",
+                "name": "ts1",
+                "placement_groups": [
+                    {
+                        "name": "pg1",
+                        "availability_zone": "az1",
+                        "storage_service": "ss1",
+                    }
+                ],
+                "volumes": [
+                    {
+                        "name": name,
+                        "size": "1G",
+                        "storage_class": "sc1",
+                        "placement_group": "pg1",
+                        "protection_policy": "pp1",
+                        "host_access_policies": ["h1"],
+                    }
+                    for name in ("v1", "v2")
+                ],
+            }
+        ],
+    }
+
+
+def test_drift_none(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_drift, {"desired_state": desired_state()})
+
+    result = exc.value.kwargs
+    assert result["changed"] is False
+    assert result["drift"] is False
+    assert result["summary"] == {"missing": 0, "extra": 0, "different": 0, "listed": 4}
+    # every collection is listed once, resources are never fetched one by one
+    assert server.request_count("GET", RESOURCES) == 4
+
+
+@pytest.mark.parametrize("raw", [True, False])
+def test_drift_report(server, run_module, raw):
+    server.add(TENANT_SPACE + "/volumes/v3", storage_class="sc1")
+    server.add("/host-access-policies/h3")
+    state = desired_state()
+    state["host_access_policies"][1]["personality"] = "linux"
+    volumes = state["tenant_spaces"][0]["volumes"]
+    volumes[0].update(size="2G", host_access_policies=["h2", "h1"])
+    volumes.append({"name": "v4"})
+
+    # SDK models are used when the raw listing is not available
+    list_items_raw = (
+        fusion_drift.list_items_raw if raw else MagicMock(return_value=None)
+    )
+    with patch.object(fusion_drift, "list_items_raw", list_items_raw):
+        with pytest.raises(AnsibleExitJson) as exc:
+            run_module(fusion_drift, {"desired_state": state})
+
+    result = exc.value.kwargs
+    assert result["drift"] is True
+    assert result["missing"] == {
+        "protection_policies": [],
+        "host_access_policies": [],
+        "placement_groups": [],
+        "volumes": ["t1/ts1/v4"],
+    }
+    assert result["extra"]["host_access_policies"] == ["h3"]
+    assert result["extra"]["volumes"] == ["t1/ts1/v3"]
+    assert result["differences"]["host_access_policies"] == {
+        "h2": {"personality": {"desired": "linux", "actual": "esxi"}}
+    }
+    assert result["differences"]["volumes"] == {
+        "t1/ts1/v1": {
+            "host_access_policies": {"desired": ["h1", "h2"], "actual": ["h1"]},
+            "size": {"desired": 2147483648, "actual": 1073741824},
+        }
+    }
+    assert result["summary"] == {"missing": 1, "extra": 2, "different": 2, "listed": 4}
+
+
+def test_drift_changed_protection_policy(run_module):
+    state = {"protection_policies": [{"name": "pp1", "local_retention": "1H"}]}
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_drift, {"desired_state": state, "report_extra": False})
+
+    assert exc.value.kwargs["differences"]["protection_policies"] == {
+        "pp1": {"local_retention": {"desired": 60, "actual": 1500}}
+    }
+
+
+def test_drift_destroyed_volume(server, run_module):
+    server.resources[TENANT_SPACE + "/volumes/v2"]["destroyed"] = True
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_drift, {"desired_state": desired_state()})
+
+    assert exc.value.kwargs["differences"]["volumes"] == {
+        "t1/ts1/v2": {"destroyed": {"desired": False, "actual": True}}
+    }
+
+
+def test_drift_only_declared_collections(server, run_module):
+    state = {"tenant_spaces": [{"tenant": "t1", "name": "ts1", "volumes": []}]}
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_drift, {"desired_state": state})
+
+    result = exc.value.kwargs
+    assert result["extra"]["volumes"] == ["t1/ts1/v1", "t1/ts1/v2"]
+    assert result["summary"]["listed"] == 1
+    assert server.request_count("GET", RESOURCES) == 1
+    assert server.request_count("GET", "/volumes$") == 1
+
+
+def test_drift_missing_tenant_space(server, run_module):
+    state = {
+        "tenant_spaces": [
+            {"tenant": "t1", "name": "ts2", "volumes": [{"name": "v1"}]},
+        ]
+    }
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_drift, {"desired_state": state})
+
+    assert exc.value.kwargs["missing"]["volumes"] == ["t1/ts2/v1"]
+
+
+@pytest.mark.parametrize("dump", [json.dumps, None])
+def test_drift_src(run_module, tmp_path, dump):
+    src = tmp_path / "desired.yml"
+    if dump is None:
+        src.write_text(
+            "host_access_policies:\n"
+            "  - name: h1\n"
+            "    personality: aix\n"
+            "  - name: h2\n"
+        )
+    else:
+        src.write_text(dump({"host_access_policies": [{"name": "h1"}, {"name": "h2"}]}))
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_drift, {"src": str(src)})
+
+    result = exc.value.kwargs
+    assert result["summary"]["listed"] == 1
+    assert result["drift"] is (dump is None)
+
+
+@pytest.mark.parametrize(
+    "content,message",
+    [
+        ("- h1\n", "must be a mapping"),
+        ("volumes: []\n", "volumes"),
+        ("host_access_policies:\n  - display_name: h1\n", "name"),
+        ("host_access_policies: [{name: h1}, {name: h1}]\n", "more than once"),
+    ],
+)
+def test_drift_invalid_src(run_module, tmp_path, content, message):
+    src = tmp_path / "desired.yml"
+    src.write_text(content)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_drift, {"src": str(src)})
+
+    assert message in str(exc.value)
@@ -14,6 +14,9 @@ from unittest.mock import MagicMock, call, patch
 import fusion as purefusion
 import pytest
 from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.module_utils.compact_table import (
+    expand,
+)
 from ansible_collections.purestorage.fusion.plugins.modules import fusion_info
 from ansible_collections.purestorage.fusion.tests.functional.utils import (
     AnsibleExitJson,
@@ -2112,6 +2115,69 @@ def test_info_hidden_fields_storage_endpoints(m_ss_api, m_az_api, m_region_api):
     assert exc.value.fusion_info == expected
 
 
+@patch("fusion.TenantsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.VolumesApi")
+@patch("fusion.SnapshotsApi")
+@patch("fusion.VolumeSnapshotsApi")
+def test_info_compact_output(
+    m_vs_api, m_snapshot_api, m_volume_api, m_ts_api, m_tenant_api
+):
+    api_obj = MagicMock()
+    api_obj.list_tenants = MagicMock(return_value=RESP_TENANTS)
+    api_obj.list_tenant_spaces = MagicMock(return_value=RESP_TS)
+    api_obj.list_volumes = MagicMock(return_value=RESP_VOLUMES)
+    api_obj.list_snapshots = MagicMock(return_value=RESP_SNAPSHOTS)
+    api_obj.list_volume_snapshots = MagicMock(return_value=RESP_VS)
+    for api in (m_vs_api, m_snapshot_api, m_volume_api, m_ts_api, m_tenant_api):
+        api.return_value = api_obj
+    args = {
+        "gather_subset": ["volumes", "snapshots"],
+        "app_id": "ABCD1234",
+        "key_file": "private-key.pem",
+    }
+
+    set_module_args(args)
+    with pytest.raises(AnsibleExitJson) as dicts:
+        fusion_info.main()
+    set_module_args(dict(args, output_format="compact"))
+    with pytest.raises(AnsibleExitJson) as compact:
+        fusion_info.main()
+
+    info = dicts.value.fusion_info
+    volumes = compact.value.fusion_info["volumes"]
+    assert volumes["fields"] == list(fusion_info.VOLUME_FIELDS)
+    assert len(volumes["rows"]) == len(RESP_TENANTS.items) * len(RESP_TS.items)
+    for volume in expand(volumes):
+        expected = info["volumes"][
+            "/".join((volume["tenant"], volume["tenant_space"], volume["name"]))
+        ]
+        assert volume["size"] == expected["size"]
+        assert volume["placement_group"] == expected["placement_group"]
+        assert volume["iscsi_iqn"] == expected["target"]["iscsi"]["iqn"]
+    for snapshot in expand(compact.value.fusion_info["snapshots"]):
+        expected = info["snapshots"][
+            "/".join((snapshot["tenant"], snapshot["tenant_space"], snapshot["name"]))
+        ]
+        assert snapshot["protection_policy"] == expected["protection_policy"].name
+        assert snapshot["time_remaining"] == expected["time_remaining"]
+    vsnaps = expand(compact.value.fusion_info["volume_snapshots"])
+    assert len(vsnaps) == len(info["volume_snapshots"])
+    for vsnap in vsnaps:
+        expected = info["volume_snapshots"][
+            "/".join(
+                (
+                    vsnap["tenant"],
+                    vsnap["tenant_space"],
+                    vsnap["snapshot"],
+                    vsnap["name"],
+                )
+            )
+        ]
+        assert vsnap["created_at"] == expected["created_at"]
+        assert vsnap["placement_group"] == expected["placement_group"]
+
+
 @patch("fusion.TenantsApi")
 @patch("fusion.TenantSpacesApi")
 @patch("fusion.VolumesApi")
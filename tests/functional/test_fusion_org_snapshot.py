@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.module_utils.org_snapshot import (
+    Snapshot,
+    SnapshotWriter,
+)
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_org_export,
+    fusion_org_import,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    exit_json,
+    fail_json,
+)
+from ansible_collections.purestorage.fusion.tests.mock_server import MockFusionServer
+
+# GLOBAL MOCKS
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+TENANT_SPACE = "/tenants/t1/tenant-spaces/ts1"
+
+
+def add_infrastructure(server):
+    """Resources which are not exported, both organizations must have them"""
+    server.add("/hardware-types/flash-array-x")
+    server.add("/regions/r1")
+    server.add("/regions/r1/availability-zones/az1")
+    server.add("/roles/tenant-admin")
+
+
+def add_organization(server):
+    server.add("/storage-services/ss1", hardware_types=["flash-array-x"])
+    server.add("/storage-services/ss1/storage-classes/sc1", size_limit=1048576)
+    server.add(
+        "/protection-policies/pp1",
+        objectives=[
+            {"type": "RPO", "rpo": "PT10M"},
+            {"type": "Retention", "after": "PT1H"},
+        ],
+    )
+    server.add("/host-access-policies/h1", iqn="iqn.h1", personality="esxi")
+    server.add("/tenants/t1", display_name="Tenant 1")
+    server.add(TENANT_SPACE)
+    server.add("/tenants/t1/tenant-spaces/ts2")
+    server.add(
+        TENANT_SPACE + "/placement-groups/pg1",
+        availability_zone="az1",
+        storage_service="ss1",
+    )
+    for name in range(5):
+        server.add(
+            TENANT_SPACE + "/volumes/v{0}".format(name),
+            size=1073741824,
+            storage_class="sc1",
+            placement_group="pg1",
+            protection_policy="pp1",
+            host_access_policies=["h1"] if name == 0 else [],
+        )
+    server.add(TENANT_SPACE + "/volumes/destroyed", storage_class="sc1")
+    server.resources[TENANT_SPACE + "/volumes/destroyed"]["destroyed"] = True
+    server.add(
+        "/roles/tenant-admin/role-assignments/ra1",
+        principal="user1",
+        scope="/tenants/t1",
+    )
+
+
+@pytest.fixture
+def source():
+    with MockFusionServer() as mock:
+        add_infrastructure(mock)
+        add_organization(mock)
+        yield mock
+
+
+@pytest.fixture
+def target():
+    with MockFusionServer() as mock:
+        add_infrastructure(mock)
+        yield mock
+
+
+@pytest.fixture
+def server(source):
+    """Modules run against the source organization unless told otherwise"""
+    return source
+
+
+def export(run_module, dest, **args):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_org_export, dict(args, dest=str(dest)))
+    return exc.value.kwargs
+
+
+def organization(server):
+    """Returns comparable state of exported kinds of resources"""
+    state = {}
+    for path, resource in server.resources.items():
+        collection = path.split("/")[-2]
+        if collection in ("hardware-types", "regions", "availability-zones", "roles"):
+            continue
+        ignored = ["id", "self_link", "created_at", "serial_number", "name"]
+        if collection == "role-assignments":
+            # names are generated, assignments are told apart by principals
+            path = "/".join(path.split("/")[:-1] + [resource["principal"]])
+            ignored.append("display_name")
+        state[path] = dict(
+            (key, value.get("name") if isinstance(value, dict) else value)
+            for key, value in resource.items()
+            # region of placement groups is only a part of their request
+            if key not in ignored + ["region"] and not key.endswith("_link")
+        )
+        if collection == "volumes":
+            state[path]["host_access_policies"] = [
+                hap["name"] for hap in resource["host_access_policies"]
+            ]
+        if collection == "storage-services":
+            state[path]["hardware_types"] = [
+                hw_type["name"] for hw_type in resource["hardware_types"]
+            ]
+    return state
+
+
+@pytest.mark.parametrize("name", ["org.jsonl", "org.jsonl.gz"])
+def test_export(source, run_module, tmp_path, name):
+    result = export(run_module, tmp_path / name, chunk_size=2)
+
+    assert result["changed"] is True
+    assert result["counts"] == {
+        "storage_services": 1,
+        "protection_policies": 1,
+        "host_access_policies": 1,
+        "tenants": 1,
+        "storage_classes": 1,
+        "tenant_spaces": 2,
+        "placement_groups": 1,
+        "volumes": 5,
+        "role_assignments": 1,
+    }
+    # 2 spaces * (placement groups, volumes) + tenant spaces + storage classes
+    # + role assignments + 5 roots
+    assert result["listed"] == 12
+    assert source.request_count("GET", "^/(?!info/|operations/)") == 12
+    snapshot = Snapshot(str(tmp_path / name))
+    assert snapshot.id == result["id"]
+    assert snapshot.counts == result["counts"]
+    volumes = [
+        record for _kind, records in snapshot.chunks(["volumes"]) for record in records
+    ]
+    assert len(volumes) == 5
+    assert result["chunks"] == 11
+    assert volumes[0] == {
+        "name": "v0",
+        "display_name": "v0",
+        "tenant": "t1",
+        "tenant_space": "ts1",
+        "size": 1073741824,
+        "storage_class": "sc1",
+        "placement_group": "pg1",
+        "protection_policy": "pp1",
+        "host_access_policies": ["h1"],
+    }
+    (pg,) = [
+        record
+        for _kind, records in snapshot.chunks(["placement_groups"])
+        for record in records
+    ]
+    assert pg["region"] == "r1"
+
+
+def test_export_check_mode(source, run_module, tmp_path):
+    result = export(run_module, tmp_path / "org.jsonl", _ansible_check_mode=True)
+
+    assert result["changed"] is False
+    assert result["counts"]["volumes"] == 5
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_export_failure_keeps_previous(source, run_module, tmp_path):
+    dest = tmp_path / "org.jsonl"
+    dest.write_text("previous")
+    source.fail("GET", TENANT_SPACE + "/volumes", times=10, status=403)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_org_export, {"dest": str(dest)})
+
+    assert "Failed to list volumes of t1/ts1" in str(exc.value)
+    assert [path.name for path in tmp_path.iterdir()] == ["org.jsonl"]
+    assert dest.read_text() == "previous"
+
+
+def test_export_placement_group_without_region(source, run_module, tmp_path):
+    pg = source.resources[TENANT_SPACE + "/placement-groups/pg1"]
+    pg["availability_zone"]["self_link"] = "/availability-zones/az1"
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_org_export, {"dest": str(tmp_path / "org.jsonl")})
+
+    assert "Cannot determine region of placement group 'pg1' of t1/ts1" in str(
+        exc.value
+    )
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_export_unexpected_error(source, run_module, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        SnapshotWriter, "add", MagicMock(side_effect=TypeError("not serializable"))
+    )
+
+    with pytest.raises(TypeError):
+        run_module(fusion_org_export, {"dest": str(tmp_path / "org.jsonl")})
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_round_trip(source, target, run_module, tmp_path):
+    export(run_module, tmp_path / "org.jsonl")
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_org_import, {"src": str(tmp_path / "org.jsonl")}, target)
+
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert result["resources"]["volumes"] == {
+        "created": 5,
+        "existing": 0,
+        "resumed": 0,
+        "failed": 0,
+    }
+    del source.resources[TENANT_SPACE + "/volumes/destroyed"]
+    assert organization(target) == organization(source)
+
+    # everything exists now
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_org_import, {"src": str(tmp_path / "org.jsonl")}, target)
+    assert exc.value.kwargs["changed"] is False
+    assert exc.value.kwargs["resources"]["volumes"]["existing"] == 5
+
+
+def test_import_check_mode(source, target, run_module, tmp_path):
+    export(run_module, tmp_path / "org.jsonl")
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_org_import,
+            {"src": str(tmp_path / "org.jsonl"), "_ansible_check_mode": True},
+            target,
+        )
+
+    assert exc.value.kwargs["resources"]["volumes"]["created"] == 5
+    assert target.request_count("POST") == 0
+
+
+def test_import_resumes_from_checkpoint(source, target, run_module, tmp_path):
+    export(run_module, tmp_path / "org.jsonl")
+    checkpoint = tmp_path / "org.checkpoint"
+    args = {"src": str(tmp_path / "org.jsonl"), "checkpoint": str(checkpoint)}
+    target.fail("POST", TENANT_SPACE + "/volumes", times=1, status=400)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_org_import, args, target)
+
+    result = exc.value.kwargs
+    assert result["resources"]["volumes"]["failed"] == 1
+    assert result["resources"]["volumes"]["created"] == 4
+    # role assignments depend on a level which failed
+    assert result["resources"]["role_assignments"]["created"] == 0
+    (failure,) = result["failed_resources"]
+    assert failure["kind"] == "volumes"
+    assert checkpoint.exists()
+
+    posts = target.request_count("POST")
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_org_import, args, target)
+
+    resources = exc.value.kwargs["resources"]
+    assert resources["volumes"] == {
+        "created": 1,
+        "existing": 0,
+        "resumed": 4,
+        "failed": 0,
+    }
+    assert resources["tenants"]["resumed"] == 1
+    assert resources["role_assignments"]["created"] == 1
+    # only the failed volume and the role assignment are created again
+    assert target.request_count("POST") == posts + 2
+    assert not checkpoint.exists()
+
+
+def test_import_other_checkpoint(source, target, run_module, tmp_path):
+    export(run_module, tmp_path / "org.jsonl")
+    checkpoint = tmp_path / "org.checkpoint"
+    checkpoint.write_text(json.dumps({"snapshot": "other"}) + "\n")
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(
+            fusion_org_import,
+            {"src": str(tmp_path / "org.jsonl"), "checkpoint": str(checkpoint)},
+            target,
+        )
+
+    assert "does not belong to snapshot" in str(exc.value)
+    assert target.request_count("POST") == 0
+
+
+def test_import_incomplete_snapshot(source, target, run_module, tmp_path):
+    export(run_module, tmp_path / "org.jsonl")
+    lines = (tmp_path / "org.jsonl").read_text().splitlines(True)
+    (tmp_path / "org.jsonl").write_text("".join(lines[:-1]))
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_org_import, {"src": str(tmp_path / "org.jsonl")}, target)
+
+    assert "snapshot is incomplete" in str(exc.value)
+    assert target.request_count("POST") == 0
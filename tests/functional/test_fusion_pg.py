@@ -1598,3 +1598,123 @@ def throw_on_specific_patch(patches, failing_patch_idx, raised_exception, op_off
         return OperationMock(id="op{0}".format(op_offset + idx))
 
     return _update_side_effect
+
+
+def _snapshot_mock(name, destroyed=False):
+    snapshot = MagicMock()
+    snapshot.name = name
+    snapshot.tenant.name = "tenant1"
+    snapshot.tenant_space.name = "tenant_space1"
+    snapshot.destroyed = destroyed
+    return snapshot
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.SnapshotsApi")
+@patch("fusion.PlacementGroupsApi")
+def test_pg_delete_with_snapshots_ok(
+    pg_api_init, snapshots_api_init, op_api_init, module_args_absent
+):
+    module_args = module_args_absent
+    module_args["destroy_snapshots_on_delete"] = True
+    set_module_args(module_args)
+
+    pg_mock = MagicMock()
+    pg_mock.get_placement_group = MagicMock(return_value=MagicMock())
+    pg_mock.delete_placement_group = MagicMock(return_value=OperationMock(id="op1"))
+    pg_api_init.return_value = pg_mock
+
+    snapshots_mock = MagicMock()
+    snapshots_mock.list_snapshots = MagicMock(
+        return_value=MagicMock(
+            items=[_snapshot_mock("snap1"), _snapshot_mock("snap2", destroyed=True)]
+        )
+    )
+    snapshots_mock.update_snapshot = MagicMock(return_value=OperationMock(id="op2"))
+    snapshots_mock.delete_snapshot = MagicMock(return_value=OperationMock(id="op3"))
+    snapshots_api_init.return_value = snapshots_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(
+        side_effect=lambda id: OperationMock(id=id, success=True)
+    )
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_pg.main()
+    assert excinfo.value.changed
+
+    snapshots_mock.list_snapshots.assert_called_with(
+        placement_group="placement_group1",
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+    )
+    snapshots_mock.update_snapshot.assert_called_once_with(
+        body=purefusion.SnapshotPatch(destroyed=purefusion.NullableBoolean(True)),
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+        snapshot_name="snap1",
+    )
+    snapshots_mock.delete_snapshot.assert_has_calls(
+        [
+            call(
+                tenant_name="tenant1",
+                tenant_space_name="tenant_space1",
+                snapshot_name="snap1",
+            ),
+            call(
+                tenant_name="tenant1",
+                tenant_space_name="tenant_space1",
+                snapshot_name="snap2",
+            ),
+        ],
+        any_order=True,
+    )
+    pg_mock.delete_placement_group.assert_called_with(
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+        placement_group_name="placement_group1",
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.SnapshotsApi")
+@patch("fusion.PlacementGroupsApi")
+def test_pg_delete_with_snapshots_fails(
+    pg_api_init, snapshots_api_init, op_api_init, module_args_absent
+):
+    module_args = module_args_absent
+    module_args["destroy_snapshots_on_delete"] = True
+    set_module_args(module_args)
+
+    pg_mock = MagicMock()
+    pg_mock.get_placement_group = MagicMock(return_value=MagicMock())
+    pg_mock.delete_placement_group = MagicMock(side_effect=NotImplementedError())
+    pg_api_init.return_value = pg_mock
+
+    snapshots_mock = MagicMock()
+    snapshots_mock.list_snapshots = MagicMock(
+        return_value=MagicMock(items=[_snapshot_mock("snap1"), _snapshot_mock("snap2")])
+    )
+    snapshots_mock.update_snapshot = MagicMock(
+        side_effect=lambda **kwargs: OperationMock(id=kwargs["snapshot_name"])
+    )
+    snapshots_mock.delete_snapshot = MagicMock(return_value=OperationMock(id="op3"))
+    snapshots_api_init.return_value = snapshots_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(
+        side_effect=lambda id: OperationMock(id=id, success=id != "snap2")
+    )
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_pg.main()
+    assert list(excinfo.value.kwargs["failed_snapshots"]) == ["snap2"]
+
+    snapshots_mock.delete_snapshot.assert_called_once_with(
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+        snapshot_name="snap1",
+    )
+    pg_mock.delete_placement_group.assert_not_called()
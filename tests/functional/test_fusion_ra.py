@@ -558,6 +558,8 @@ def test_ra_delete_ok(ra_api_init, im_api_init, op_api_init, args_and_scope):
     ra_mock.list_role_assignments.assert_called_with(
         role_name=module_args["role"], principal="principal1"
     )
+    im_mock.list_users.assert_called_once_with(name="user1")
+    ra_mock.list_role_assignments.assert_called_once()
     ra_mock.create_role_assignment.assert_not_called()
     ra_mock.delete_role_assignment.assert_called_with(
         role_name=module_args["role"], role_assignment_name="ra1"
@@ -813,3 +815,46 @@ def test_ra_absent_not_changed(
     ra_mock.create_role_assignment.assert_not_called()
     ra_mock.delete_role_assignment.assert_not_called()
     op_mock.get_operation.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_user_name_mismatch(
+    ra_api_init, im_api_init, op_api_init, module_args_present
+):
+    module_args = module_args_present
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=NotImplementedError())
+    ra_mock.create_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_mock.delete_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_api_init.return_value = ra_mock
+
+    # server-side filter may match more loosely than exact name equality
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(
+        return_value=[
+            purefusion.User(
+                id="principal11",
+                self_link="test_value",
+                name="user11",
+                email="example@example.com",
+            )
+        ]
+    )
+    im_api_init.return_value = im_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(side_effect=NotImplementedError())
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_ra.main()
+
+    im_mock.list_users.assert_called_once_with(name="user1")
+    ra_mock.list_role_assignments.assert_not_called()
+    ra_mock.create_role_assignment.assert_not_called()
+    ra_mock.delete_role_assignment.assert_not_called()
+    op_mock.get_operation.assert_not_called()
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_ra_bulk
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+
+# GLOBAL MOCKS
+fusion_ra_bulk.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+def role_assignment(name, role, principal, scope):
+    return purefusion.RoleAssignment(
+        id=name + "_id",
+        name=name,
+        self_link="test_value",
+        role=purefusion.RoleRef(
+            id=role + "_id", name=role, kind="Role", self_link="test_value"
+        ),
+        scope=purefusion.ResourceMetadata(id="scope_id", name="scope", self_link=scope),
+        principal=principal,
+    )
+
+
+def users_by_name(name=None):
+    users = {
+        "user1": "principal1",
+        "user2": "principal2",
+    }
+    if name not in users:
+        return []
+    return [
+        purefusion.User(
+            id=users[name],
+            self_link="test_value",
+            name=name,
+            email="example@example.com",
+        )
+    ]
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "assignments": [
+            {"role": "az-admin", "user": "user1"},
+            {
+                "role": "tenant-admin",
+                "user": "user2",
+                "scope": "tenant",
+                "tenant": "tenant1",
+            },
+            {
+                "role": "tenant-admin",
+                "principal": "principal3",
+                "scope": "tenant_space",
+                "tenant": "tenant1",
+                "tenant_space": "tenant_space1",
+            },
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def current_assignments(role_name):
+    return {
+        "az-admin": [role_assignment("ra1", "az-admin", "principal1", "/")],
+        "tenant-admin": [
+            role_assignment("ra2", "tenant-admin", "principal2", "/tenants/tenant1"),
+            role_assignment("ra4", "tenant-admin", "principal4", "/tenants/tenant2"),
+        ],
+    }[role_name]
+
+
+@pytest.mark.parametrize(
+    "assignment",
+    [
+        # no principal
+        {"role": "az-admin"},
+        # two principals
+        {"role": "az-admin", "user": "user1", "principal": "principal1"},
+        # 'tenant' is missing
+        {"role": "tenant-admin", "user": "user1", "scope": "tenant"},
+        # 'tenant_space' is missing
+        {
+            "role": "tenant-admin",
+            "user": "user1",
+            "scope": "tenant_space",
+            "tenant": "tenant1",
+        },
+    ],
+)
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_module_args_wrong(ra_api_init, im_api_init, assignment):
+    set_module_args(
+        {
+            "assignments": [assignment],
+            "issuer_id": "ABCD1234",
+            "private_key_file": "private-key.pem",
+        }
+    )
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_ra_bulk.main()
+
+    ra_api_init.return_value.list_role_assignments.assert_not_called()
+    im_api_init.return_value.list_users.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_bulk_not_changed(ra_api_init, im_api_init, op_api_init, module_args):
+    module_args["assignments"].pop()
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=current_assignments)
+    ra_mock.create_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_mock.delete_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(side_effect=users_by_name)
+    im_api_init.return_value = im_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(side_effect=NotImplementedError())
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_ra_bulk.main()
+    assert not excinfo.value.changed
+    assert excinfo.value.kwargs["created"] == []
+    assert excinfo.value.kwargs["deleted"] == []
+
+    assert ra_mock.list_role_assignments.call_count == 2
+    ra_mock.list_role_assignments.assert_has_calls(
+        [call(role_name="az-admin"), call(role_name="tenant-admin")], any_order=True
+    )
+    assert im_mock.list_users.call_count == 2
+    im_mock.list_users.assert_has_calls(
+        [call(name="user1"), call(name="user2")], any_order=True
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_bulk_create(ra_api_init, im_api_init, op_api_init, module_args):
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=current_assignments)
+    ra_mock.create_role_assignment = MagicMock(return_value=OperationMock("op1"))
+    ra_mock.delete_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(side_effect=users_by_name)
+    im_api_init.return_value = im_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(return_value=OperationMock("op1", success=True))
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_ra_bulk.main()
+    assert excinfo.value.changed
+    assert excinfo.value.kwargs["created"] == [
+        {
+            "role": "tenant-admin",
+            "principal": "principal3",
+            "scope": "/tenants/tenant1/tenant-spaces/tenant_space1",
+        }
+    ]
+    assert excinfo.value.kwargs["deleted"] == []
+
+    ra_mock.create_role_assignment.assert_called_once_with(
+        purefusion.RoleAssignmentPost(
+            scope="/tenants/tenant1/tenant-spaces/tenant_space1",
+            principal="principal3",
+        ),
+        role_name="tenant-admin",
+    )
+    ra_mock.delete_role_assignment.assert_not_called()
+    op_mock.get_operation.assert_called_once_with("op1")
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_bulk_create_check_mode(ra_api_init, im_api_init, op_api_init, module_args):
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=current_assignments)
+    ra_mock.create_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_mock.delete_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(side_effect=users_by_name)
+    im_api_init.return_value = im_mock
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_ra_bulk.main()
+    assert excinfo.value.changed
+    assert len(excinfo.value.kwargs["created"]) == 1
+
+    ra_mock.create_role_assignment.assert_not_called()
+    ra_mock.delete_role_assignment.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_bulk_exclusive(ra_api_init, im_api_init, op_api_init, module_args):
+    module_args["exclusive"] = True
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=current_assignments)
+    ra_mock.create_role_assignment = MagicMock(return_value=OperationMock("op1"))
+    ra_mock.delete_role_assignment = MagicMock(return_value=OperationMock("op2"))
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(side_effect=users_by_name)
+    im_api_init.return_value = im_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(
+        side_effect=lambda op_id: OperationMock(op_id, success=True)
+    )
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_ra_bulk.main()
+    assert excinfo.value.changed
+    assert excinfo.value.kwargs["deleted"] == [
+        {
+            "role": "tenant-admin",
+            "principal": "principal4",
+            "scope": "/tenants/tenant2",
+        }
+    ]
+
+    ra_mock.create_role_assignment.assert_called_once()
+    ra_mock.delete_role_assignment.assert_called_once_with(
+        role_name="tenant-admin", role_assignment_name="ra4"
+    )
+    op_mock.get_operation.assert_has_calls([call("op1"), call("op2")], any_order=True)
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_bulk_delete_absent(ra_api_init, im_api_init, op_api_init, module_args):
+    module_args["assignments"] = [
+        {"role": "az-admin", "user": "user1", "state": "absent"},
+        {"role": "az-admin", "user": "user2", "state": "absent"},
+    ]
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=current_assignments)
+    ra_mock.create_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_mock.delete_role_assignment = MagicMock(return_value=OperationMock("op1"))
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(side_effect=users_by_name)
+    im_api_init.return_value = im_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(return_value=OperationMock("op1", success=True))
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_ra_bulk.main()
+    assert excinfo.value.changed
+    assert excinfo.value.kwargs["created"] == []
+    assert excinfo.value.kwargs["deleted"] == [
+        {"role": "az-admin", "principal": "principal1", "scope": "/"}
+    ]
+
+    ra_mock.list_role_assignments.assert_called_once_with(role_name="az-admin")
+    ra_mock.delete_role_assignment.assert_called_once_with(
+        role_name="az-admin", role_assignment_name="ra1"
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_bulk_user_does_not_exist(
+    ra_api_init, im_api_init, op_api_init, module_args
+):
+    module_args["assignments"][0]["user"] = "user5"
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=current_assignments)
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(side_effect=users_by_name)
+    im_api_init.return_value = im_mock
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_ra_bulk.main()
+    assert "user5" in str(excinfo.value)
+
+    ra_mock.list_role_assignments.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_bulk_op_fails(ra_api_init, im_api_init, op_api_init, module_args):
+    module_args["exclusive"] = True
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=current_assignments)
+    ra_mock.create_role_assignment = MagicMock(return_value=OperationMock("op1"))
+    ra_mock.delete_role_assignment = MagicMock(return_value=OperationMock("op2"))
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(side_effect=users_by_name)
+    im_api_init.return_value = im_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(
+        side_effect=lambda op_id: OperationMock(op_id, success=op_id == "op1")
+    )
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_ra_bulk.main()
+    assert excinfo.value.kwargs["changed"]
+    failed = excinfo.value.kwargs["failed_assignments"]
+    assert len(failed) == 1
+    assert failed[0]["action"] == "delete"
+    assert failed[0]["principal"] == "principal4"
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_bulk_list_exception(ra_api_init, im_api_init, op_api_init, module_args):
+    set_module_args(module_args)
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(side_effect=purefusion.rest.ApiException)
+    ra_mock.create_role_assignment = MagicMock(side_effect=NotImplementedError())
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(side_effect=users_by_name)
+    im_api_init.return_value = im_mock
+
+    with pytest.raises(purefusion.rest.ApiException):
+        fusion_ra_bulk.main()
+
+    ra_mock.create_role_assignment.assert_not_called()
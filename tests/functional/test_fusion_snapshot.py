@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_snapshot
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    exit_json,
+    fail_json,
+)
+
+# GLOBAL MOCKS
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+TENANT_SPACE = "/tenants/t1/tenant-spaces/ts1"
+PG_COUNT = 20
+
+
+@pytest.fixture
+def server(server):
+    server.add("/tenants/t1/tenant-spaces/ts2")
+    for pg in range(PG_COUNT):
+        server.add(
+            TENANT_SPACE + "/placement-groups/pg{0}".format(pg),
+            availability_zone="az1",
+            storage_service="ss1",
+        )
+        for volume in range(2):
+            server.add(
+                TENANT_SPACE + "/volumes/v{0}-{1}".format(pg, volume),
+                size=1048576,
+                storage_class="sc1",
+                placement_group="pg{0}".format(pg),
+            )
+    return server
+
+
+def pg_snapshots(name="backup"):
+    return [
+        {
+            "name": "{0}-pg{1}".format(name, pg),
+            "tenant": "t1",
+            "tenant_space": "ts1",
+            "placement_group": "pg{0}".format(pg),
+        }
+        for pg in range(PG_COUNT)
+    ]
+
+
+def test_create_pg_snapshots(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_snapshot, {"snapshots": pg_snapshots(), "concurrency": 4})
+
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert len(result["created"]) == PG_COUNT
+    assert result["created"][0] == {
+        "tenant": "t1",
+        "tenant_space": "ts1",
+        "name": "backup-pg0",
+    }
+    # snapshots are listed once for the tenant space
+    assert server.request_count("GET", "/snapshots$") == 1
+    assert server.request_count("POST", "/snapshots$") == PG_COUNT
+    volume_snapshots = server.list(
+        TENANT_SPACE + "/snapshots/backup-pg3/volume-snapshots"
+    )
+    assert sorted(vs["name"] for vs in volume_snapshots) == ["v3-0", "v3-1"]
+
+    # everything exists now
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_snapshot, {"snapshots": pg_snapshots()})
+
+    assert exc.value.kwargs["changed"] is False
+    assert exc.value.kwargs["created"] == []
+    assert server.request_count("POST", "/snapshots$") == PG_COUNT
+
+
+def test_create_volumes_snapshot(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_snapshot,
+            {
+                "snapshots": [
+                    {
+                        "name": "db",
+                        "display_name": "Database",
+                        "tenant": "t1",
+                        "tenant_space": "ts1",
+                        "volumes": ["v0-0", "v1-1"],
+                    }
+                ]
+            },
+        )
+
+    assert exc.value.kwargs["changed"] is True
+    snapshot = server.get(TENANT_SPACE + "/snapshots/db")
+    assert snapshot["display_name"] == "Database"
+    volume_snapshots = server.list(TENANT_SPACE + "/snapshots/db/volume-snapshots")
+    assert sorted(vs["name"] for vs in volume_snapshots) == ["v0-0", "v1-1"]
+
+
+def test_check_mode(server, run_module):
+    server.add(TENANT_SPACE + "/snapshots/backup-pg0", placement_group="pg0")
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_snapshot, {"snapshots": pg_snapshots(), "_ansible_check_mode": True}
+        )
+
+    assert exc.value.kwargs["changed"] is True
+    assert len(exc.value.kwargs["created"]) == PG_COUNT - 1
+    assert server.request_count("POST") == 0
+
+
+def test_recover_and_delete(server, run_module):
+    server.add(TENANT_SPACE + "/snapshots/destroyed", placement_group="pg0")
+    server.resources[TENANT_SPACE + "/snapshots/destroyed"]["destroyed"] = True
+    server.add(TENANT_SPACE + "/snapshots/old", placement_group="pg1")
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_snapshot,
+            {
+                "snapshots": [
+                    {
+                        "name": "destroyed",
+                        "tenant": "t1",
+                        "tenant_space": "ts1",
+                        "placement_group": "pg0",
+                    },
+                    {
+                        "name": "old",
+                        "tenant": "t1",
+                        "tenant_space": "ts1",
+                        "state": "absent",
+                    },
+                    {
+                        "name": "missing",
+                        "tenant": "t1",
+                        "tenant_space": "ts2",
+                        "state": "absent",
+                    },
+                ]
+            },
+        )
+
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert result["created"] == []
+    assert result["recovered"] == [
+        {"tenant": "t1", "tenant_space": "ts1", "name": "destroyed"}
+    ]
+    assert result["deleted"] == [{"tenant": "t1", "tenant_space": "ts1", "name": "old"}]
+    assert server.get(TENANT_SPACE + "/snapshots/destroyed")["destroyed"] is False
+    assert server.get(TENANT_SPACE + "/snapshots/old") is None
+
+
+def test_failures_are_reported_per_snapshot(server, run_module):
+    server.fail("POST", TENANT_SPACE + "/snapshots$", times=1, status=400)
+    server.fail_operation("POST", TENANT_SPACE + "/snapshots$", times=1)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_snapshot, {"snapshots": pg_snapshots()})
+
+    assert "Failed to manage 2 of {0} snapshots".format(PG_COUNT) in str(exc.value)
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert len(result["failed_snapshots"]) == 2
+    assert all(failure["msg"] for failure in result["failed_snapshots"])
+    assert len(server.list(TENANT_SPACE + "/snapshots")) == PG_COUNT - 2
+
+    # the failed ones are created by the next run
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_snapshot, {"snapshots": pg_snapshots()})
+
+    assert len(exc.value.kwargs["created"]) == 2
+    assert len(server.list(TENANT_SPACE + "/snapshots")) == PG_COUNT
+
+
+@pytest.mark.parametrize(
+    "snapshot,message",
+    [
+        ({"name": "s", "tenant": "t1", "tenant_space": "ts1"}, "placement_group"),
+        (
+            {
+                "name": "s",
+                "tenant": "t1",
+                "tenant_space": "ts1",
+                "placement_group": "pg0",
+                "volumes": ["v0-0"],
+            },
+            "mutually exclusive",
+        ),
+    ],
+)
+def test_wrong_args(server, run_module, snapshot, message):
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_snapshot, {"snapshots": [snapshot]})
+
+    assert message in str(exc.value)
+    assert server.request_count("POST") == 0
+
+
+def test_duplicate_snapshot(server, run_module):
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_snapshot, {"snapshots": pg_snapshots()[:1] * 2})
+
+    assert "'t1/ts1/backup-pg0' is declared more than once" in str(exc.value)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import time
+
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_snapshot_sweep,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    exit_json,
+    fail_json,
+)
+
+# GLOBAL MOCKS
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def add_snapshot(server, tenant_space, name, pg, age_days):
+    """Adds snapshot of placement group `pg` taken `age_days` ago"""
+    path = "/tenants/t1/tenant-spaces/{0}/snapshots/{1}".format(tenant_space, name)
+    server.add(path, placement_group=pg)
+    created_at = int(time.time() * 1000) - age_days * DAY_MS
+    for volume_snapshot in server.list(path + "/volume-snapshots"):
+        volume_snapshot["created_at"] = created_at
+
+
+@pytest.fixture
+def server(server):
+    server.add("/tenants/t1/tenant-spaces/ts2")
+    for tenant_space in ("ts1", "ts2"):
+        base = "/tenants/t1/tenant-spaces/" + tenant_space
+        for pg in ("pg1", "pg2"):
+            server.add(
+                base + "/placement-groups/" + pg,
+                availability_zone="az1",
+                storage_service="ss1",
+            )
+            server.add(
+                base + "/volumes/" + pg + "-v1",
+                size=1048576,
+                storage_class="sc1",
+                placement_group=pg,
+            )
+        for day in (1, 10, 20):
+            add_snapshot(server, tenant_space, "backup-{0}".format(day), "pg1", day)
+        add_snapshot(server, tenant_space, "manual", "pg2", 30)
+    return server
+
+
+def remaining(server, tenant_space):
+    return sorted(
+        snap["name"]
+        for snap in server.list(
+            "/tenants/t1/tenant-spaces/{0}/snapshots".format(tenant_space)
+        )
+    )
+
+
+def test_sweep_by_age_and_name(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_snapshot_sweep, {"older_than": "1W", "name_pattern": "backup-.*"}
+        )
+
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert result["listed"] == 8
+    assert result["matched"] == 4
+    assert result["deferred"] == 0
+    assert [(snap["tenant_space"], snap["name"]) for snap in result["snapshots"]][
+        :2
+    ] == [("ts1", "backup-20"), ("ts2", "backup-20")]
+    assert result["snapshots"][0]["created_at"].endswith("+00:00")
+    assert remaining(server, "ts1") == ["backup-1", "manual"]
+    assert remaining(server, "ts2") == ["backup-1", "manual"]
+    # tenant spaces are listed once, then ages of the 6 backups
+    assert server.request_count("GET", "/tenant-spaces$") == 1
+    assert server.request_count("GET", "/snapshots$") == 2
+    assert server.request_count("GET", "/volume-snapshots$") == 6
+
+
+def test_sweep_placement_group(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_snapshot_sweep,
+            {"tenant": "t1", "tenant_space": "ts2", "placement_groups": ["pg2"]},
+        )
+
+    result = exc.value.kwargs
+    assert [snap["name"] for snap in result["snapshots"]] == ["manual"]
+    # age is not needed
+    assert result["snapshots"][0]["created_at"] is None
+    assert server.request_count("GET", "/volume-snapshots$") == 0
+    assert remaining(server, "ts1") == ["backup-1", "backup-10", "backup-20", "manual"]
+    assert remaining(server, "ts2") == ["backup-1", "backup-10", "backup-20"]
+
+
+def test_sweep_cap_deletes_oldest_first(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_snapshot_sweep, {"older_than": "5D", "max_deletions": 3})
+
+    result = exc.value.kwargs
+    assert result["matched"] == 6
+    assert result["deferred"] == 3
+    assert sorted(
+        (snap["tenant_space"], snap["name"]) for snap in result["snapshots"]
+    ) == [("ts1", "backup-20"), ("ts1", "manual"), ("ts2", "manual")]
+
+
+def test_sweep_cap_by_name_deletes_oldest_first(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_snapshot_sweep, {"name_pattern": "backup-.*", "max_deletions": 2}
+        )
+
+    result = exc.value.kwargs
+    assert result["matched"] == 6
+    assert result["deferred"] == 4
+    assert sorted(
+        (snap["tenant_space"], snap["name"]) for snap in result["snapshots"]
+    ) == [("ts1", "backup-20"), ("ts2", "backup-20")]
+    assert all(snap["created_at"] for snap in result["snapshots"])
+    assert remaining(server, "ts1") == ["backup-1", "backup-10", "manual"]
+    assert remaining(server, "ts2") == ["backup-1", "backup-10", "manual"]
+
+
+def test_sweep_check_mode(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_snapshot_sweep,
+            {"name_pattern": "manual", "_ansible_check_mode": True},
+        )
+
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert len(result["snapshots"]) == 2
+    assert server.request_count("PATCH") == 0
+    assert server.request_count("DELETE") == 0
+
+
+def test_sweep_destroyed_and_failures(server, run_module):
+    server.resources["/tenants/t1/tenant-spaces/ts1/snapshots/manual"][
+        "destroyed"
+    ] = True
+    server.fail("PATCH", "/ts2/snapshots/manual$", status=409, times=1)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_snapshot_sweep, {"name_pattern": "manual"})
+
+    assert "Failed to delete 1 of 2 snapshots" in str(exc.value)
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert result["failed_snapshots"][0]["tenant_space"] == "ts2"
+    # destroyed snapshot is only eradicated
+    assert server.request_count("PATCH", "/ts1/") == 0
+    assert remaining(server, "ts1") == ["backup-1", "backup-10", "backup-20"]
+    assert "manual" in remaining(server, "ts2")
+
+
+@pytest.mark.parametrize(
+    "args,message",
+    [
+        ({}, "one of the following is required"),
+        ({"tenant_space": "ts1", "name_pattern": "x"}, "tenant"),
+        ({"name_pattern": "("}, "not a valid regular expression"),
+        ({"older_than": "soon"}, "not a valid time period"),
+    ],
+)
+def test_wrong_args(server, run_module, args, message):
+    with pytest.raises(AnsibleFailJson) as exc:
+        run_module(fusion_snapshot_sweep, args)
+
+    assert message in str(exc.value)
+    assert server.request_count("DELETE") == 0
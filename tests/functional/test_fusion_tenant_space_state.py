@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_tenant_space_state,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+
+# GLOBAL MOCKS
+fusion_tenant_space_state.setup_fusion = MagicMock(
+    return_value=purefusion.api_client.ApiClient()
+)
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+def ref(name):
+    if name is None:
+        return None
+    reference = MagicMock()
+    reference.name = name
+    return reference
+
+
+def placement_group(name, display_name=None):
+    pg = MagicMock()
+    pg.name = name
+    pg.display_name = display_name or name
+    return pg
+
+
+def volume(
+    name,
+    placement_group="pg1",
+    size=1073741824,
+    storage_class="sc1",
+    protection_policy=None,
+    host_access_policies=(),
+    destroyed=False,
+):
+    vol = MagicMock()
+    vol.name = name
+    vol.display_name = name
+    vol.size = size
+    vol.storage_class = ref(storage_class)
+    vol.placement_group = ref(placement_group)
+    vol.protection_policy = ref(protection_policy)
+    vol.host_access_policies = [ref(hap) for hap in host_access_policies]
+    vol.destroyed = destroyed
+    return vol
+
+
+def protection_policy(name):
+    pp = MagicMock()
+    pp.name = name
+    return pp
+
+
+class FusionMocks:
+    def __init__(self, pg_api_init, volume_api_init, pp_api_init, op_api_init):
+        self.pg = MagicMock()
+        self.pg.list_placement_groups = MagicMock(return_value=MagicMock(items=[]))
+        self.pg.create_placement_group = MagicMock(return_value=OperationMock("pg"))
+        self.pg.update_placement_group = MagicMock(return_value=OperationMock("pg"))
+        self.pg.delete_placement_group = MagicMock(return_value=OperationMock("pg"))
+        pg_api_init.return_value = self.pg
+
+        self.volume = MagicMock()
+        self.volume.list_volumes = MagicMock(return_value=MagicMock(items=[]))
+        self.volume.create_volume = MagicMock(return_value=OperationMock("volume"))
+        self.volume.update_volume = MagicMock(return_value=OperationMock("volume"))
+        self.volume.delete_volume = MagicMock(return_value=OperationMock("volume"))
+        volume_api_init.return_value = self.volume
+
+        self.pp = MagicMock()
+        self.pp.list_protection_policies = MagicMock(return_value=MagicMock(items=[]))
+        self.pp.create_protection_policy = MagicMock(return_value=OperationMock("pp"))
+        self.pp.delete_protection_policy = MagicMock(return_value=OperationMock("pp"))
+        pp_api_init.return_value = self.pp
+
+        self.op = MagicMock()
+        self.op.get_operation = MagicMock(
+            side_effect=lambda id: OperationMock(id, success=True)
+        )
+        op_api_init.return_value = self.op
+
+    def set_current(self, pgs=(), volumes=(), pps=()):
+        self.pg.list_placement_groups.return_value = MagicMock(items=list(pgs))
+        self.volume.list_volumes.return_value = MagicMock(items=list(volumes))
+        self.pp.list_protection_policies.return_value = MagicMock(items=list(pps))
+
+    def assert_no_writes(self):
+        self.pg.create_placement_group.assert_not_called()
+        self.pg.update_placement_group.assert_not_called()
+        self.pg.delete_placement_group.assert_not_called()
+        self.volume.create_volume.assert_not_called()
+        self.volume.update_volume.assert_not_called()
+        self.volume.delete_volume.assert_not_called()
+        self.pp.create_protection_policy.assert_not_called()
+        self.pp.delete_protection_policy.assert_not_called()
+
+
+@pytest.fixture
+def mocks():
+    with patch("fusion.OperationsApi") as op_api_init, patch(
+        "fusion.ProtectionPoliciesApi"
+    ) as pp_api_init, patch("fusion.VolumesApi") as volume_api_init, patch(
+        "fusion.PlacementGroupsApi"
+    ) as pg_api_init:
+        yield FusionMocks(pg_api_init, volume_api_init, pp_api_init, op_api_init)
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "tenant": "tenant1",
+        "tenant_space": "tenant_space1",
+        "protection_policies": [
+            {"name": "pp1", "local_rpo": "10", "local_retention": "1H"},
+        ],
+        "placement_groups": [
+            {
+                "name": "pg1",
+                "region": "region1",
+                "availability_zone": "az1",
+                "storage_service": "ss1",
+            },
+        ],
+        "volumes": [
+            {
+                "name": "volume1",
+                "size": "1G",
+                "storage_class": "sc1",
+                "placement_group": "pg1",
+                "protection_policy": "pp1",
+                "host_access_policies": ["hap1", "hap2"],
+            },
+            {
+                "name": "volume2",
+                "size": "1G",
+                "storage_class": "sc1",
+                "placement_group": "pg1",
+            },
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def steps_by_id(plan):
+    return dict((step["id"], step) for step in plan)
+
+
+def test_create_all(mocks, module_args):
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert excinfo.value.changed
+
+    steps = steps_by_id(excinfo.value.kwargs["plan"])
+    assert sorted(steps) == [
+        "placement_group:create:pg1",
+        "protection_policy:create:pp1",
+        "volume:create:volume1",
+        "volume:create:volume2",
+    ]
+    assert steps["volume:create:volume1"]["depends_on"] == [
+        "placement_group:create:pg1",
+        "protection_policy:create:pp1",
+    ]
+    assert steps["volume:create:volume2"]["depends_on"] == [
+        "placement_group:create:pg1"
+    ]
+
+    mocks.pg.list_placement_groups.assert_called_once_with(
+        tenant_name="tenant1", tenant_space_name="tenant_space1"
+    )
+    mocks.volume.list_volumes.assert_called_once_with(
+        tenant_name="tenant1", tenant_space_name="tenant_space1"
+    )
+    mocks.pp.list_protection_policies.assert_called_once_with()
+    mocks.pp.create_protection_policy.assert_called_once_with(
+        purefusion.ProtectionPolicyPost(
+            name="pp1",
+            display_name="pp1",
+            objectives=[
+                purefusion.RPO(type="RPO", rpo="PT10M"),
+                purefusion.Retention(type="Retention", after="PT60M"),
+            ],
+        )
+    )
+    mocks.pg.create_placement_group.assert_called_once_with(
+        purefusion.PlacementGroupPost(
+            name="pg1",
+            display_name="pg1",
+            region="region1",
+            availability_zone="az1",
+            storage_service="ss1",
+        ),
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+    )
+    assert mocks.volume.create_volume.call_count == 2
+    mocks.volume.create_volume.assert_any_call(
+        purefusion.VolumePost(
+            name="volume1",
+            display_name="volume1",
+            size=1073741824,
+            storage_class="sc1",
+            placement_group="pg1",
+            protection_policy="pp1",
+        ),
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+    )
+    # host access policies are attached once the volume exists
+    mocks.volume.update_volume.assert_called_once_with(
+        purefusion.VolumePatch(
+            host_access_policies=purefusion.NullableString("hap1,hap2")
+        ),
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+        volume_name="volume1",
+    )
+
+
+def test_create_all_check_mode(mocks, module_args):
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert excinfo.value.changed
+    assert len(excinfo.value.kwargs["plan"]) == 4
+
+    mocks.assert_no_writes()
+
+
+def test_not_changed(mocks, module_args):
+    mocks.set_current(
+        pgs=[placement_group("pg1")],
+        volumes=[
+            volume(
+                "volume1",
+                protection_policy="pp1",
+                host_access_policies=["hap2", "hap1"],
+            ),
+            volume("volume2"),
+            volume("volume3"),
+        ],
+        pps=[protection_policy("pp1")],
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert not excinfo.value.changed
+    assert excinfo.value.kwargs["plan"] == []
+
+    mocks.assert_no_writes()
+
+
+def test_update_volumes(mocks, module_args):
+    module_args["placement_groups"].append(
+        {
+            "name": "pg2",
+            "region": "region1",
+            "availability_zone": "az1",
+            "storage_service": "ss1",
+        }
+    )
+    module_args["volumes"][0]["size"] = "2G"
+    module_args["volumes"][1]["placement_group"] = "pg2"
+    mocks.set_current(
+        pgs=[placement_group("pg1")],
+        volumes=[
+            volume("volume1", protection_policy="pp1", host_access_policies=["hap1"]),
+            volume("volume2", destroyed=True),
+        ],
+        pps=[protection_policy("pp1")],
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert excinfo.value.changed
+
+    steps = steps_by_id(excinfo.value.kwargs["plan"])
+    assert sorted(steps) == [
+        "placement_group:create:pg2",
+        "volume:update:volume1",
+        "volume:update:volume2",
+    ]
+    assert steps["volume:update:volume1"]["changes"] == {
+        "size": 2147483648,
+        "host_access_policies": ["hap1", "hap2"],
+    }
+    assert steps["volume:update:volume1"]["depends_on"] == []
+    assert steps["volume:update:volume2"]["changes"] == {
+        "destroyed": False,
+        "placement_group": "pg2",
+    }
+    assert steps["volume:update:volume2"]["depends_on"] == [
+        "placement_group:create:pg2"
+    ]
+
+    # destroyed volume has to be recovered before anything else changes
+    volume2_patches = [
+        c.args[0]
+        for c in mocks.volume.update_volume.call_args_list
+        if c.kwargs["volume_name"] == "volume2"
+    ]
+    assert volume2_patches == [
+        purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(False)),
+        purefusion.VolumePatch(placement_group=purefusion.NullableString("pg2")),
+    ]
+    assert mocks.volume.update_volume.call_count == 4
+
+
+def test_delete(mocks, module_args):
+    module_args["placement_groups"][0]["state"] = "absent"
+    module_args["protection_policies"][0]["state"] = "absent"
+    module_args["volumes"] = [
+        {"name": "volume1", "state": "absent"},
+        {"name": "volume2", "state": "absent"},
+    ]
+    module_args["eradicate"] = True
+    mocks.set_current(
+        pgs=[placement_group("pg1")],
+        volumes=[
+            volume("volume1", protection_policy="pp1", host_access_policies=["hap1"]),
+            volume("volume2", destroyed=True),
+        ],
+        pps=[protection_policy("pp1")],
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert excinfo.value.changed
+
+    steps = steps_by_id(excinfo.value.kwargs["plan"])
+    assert sorted(steps) == [
+        "placement_group:delete:pg1",
+        "protection_policy:delete:pp1",
+        "volume:delete:volume1",
+        "volume:delete:volume2",
+        "volume:destroy:volume1",
+    ]
+    assert steps["volume:destroy:volume1"]["changes"] == {
+        "host_access_policies": [],
+        "destroyed": True,
+    }
+    assert steps["volume:delete:volume1"]["depends_on"] == ["volume:destroy:volume1"]
+    assert steps["volume:delete:volume2"]["depends_on"] == []
+    assert steps["placement_group:delete:pg1"]["depends_on"] == [
+        "volume:delete:volume1",
+        "volume:delete:volume2",
+    ]
+    assert steps["protection_policy:delete:pp1"]["depends_on"] == [
+        "volume:delete:volume1",
+        "volume:destroy:volume1",
+    ]
+
+    # host access policies are detached before the volume is destroyed
+    assert [c.args[0] for c in mocks.volume.update_volume.call_args_list] == [
+        purefusion.VolumePatch(host_access_policies=purefusion.NullableString("")),
+        purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(True)),
+    ]
+    assert mocks.volume.delete_volume.call_count == 2
+    mocks.pg.delete_placement_group.assert_called_once_with(
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+        placement_group_name="pg1",
+    )
+    mocks.pp.delete_protection_policy.assert_called_once_with(
+        protection_policy_name="pp1"
+    )
+
+
+def test_exclusive(mocks, module_args):
+    module_args["exclusive"] = True
+    module_args["eradicate"] = True
+    mocks.set_current(
+        pgs=[placement_group("pg1"), placement_group("pg2")],
+        volumes=[
+            volume(
+                "volume1",
+                protection_policy="pp1",
+                host_access_policies=["hap1", "hap2"],
+            ),
+            volume("volume2"),
+            volume("volume3", placement_group="pg2"),
+        ],
+        pps=[protection_policy("pp1"), protection_policy("pp2")],
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert excinfo.value.changed
+
+    steps = steps_by_id(excinfo.value.kwargs["plan"])
+    assert sorted(steps) == [
+        "placement_group:delete:pg2",
+        "volume:delete:volume3",
+        "volume:destroy:volume3",
+    ]
+    mocks.pp.delete_protection_policy.assert_not_called()
+
+
+def test_delete_pg_with_volumes(mocks, module_args):
+    module_args["placement_groups"][0]["state"] = "absent"
+    module_args["volumes"] = [{"name": "volume1", "state": "absent"}]
+    mocks.set_current(
+        pgs=[placement_group("pg1")],
+        volumes=[volume("volume1")],
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert "volume 'volume1' is still placed in it" in str(excinfo.value)
+
+    mocks.assert_no_writes()
+
+
+@pytest.mark.parametrize(
+    ("kind", "missing", "msg"),
+    [
+        ("placement_groups", "storage_service", "placement group 'pg1'"),
+        ("volumes", "size", "volume 'volume1'"),
+        ("protection_policies", "local_rpo", "protection policy 'pp1'"),
+    ],
+)
+def test_create_missing_args(mocks, module_args, kind, missing, msg):
+    del module_args[kind][0][missing]
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert msg in str(excinfo.value)
+
+    mocks.assert_no_writes()
+
+
+def test_duplicate_names(mocks, module_args):
+    module_args["volumes"][1]["name"] = "volume1"
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_tenant_space_state.main()
+    assert "declared more than once" in str(excinfo.value)
+
+    mocks.assert_no_writes()
+
+
+def test_failed_step_skips_dependents(mocks, module_args):
+    mocks.pg.create_placement_group.side_effect = purefusion.rest.ApiException(
+        status=409
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_tenant_space_state.main()
+
+    assert excinfo.value.kwargs["changed"]
+    assert [step["id"] for step in excinfo.value.kwargs["failed_steps"]] == [
+        "placement_group:create:pg1"
+    ]
+    assert excinfo.value.kwargs["skipped_steps"] == [
+        "volume:create:volume1",
+        "volume:create:volume2",
+    ]
+    mocks.pp.create_protection_policy.assert_called_once()
+    mocks.volume.create_volume.assert_not_called()
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_topology
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+
+# GLOBAL MOCKS
+fusion_topology.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+def named(*names):
+    items = []
+    for name in names:
+        item = MagicMock()
+        item.name = name
+        items.append(item)
+    return MagicMock(items=items)
+
+
+class FusionMocks:
+    """Records order of create requests, listings return `existing` names"""
+
+    def __init__(self, api_inits):
+        self.existing = {}
+        self.created = []
+        self.failing = set()
+
+        def _list(kind):
+            def _list_func(**kwargs):
+                key = (kind,) + tuple(sorted(kwargs.values()))
+                return named(*self.existing.get(key, []))
+
+            return MagicMock(side_effect=_list_func)
+
+        def _create(kind):
+            def _create_func(body, **kwargs):
+                self.created.append((kind, body.name))
+                return OperationMock(
+                    "{0}:{1}".format(kind, body.name),
+                    success=None,
+                )
+
+            return MagicMock(side_effect=_create_func)
+
+        self.region = MagicMock()
+        self.region.list_regions = _list("region")
+        self.region.create_region = _create("region")
+        self.az = MagicMock()
+        self.az.list_availability_zones = _list("availability_zone")
+        self.az.create_availability_zone = _create("availability_zone")
+        self.array = MagicMock()
+        self.array.list_arrays = _list("array")
+        self.array.create_array = _create("array")
+        self.nig = MagicMock()
+        self.nig.list_network_interface_groups = _list("network_interface_group")
+        self.nig.create_network_interface_group = _create("network_interface_group")
+        self.se = MagicMock()
+        self.se.list_storage_endpoints = _list("storage_endpoint")
+        self.se.create_storage_endpoint = _create("storage_endpoint")
+        self.op = MagicMock()
+        self.op.get_operation = MagicMock(
+            side_effect=lambda id: OperationMock(id, success=id not in self.failing)
+        )
+
+        for api_init, api in zip(
+            api_inits, [self.region, self.az, self.array, self.nig, self.se, self.op]
+        ):
+            api_init.return_value = api
+
+    def created_kinds(self):
+        return [kind for kind, _name in self.created]
+
+
+@pytest.fixture
+def mocks():
+    with patch("fusion.RegionsApi") as region, patch(
+        "fusion.AvailabilityZonesApi"
+    ) as az, patch("fusion.ArraysApi") as array, patch(
+        "fusion.NetworkInterfaceGroupsApi"
+    ) as nig, patch(
+        "fusion.StorageEndpointsApi"
+    ) as se, patch(
+        "fusion.OperationsApi"
+    ) as op:
+        yield FusionMocks([region, az, array, nig, se, op])
+
+
+def availability_zone(name, arrays=()):
+    return {
+        "name": name,
+        "arrays": [
+            {
+                "name": array,
+                "hardware_type": "flash-array-x",
+                "host_name": array,
+                "appliance_id": "1187351-242133817-5976825671211737520",
+            }
+            for array in arrays
+        ],
+        "network_interface_groups": [
+            {"name": "nig1", "prefix": "172.17.1.0/24", "gateway": "172.17.1.1"}
+        ],
+        "storage_endpoints": [
+            {
+                "name": "se1",
+                "iscsi": [
+                    {
+                        "address": "172.17.1.2/24",
+                        "gateway": "172.17.1.1",
+                        "network_interface_groups": ["nig1"],
+                    }
+                ],
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "regions": [
+            {
+                "name": "region1",
+                "availability_zones": [
+                    availability_zone("az1", ["array1", "array2"]),
+                    availability_zone("az2", ["array3"]),
+                ],
+            }
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def test_create_all(mocks, module_args):
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_topology.main()
+    assert excinfo.value.changed
+
+    # levels are created one after another, order within a level is arbitrary
+    kinds = mocks.created_kinds()
+    assert kinds[:3] == ["region", "availability_zone", "availability_zone"]
+    assert sorted(kinds[3:8]) == [
+        "array",
+        "array",
+        "array",
+        "network_interface_group",
+        "network_interface_group",
+    ]
+    assert kinds[8:] == ["storage_endpoint", "storage_endpoint"]
+    assert len(excinfo.value.kwargs["created"]) == 10
+    assert {
+        "kind": "array",
+        "name": "array1",
+        "region": "region1",
+        "availability_zone": "az1",
+    } in excinfo.value.kwargs["created"]
+
+    # nothing below a new region can exist, only regions are listed
+    mocks.region.list_regions.assert_called_once_with()
+    mocks.az.list_availability_zones.assert_not_called()
+    mocks.array.list_arrays.assert_not_called()
+    mocks.nig.list_network_interface_groups.assert_not_called()
+    mocks.se.list_storage_endpoints.assert_not_called()
+
+    mocks.array.create_array.assert_any_call(
+        purefusion.ArrayPost(
+            name="array3",
+            display_name="array3",
+            hardware_type="flash-array-x",
+            host_name="array3",
+            appliance_id="1187351-242133817-5976825671211737520",
+            apartment_id=None,
+        ),
+        region_name="region1",
+        availability_zone_name="az2",
+    )
+    mocks.nig.create_network_interface_group.assert_any_call(
+        purefusion.NetworkInterfaceGroupPost(
+            group_type="eth",
+            eth=purefusion.NetworkInterfaceGroupEthPost(
+                prefix="172.17.1.0/24", gateway="172.17.1.1", mtu=1500
+            ),
+            name="nig1",
+            display_name="nig1",
+        ),
+        region_name="region1",
+        availability_zone_name="az1",
+    )
+    mocks.se.create_storage_endpoint.assert_any_call(
+        purefusion.StorageEndpointPost(
+            name="se1",
+            display_name="se1",
+            endpoint_type="iscsi",
+            iscsi=purefusion.StorageEndpointIscsiPost(
+                discovery_interfaces=[
+                    purefusion.StorageEndpointIscsiDiscoveryInterfacePost(
+                        address="172.17.1.2/24",
+                        gateway="172.17.1.1",
+                        network_interface_groups=["nig1"],
+                    )
+                ]
+            ),
+            cbs_azure_iscsi=None,
+        ),
+        region_name="region1",
+        availability_zone_name="az2",
+    )
+    assert mocks.op.get_operation.call_count == 10
+
+
+def test_partially_existing(mocks, module_args):
+    mocks.existing = {
+        ("region",): ["region1"],
+        ("availability_zone", "region1"): ["az1"],
+        ("array", "az1", "region1"): ["array1"],
+        ("network_interface_group", "az1", "region1"): ["nig1"],
+    }
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_topology.main()
+    assert excinfo.value.changed
+
+    assert mocks.created[0] == ("availability_zone", "az2")
+    assert sorted(mocks.created[1:4]) == [
+        ("array", "array2"),
+        ("array", "array3"),
+        ("network_interface_group", "nig1"),
+    ]
+    assert mocks.created[4:] == [
+        ("storage_endpoint", "se1"),
+        ("storage_endpoint", "se1"),
+    ]
+    mocks.az.list_availability_zones.assert_called_once_with(region_name="region1")
+    # one listing per existing availability zone and kind
+    mocks.array.list_arrays.assert_called_once_with(
+        region_name="region1", availability_zone_name="az1"
+    )
+    mocks.nig.list_network_interface_groups.assert_called_once_with(
+        region_name="region1", availability_zone_name="az1"
+    )
+    mocks.se.list_storage_endpoints.assert_called_once_with(
+        region_name="region1", availability_zone_name="az1"
+    )
+
+
+def test_not_changed(mocks, module_args):
+    mocks.existing = {
+        ("region",): ["region1"],
+        ("availability_zone", "region1"): ["az1", "az2"],
+        ("array", "az1", "region1"): ["array1", "array2"],
+        ("array", "az2", "region1"): ["array3"],
+        ("network_interface_group", "az1", "region1"): ["nig1"],
+        ("network_interface_group", "az2", "region1"): ["nig1"],
+        ("storage_endpoint", "az1", "region1"): ["se1"],
+        ("storage_endpoint", "az2", "region1"): ["se1"],
+    }
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_topology.main()
+    assert not excinfo.value.changed
+    assert excinfo.value.kwargs["created"] == []
+    assert mocks.created == []
+    mocks.op.get_operation.assert_not_called()
+
+
+def test_check_mode(mocks, module_args):
+    mocks.existing = {("region",): ["region1"]}
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_topology.main()
+    assert excinfo.value.changed
+    assert len(excinfo.value.kwargs["created"]) == 9
+    assert mocks.created == []
+    mocks.array.list_arrays.assert_not_called()
+
+
+def test_failed_level_stops(mocks, module_args):
+    mocks.failing = {"availability_zone:az2"}
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_topology.main()
+
+    assert excinfo.value.kwargs["changed"]
+    assert excinfo.value.kwargs["created"] == [
+        {"kind": "region", "name": "region1"},
+        {"kind": "availability_zone", "name": "az1", "region": "region1"},
+    ]
+    assert [
+        (f["kind"], f["name"]) for f in excinfo.value.kwargs["failed_resources"]
+    ] == [("availability_zone", "az2")]
+    mocks.array.create_array.assert_not_called()
+
+
+def test_create_request_fails(mocks, module_args):
+    mocks.region.create_region.side_effect = purefusion.rest.ApiException(status=409)
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_topology.main()
+
+    assert not excinfo.value.kwargs["changed"]
+    assert excinfo.value.kwargs["failed_resources"][0]["name"] == "region1"
+    mocks.az.create_availability_zone.assert_not_called()
+    mocks.op.get_operation.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("update", "msg"),
+    [
+        (
+            lambda az: az["network_interface_groups"][0].update(gateway="10.0.0.1"),
+            "must be an address in subnet",
+        ),
+        (
+            lambda az: az["network_interface_groups"][0].update(prefix="10.0.0.1"),
+            "must be a valid IPv4 network",
+        ),
+        (
+            lambda az: az["storage_endpoints"][0].update(iscsi=None),
+            "Exactly one of `iscsi` and `cbs_azure_iscsi`",
+        ),
+        (
+            lambda az: az["arrays"].append(dict(az["arrays"][0])),
+            "declared more than once",
+        ),
+    ],
+)
+def test_invalid_topology(mocks, module_args, update, msg):
+    update(module_args["regions"][0]["availability_zones"][0])
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_topology.main()
+    assert msg in str(excinfo.value)
+
+    mocks.region.list_regions.assert_not_called()
+    assert mocks.created == []
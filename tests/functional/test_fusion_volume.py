@@ -500,7 +500,7 @@ def test_volume_update_with_state_present_executed_correctly(
         fusion_volume.main()
     assert exception.value.changed is True
     assert exception.value.id == volume["id"]
-    volumes_api.get_volume.assert_called_with(
+    volumes_api.get_volume.assert_called_once_with(
         volume_name=module_args["name"],
         tenant_name=module_args["tenant"],
         tenant_space_name=module_args["tenant_space"],
@@ -549,7 +549,7 @@ def test_volume_update_with_state_absent_executed_correctly(
         fusion_volume.main()
     assert exception.value.changed is True
     assert exception.value.id == volume["id"]
-    volumes_api.get_volume.assert_called_with(
+    volumes_api.get_volume.assert_called_once_with(
         volume_name=module_args["name"],
         tenant_name=module_args["tenant"],
         tenant_space_name=module_args["tenant_space"],
@@ -680,6 +680,8 @@ def test_volume_delete_throws_validation_error(
         tenant_name=absent_module_args["tenant"],
         tenant_space_name=absent_module_args["tenant_space"],
     )
+    # fetched again only because the update destroyed it
+    assert volumes_api.get_volume.call_count == 2
     volumes_api.update_volume.assert_called_once_with(
         purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(True)),
         volume_name=absent_module_args["name"],
@@ -710,7 +712,7 @@ def test_volume_delete_executed_correctly(
     # run module
     with pytest.raises(AnsibleExitJson):
         fusion_volume.main()
-    volumes_api.get_volume.assert_called_with(
+    volumes_api.get_volume.assert_called_once_with(
         volume_name=absent_module_args["name"],
         tenant_name=absent_module_args["tenant"],
         tenant_space_name=absent_module_args["tenant_space"],
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_volume_clone
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    exit_json,
+    fail_json,
+)
+
+# GLOBAL MOCKS
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+TENANT_SPACE = "/tenants/t1/tenant-spaces/ts1"
+VOLUME_SNAPSHOT = TENANT_SPACE + "/snapshots/nightly/volume-snapshots/db"
+CLONES = ["clone{0}".format(i) for i in range(30)]
+# target of all clones
+LOCATION = dict(
+    tenant="t1", tenant_space="ts1", storage_class="sc1", placement_group="pg1"
+)
+
+
+@pytest.fixture
+def server(server):
+    server.add(
+        TENANT_SPACE + "/placement-groups/pg1",
+        availability_zone="az1",
+        storage_service="ss1",
+    )
+    server.add(
+        TENANT_SPACE + "/volumes/db",
+        size=1048576,
+        storage_class="sc1",
+        placement_group="pg1",
+    )
+    server.add(TENANT_SPACE + "/snapshots/nightly", placement_group="pg1")
+    return server
+
+
+def clone(run_module, args):
+    run_module(fusion_volume_clone, dict(args, **LOCATION))
+
+
+def source(server, name):
+    return server.get(TENANT_SPACE + "/volumes/" + name)["source"]["self_link"]
+
+
+def test_clone_from_volume_snapshot(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        clone(
+            run_module,
+            {
+                "names": CLONES,
+                "source_snapshot": "nightly",
+                "source_volume_snapshot": "db",
+                "concurrency": 4,
+            },
+        )
+
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert result["created"] == CLONES
+    assert result["refreshed"] == []
+    assert all(source(server, name) == VOLUME_SNAPSHOT for name in CLONES)
+    # volumes are listed once
+    assert server.request_count("GET", "/volumes$") == 1
+    assert server.request_count("POST", "/volumes$") == len(CLONES)
+
+    # clones exist and refresh is not asked for
+    with pytest.raises(AnsibleExitJson) as exc:
+        clone(run_module, {"names": CLONES, "source_volume": "db"})
+
+    assert exc.value.kwargs["changed"] is False
+    assert server.request_count("PATCH") == 0
+
+
+def test_refresh(server, run_module):
+    server.add(
+        TENANT_SPACE + "/volumes/clone0",
+        size=1048576,
+        storage_class="sc1",
+        placement_group="pg1",
+        source_link=TENANT_SPACE + "/volumes/db",
+    )
+    server.add(
+        TENANT_SPACE + "/volumes/clone1",
+        size=1048576,
+        storage_class="sc1",
+        placement_group="pg1",
+        source_link=VOLUME_SNAPSHOT,
+    )
+    args = {
+        "names": ["clone0", "clone1", "clone2"],
+        "source_snapshot": "nightly",
+        "source_volume_snapshot": "db",
+        "refresh": True,
+    }
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        clone(run_module, dict(args, _ansible_check_mode=True))
+
+    assert exc.value.kwargs["created"] == ["clone2"]
+    assert exc.value.kwargs["refreshed"] == ["clone0"]
+    assert server.request_count("POST") == 0
+    assert server.request_count("PATCH") == 0
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        clone(run_module, args)
+
+    assert exc.value.kwargs["changed"] is True
+    assert source(server, "clone0") == VOLUME_SNAPSHOT
+    assert source(server, "clone2") == VOLUME_SNAPSHOT
+    assert server.request_count("PATCH") == 1
+
+
+def test_failures_are_reported_per_volume(server, run_module):
+    server.fail("POST", TENANT_SPACE + "/volumes$", times=1, status=400)
+    server.fail_operation("POST", TENANT_SPACE + "/volumes$", times=1)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        clone(run_module, {"names": CLONES, "source_volume": "db"})
+
+    assert "Failed to clone 2 of {0} volumes".format(len(CLONES)) in str(exc.value)
+    result = exc.value.kwargs
+    assert result["changed"] is True
+    assert len(result["failed_volumes"]) == 2
+    assert len(result["created"]) == len(CLONES) - 2
+
+    # the failed ones are cloned by the next run
+    with pytest.raises(AnsibleExitJson) as exc:
+        clone(run_module, {"names": CLONES, "source_volume": "db"})
+
+    assert sorted(exc.value.kwargs["created"]) == sorted(
+        failure["name"] for failure in result["failed_volumes"]
+    )
+
+
+@pytest.mark.parametrize(
+    "args,message",
+    [
+        ({"names": ["c"]}, "one of the following is required"),
+        (
+            {"names": ["c"], "source_volume": "db", "source_snapshot": "nightly"},
+            "mutually exclusive",
+        ),
+        ({"names": ["c"], "source_snapshot": "nightly"}, "required together"),
+        ({"names": ["c", "c"], "source_volume": "db"}, "duplicates"),
+    ],
+)
+def test_wrong_args(server, run_module, args, message):
+    with pytest.raises(AnsibleFailJson) as exc:
+        clone(run_module, args)
+
+    assert message in str(exc.value)
+    assert server.request_count("POST") == 0
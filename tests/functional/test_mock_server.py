@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import time
+from unittest.mock import patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.module_utils.compact_table import (
+    expand,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    OperationException,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_info,
+    fusion_region,
+    fusion_tenant,
+    fusion_volume,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    exit_json,
+    fail_json,
+)
+
+# GLOBAL MOCKS
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+TENANT_SPACE = "/tenants/t1/tenant-spaces/ts1"
+
+
+@pytest.fixture
+def client(server):
+    return server.api_client()
+
+
+def test_crud(server, client):
+    tenants_api = purefusion.TenantsApi(client)
+
+    op = tenants_api.create_tenant(
+        purefusion.TenantPost(name="t2", display_name="Tenant 2")
+    )
+    op = await_operation(client, op)
+    assert op.result.resource.name == "t2"
+    assert tenants_api.get_tenant("t2").display_name == "Tenant 2"
+    assert sorted(t.name for t in tenants_api.list_tenants().items) == ["t1", "t2"]
+
+    await_operation(
+        client,
+        tenants_api.update_tenant(
+            purefusion.TenantPatch(display_name=purefusion.NullableString("Renamed")),
+            "t2",
+        ),
+    )
+    assert server.get("/tenants/t2")["display_name"] == "Renamed"
+
+    await_operation(client, tenants_api.delete_tenant("t2"))
+    with pytest.raises(purefusion.rest.ApiException) as excinfo:
+        tenants_api.get_tenant("t2")
+    assert excinfo.value.status == 404
+
+
+def test_create_conflicts(client):
+    with pytest.raises(purefusion.rest.ApiException) as excinfo:
+        purefusion.TenantsApi(client).create_tenant(purefusion.TenantPost(name="t1"))
+    assert excinfo.value.status == 409
+
+
+def test_delete_non_empty(client):
+    with pytest.raises(purefusion.rest.ApiException) as excinfo:
+        purefusion.TenantsApi(client).delete_tenant("t1")
+    assert excinfo.value.status == 409
+
+
+def test_references_resolved(server, client):
+    server.add(TENANT_SPACE + "/placement-groups/pg1", availability_zone="az1")
+
+    op = purefusion.VolumesApi(client).create_volume(
+        purefusion.VolumePost(
+            name="v1",
+            size=1048576,
+            storage_class="sc1",
+            placement_group="pg1",
+        ),
+        "t1",
+        "ts1",
+    )
+    await_operation(client, op)
+
+    volume = purefusion.VolumesApi(client).get_volume("t1", "ts1", "v1")
+    assert volume.storage_class.name == "sc1"
+    assert volume.placement_group.name == "pg1"
+    assert volume.tenant.name == "t1"
+    assert volume.tenant_space.name == "ts1"
+    assert volume.serial_number
+
+
+def test_snapshot_of_placement_group(server, client):
+    server.add(TENANT_SPACE + "/placement-groups/pg1", availability_zone="az1")
+    for name in ("v1", "v2"):
+        server.add(
+            TENANT_SPACE + "/volumes/" + name,
+            storage_class="sc1",
+            placement_group="pg1",
+        )
+    server.add(TENANT_SPACE + "/volumes/v3", storage_class="sc1")
+
+    snapshots_api = purefusion.SnapshotsApi(client)
+    op = snapshots_api.create_snapshot(
+        purefusion.SnapshotPost(name="s1", placement_group="pg1"), "t1", "ts1"
+    )
+    await_operation(client, op)
+
+    volume_snapshots = purefusion.VolumeSnapshotsApi(client).list_volume_snapshots(
+        "t1", "ts1", "s1"
+    )
+    assert sorted(vs.volume.name for vs in volume_snapshots.items) == ["v1", "v2"]
+
+    # volume snapshots go away with the snapshot
+    await_operation(client, snapshots_api.delete_snapshot("t1", "ts1", "s1"))
+    assert server.list(TENANT_SPACE + "/snapshots/s1/volume-snapshots") == []
+
+
+def test_list_filter_and_paging(server, client):
+    for i in range(5):
+        server.add("/tenants/t{0}".format(i + 2), display_name="odd" if i % 2 else "")
+
+    first = purefusion.TenantsApi(client).list_tenants(limit=4)
+    assert first.count == 6
+    assert len(first.items) == 4
+    assert first.more_items_remaining is True
+
+    second = purefusion.TenantsApi(client).list_tenants(limit=4, offset=4)
+    assert len(second.items) == 2
+    assert second.more_items_remaining is False
+
+    assert server.request_count("GET", "^/tenants$") == 2
+
+
+def test_operation_polls(server, client):
+    server.operation_polls = 2
+    server.retry_in = 0
+
+    op = purefusion.TenantsApi(client).create_tenant(purefusion.TenantPost(name="t2"))
+    assert op.status == "Pending"
+    op = await_operation(client, op)
+
+    assert op.status == "Succeeded"
+    assert server.request_count("GET", "^/operations/") == 3
+
+
+def test_retry_in_reported(server, client):
+    server.retry_in = 250
+
+    op = purefusion.TenantsApi(client).create_tenant(purefusion.TenantPost(name="t2"))
+
+    assert op.retry_in == 250
+
+
+def test_latency(server, client):
+    server.latency = 0.05
+
+    start = time.monotonic()
+    purefusion.TenantsApi(client).list_tenants()
+
+    assert time.monotonic() - start >= 0.05
+
+
+def test_injected_request_failure(server, client):
+    # urllib3 itself retries 413, 429 and 503 responses carrying Retry-After
+    server.fail("GET", "^/tenants$", status=502, retry_after=3)
+
+    with pytest.raises(purefusion.rest.ApiException) as excinfo:
+        purefusion.TenantsApi(client).list_tenants()
+    assert excinfo.value.status == 502
+    assert excinfo.value.headers["Retry-After"] == "3"
+
+    # the failure was used up
+    purefusion.TenantsApi(client).list_tenants()
+
+
+def test_injected_operation_failure(server, client):
+    server.fail_operation("POST", "^/tenants$", message="No capacity")
+
+    op = purefusion.TenantsApi(client).create_tenant(purefusion.TenantPost(name="t2"))
+    with pytest.raises(OperationException) as excinfo:
+        await_operation(client, op)
+
+    assert excinfo.value.op.error.message == "No capacity"
+    assert server.get("/tenants/t2") is None
+
+
+def test_repeated_request_id(server, client):
+    tenants_api = purefusion.TenantsApi(client)
+
+    first = tenants_api.create_tenant(
+        purefusion.TenantPost(name="t2"), x_request_id="request-1"
+    )
+    second = tenants_api.create_tenant(
+        purefusion.TenantPost(name="t2"), x_request_id="request-1"
+    )
+
+    assert first.id == second.id
+
+
+def test_module_create(server, run_module):
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_tenant,
+            {"name": "t2", "display_name": "Tenant 2", "state": "present"},
+        )
+
+    assert exc.value.changed is True
+    assert server.get("/tenants/t2")["display_name"] == "Tenant 2"
+
+
+def test_module_retries_transient_failure(server, run_module):
+    server.fail("GET", "^/tenants/t1$", status=502, retry_after=0)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_tenant,
+            {"name": "t1", "display_name": "t1", "state": "present"},
+        )
+
+    assert exc.value.changed is False
+    assert exc.value.kwargs["fusion_api_stats"]["retries"] == 1
+
+
+def test_module_operation_fails(server, run_module):
+    server.add(TENANT_SPACE + "/placement-groups/pg1", availability_zone="az1")
+    server.fail_operation("POST", "/volumes$", message="No capacity")
+
+    with pytest.raises(OperationException) as exc:
+        run_module(
+            fusion_volume,
+            {
+                "name": "v1",
+                "tenant": "t1",
+                "tenant_space": "ts1",
+                "storage_class": "sc1",
+                "placement_group": "pg1",
+                "size": "1M",
+                "state": "present",
+            },
+        )
+
+    assert exc.value.op.error.message == "No capacity"
+    assert server.get(TENANT_SPACE + "/volumes/v1") is None
+
+
+def test_module_traced(server, run_module, monkeypatch, tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    monkeypatch.setenv("FUSION_TRACE_FILE", str(trace_file))
+    server.operation_polls = 1
+
+    with pytest.raises(AnsibleExitJson):
+        run_module(
+            fusion_tenant,
+            {"name": "t2", "display_name": "Tenant 2", "state": "present"},
+        )
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    assert len({span["trace_id"] for span in spans}) == 1
+    requests = [span for span in spans if span["kind"] == "request"]
+    assert [(span["name"], span["status"]) for span in requests] == [
+        ("Get version", 200),
+        ("Get tenant", 404),
+        ("Create tenant", 200),
+        ("Get operation", 200),
+        ("Get operation", 200),
+    ]
+    assert requests[1]["path"] == "/tenants/t2"
+    operation_id = requests[2]["operation_id"]
+
+    (wait,) = [span for span in spans if span["kind"] == "await"]
+    polls = [span for span in spans if span["kind"] == "poll"]
+    assert wait["operation_id"] == operation_id
+    assert wait["operation_status"] == "Succeeded"
+    assert [poll["operation_status"] for poll in polls] == ["Running", "Succeeded"]
+    assert all(poll["parent_id"] == wait["span_id"] for poll in polls)
+    assert requests[3]["parent_id"] == polls[0]["span_id"]
+
+
+def test_module_reports_api_stats(server, run_module):
+    server.operation_polls = 1
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(
+            fusion_tenant,
+            {"name": "t2", "display_name": "Tenant 2", "state": "present"},
+        )
+
+    stats = exc.value.kwargs["fusion_api_stats"]
+    assert stats["requests"] == {"DefaultApi": 1, "TenantsApi": 2, "OperationsApi": 2}
+    assert stats["request_count"] == len(server.requests)
+    assert stats["bytes_sent"] > 0
+    assert stats["bytes_received"] > 0
+    assert stats["operation_waits"] == 1
+    assert stats["poll_sleep"] == 0
+    assert stats["retries"] == 0
+
+
+def test_module_info_raw_listing(server, run_module):
+    server.add(TENANT_SPACE + "/protection-policies/pp1")
+    server.add(TENANT_SPACE + "/placement-groups/pg1", availability_zone="az1")
+    for name in ("v1", "v2"):
+        server.add(
+            TENANT_SPACE + "/volumes/" + name,
+            storage_class="sc1",
+            placement_group="pg1",
+        )
+    server.add(TENANT_SPACE + "/snapshots/s1", placement_group="pg1")
+    args = {"gather_subset": ["volumes", "snapshots"]}
+
+    with pytest.raises(AnsibleExitJson) as raw:
+        run_module(fusion_info, args)
+    with patch.object(fusion_info, "list_items_raw", return_value=None):
+        with pytest.raises(AnsibleExitJson) as models:
+            run_module(fusion_info, args)
+
+    info = raw.value.fusion_info
+    assert sorted(info["volumes"]) == ["t1/ts1/v1", "t1/ts1/v2"]
+    assert list(info["volume_snapshots"]) == ["t1/ts1/s1/v1", "t1/ts1/s1/v2"]
+    assert info == models.value.fusion_info
+
+
+@pytest.mark.parametrize("compression", ["true", "false"])
+def test_module_compressed_responses(server, run_module, monkeypatch, compression):
+    monkeypatch.setenv("FUSION_COMPRESSION", compression)
+    server.add(TENANT_SPACE + "/placement-groups/pg1", availability_zone="az1")
+    for name in range(20):
+        server.add(
+            TENANT_SPACE + "/volumes/v{0}".format(name),
+            storage_class="sc1",
+            placement_group="pg1",
+        )
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        run_module(fusion_info, {"gather_subset": ["volumes"]})
+
+    assert len(exc.value.fusion_info["volumes"]) == 20
+    stats = exc.value.kwargs["fusion_api_stats"]
+    if compression == "true":
+        assert stats["bytes_received"] < stats["bytes_decoded"]
+    else:
+        assert stats["bytes_received"] == stats["bytes_decoded"]
+
+
+def test_module_info_compact(server, run_module):
+    server.add(TENANT_SPACE + "/placement-groups/pg1", availability_zone="az1")
+    for name in ("v1", "v2", "v3"):
+        server.add(
+            TENANT_SPACE + "/volumes/" + name,
+            storage_class="sc1",
+            placement_group="pg1",
+        )
+    server.add(TENANT_SPACE + "/snapshots/s1", placement_group="pg1")
+    args = {"gather_subset": ["volumes", "snapshots"]}
+
+    with pytest.raises(AnsibleExitJson) as dicts:
+        run_module(fusion_info, args)
+    with pytest.raises(AnsibleExitJson) as compact:
+        run_module(fusion_info, dict(args, output_format="compact"))
+
+    volumes = compact.value.fusion_info["volumes"]
+    assert len(volumes["rows"]) == 3
+    # tenant, tenant space, placement group, storage class, iSCSI target
+    assert len(volumes["values"]) == 6
+    info = dicts.value.fusion_info
+    for volume in expand(volumes):
+        key = "t1/ts1/" + volume["name"]
+        iscsi = info["volumes"][key]["target"]["iscsi"]
+        assert volume["iscsi_addresses"] == iscsi["addresses"]
+        assert volume["iscsi_iqn"] == iscsi["iqn"]
+        expected = dict(info["volumes"][key])
+        del expected["target"]
+        assert (
+            dict((field, value) for field, value in volume.items() if field in expected)
+            == expected
+        )
+    for vsnap in expand(compact.value.fusion_info["volume_snapshots"]):
+        expected = info["volume_snapshots"]["t1/ts1/s1/" + vsnap["name"]]
+        assert vsnap["snapshot"] == "s1"
+        assert dict((field, vsnap[field]) for field in expected) == expected
+    (snapshot,) = expand(compact.value.fusion_info["snapshots"])
+    assert snapshot["name"] == "s1"
+    assert (
+        snapshot["time_remaining"] == info["snapshots"]["t1/ts1/s1"]["time_remaining"]
+    )
+
+
+def test_module_shared_cache(server, run_module, monkeypatch, tmp_path):
+    monkeypatch.setenv("FUSION_CACHE_FILE", str(tmp_path / "cache.sqlite"))
+
+    def regions():
+        with pytest.raises(AnsibleExitJson) as exc:
+            run_module(fusion_info, {"gather_subset": ["regions"]})
+        return sorted(exc.value.fusion_info["regions"])
+
+    assert regions() == ["r1"]
+    assert regions() == ["r1"]
+    assert server.request_count("GET", "^/regions$") == 1
+
+    # changes made by modules invalidate the cached list
+    with pytest.raises(AnsibleExitJson):
+        run_module(fusion_region, {"name": "r2", "state": "present"})
+    assert regions() == ["r1", "r2"]
+    assert server.request_count("GET", "^/regions$") == 2
@@ -129,3 +129,17 @@ def side_effects_with_exceptions(side_effects):
         return i
 
     return _pop_side_effect
+
+
+def add_base_organization(server):
+    """
+    Adds resources most functional tests against `MockFusionServer` need:
+    storage service `ss1` with storage class `sc1`, region `r1` with
+    availability zone `az1` and tenant `t1` with tenant space `ts1`.
+    """
+    server.add("/storage-services/ss1")
+    server.add("/storage-services/ss1/storage-classes/sc1")
+    server.add("/regions/r1")
+    server.add("/regions/r1/availability-zones/az1")
+    server.add("/tenants/t1")
+    server.add("/tenants/t1/tenant-spaces/ts1")
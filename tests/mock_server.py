@@ -0,0 +1,793 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Local stand-in for the Fusion REST API.
+
+Resources are kept in memory in a tree mirroring the API paths, e.g.
+'/tenants/t1/tenant-spaces/ts1/volumes/v1', so the generic REST semantics
+(list, get, create, update, delete) cover all collections the modules use.
+Writes are applied immediately and return an operation which reports
+'Succeeded' after `operation_polls` polls. Latency, `retry_in` of operations
+and failures of requests or operations can be injected.
+
+Can be used from tests:
+
+    with MockFusionServer(latency=0.01) as server:
+        server.add("/tenants/t1")
+        client = server.api_client()
+
+or run standalone for manual benchmarking with FUSION_API_HOST pointing to it:
+
+    python tests/mock_server.py --port 8080 --latency 0.05
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import gzip
+import importlib.util
+import itertools
+import json
+import re
+import threading
+import time
+import types
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import fusion as purefusion
+
+BASE_PATH = "/api/1.1"
+API_PREFIX_RE = re.compile(r"^/api/[^/]+")
+
+# fields of request bodies naming another resource, turned into references
+REFERENCE_FIELDS = {
+    "array": "arrays",
+    "availability_zone": "availability-zones",
+    "hardware_type": "hardware-types",
+    "network_interface_group": "network-interface-groups",
+    "placement_group": "placement-groups",
+    "protection_policy": "protection-policies",
+    "region": "regions",
+    "role": "roles",
+    "storage_class": "storage-classes",
+    "storage_service": "storage-services",
+}
+
+# fields of request bodies naming a list of other resources, either as a list
+# or as a comma separated string
+LIST_REFERENCE_FIELDS = {
+    "hardware_types": "hardware-types",
+    "host_access_policies": "host-access-policies",
+}
+
+# required fields of the SDK models which the requests do not always carry
+DEFAULTS = {
+    "arrays": {"apartment_id": "", "appliance_id": "", "host_name": ""},
+    "hardware-types": {"array_type": "FA//X", "media_type": "flash"},
+    "host-access-policies": {"iqn": "", "personality": "linux"},
+    "network-interface-groups": {"group_type": "eth"},
+    "network-interfaces": {"enabled": True, "interface_type": "eth", "max_speed": 0},
+    "protection-policies": {"objectives": []},
+    "role-assignments": {"principal": ""},
+    "roles": {"assignable_scopes": [], "description": ""},
+    "snapshots": {"destroyed": False, "time_remaining": 0},
+    "storage-classes": {
+        "size_limit": 4503599627370496,
+        "iops_limit": 100000000,
+        "bandwidth_limit": 549755813888,
+    },
+    "storage-endpoints": {"endpoint_type": "iscsi"},
+    "volume-snapshots": {"destroyed": False, "size": 0, "time_remaining": 0},
+    "volumes": {
+        "size": 0,
+        "destroyed": False,
+        "host_access_policies": [],
+        "target": {
+            "iscsi": {"iqn": "iqn.2010-06.com.purestorage:mock", "addresses": []}
+        },
+    },
+}
+
+# links to nested collections
+LINKS = {
+    "tenant-spaces": ("volumes", "snapshots", "placement_groups"),
+    "snapshots": ("volume_snapshots",),
+}
+
+# deleting these deletes everything nested under them, otherwise a resource
+# with nested resources cannot be deleted
+CASCADE_DELETE = ("snapshots",)
+
+PAGING_PARAMS = ("limit", "offset", "filter", "sort")
+
+# collections listed as bare arrays rather than paged lists
+PLAIN_LISTS = ("api-clients", "roles", "role-assignments", "users")
+
+ERROR_CODES = {
+    400: "INVALID_ARGUMENT",
+    404: "NOT_FOUND",
+    405: "NOT_IMPLEMENTED",
+    409: "ALREADY_EXISTS",
+    429: "EXHAUSTED",
+    503: "UNAVAILABLE",
+}
+
+
+def _kind(collection):
+    """'tenant-spaces' -> 'TenantSpace', 'storage-classes' -> 'StorageClass'"""
+    if collection.endswith("ies"):
+        singular = collection[:-3] + "y"
+    elif collection.endswith("sses"):
+        singular = collection[:-2]
+    else:
+        singular = collection[:-1]
+    return "".join(part.capitalize() for part in singular.split("-"))
+
+
+def _field(collection):
+    """'tenant-spaces' -> 'tenant_space'"""
+    return re.sub("(?<!^)([A-Z])", r"_\1", _kind(collection)).lower()
+
+
+class _Failure:
+    def __init__(self, method, path, times, **kwargs):
+        self.method = method
+        self.path = re.compile(path) if path is not None else None
+        self.times = times
+        self.kwargs = kwargs
+
+    def take(self, method, path):
+        """Returns True if the failure applies to the request, counting it"""
+        if self.times == 0:
+            return False
+        if self.method is not None and self.method != method:
+            return False
+        if self.path is not None and not self.path.search(path):
+            return False
+        if self.times is not None:
+            self.times -= 1
+        return True
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, name=None):
+        super(ApiError, self).__init__(message)
+        self.status = status
+        self.message = message
+        self.name = name
+
+
+class MockFusionServer:
+    """In-memory Fusion API served over HTTP on localhost.
+
+    `latency` seconds are added to every request, operations are polled
+    `operation_polls` times before they finish and ask for polling after
+    `retry_in` milliseconds. Generated ids are sequential and timestamps come
+    from `clock`, so that a fixed clock makes responses reproducible.
+    Responses are compressed if the client accepts it and `compress` is set.
+    """
+
+    def __init__(
+        self,
+        latency=0,
+        retry_in=0,
+        operation_polls=0,
+        host="127.0.0.1",
+        port=0,
+        clock=time.time,
+        compress=True,
+    ):
+        self.latency = latency
+        self.retry_in = retry_in
+        self.operation_polls = operation_polls
+        self.clock = clock
+        self.compress = compress
+        self.resources = {}
+        # indexes keeping lookups cheap in large generated orgs
+        self._collections = {}
+        self._by_name = {}
+        self._refs = {}
+        self.operations = {}
+        self.requests = []
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._request_failures = []
+        self._operation_failures = []
+        self._request_ids = {}
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return "http://{0}:{1}".format(host, port)
+
+    @property
+    def host(self):
+        """Value for `fusion.Configuration.host`"""
+        return self.url + BASE_PATH
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.01}
+        )
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def api_client(self):
+        """Returns `fusion.ApiClient` talking to this server"""
+        config = purefusion.Configuration()
+        config.host = self.host
+        config.access_token = "mock-token"
+        client = purefusion.ApiClient(config)
+        client.call_api = types.MethodType(original_call_api(), client)
+        return client
+
+    def _uuid(self):
+        return str(uuid.UUID(int=next(self._ids)))
+
+    def _serial(self):
+        return "{0:024X}".format(next(self._ids))
+
+    def _now_ms(self):
+        return int(self.clock() * 1000)
+
+    # state
+
+    def add(self, path, **fields):
+        """Creates resource at `path` directly, its parents must exist"""
+        with self._lock:
+            return self._create(path, dict(fields))
+
+    def get(self, path):
+        """Returns resource at `path` or None"""
+        with self._lock:
+            return self.resources.get(path.rstrip("/"))
+
+    def list(self, collection_path):
+        with self._lock:
+            return self._children(collection_path.rstrip("/"))
+
+    # failure injection
+
+    def fail(
+        self,
+        method=None,
+        path=None,
+        status=500,
+        times=1,
+        message="Injected failure",
+        retry_after=None,
+        drop=False,
+    ):
+        """Makes next `times` (None for all) requests matching `method` and
+        `path` regular expression fail with HTTP `status`, or close the
+        connection without response if `drop` is set"""
+        self._request_failures.append(
+            _Failure(
+                method,
+                path,
+                times,
+                status=status,
+                message=message,
+                retry_after=retry_after,
+                drop=drop,
+            )
+        )
+
+    def fail_operation(
+        self, method=None, path=None, times=1, message="Injected failure"
+    ):
+        """Makes operations of next `times` writes matching `method` and
+        `path` fail without changing anything"""
+        self._operation_failures.append(_Failure(method, path, times, message=message))
+
+    def request_count(self, method=None, path=None):
+        pattern = re.compile(path) if path is not None else None
+        return sum(
+            1
+            for request_method, request_path in self.requests
+            if (method is None or method == request_method)
+            and (pattern is None or pattern.search(request_path))
+        )
+
+    # request handling
+
+    def handle(self, method, raw_path, headers, body):
+        """Returns (status, headers, payload) of response, payload None means
+        closing the connection without response"""
+        url = urlsplit(raw_path)
+        path = API_PREFIX_RE.sub("", url.path).rstrip("/") or "/"
+        query = dict(parse_qsl(url.query))
+        with self._lock:
+            self.requests.append((method, path))
+            failure = next(
+                (f for f in self._request_failures if f.take(method, path)), None
+            )
+        if self.latency:
+            # not time.sleep(), tests tend to mock it
+            threading.Event().wait(self.latency)
+
+        if failure is not None:
+            if failure.kwargs["drop"]:
+                return None, {}, None
+            response_headers = {}
+            if failure.kwargs["retry_after"] is not None:
+                response_headers["Retry-After"] = str(failure.kwargs["retry_after"])
+            return (
+                failure.kwargs["status"],
+                response_headers,
+                self._error_body(failure.kwargs["status"], failure.kwargs["message"]),
+            )
+
+        try:
+            with self._lock:
+                return 200, {}, self._route(method, path, query, headers, body)
+        except ApiError as err:
+            return err.status, {}, self._error_body(err.status, err.message, err.name)
+
+    def _error_body(self, status, message, name=None):
+        return {
+            "request_id": self._uuid(),
+            "error": {
+                "pure_code": ERROR_CODES.get(status, "INTERNAL"),
+                "http_code": status,
+                "message": message,
+                "details": {"name": name} if name else {},
+            },
+        }
+
+    def _route(self, method, path, query, headers, body):
+        segments = path.strip("/").split("/")
+        if path == "/info/version" and method == "GET":
+            return {"version": "1.1"}
+        if segments[0] == "operations":
+            return self._operations(method, segments)
+        if segments[0] == "resources":
+            return self._resources_by_id(method, segments[1:], query)
+        if segments[-1] in ("space", "performance") and len(segments) % 2 == 1:
+            self._existing("/" + "/".join(segments[:-1]))
+            if segments[-1] == "space":
+                return {
+                    "total_physical_space": 0,
+                    "unique_space": 0,
+                    "snapshot_space": 0,
+                }
+            return {}
+
+        if len(segments) % 2 == 0:
+            if method == "GET":
+                return self._get(path)
+            if method == "PATCH":
+                return self._write(method, path, headers, body, self._update)
+            if method == "DELETE":
+                return self._write(method, path, headers, body, self._delete)
+        else:
+            if method == "GET":
+                parent = path.rsplit("/", 1)[0]
+                if parent:
+                    self._existing(parent)
+                return self._list(
+                    self._children(path), query, segments[-1] in PLAIN_LISTS
+                )
+            if method == "POST":
+                return self._write(method, path, headers, body, self._post)
+        raise ApiError(405, "Method {0} not allowed on {1}".format(method, path))
+
+    def _operations(self, method, segments):
+        if method != "GET":
+            raise ApiError(405, "Operations are read-only")
+        if len(segments) == 1:
+            return self._list(list(self.operations.values()), {})
+        operation = self.operations.get(segments[1])
+        if operation is None:
+            raise ApiError(404, "Operation not found", segments[1])
+        self._advance(operation)
+        return operation
+
+    def _resources_by_id(self, method, segments, query):
+        if method != "GET" or not segments:
+            raise ApiError(405, "Only reads are supported by id")
+        items = [
+            r for p, r in self.resources.items() if p.split("/")[-2] == segments[0]
+        ]
+        if len(segments) == 1:
+            return self._list(items, query, segments[0] in PLAIN_LISTS)
+        for item in items:
+            if item["id"] == segments[1]:
+                return item
+        raise ApiError(404, "Resource not found", segments[1])
+
+    # resources
+
+    def _existing(self, path):
+        resource = self.resources.get(path)
+        if resource is None:
+            raise ApiError(
+                404, "Resource {0} not found".format(path), path.split("/")[-1]
+            )
+        return resource
+
+    def _children(self, collection_path):
+        return list(self._collections.get(collection_path, {}).values())
+
+    def _ref(self, path):
+        ref = self._refs.get(path)
+        if ref is None:
+            resource = self.resources[path]
+            ref = self._refs[path] = {
+                "id": resource["id"],
+                "name": resource["name"],
+                "kind": _kind(path.split("/")[-2]),
+                "self_link": resource["self_link"],
+            }
+        return ref
+
+    def _resolve(self, near_path, collection, name):
+        """Finds resource of `collection` called `name`, preferring the one
+        closest to `near_path`"""
+        best = None
+        for path in self._by_name.get((collection, name), ()):
+            shared = len(_common_prefix(path, near_path))
+            if best is None or shared > best[0]:
+                best = (shared, path)
+        if best is None:
+            raise ApiError(
+                400, "{0} '{1}' does not exist".format(_kind(collection), name), name
+            )
+        return self._ref(best[1])
+
+    def _resolve_link(self, link):
+        path = API_PREFIX_RE.sub("", urlsplit(link).path).rstrip("/")
+        self._existing(path)
+        return self._ref(path)
+
+    def _apply_fields(self, path, resource, fields):
+        for key, value in fields.items():
+            if isinstance(value, dict) and set(value) == {"value"}:
+                # Nullable* wrappers of PATCH bodies
+                value = value["value"]
+            if key in REFERENCE_FIELDS and isinstance(value, str):
+                value = (
+                    self._resolve(path, REFERENCE_FIELDS[key], value) if value else None
+                )
+            elif key in LIST_REFERENCE_FIELDS:
+                names = value.split(",") if isinstance(value, str) else value or []
+                value = [
+                    self._resolve(path, LIST_REFERENCE_FIELDS[key], name)
+                    for name in names
+                    if name
+                ]
+            elif key == "source_link":
+                key = "source"
+                value = self._resolve_link(value) if value else None
+            elif key == "scope" and isinstance(value, str):
+                value = self._resolve_link(value)
+            resource[key] = value
+
+    def _create(self, path, fields):
+        path = path.rstrip("/")
+        if path in self.resources:
+            raise ApiError(409, "Resource already exists", path.split("/")[-1])
+        segments = path.strip("/").split("/")
+        if len(segments) % 2 != 0:
+            raise ApiError(400, "{0} is not a resource path".format(path))
+        if len(segments) > 2:
+            self._existing("/" + "/".join(segments[:-2]))
+
+        collection, name = segments[-2], segments[-1]
+        resource = {
+            "id": self._uuid(),
+            "name": name,
+            "display_name": name,
+            # links are relative to the API base, as the modules expect
+            "self_link": path,
+            "created_at": self._now_ms(),
+        }
+        resource.update(DEFAULTS.get(collection, {}))
+        for i in range(0, len(segments) - 2, 2):
+            ancestor = "/" + "/".join(segments[: i + 2])
+            resource[_field(segments[i])] = self._ref(ancestor)
+        for link in LINKS.get(collection, ()):
+            resource[link + "_link"] = "{0}/{1}".format(path, link.replace("_", "-"))
+        if collection == "volumes":
+            resource["serial_number"] = self._serial()
+
+        self.resources[path] = resource
+        try:
+            self._apply_fields(path, resource, fields)
+        except ApiError:
+            del self.resources[path]
+            raise
+        collection_path = path.rsplit("/", 1)[0]
+        self._collections.setdefault(collection_path, {})[name] = resource
+        self._by_name.setdefault((collection, name), []).append(path)
+        if collection == "snapshots":
+            self._snapshot_volumes(path, resource, fields)
+        return resource
+
+    def _snapshot_volumes(self, path, snapshot, fields):
+        tenant_space = path.rsplit("/", 2)[0]
+        volumes = self._children(tenant_space + "/volumes")
+        if fields.get("volumes"):
+            volumes = [v for v in volumes if v["name"] in fields["volumes"]]
+        elif fields.get("placement_group"):
+            pg = snapshot["placement_group"]["name"]
+            volumes = [
+                v
+                for v in volumes
+                if v.get("placement_group") and v["placement_group"]["name"] == pg
+            ]
+        consistency_id = self._uuid().replace("-", "")
+        for volume in volumes:
+            volume_path = tenant_space + "/volumes/" + volume["name"]
+            self._create(
+                path + "/volume-snapshots/" + volume["name"],
+                {
+                    "volume": self._ref(volume_path),
+                    "placement_group": volume.get("placement_group"),
+                    "size": volume.get("size", 0),
+                    "serial_number": self._serial(),
+                    "volume_serial_number": volume["serial_number"],
+                    "consistency_id": consistency_id,
+                },
+            )
+
+    def _post(self, path, body):
+        body = dict(body or {})
+        name = body.pop("name", None)
+        if not name:
+            # e.g. API clients are addressed by their id
+            name = body["id"] = self._uuid()
+        resource = self._create(path + "/" + name, body)
+        return path + "/" + name, resource
+
+    def _update(self, path, body):
+        resource = self._existing(path)
+        self._apply_fields(path, resource, body or {})
+        return path, resource
+
+    def _delete(self, path, body):
+        resource = self._existing(path)
+        nested = [p for p in self.resources if p.startswith(path + "/")]
+        if nested and path.split("/")[-2] not in CASCADE_DELETE:
+            raise ApiError(
+                409,
+                "Resource {0} still contains other resources".format(path),
+                resource["name"],
+            )
+        for removed in nested + [path]:
+            collection_path, name = removed.rsplit("/", 1)
+            del self.resources[removed]
+            del self._collections[collection_path][name]
+            self._by_name[(collection_path.rsplit("/", 1)[-1], name)].remove(removed)
+            self._refs.pop(removed, None)
+        return path, resource
+
+    def _get(self, path):
+        return self._existing(path)
+
+    def _list(self, items, query, plain=False):
+        for key, value in query.items():
+            if key in PAGING_PARAMS:
+                continue
+            items = [item for item in items if _matches(item, key, value)]
+        if plain:
+            return items
+        offset = int(query.get("offset", 0))
+        limit = int(query["limit"]) if "limit" in query else len(items)
+        page = items[offset : offset + limit]
+        return {
+            "count": len(items),
+            "more_items_remaining": offset + len(page) < len(items),
+            "items": page,
+        }
+
+    # operations
+
+    def _write(self, method, path, headers, body, apply):
+        request_id = headers.get("X-Request-ID")
+        if request_id and request_id in self._request_ids:
+            # repeated request, Fusion processes it only once
+            return self.operations[self._request_ids[request_id]]
+
+        verb = {"POST": "Create", "PATCH": "Update", "DELETE": "Delete"}[method]
+        segments = path.strip("/").split("/")
+        collection = segments[-1] if method == "POST" else segments[-2]
+        failure = next(
+            (f for f in self._operation_failures if f.take(method, path)), None
+        )
+
+        operation_id = self._uuid()
+        operation = {
+            "id": operation_id,
+            "self_link": "/operations/{0}".format(operation_id),
+            "request_type": verb + _kind(collection),
+            "request_id": request_id or self._uuid(),
+            "status": "Pending",
+            "retry_in": self.retry_in,
+            "created_at": self._now_ms(),
+            "started_at": self._now_ms(),
+            "ended_at": 0,
+            "update_fields": {},
+            "_polls": self.operation_polls,
+        }
+        if failure is not None:
+            operation["_error"] = {
+                "pure_code": "INTERNAL",
+                "http_code": 500,
+                "message": failure.kwargs["message"],
+                "details": {},
+            }
+        else:
+            resource_path, _resource = apply(path, body)
+            if method != "DELETE":
+                operation["_result"] = {"resource": self._ref(resource_path)}
+
+        self.operations[operation_id] = operation
+        self._request_ids[operation["request_id"]] = operation_id
+        return operation
+
+    def _advance(self, operation):
+        if operation["status"] in ("Succeeded", "Failed"):
+            return
+        if operation["_polls"] > 0:
+            operation["_polls"] -= 1
+            operation["status"] = "Running"
+            return
+        operation["ended_at"] = self._now_ms()
+        operation["retry_in"] = 0
+        if "_error" in operation:
+            operation["status"] = "Failed"
+            operation["error"] = operation["_error"]
+        else:
+            operation["status"] = "Succeeded"
+            operation["result"] = operation.get("_result")
+
+
+def _common_prefix(first, second):
+    prefix = []
+    for a, b in zip(first.split("/"), second.split("/")):
+        if a != b:
+            break
+        prefix.append(a)
+    return prefix
+
+
+def _matches(item, key, value):
+    if key in item:
+        field = item[key]
+        if isinstance(field, dict):
+            return value in (field.get("name"), field.get("id"))
+        if isinstance(field, bool):
+            return str(field).lower() == value.lower()
+        return str(field) == value
+    if key.endswith("_id") and isinstance(item.get(key[:-3]), dict):
+        return item[key[:-3]]["id"] == value
+    # unknown filters are ignored
+    return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive, so that connection pooling of the client is exercised
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, do not let Nagle's algorithm
+    # add delayed ACK waits to every response
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        body = json.loads(raw.decode("utf-8")) if raw else None
+        status, headers, payload = self.server.mock.handle(
+            self.command, self.path, self.headers, body
+        )
+        if payload is None and status is None:
+            self.close_connection = True
+            return
+        data = json.dumps(_public(payload)).encode("utf-8")
+        encoding = (
+            _content_encoding(self.headers) if self.server.mock.compress else None
+        )
+        if encoding == "gzip":
+            data = gzip.compress(data)
+        elif encoding == "deflate":
+            data = zlib.compress(data)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = do_PUT = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _content_encoding(headers):
+    accepted = [
+        value.split(";")[0].strip()
+        for value in (headers.get("Accept-Encoding") or "").split(",")
+    ]
+    return next((e for e in ("gzip", "deflate") if e in accepted), None)
+
+
+def _public(payload):
+    """Strips private bookkeeping keys of operations"""
+    if isinstance(payload, dict):
+        return {k: _public(v) for k, v in payload.items() if not k.startswith("_")}
+    if isinstance(payload, list):
+        return [_public(item) for item in payload]
+    return payload
+
+
+_ORIGINAL_CALL_API = None
+
+
+def original_call_api():
+    """Returns unpatched `fusion.ApiClient.call_api`.
+
+    Functional tests replace the method on the class for the whole test
+    session, so a fresh copy of the SDK module is loaded to get it back.
+    """
+    global _ORIGINAL_CALL_API
+    if _ORIGINAL_CALL_API is None:
+        spec = importlib.util.find_spec("fusion.api_client")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _ORIGINAL_CALL_API = module.ApiClient.call_api
+    return _ORIGINAL_CALL_API
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0, help="seconds")
+    parser.add_argument("--retry-in", type=int, default=0, help="milliseconds")
+    parser.add_argument("--operation-polls", type=int, default=0)
+    parser.add_argument(
+        "--no-compress", action="store_true", help="never compress responses"
+    )
+    args = parser.parse_args()
+
+    server = MockFusionServer(
+        latency=args.latency,
+        retry_in=args.retry_in,
+        operation_polls=args.operation_polls,
+        host=args.host,
+        port=args.port,
+        compress=not args.no_compress,
+    )
+    print("Serving Fusion API mock, set FUSION_API_HOST={0}".format(server.url))
+    server._httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
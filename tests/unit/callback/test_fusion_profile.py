@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from ansible_collections.purestorage.fusion.plugins.callback.fusion_profile import (
+    CallbackModule,
+)
+
+
+def stats(requests, bytes_received=0, operation_waits=0, poll_sleep=0, retries=0):
+    return {
+        "requests": requests,
+        "request_count": sum(requests.values()),
+        "bytes_sent": 10,
+        "bytes_received": bytes_received,
+        "operation_waits": operation_waits,
+        "poll_sleep": poll_sleep,
+        "retries": retries,
+    }
+
+
+def task_result(uuid, name, result, host="localhost"):
+    task = MagicMock(_uuid=uuid, action="purestorage.fusion.fusion_volume")
+    task.get_name.return_value = name
+    task.get_path.return_value = "playbook.yml:1"
+    host_mock = MagicMock()
+    host_mock.get_name.return_value = host
+    return MagicMock(_result=result, _task=task, _host=host_mock)
+
+
+@pytest.fixture
+def callback(tmp_path):
+    options = {"output_file": str(tmp_path / "profile.json"), "sort_by": "requests"}
+    callback = CallbackModule()
+    callback.get_option = options.get
+    callback._display = MagicMock()
+    callback.options = options
+    return callback
+
+
+def test_aggregates_per_task(callback):
+    callback.v2_runner_on_ok(
+        task_result(
+            "1",
+            "Create volumes",
+            {
+                "results": [
+                    {"fusion_api_stats": stats({"VolumesApi": 2}, operation_waits=1)},
+                    {"fusion_api_stats": stats({"VolumesApi": 3}, poll_sleep=2)},
+                    {"skipped": True},
+                ]
+            },
+        )
+    )
+    callback.v2_runner_on_failed(
+        task_result(
+            "1",
+            "Create volumes",
+            {"fusion_api_stats": stats({"OperationsApi": 1}, retries=1)},
+            host="other",
+        )
+    )
+    callback.v2_runner_on_ok(
+        task_result("2", "Info", {"fusion_api_stats": stats({"TenantsApi": 10})})
+    )
+    # results of other modules are ignored
+    callback.v2_runner_on_ok(task_result("3", "Debug", {"msg": "hello"}))
+
+    summary = callback.summary()
+
+    assert [task["name"] for task in summary["tasks"]] == ["Info", "Create volumes"]
+    create = summary["tasks"][1]
+    assert create["invocations"] == 3
+    assert create["hosts"] == ["localhost", "other"]
+    assert create["requests"] == {"VolumesApi": 5, "OperationsApi": 1}
+    assert create["request_count"] == 6
+    assert create["bytes_sent"] == 30
+    assert create["operation_waits"] == 1
+    assert create["poll_sleep"] == 2
+    assert create["retries"] == 1
+    assert summary["playbook"]["request_count"] == 16
+    assert summary["playbook"]["invocations"] == 4
+    assert summary["playbook"]["requests"] == {
+        "VolumesApi": 5,
+        "OperationsApi": 1,
+        "TenantsApi": 10,
+    }
+
+
+def test_sort_by(callback):
+    callback.options["sort_by"] = "poll_sleep"
+    callback.v2_runner_on_ok(
+        task_result("1", "Many requests", {"fusion_api_stats": stats({"A": 10})})
+    )
+    callback.v2_runner_on_ok(
+        task_result(
+            "2", "Long waits", {"fusion_api_stats": stats({"A": 1}, poll_sleep=30)}
+        )
+    )
+
+    assert [task["name"] for task in callback.summary()["tasks"]] == [
+        "Long waits",
+        "Many requests",
+    ]
+
+
+def test_playbook_stats(callback):
+    callback.v2_runner_on_ok(
+        task_result(
+            "1",
+            "Info",
+            {"fusion_api_stats": stats({"TenantsApi": 2}, bytes_received=2048)},
+        )
+    )
+
+    callback.v2_playbook_on_stats(MagicMock())
+
+    lines = [call.args[0] for call in callback._display.display.call_args_list]
+    assert lines[1].split() == ["Info", "1", "2", "0.0", "2.0", "2.0", "0", "0s", "0"]
+    assert lines[2].split()[0] == "TOTAL"
+    assert lines[3] == "Requests by API: TenantsApi=2"
+    with open(callback.options["output_file"]) as f:
+        written = json.load(f)
+    assert written["tasks"][0]["requests"] == {"TenantsApi": 2}
+    assert written["playbook"]["bytes_received"] == 2048
+
+
+def test_playbook_stats_compressed(callback):
+    compressed = dict(stats({"VolumesApi": 1}, bytes_received=1024), bytes_decoded=8192)
+    callback.v2_runner_on_ok(task_result("1", "Info", {"fusion_api_stats": compressed}))
+
+    callback.v2_playbook_on_stats(MagicMock())
+
+    lines = [call.args[0] for call in callback._display.display.call_args_list]
+    assert lines[1].split()[3:6] == ["0.0", "1.0", "8.0"]
+    assert callback.summary()["playbook"]["bytes_decoded"] == 8192
+
+
+def test_playbook_stats_without_fusion_tasks(callback):
+    callback.v2_playbook_on_stats(MagicMock())
+
+    callback._display.display.assert_not_called()
+
+
+def test_output_file_not_writable(callback, tmp_path):
+    callback.options["output_file"] = str(tmp_path / "missing" / "profile.json")
+    callback.v2_runner_on_ok(
+        task_result("1", "Info", {"fusion_api_stats": stats({"TenantsApi": 2})})
+    )
+
+    callback.v2_playbook_on_stats(MagicMock())
+
+    callback._display.warning.assert_called_once()
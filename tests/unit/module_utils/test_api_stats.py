@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import io
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import urllib3
+from ansible_collections.purestorage.fusion.plugins.module_utils.api_stats import (
+    ApiStats,
+    CountingRequest,
+    get_api_stats,
+    install_api_stats,
+    report_api_stats,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.request_cache import (
+    RequestCache,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.retry import (
+    install_retries,
+)
+from ansible_collections.purestorage.fusion.tests.mock_server import (
+    original_call_api,
+)
+
+
+def response(data=b"", headers=None):
+    return MagicMock(data=data, headers=headers or {})
+
+
+def test_counting_request():
+    stats = ApiStats()
+    request = MagicMock(return_value=response(b"0123456789"))
+    counting = CountingRequest(request, stats)
+
+    counting("POST", "https://fusion/tenants", body='{"name": "t1"}', headers={})
+    counting("GET", "https://fusion/tenants", fields=[], preload_content=True)
+
+    request.assert_called_with(
+        "GET", "https://fusion/tenants", body=None, fields=[], preload_content=True
+    )
+    assert stats.as_dict() == {
+        "requests": {"other": 2},
+        "request_count": 2,
+        "bytes_sent": 14,
+        "bytes_received": 20,
+        "bytes_decoded": 20,
+        "operation_waits": 0,
+        "poll_sleep": 0,
+        "retries": 0,
+    }
+
+
+def test_counting_request_streamed_response():
+    stats = ApiStats()
+    streamed = MagicMock()
+    streamed.read.return_value = b"0123456789"
+    streamed.tell.side_effect = [0, 4]
+    counting = CountingRequest(MagicMock(return_value=streamed), stats)
+
+    counting("GET", "https://fusion/volumes", preload_content=False)
+
+    # reading data would consume the stream, it is counted once the caller reads
+    assert "read" not in [name for name, _args, _kwargs in streamed.mock_calls]
+    assert stats.bytes_received == 0
+
+    assert streamed.read(cache_content=True) == b"0123456789"
+    assert stats.bytes_received == 4
+    assert stats.bytes_decoded == 10
+
+
+def test_counting_request_compressed_response():
+    stats = ApiStats()
+    data = b'{"items": []}' * 100
+    compressed = urllib3.HTTPResponse(
+        body=io.BytesIO(gzip.compress(data)),
+        headers={"Content-Encoding": "gzip"},
+        preload_content=True,
+    )
+    counting = CountingRequest(MagicMock(return_value=compressed), stats)
+
+    counting("GET", "https://fusion/volumes", preload_content=True)
+
+    assert stats.bytes_decoded == len(data)
+    assert stats.bytes_received == len(gzip.compress(data))
+    assert stats.bytes_received < stats.bytes_decoded
+
+
+def test_api_class_of_request():
+    client = purefusion.ApiClient()
+    stats = install_api_stats(client)
+    client.rest_client.pool_manager.request._request = MagicMock(
+        return_value=MagicMock(status=200, reason="OK", data=b"{}", headers={})
+    )
+
+    # functional tests replace call_api globally
+    with patch.object(purefusion.api_client.ApiClient, "call_api", original_call_api()):
+        purefusion.DefaultApi(client).get_version()
+
+    assert stats.requests == {"DefaultApi": 1}
+
+
+def test_install_api_stats_once():
+    client = purefusion.ApiClient()
+
+    stats = install_api_stats(client)
+
+    assert install_api_stats(client) is stats
+    assert get_api_stats(client) is stats
+    assert not isinstance(
+        client.rest_client.pool_manager.request._request, CountingRequest
+    )
+
+
+def test_get_api_stats_of_mock():
+    assert get_api_stats(MagicMock()) is None
+
+
+def test_report_api_stats():
+    client = purefusion.ApiClient()
+    install_retries(client)
+    client.call_api = RequestCache(client.call_api)
+    stats = install_api_stats(client)
+    stats.add_request("VolumesApi", 1)
+    stats.add_received(2, 6)
+    stats.add_operation_waits(3)
+    stats.add_poll_sleep(4)
+    client.call_api._call_api.retries = 5
+    module = MagicMock()
+    exit_json = module.exit_json
+
+    report_api_stats(module, client)
+    module.exit_json(changed=True)
+
+    exit_json.assert_called_once_with(
+        changed=True,
+        fusion_api_stats={
+            "requests": {"VolumesApi": 1},
+            "request_count": 1,
+            "bytes_sent": 1,
+            "bytes_received": 2,
+            "bytes_decoded": 6,
+            "operation_waits": 3,
+            "poll_sleep": 4,
+            "retries": 5,
+        },
+    )
+
+
+def test_report_api_stats_not_counted():
+    module = MagicMock()
+    exit_json = module.exit_json
+
+    report_api_stats(module, purefusion.ApiClient())
+
+    assert module.exit_json is exit_json
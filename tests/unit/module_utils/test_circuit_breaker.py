@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+import urllib3
+from ansible_collections.purestorage.fusion.plugins.module_utils.circuit_breaker import (
+    STATE_LIFETIME,
+    CircuitBreaker,
+    CircuitBreakerCall,
+    get_circuit_breaker_config,
+    install_circuit_breaker,
+    is_connection_failure,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    CircuitOpenError,
+    format_fusion_exception,
+)
+
+circuit_breaker_module = (
+    "ansible_collections.purestorage.fusion.plugins.module_utils.circuit_breaker"
+)
+
+
+def connection_error():
+    return urllib3.exceptions.MaxRetryError(None, "/tenants", "connection refused")
+
+
+@pytest.fixture
+def now():
+    clock = MagicMock(return_value=1000.0)
+    with patch(
+        f"{circuit_breaker_module}.time.time",
+        clock,
+    ):
+        yield clock
+
+
+@pytest.fixture
+def breaker(tmp_path):
+    return CircuitBreaker("https://fusion", 3, 30, str(tmp_path / "state"))
+
+
+@pytest.mark.parametrize(
+    ("environ", "expected"),
+    [
+        ({}, (5, 30)),
+        ({"FUSION_CIRCUIT_BREAKER_THRESHOLD": "2"}, (2, 30)),
+        (
+            {
+                "FUSION_CIRCUIT_BREAKER_THRESHOLD": "2",
+                "FUSION_CIRCUIT_BREAKER_COOLDOWN": "1.5",
+            },
+            (2, 1.5),
+        ),
+        ({"FUSION_CIRCUIT_BREAKER_THRESHOLD": "0"}, None),
+    ],
+)
+def test_get_circuit_breaker_config(environ, expected):
+    assert get_circuit_breaker_config(environ) == expected
+
+
+@pytest.mark.parametrize(
+    "environ",
+    [
+        {"FUSION_CIRCUIT_BREAKER_THRESHOLD": "-1"},
+        {"FUSION_CIRCUIT_BREAKER_THRESHOLD": "many"},
+        {"FUSION_CIRCUIT_BREAKER_COOLDOWN": "-5"},
+        {"FUSION_CIRCUIT_BREAKER_COOLDOWN": "long"},
+    ],
+)
+def test_get_circuit_breaker_config_invalid(environ):
+    with pytest.raises(ValueError):
+        get_circuit_breaker_config(environ)
+
+
+@pytest.mark.parametrize(
+    ("exception", "expected"),
+    [
+        (connection_error(), True),
+        (urllib3.exceptions.ReadTimeoutError(None, "/tenants", "timed out"), True),
+        (purefusion.rest.ApiException(status=0, reason="SSL error"), True),
+        (purefusion.rest.ApiException(status=503), False),
+        (purefusion.rest.ApiException(status=404), False),
+        (ValueError("bug"), False),
+    ],
+)
+def test_is_connection_failure(exception, expected):
+    assert is_connection_failure(exception) is expected
+
+
+def test_opens_after_threshold(breaker, now):
+    for _i in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_request()
+    assert "https://fusion" in str(excinfo.value)
+    assert "3 consecutive connection failures" in str(excinfo.value)
+    assert "30 more seconds" in str(excinfo.value)
+
+
+def test_success_resets_failures(breaker, now):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+
+    breaker.before_request()
+
+
+def test_single_probe_after_cooldown(breaker, now):
+    for _i in range(3):
+        breaker.record_failure()
+
+    now.return_value = 1031.0
+    # the probe goes through, others keep failing fast
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    # successful probe closes the circuit
+    breaker.record_success()
+    breaker.before_request()
+    breaker.before_request()
+
+
+def test_failed_probe_reopens(breaker, now):
+    for _i in range(3):
+        breaker.record_failure()
+
+    now.return_value = 1031.0
+    breaker.before_request()
+    breaker.record_failure()
+
+    now.return_value = 1060.0
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    now.return_value = 1062.0
+    breaker.before_request()
+
+
+def test_state_forgotten_after_lifetime(breaker, now):
+    for _i in range(3):
+        breaker.record_failure()
+
+    # e.g. the next run, long after the failures
+    now.return_value = 1000.0 + 30 + STATE_LIFETIME + 1
+    breaker.before_request()
+    breaker.record_failure()
+    breaker.before_request()
+
+
+def test_closed_circuit_not_written(breaker, now):
+    call = CircuitBreakerCall(MagicMock(return_value="response"), breaker)
+
+    with patch(f"{circuit_breaker_module}.locked_state") as locked_state:
+        for _i in range(3):
+            assert call("/tenants", "GET") == "response"
+
+    locked_state.assert_not_called()
+
+
+def test_state_shared_by_breakers(tmp_path, now):
+    path = str(tmp_path / "state")
+    first = CircuitBreaker("https://fusion", 2, 30, path)
+    second = CircuitBreaker("https://fusion", 2, 30, path)
+
+    first.record_failure()
+    second.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        first.before_request()
+
+
+def test_corrupted_state(tmp_path, now):
+    path = tmp_path / "state"
+    path.write_text('{"failures": "many", "opened_at": null}')
+    breaker = CircuitBreaker("https://fusion", 2, 30, str(path))
+
+    breaker.before_request()
+
+
+def test_call_records_outcome(breaker, now):
+    call_api = MagicMock(
+        side_effect=[
+            connection_error(),
+            purefusion.rest.ApiException(status=500),
+            connection_error(),
+            connection_error(),
+            connection_error(),
+        ]
+    )
+    call = CircuitBreakerCall(call_api, breaker)
+
+    with pytest.raises(urllib3.exceptions.MaxRetryError):
+        call("/tenants", "GET")
+    # server responded, even though with an error
+    with pytest.raises(purefusion.rest.ApiException):
+        call("/tenants", "GET")
+    for _i in range(3):
+        with pytest.raises(urllib3.exceptions.MaxRetryError):
+            call("/tenants", "GET")
+
+    with pytest.raises(CircuitOpenError):
+        call("/tenants", "GET")
+    assert call_api.call_count == 5
+
+
+def test_install_circuit_breaker(tmp_path):
+    client = MagicMock()
+    client.configuration.host = "https://fusion"
+    call_api = client.call_api
+
+    with patch(
+        f"{circuit_breaker_module}.get_state_file",
+        return_value=str(tmp_path / "state"),
+    ):
+        install_circuit_breaker(client, 3, 30)
+        install_circuit_breaker(client, 3, 30)
+
+    assert isinstance(client.call_api, CircuitBreakerCall)
+    assert client.call_api._call_api is call_api
+    assert client.call_api.breaker.threshold == 3
+
+
+def test_format_circuit_open_error():
+    assert format_fusion_exception(CircuitOpenError("unavailable")) == "unavailable"
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils.compact_table import (
+    CompactTable,
+    expand,
+)
+
+
+def test_compact_table():
+    table = CompactTable(
+        ("name", "tenant", "addresses"), shared=("tenant", "addresses")
+    )
+    table.add("v1", "t1", ["10.0.0.1"])
+    table.add("v2", "t1", ["10.0.0.1"])
+    table.add("v3", "t2", None)
+
+    assert len(table) == 3
+    assert table.as_dict() == {
+        "fields": ["name", "tenant", "addresses"],
+        "shared": ["tenant", "addresses"],
+        "values": ["t1", ["10.0.0.1"], "t2"],
+        "rows": [["v1", 0, 1], ["v2", 0, 1], ["v3", 2, None]],
+    }
+
+
+def test_compact_table_shares_equal_values():
+    table = CompactTable(("tenant",), shared=("tenant",))
+    for name in ("t1", "t2", "t1", "t2"):
+        table.add("".join(name))
+
+    assert table.values == ["t1", "t2"]
+    assert table.rows == [[0], [1], [0], [1]]
+
+
+def test_compact_table_wrong_row():
+    table = CompactTable(("name", "tenant"))
+
+    with pytest.raises(ValueError):
+        table.add("v1")
+
+
+def test_expand():
+    rows = [
+        {"name": "v1", "tenant": "t1", "size": 1},
+        {"name": "v2", "tenant": "t1", "size": 2},
+        {"name": "v3", "tenant": None, "size": 3},
+    ]
+    table = CompactTable(("name", "tenant", "size"), shared=("tenant",))
+    for row in rows:
+        table.add(row["name"], row["tenant"], row["size"])
+
+    assert expand(table.as_dict()) == rows
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import fusion as purefusion
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils.compression import (
+    get_compression,
+    install_compression,
+)
+
+
+@pytest.mark.parametrize(
+    "environ,expected",
+    [
+        ({}, True),
+        ({"FUSION_COMPRESSION": ""}, True),
+        ({"FUSION_COMPRESSION": "true"}, True),
+        ({"FUSION_COMPRESSION": "false"}, False),
+        ({"FUSION_COMPRESSION": "0"}, False),
+        ({"FUSION_COMPRESSION": "no"}, False),
+    ],
+)
+def test_get_compression(environ, expected):
+    assert get_compression(environ) is expected
+
+
+def test_get_compression_invalid():
+    with pytest.raises(ValueError) as excinfo:
+        get_compression({"FUSION_COMPRESSION": "sometimes"})
+    assert "FUSION_COMPRESSION" in str(excinfo.value)
+
+
+def test_install_compression():
+    client = install_compression(purefusion.ApiClient())
+
+    assert client.default_headers["Accept-Encoding"] == "gzip, deflate"
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils.concurrency import (
+    run_concurrently,
+    run_graph,
+    walk_concurrently,
+)
+
+
+def test_run_concurrently_keeps_order():
+    results = run_concurrently(lambda x: x * 2, [3, 1, 2])
+    assert results == [(3, 6, None), (1, 2, None), (2, 4, None)]
+
+
+def test_run_concurrently_empty():
+    assert run_concurrently(lambda x: x, []) == []
+
+
+def test_run_concurrently_collects_exceptions():
+    def func(x):
+        if x == 2:
+            raise ValueError("boom")
+        return x
+
+    results = run_concurrently(func, [1, 2, 3])
+    assert [r[1] for r in results] == [1, None, 3]
+    assert results[0][2] is None
+    assert isinstance(results[1][2], ValueError)
+    assert results[2][2] is None
+
+
+def test_run_concurrently_respects_limit():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def func(x):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        # time.sleep() is mocked globally by other tests
+        threading.Event().wait(0.01)
+        with lock:
+            running[0] -= 1
+        return x
+
+    results = run_concurrently(func, range(20), concurrency=3)
+    assert [r[1] for r in results] == list(range(20))
+    assert 1 < peak[0] <= 3
+
+
+def test_run_concurrently_serial():
+    thread_ids = set()
+
+    def func(x):
+        thread_ids.add(threading.get_ident())
+        return x
+
+    run_concurrently(func, range(5), concurrency=1)
+    assert thread_ids == {threading.get_ident()}
+
+
+def test_run_graph_respects_dependencies():
+    lock = threading.Lock()
+    order = []
+
+    def step(name):
+        def _run():
+            with lock:
+                order.append(name)
+            return name.upper()
+
+        return _run
+
+    steps = {
+        "pg": (step("pg"), []),
+        "pp": (step("pp"), []),
+        "volume1": (step("volume1"), ["pg", "pp"]),
+        "volume2": (step("volume2"), ["pg"]),
+        "hap": (step("hap"), ["volume1", "volume2"]),
+    }
+    results, failures, skipped = run_graph(steps, concurrency=3)
+
+    assert results == {name: name.upper() for name in steps}
+    assert failures == {}
+    assert skipped == []
+    assert order.index("volume1") > order.index("pg")
+    assert order.index("volume1") > order.index("pp")
+    assert order.index("volume2") > order.index("pg")
+    assert order[-1] == "hap"
+
+
+def test_run_graph_runs_independent_steps_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    steps = dict((i, (barrier.wait, [])) for i in range(3))
+
+    # would time out if the steps ran one by one
+    results, failures, skipped = run_graph(steps, concurrency=3)
+
+    assert sorted(results) == [0, 1, 2]
+    assert failures == {}
+
+
+def test_run_graph_skips_dependents_of_failed():
+    def fail():
+        raise ValueError("boom")
+
+    steps = {
+        "a": (fail, []),
+        "b": (lambda: "b", ["a"]),
+        "c": (lambda: "c", ["b"]),
+        "d": (lambda: "d", []),
+        "e": (lambda: "e", ["d", "c"]),
+    }
+    results, failures, skipped = run_graph(steps)
+
+    assert results == {"d": "d"}
+    assert list(failures) == ["a"]
+    assert isinstance(failures["a"], ValueError)
+    assert sorted(skipped) == ["b", "c", "e"]
+
+
+def test_run_graph_empty():
+    assert run_graph({}) == ({}, {}, [])
+
+
+def test_run_graph_cycle():
+    called = []
+    steps = {
+        "a": (lambda: called.append("a"), []),
+        "b": (lambda: called.append("b"), ["c"]),
+        "c": (lambda: called.append("c"), ["b"]),
+    }
+    with pytest.raises(ValueError, match="b, c"):
+        run_graph(steps)
+    assert called == []
+
+
+def test_run_graph_unknown_dependency():
+    with pytest.raises(ValueError, match="unknown step 'b'"):
+        run_graph({"a": (lambda: None, ["b"])})
+
+
+def test_walk_concurrently_walks_children():
+    tree = {"a": ["b", "c"], "b": ["d"], "c": [], "d": []}
+
+    results = list(walk_concurrently(lambda node: (node.upper(), tree[node]), ["a"]))
+
+    assert sorted(results) == [(node, node.upper(), None) for node in "abcd"]
+    assert results[0] == ("a", "A", None)
+
+
+def test_walk_concurrently_skips_children_of_failed():
+    def func(node):
+        if node == "b":
+            raise ValueError("boom")
+        return node, {"a": ["b", "c"], "b": ["d"], "c": []}[node]
+
+    results = dict((node, exc) for node, _result, exc in walk_concurrently(func, ["a"]))
+
+    assert sorted(results) == ["a", "b", "c"]
+    assert isinstance(results["b"], ValueError)
+
+
+def test_walk_concurrently_respects_limit():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def func(node):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        threading.Event().wait(0.01)
+        with lock:
+            running[0] -= 1
+        # binary tree of 31 nodes
+        return None, [node * 2 + 1, node * 2 + 2] if node < 15 else []
+
+    nodes = [node for node, _result, _exc in walk_concurrently(func, [0], 3)]
+
+    assert sorted(nodes) == list(range(31))
+    assert 1 < peak[0] <= 3
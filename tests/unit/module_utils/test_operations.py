@@ -34,7 +34,7 @@ current_module = (
 
 
 class TestAwaitOperations:
-    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
     def test_await_success_op(self, mock_op_api):
         """
         Should return operation
@@ -57,7 +57,7 @@ class TestAwaitOperations:
         assert op == op1
         mock_op_api_obj.get_operation.assert_called_once_with(op.id)
 
-    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
     def test_await_failed_op(self, mock_op_api):
         """
         Should raise OperationException
@@ -87,7 +87,7 @@ class TestAwaitOperations:
             )
             mock_op_api_obj.get_operation.assert_called_once_with(op.id)
 
-    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
     def test_await_pending_op(self, mock_op_api):
         """
         Should return operation
@@ -112,7 +112,7 @@ class TestAwaitOperations:
         calls = [call(op1.id), call(op1.id)]
         mock_op_api_obj.get_operation.assert_has_calls(calls)
 
-    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
     def test_await_failed_pending_op(self, mock_op_api):
         """
         Should raise OperationException
@@ -144,7 +144,7 @@ class TestAwaitOperations:
             calls = [call(op1.id), call(op1.id)]
             mock_op_api_obj.get_operation.assert_has_calls(calls)
 
-    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
     def test_await_api_exception(self, mock_op_api):
         """
         Should raise ApiException
@@ -174,7 +174,7 @@ class TestAwaitOperations:
             )
             mock_op_api_obj.get_operation.assert_called_once_with(op)
 
-    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
     def test_await_http_exception(self, mock_op_api):
         """
         Should raise OperationException
@@ -204,7 +204,7 @@ class TestAwaitOperations:
             )
             mock_op_api_obj.get_operation.assert_called_once_with(op)
 
-    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
     def test_await_failed_op_without_failing(self, mock_op_api):
         """
         Should return failed operation
@@ -228,3 +228,196 @@ class TestAwaitOperations:
         # Assertions
         assert op_res == op
         mock_op_api_obj.get_operation.assert_called_once_with(op.id)
+
+
+class TestAwaitOperations:
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
+    def test_await_multiple_ops(self, mock_op_api):
+        """
+        Should return finished operations in the order they were given
+        """
+        # Mock operations
+        op1 = OperationMock("1", OperationStatus.PENDING)
+        op2 = OperationMock("2", OperationStatus.PENDING)
+        polled = {
+            "1": [
+                OperationMock("1", OperationStatus.PENDING, retry_in=3000),
+                OperationMock("1", OperationStatus.SUCCEDED),
+            ],
+            "2": [OperationMock("2", OperationStatus.SUCCEDED)],
+        }
+
+        # Mock operations api
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = Mock(side_effect=lambda id: polled[id].pop(0))
+
+        # Mock fusion
+        fusion_mock = MagicMock()
+
+        # Test function
+        time.sleep.reset_mock()
+        ops = operations.await_operations(fusion_mock, [op1, op2])
+
+        # Assertions
+        assert [op.id for op in ops] == ["1", "2"]
+        assert all(op.status == OperationStatus.SUCCEDED for op in ops)
+        assert mock_op_api_obj.get_operation.call_count == 3
+        time.sleep.assert_called_once_with(3)
+
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
+    def test_await_multiple_ops_failed(self, mock_op_api):
+        """
+        Should raise OperationException
+        """
+        # Mock operations
+        op1 = OperationMock("1", OperationStatus.SUCCEDED)
+        op2 = OperationMock("2", OperationStatus.FAILED)
+
+        # Mock operations api
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = Mock(
+            side_effect=lambda id: {"1": op1, "2": op2}[id]
+        )
+
+        # Mock fusion
+        fusion_mock = MagicMock()
+
+        # Test function
+        with pytest.raises(OperationException) as exception:
+            operations.await_operations(fusion_mock, [op1, op2])
+
+        # Assertions
+        assert exception.value.op == op2
+
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
+    def test_await_multiple_ops_failed_without_failing(self, mock_op_api):
+        """
+        Should return failed operations too
+        """
+        # Mock operations
+        op1 = OperationMock("1", OperationStatus.SUCCEDED)
+        op2 = OperationMock("2", OperationStatus.FAILED)
+
+        # Mock operations api
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = Mock(
+            side_effect=lambda id: {"1": op1, "2": op2}[id]
+        )
+
+        # Mock fusion
+        fusion_mock = MagicMock()
+
+        # Test function
+        ops = operations.await_operations(
+            fusion_mock, [op1, op2], fail_playbook_if_operation_fails=False
+        )
+
+        # Assertions
+        assert ops == [op1, op2]
+
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
+    def test_await_multiple_ops_http_exception(self, mock_op_api):
+        """
+        Should raise OperationException
+        """
+        # Mock operation
+        op = OperationMock("1", OperationStatus.PENDING)
+
+        # Mock operations api
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = Mock(side_effect=HTTPError())
+
+        # Mock fusion
+        fusion_mock = MagicMock()
+
+        # Test function
+        with pytest.raises(OperationException) as exception:
+            operations.await_operations(fusion_mock, [op])
+
+        # Assertions
+        assert exception.value.op == op
+        assert isinstance(exception.value.http_error, HTTPError)
+
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
+    def test_await_no_ops(self, mock_op_api):
+        """
+        Should return empty list without polling
+        """
+        # Mock operations api
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+
+        # Test function
+        assert operations.await_operations(MagicMock(), []) == []
+
+        # Assertions
+        mock_op_api_obj.get_operation.assert_not_called()
+
+
+class TestSubmitAndAwait:
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
+    def test_submit_and_await(self, mock_op_api):
+        """
+        Should return exceptions of failed submits and failed operations
+        in order of items
+        """
+        # Mock operations
+        ops = {
+            "a": OperationMock("1", OperationStatus.SUCCEDED),
+            "c": OperationMock("3", OperationStatus.FAILED),
+        }
+
+        def submit(item):
+            if item == "b":
+                raise ApiExceptionsMockGenerator.create_conflict()
+            return ops[item]
+
+        # Mock operations api
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = Mock(
+            side_effect=lambda id: {"1": ops["a"], "3": ops["c"]}[id]
+        )
+
+        # Test function
+        results = operations.submit_and_await(MagicMock(), ["a", "b", "c"], submit)
+
+        # Assertions
+        assert [item for item, _exc in results] == ["a", "b", "c"]
+        assert results[0][1] is None
+        assert isinstance(results[1][1], purefusion.rest.ApiException)
+        assert isinstance(results[2][1], OperationException)
+        assert results[2][1].op == ops["c"]
+        assert mock_op_api_obj.get_operation.call_count == 2
+
+
+class TestOperationFinished:
+    @patch(f"{current_module}.operations.operation_finished")
+    @patch(f"{current_module}.operations.purefusion.OperationsApi")
+    def test_shared_cache_told_when_operations_finish(
+        self, mock_op_api, operation_finished_mock
+    ):
+        """
+        Should tell the shared cache about every finished operation
+        """
+        op1 = OperationMock("1", OperationStatus.SUCCEDED)
+        op2 = OperationMock("2", OperationStatus.FAILED)
+        mock_op_api.return_value.get_operation = Mock(
+            side_effect=lambda id: {"1": op1, "2": op2}[id]
+        )
+        fusion_mock = MagicMock()
+
+        operations.await_operation(fusion_mock, op1)
+        operations.await_operations(
+            fusion_mock, [op1, op2], fail_playbook_if_operation_fails=False
+        )
+
+        assert operation_finished_mock.call_args_list == [
+            call(fusion_mock, op1),
+            call(fusion_mock, op1),
+            call(fusion_mock, op2),
+        ]
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils.org_snapshot import (
+    FORMAT,
+    Checkpoint,
+    Snapshot,
+    SnapshotWriter,
+    read_checkpoint,
+    resource_key,
+)
+
+
+def write_snapshot(path, chunk_size=2):
+    writer = SnapshotWriter(str(path), chunk_size)
+    writer.add("tenants", [{"name": "t1"}])
+    writer.add("volumes", [{"name": "v{0}".format(i)} for i in range(5)])
+    writer.add("tenants", [{"name": "t2"}])
+    writer.close()
+    return writer
+
+
+@pytest.mark.parametrize("name", ["org.jsonl", "org.jsonl.gz"])
+def test_round_trip(tmp_path, name):
+    writer = write_snapshot(tmp_path / name)
+
+    snapshot = Snapshot(str(tmp_path / name))
+
+    assert snapshot.id == writer.id
+    assert snapshot.header["format"] == FORMAT
+    assert snapshot.counts["volumes"] == 5
+    assert list(snapshot.chunks(["tenants"])) == [
+        ("tenants", [{"name": "t1"}]),
+        ("tenants", [{"name": "t2"}]),
+    ]
+    # 5 volumes in chunks of 2
+    assert [len(records) for _kind, records in snapshot.chunks(["volumes"])] == [
+        2,
+        2,
+        1,
+    ]
+    assert [path.name for path in tmp_path.iterdir()] == [name]
+
+
+def test_compressed(tmp_path):
+    write_snapshot(tmp_path / "org.jsonl.gz")
+
+    assert (tmp_path / "org.jsonl.gz").read_bytes()[:2] == b"\x1f\x8b"
+
+
+def test_abort(tmp_path):
+    writer = SnapshotWriter(str(tmp_path / "org.jsonl"))
+    writer.add("tenants", [{"name": "t1"}])
+    writer.abort()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "mangle,message",
+    [
+        (lambda lines: lines[:-1], "incomplete"),
+        (lambda lines: lines[:2] + lines[3:], "incomplete"),
+        (lambda lines: lines + [lines[1]], "follows the end"),
+        (
+            lambda lines: lines[:1] + ['{"kind": "tenants"'] + lines[1:],
+            "not valid JSON",
+        ),
+        (
+            lambda lines: lines[:1] + ['{"kind": "users", "items": []}'] + lines[1:],
+            "line 2",
+        ),
+        (lambda lines: lines[1:], "not a Fusion organization snapshot"),
+        (
+            lambda lines: [json.dumps(dict(json.loads(lines[0]), version=2))]
+            + lines[1:],
+            "version 2 is not supported",
+        ),
+    ],
+)
+def test_invalid(tmp_path, mangle, message):
+    path = tmp_path / "org.jsonl"
+    write_snapshot(path)
+    lines = path.read_text().splitlines()
+    path.write_text("\n".join(mangle(lines)) + "\n")
+
+    with pytest.raises(ValueError, match=message):
+        Snapshot(str(path))
+
+
+def test_resource_key():
+    assert resource_key("tenants", {"name": "t1"}) == "tenants/t1"
+    assert (
+        resource_key("volumes", {"tenant": "t1", "tenant_space": "ts1", "name": "v1"})
+        == "volumes/t1/ts1/v1"
+    )
+    assert (
+        resource_key(
+            "role_assignments", {"role": "r", "principal": "p", "scope": "/tenants/t1"}
+        )
+        == "role_assignments/r/p//tenants/t1"
+    )
+
+
+def test_checkpoint(tmp_path):
+    path = tmp_path / "org.checkpoint"
+
+    checkpoint = Checkpoint(str(path), "s1")
+    checkpoint.add(["tenants/t1", "tenants/t2"])
+    checkpoint.add([])
+
+    assert read_checkpoint(str(path), "s1") == {"tenants/t1", "tenants/t2"}
+    # a line cut short by a crash
+    with open(str(path), "a") as f:
+        f.write('"tenants/t')
+    resumed = Checkpoint(str(path), "s1")
+    assert resumed.done == {"tenants/t1", "tenants/t2"}
+    resumed.add(["tenants/t3"])
+    assert read_checkpoint(str(path), "s1") == {
+        "tenants/t1",
+        "tenants/t2",
+        "tenants/t3",
+    }
+    resumed.remove()
+    assert not path.exists()
+
+
+def test_checkpoint_empty_file(tmp_path):
+    path = tmp_path / "org.checkpoint"
+    path.write_bytes(b"")
+
+    checkpoint = Checkpoint(str(path), "s1")
+    checkpoint.add(["tenants/t1"])
+
+    assert checkpoint.done == {"tenants/t1"}
+    assert Checkpoint(str(path), "s1").done == {"tenants/t1"}
+
+
+def test_checkpoint_of_other_snapshot(tmp_path):
+    path = tmp_path / "org.checkpoint"
+    Checkpoint(str(path), "s1").add(["tenants/t1"])
+
+    with pytest.raises(ValueError, match="does not belong to snapshot s2"):
+        read_checkpoint(str(path), "s2")
+    assert read_checkpoint(str(tmp_path / "missing"), "s2") == set()
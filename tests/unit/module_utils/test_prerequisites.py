@@ -7,10 +7,18 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+from ansible_collections.purestorage.fusion.plugins.module_utils import prerequisites
 from ansible_collections.purestorage.fusion.plugins.module_utils.prerequisites import (
+    _check_import,
+    _package_version,
     _parse_version,
     _parse_version_requirements,
     _version_satisfied,
+    lazy_import,
 )
 
 import pytest
@@ -114,3 +122,104 @@ def test_version_satisfied():
     assert _version_satisfied("1.0", "!=1.0.0") is False
     assert _version_satisfied("1.0.1", "!=1.0") is False
     assert _version_satisfied("1.0", "!=1.0") is False
+
+
+def test_lazy_import():
+    with patch.object(
+        prerequisites.importlib,
+        "import_module",
+        wraps=prerequisites.importlib.import_module,
+    ) as import_module:
+        module = lazy_import("json")
+        import_module.assert_not_called()
+
+        assert module.dumps([1]) == "[1]"
+        assert module.loads("[1]") == [1]
+        import_module.assert_called_once_with("json")
+
+
+def test_lazy_import_missing_module():
+    module = lazy_import("no_such_module_for_test")
+    with pytest.raises(ImportError):
+        module.anything
+
+
+@pytest.fixture
+def installed_package(tmp_path, monkeypatch):
+    """Fake package 'fake-pkg' providing imported module 'fake_module'"""
+    (tmp_path / "fake_module").mkdir()
+    (tmp_path / "fake_module" / "__init__.py").write_text("")
+    (tmp_path / "fake_pkg-1.2.3.dist-info").mkdir()
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(
+        prerequisites,
+        "get_state_file",
+        lambda prefix, key: str(tmp_path / (prefix + "state")),
+    )
+    return tmp_path / "fake_pkg-1.2.3.dist-info"
+
+
+@pytest.fixture
+def installed_location(installed_package):
+    return str(installed_package.parent / "fake_module" / "__init__.py")
+
+
+def test_package_version_cached(installed_package, installed_location):
+    with patch.object(
+        prerequisites, "_read_version", return_value="1.2.3"
+    ) as read_version:
+        assert _package_version(installed_location, "fake-pkg") == "1.2.3"
+        assert _package_version(installed_location, "fake-pkg") == "1.2.3"
+        assert read_version.call_count == 1
+
+
+def test_package_version_read_after_reinstall(installed_package, installed_location):
+    with patch.object(
+        prerequisites, "_read_version", return_value="1.2.3"
+    ) as read_version:
+        _package_version(installed_location, "fake-pkg")
+        stat = os.stat(installed_package)
+        os.utime(installed_package, (stat.st_atime, stat.st_mtime + 10))
+        read_version.return_value = "1.2.4"
+
+        assert _package_version(installed_location, "fake-pkg") == "1.2.4"
+        assert read_version.call_count == 2
+
+
+def test_package_version_without_dist_info(installed_package, installed_location):
+    installed_package.rmdir()
+    with patch.object(
+        prerequisites, "_read_version", return_value="1.2.3"
+    ) as read_version:
+        assert _package_version(installed_location, "fake-pkg") == "1.2.3"
+        assert _package_version(installed_location, "fake-pkg") == "1.2.3"
+        assert read_version.call_count == 2
+
+
+def test_check_import_does_not_import(installed_package):
+    module = MagicMock()
+    with patch.object(
+        prerequisites, "_read_version", return_value="1.2.3"
+    ) as read_version:
+        _check_import(module, "fake_module", "fake-pkg", ">=1.0")
+
+    module.fail_json.assert_not_called()
+    read_version.assert_called_once_with("fake-pkg")
+    assert "fake_module" not in sys.modules
+
+
+@pytest.mark.parametrize(
+    "name,version,message",
+    [
+        ("no_such_module_for_test", "1.2.3", "required and missing"),
+        ("fake_module", "0.9", "does not satisfy requirements"),
+    ],
+)
+def test_check_import_fails(installed_package, name, version, message):
+    module = MagicMock()
+    module.fail_json.side_effect = SystemExit
+    with patch.object(prerequisites, "_read_version", return_value=version):
+        with pytest.raises(SystemExit):
+            _check_import(module, name, "fake-pkg", ">=1.0")
+
+    assert message in module.fail_json.call_args.kwargs["msg"]
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils import rate_limit
+from ansible_collections.purestorage.fusion.plugins.module_utils.rate_limit import (
+    RateLimitedCall,
+    RateLimiter,
+    get_rate_limit,
+    install_rate_limiter,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.state_file import (
+    get_state_file,
+)
+
+current_module = (
+    "ansible_collections.purestorage.fusion.tests.unit.module_utils.test_rate_limit"
+)
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+
+
+@pytest.fixture
+def fake_time():
+    fake = FakeTime()
+    with patch(f"{current_module}.rate_limit.time", fake):
+        yield fake
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    return str(tmp_path / "bucket")
+
+
+@pytest.mark.parametrize(
+    ("environ", "expected"),
+    [
+        ({}, None),
+        ({"FUSION_RATE_LIMIT": ""}, None),
+        ({"FUSION_RATE_LIMIT": "0"}, None),
+        ({"FUSION_RATE_LIMIT": "10"}, (10.0, 10.0)),
+        ({"FUSION_RATE_LIMIT": "0.5"}, (0.5, 1.0)),
+        ({"FUSION_RATE_LIMIT": "10", "FUSION_RATE_LIMIT_BURST": "25"}, (10.0, 25.0)),
+    ],
+)
+def test_get_rate_limit(environ, expected):
+    assert get_rate_limit(environ) == expected
+
+
+@pytest.mark.parametrize(
+    "environ",
+    [
+        {"FUSION_RATE_LIMIT": "fast"},
+        {"FUSION_RATE_LIMIT": "10", "FUSION_RATE_LIMIT_BURST": "lots"},
+        {"FUSION_RATE_LIMIT": "10", "FUSION_RATE_LIMIT_BURST": "0.5"},
+    ],
+)
+def test_get_rate_limit_invalid(environ):
+    with pytest.raises(ValueError):
+        get_rate_limit(environ)
+
+
+def test_burst_then_smoothed(fake_time, state_file):
+    limiter = RateLimiter(2, 3, state_file)
+
+    # full bucket lets the burst through immediately
+    assert [limiter.acquire() for _i in range(3)] == [0, 0, 0]
+    # then every request waits for its own slot
+    assert limiter.acquire() == pytest.approx(0.5)
+    assert limiter.acquire() == pytest.approx(1.0)
+    assert fake_time.slept == [pytest.approx(0.5), pytest.approx(1.0)]
+
+
+def test_refill(fake_time, state_file):
+    limiter = RateLimiter(2, 3, state_file)
+    for _i in range(3):
+        limiter.acquire()
+
+    fake_time.now += 1
+    assert [limiter.acquire() for _i in range(2)] == [0, 0]
+    assert limiter.acquire() > 0
+
+    # refill never exceeds burst
+    fake_time.now += 3600
+    assert [limiter.acquire() for _i in range(3)] == [0, 0, 0]
+    assert limiter.acquire() > 0
+
+
+def test_shared_between_limiters(fake_time, state_file):
+    """Limiters of different processes share the bucket through the state file"""
+    first = RateLimiter(1, 2, state_file)
+    second = RateLimiter(1, 2, state_file)
+
+    assert first.acquire() == 0
+    assert second.acquire() == 0
+    assert first.acquire() == pytest.approx(1)
+    assert second.acquire() == pytest.approx(2)
+
+
+def test_corrupted_state_file(fake_time, state_file):
+    with open(state_file, "w") as f:
+        f.write("garbage")
+
+    limiter = RateLimiter(1, 1, state_file)
+    assert limiter.acquire() == 0
+    with open(state_file) as f:
+        assert json.load(f) == {"tokens": 0, "updated": 1000.0}
+
+
+def test_clock_going_backwards(fake_time, state_file):
+    limiter = RateLimiter(1, 1, state_file)
+    limiter.acquire()
+
+    fake_time.now -= 100
+    assert limiter.acquire() == pytest.approx(1)
+
+
+def test_rate_limited_call():
+    call_api = MagicMock(return_value="response")
+    limiter = MagicMock()
+    wrapped = RateLimitedCall(call_api, limiter)
+
+    assert wrapped("/path", "GET", query_params=[]) == "response"
+    limiter.acquire.assert_called_once_with()
+    call_api.assert_called_once_with("/path", "GET", query_params=[])
+
+
+def test_install_rate_limiter():
+    client = purefusion.api_client.ApiClient()
+
+    install_rate_limiter(client, 5, 10)
+    install_rate_limiter(client, 5, 10)
+
+    assert isinstance(client.call_api, RateLimitedCall)
+    assert not isinstance(client.call_api._call_api, RateLimitedCall)
+    assert client.call_api.limiter.rate == 5
+    assert client.call_api.limiter.burst == 10
+    assert client.call_api.limiter.state_file == get_state_file(
+        rate_limit.STATE_FILE_PREFIX, client.configuration.host
+    )
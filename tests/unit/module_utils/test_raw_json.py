@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils import raw_json
+from ansible_collections.purestorage.fusion.plugins.module_utils.raw_json import (
+    list_items_raw,
+    loads,
+)
+
+
+class RawResponse:
+    def __init__(self, data):
+        self.data = data
+        self.released = False
+
+    def release_conn(self):
+        self.released = True
+
+
+def volumes_api(response):
+    client = purefusion.ApiClient()
+    client.call_api = MagicMock(return_value=response)
+    return purefusion.VolumesApi(client)
+
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_loads(has_orjson):
+    if has_orjson and not raw_json.HAS_ORJSON:
+        pytest.skip("orjson is not installed")
+    with patch.object(raw_json, "HAS_ORJSON", has_orjson):
+        assert loads(b'{"items": [{"name": "v1"}]}') == {"items": [{"name": "v1"}]}
+        assert loads('{"size": 1}') == {"size": 1}
+
+
+def test_list_items_raw():
+    response = RawResponse(b'{"count": 1, "items": [{"name": "v1"}]}')
+    api = volumes_api(response)
+
+    items = list_items_raw(api.list_volumes, tenant_name="t1", tenant_space_name="ts1")
+
+    assert items == [{"name": "v1"}]
+    assert response.released
+    args, kwargs = api.api_client.call_api.call_args
+    assert args[2] == {"tenant_name": "t1", "tenant_space_name": "ts1"}
+    assert kwargs["_preload_content"] is False
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"not json", b'{"name": "v1"}', b'{"items": null}', b"[]"],
+)
+def test_list_items_raw_not_listing(data):
+    response = RawResponse(data)
+    api = volumes_api(response)
+
+    items = list_items_raw(api.list_volumes, tenant_name="t1", tenant_space_name="ts1")
+
+    assert items is None
+    assert response.released
+
+
+def test_list_items_raw_mocked_api():
+    list_volumes = MagicMock()
+
+    assert list_items_raw(list_volumes, tenant_name="t1") is None
+    list_volumes.assert_not_called()
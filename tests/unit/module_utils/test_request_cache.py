@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock
+
+import fusion as purefusion
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils.request_cache import (
+    RequestCache,
+    install_request_cache,
+)
+
+VOLUME_PATH = (
+    "/tenants/{tenant_name}/tenant-spaces/{tenant_space_name}/volumes/{volume_name}"
+)
+VOLUMES_PATH = "/tenants/{tenant_name}/tenant-spaces/{tenant_space_name}/volumes"
+
+
+def volume_params(volume_name="volume1"):
+    return {
+        "tenant_name": "tenant1",
+        "tenant_space_name": "tenant_space1",
+        "volume_name": volume_name,
+    }
+
+
+@pytest.fixture
+def call_api():
+    responses = iter(range(1000))
+    return MagicMock(side_effect=lambda *args, **kwargs: next(responses))
+
+
+def test_get_is_memoized(call_api):
+    cache = RequestCache(call_api)
+
+    first = cache(VOLUME_PATH, "GET", volume_params(), [], response_type="Volume")
+    second = cache(VOLUME_PATH, "GET", volume_params(), [], response_type="Volume")
+
+    assert first == second
+    assert call_api.call_count == 1
+
+
+def test_get_different_args(call_api):
+    cache = RequestCache(call_api)
+
+    cache(VOLUME_PATH, "GET", volume_params("volume1"), [])
+    cache(VOLUME_PATH, "GET", volume_params("volume2"), [])
+    cache(VOLUMES_PATH, "GET", volume_params(), [("name", "volume1")])
+    cache(VOLUMES_PATH, "GET", volume_params(), [("name", "volume2")])
+
+    assert call_api.call_count == 4
+
+
+@pytest.mark.parametrize(
+    ("write_path", "write_params"),
+    [
+        (VOLUME_PATH, volume_params()),
+        (VOLUMES_PATH, volume_params()),
+        ("/tenants/{tenant_name}", {"tenant_name": "tenant1"}),
+    ],
+)
+@pytest.mark.parametrize("method", ["POST", "PATCH", "DELETE"])
+def test_write_invalidates_related(call_api, method, write_path, write_params):
+    cache = RequestCache(call_api)
+
+    first = cache(VOLUME_PATH, "GET", volume_params(), [])
+    cache(write_path, method, write_params, [], body=MagicMock())
+    second = cache(VOLUME_PATH, "GET", volume_params(), [])
+
+    assert first != second
+    assert call_api.call_count == 3
+
+
+def test_write_invalidates_collection(call_api):
+    cache = RequestCache(call_api)
+
+    first = cache(VOLUMES_PATH, "GET", volume_params(), [])
+    cache(VOLUME_PATH, "PATCH", volume_params(), [], body=MagicMock())
+    second = cache(VOLUMES_PATH, "GET", volume_params(), [])
+
+    assert first != second
+
+
+def test_write_keeps_unrelated(call_api):
+    cache = RequestCache(call_api)
+
+    first = cache(VOLUME_PATH, "GET", volume_params("volume1"), [])
+    cache(VOLUME_PATH, "DELETE", volume_params("volume2"), [])
+    cache(VOLUME_PATH, "DELETE", volume_params("volume10"), [])
+    second = cache(VOLUME_PATH, "GET", volume_params("volume1"), [])
+
+    assert first == second
+    assert call_api.call_count == 3
+
+
+def test_operations_are_not_cached(call_api):
+    cache = RequestCache(call_api)
+
+    cache("/operations/{id}", "GET", {"id": "op1"}, [])
+    cache("/operations/{id}", "GET", {"id": "op1"}, [])
+
+    assert call_api.call_count == 2
+
+
+def test_raw_responses_are_not_cached(call_api):
+    cache = RequestCache(call_api)
+
+    cache(VOLUME_PATH, "GET", volume_params(), [], _preload_content=False)
+    cache(VOLUME_PATH, "GET", volume_params(), [], _preload_content=False)
+
+    assert call_api.call_count == 2
+
+
+def test_errors_are_not_cached():
+    call_api = MagicMock(side_effect=[purefusion.rest.ApiException(status=404), 1])
+    cache = RequestCache(call_api)
+
+    with pytest.raises(purefusion.rest.ApiException):
+        cache(VOLUME_PATH, "GET", volume_params(), [])
+    assert cache(VOLUME_PATH, "GET", volume_params(), []) == 1
+
+
+def test_arguments_are_passed_through(call_api):
+    cache = RequestCache(call_api)
+
+    cache(
+        VOLUME_PATH,
+        "GET",
+        volume_params(),
+        [],
+        {"Accept": "application/json"},
+        response_type="Volume",
+        auth_settings=["accessToken"],
+        _return_http_data_only=True,
+    )
+
+    call_api.assert_called_once_with(
+        VOLUME_PATH,
+        "GET",
+        path_params=volume_params(),
+        query_params=[],
+        header_params={"Accept": "application/json"},
+        body=None,
+        post_params=None,
+        files=None,
+        response_type="Volume",
+        auth_settings=["accessToken"],
+        async_req=None,
+        _return_http_data_only=True,
+        collection_formats=None,
+        _preload_content=True,
+        _request_timeout=None,
+    )
+
+
+def test_install_request_cache():
+    client = purefusion.api_client.ApiClient()
+
+    install_request_cache(client)
+    install_request_cache(client)
+
+    assert isinstance(client.call_api, RequestCache)
+    assert not isinstance(client.call_api._call_api, RequestCache)
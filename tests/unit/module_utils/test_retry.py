@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils import retry
+from ansible_collections.purestorage.fusion.plugins.module_utils.retry import (
+    RetryingCall,
+    get_max_retries,
+    install_retries,
+    parse_retry_after,
+)
+
+current_module = (
+    "ansible_collections.purestorage.fusion.tests.unit.module_utils.test_retry"
+)
+
+
+def api_exception(status, headers=None):
+    exc = purefusion.rest.ApiException(status=status)
+    exc.headers = headers
+    return exc
+
+
+@pytest.fixture
+def sleep():
+    with patch(f"{current_module}.retry.time.sleep") as sleep_mock:
+        yield sleep_mock
+
+
+@pytest.mark.parametrize(
+    ("environ", "expected"),
+    [
+        ({}, 5),
+        ({"FUSION_MAX_RETRIES": ""}, 5),
+        ({"FUSION_MAX_RETRIES": "0"}, 0),
+        ({"FUSION_MAX_RETRIES": "10"}, 10),
+    ],
+)
+def test_get_max_retries(environ, expected):
+    assert get_max_retries(environ) == expected
+
+
+@pytest.mark.parametrize("value", ["-1", "often"])
+def test_get_max_retries_invalid(value):
+    with pytest.raises(ValueError):
+        get_max_retries({"FUSION_MAX_RETRIES": value})
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("3", 3),
+        (" 1.5 ", 1.5),
+        ("-5", 0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0),
+        ("soon", None),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_date():
+    with patch(f"{current_module}.retry.time.time", return_value=1445412470):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 10
+
+
+@pytest.mark.parametrize("status", [429, 502, 503, 504])
+def test_get_retried(sleep, status):
+    call_api = MagicMock(side_effect=[api_exception(status), "response"])
+    wrapped = RetryingCall(call_api)
+
+    assert wrapped("/volumes", "GET", query_params=[]) == "response"
+    assert call_api.call_count == 2
+    assert wrapped.retries == 1
+    sleep.assert_called_once()
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 409, 500])
+def test_not_transient_not_retried(sleep, status):
+    call_api = MagicMock(side_effect=api_exception(status))
+    wrapped = RetryingCall(call_api)
+
+    with pytest.raises(purefusion.rest.ApiException):
+        wrapped("/volumes", "GET")
+    assert call_api.call_count == 1
+    assert wrapped.retries == 0
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH", "DELETE"])
+def test_write_not_retried(sleep, method):
+    call_api = MagicMock(side_effect=api_exception(503))
+    wrapped = RetryingCall(call_api)
+
+    with pytest.raises(purefusion.rest.ApiException):
+        wrapped("/volumes", method, {}, [], {"Accept": "application/json"})
+    assert call_api.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_write_with_request_id_retried(sleep):
+    call_api = MagicMock(side_effect=[api_exception(503), "op"])
+    wrapped = RetryingCall(call_api)
+
+    assert wrapped("/volumes", "POST", header_params={"X-Request-ID": "abc"}) == "op"
+    assert call_api.call_count == 2
+
+
+def test_gives_up(sleep):
+    call_api = MagicMock(side_effect=api_exception(429))
+    wrapped = RetryingCall(call_api, max_retries=3)
+
+    with pytest.raises(purefusion.rest.ApiException):
+        wrapped("/operations/{id}", "GET", {"id": "op1"})
+    assert call_api.call_count == 4
+    assert wrapped.retries == 3
+
+
+def test_backoff_capped(sleep):
+    call_api = MagicMock(side_effect=api_exception(502))
+    wrapped = RetryingCall(call_api, max_retries=8)
+
+    with patch(f"{current_module}.retry.random.uniform", side_effect=lambda a, b: b):
+        with pytest.raises(purefusion.rest.ApiException):
+            wrapped("/volumes", "GET")
+
+    assert [c.args[0] for c in sleep.call_args_list] == [1, 2, 4, 8, 16, 30, 30, 30]
+
+
+def test_retry_after_honored(sleep):
+    call_api = MagicMock(
+        side_effect=[
+            api_exception(429, {"retry-after": "7"}),
+            api_exception(503, {"Retry-After": "1000"}),
+            "response",
+        ]
+    )
+    wrapped = RetryingCall(call_api)
+
+    assert wrapped("/volumes", "GET") == "response"
+    assert [c.args[0] for c in sleep.call_args_list] == [7, retry.RETRY_AFTER_MAX]
+
+
+def test_install_retries():
+    client = purefusion.api_client.ApiClient()
+    install_retries(client, 0)
+    assert not isinstance(client.call_api, RetryingCall)
+
+    install_retries(client, 3)
+    install_retries(client, 3)
+    assert isinstance(client.call_api, RetryingCall)
+    assert not isinstance(client.call_api._call_api, RetryingCall)
+    assert client.call_api.max_retries == 3
+
+
+def test_retries_counted_across_threads(sleep):
+    failed = threading.local()
+
+    def call_api(resource_path, method, **kwargs):
+        # every thread gets a transient failure first
+        if not getattr(failed, "once", False):
+            failed.once = True
+            raise api_exception(503)
+        return "response"
+
+    wrapped = RetryingCall(call_api)
+    threads = [
+        threading.Thread(target=wrapped, args=("/volumes", "GET")) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert wrapped.retries == 8
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils import shared_cache
+from ansible_collections.purestorage.fusion.plugins.module_utils.shared_cache import (
+    DEFAULT_TTLS,
+    SharedCache,
+    get_shared_cache_config,
+    install_shared_cache,
+    resource_kind,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.operation_mock import (
+    OperationMock,
+    OperationStatus,
+)
+
+REGION = {"id": "1", "name": "r1", "self_link": "/regions/r1", "display_name": "R1"}
+
+
+class RawResponse:
+    def __init__(self, payload):
+        self.data = json.dumps(payload).encode("utf-8")
+        self.released = False
+
+    def release_conn(self):
+        self.released = True
+
+
+def raw_call_api(payload=REGION):
+    def _call(resource_path, method, **kwargs):
+        if kwargs["_preload_content"]:
+            return "not cached"
+        return RawResponse(payload), 200, {"Content-Type": "application/json"}
+
+    return MagicMock(side_effect=_call)
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+@pytest.fixture
+def client(cache_file):
+    config = purefusion.Configuration()
+    config.host = "https://fusion.example.com/api/1.2"
+    client = purefusion.ApiClient(config)
+    client.call_api = raw_call_api()
+    return install_shared_cache(client, cache_file, dict(DEFAULT_TTLS))
+
+
+def test_get_shared_cache_config():
+    assert get_shared_cache_config({}) is None
+    assert get_shared_cache_config({"FUSION_CACHE_FILE": "/tmp/c"}) == (
+        "/tmp/c",
+        DEFAULT_TTLS,
+    )
+    path, ttls = get_shared_cache_config(
+        {"FUSION_CACHE_FILE": "/tmp/c", "FUSION_CACHE_TTL": "30"}
+    )
+    assert set(ttls.values()) == {30}
+    path, ttls = get_shared_cache_config(
+        {
+            "FUSION_CACHE_FILE": "/tmp/c",
+            "FUSION_CACHE_TTL": "storage_classes=60, regions=0",
+        }
+    )
+    assert ttls["storage-classes"] == 60
+    assert ttls["regions"] == 0
+    assert ttls["hardware-types"] == DEFAULT_TTLS["hardware-types"]
+
+
+@pytest.mark.parametrize("ttl", ["-1", "soon", "volumes=60", "regions=x"])
+def test_get_shared_cache_config_invalid(ttl):
+    with pytest.raises(ValueError) as excinfo:
+        get_shared_cache_config(
+            {"FUSION_CACHE_FILE": "/tmp/c", "FUSION_CACHE_TTL": ttl}
+        )
+    assert "FUSION_CACHE_TTL" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    "path,kind",
+    [
+        ("/", None),
+        ("/regions", "regions"),
+        ("/regions/r1", "regions"),
+        ("/regions/r1/availability-zones", "availability-zones"),
+        ("/storage-services/ss1/storage-classes/sc1", "storage-classes"),
+        ("/tenants/t1/tenant-spaces/ts1/volumes", "volumes"),
+    ],
+)
+def test_resource_kind(path, kind):
+    assert resource_kind(path) == kind
+
+
+def test_read_through(client, cache_file):
+    region = purefusion.RegionsApi(client).get_region("r1")
+    assert region.name == "r1"
+    assert client.call_api._call_api.call_count == 1
+
+    # another module run with its own client
+    other = purefusion.ApiClient(client.configuration)
+    other.call_api = raw_call_api(payload={})
+    install_shared_cache(other, cache_file, dict(DEFAULT_TTLS))
+    region, status, _headers = purefusion.RegionsApi(other).get_region_with_http_info(
+        "r1"
+    )
+
+    assert isinstance(region, purefusion.Region)
+    assert region.display_name == "R1"
+    assert status == 200
+    other.call_api._call_api.assert_not_called()
+    assert other.call_api.hits == 1
+
+
+def test_not_cached_kinds(client):
+    result = purefusion.TenantsApi(client).get_tenant("t1")
+
+    assert result == "not cached"
+    assert client.call_api._call_api.call_args.kwargs["_preload_content"] is True
+
+
+def test_expired(client):
+    purefusion.RegionsApi(client).get_region("r1")
+    with patch.object(shared_cache.time, "time", return_value=10**10):
+        purefusion.RegionsApi(client).get_region("r1")
+
+    assert client.call_api._call_api.call_count == 2
+
+
+def test_hosts_cached_separately(client, cache_file):
+    purefusion.RegionsApi(client).get_region("r1")
+    config = purefusion.Configuration()
+    config.host = "https://other.example.com/api/1.2"
+    other = purefusion.ApiClient(config)
+    other.call_api = raw_call_api()
+    install_shared_cache(other, cache_file, dict(DEFAULT_TTLS))
+
+    purefusion.RegionsApi(other).get_region("r1")
+
+    other.call_api._call_api.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "written,invalidated",
+    [
+        ("/regions/r1", True),
+        ("/regions/r1/availability-zones", True),
+        ("/regions", True),
+        ("/regions/r10", False),
+        ("/storage-services/ss1", False),
+    ],
+)
+def test_invalidated_by_writes(client, written, invalidated):
+    regions_api = purefusion.RegionsApi(client)
+    regions_api.get_region("r1")
+
+    client.call_api(written, "PATCH", _return_http_data_only=True)
+    regions_api.get_region("r1")
+
+    gets = [c for c in client.call_api._call_api.call_args_list if c.args[1] == "GET"]
+    assert len(gets) == (2 if invalidated else 1)
+
+
+def in_thread(func):
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+
+
+def test_used_from_worker_threads(client):
+    """Requests are sent from worker threads of run_concurrently() too"""
+    regions_api = purefusion.RegionsApi(client)
+
+    # the cache is opened by a worker thread first
+    in_thread(lambda: regions_api.get_region("r1"))
+    regions_api.get_region("r1")
+    assert client.call_api.hits == 1
+
+    # a write from a worker thread invalidates the entry
+    in_thread(
+        lambda: client.call_api("/regions/r1", "PATCH", _return_http_data_only=True)
+    )
+    regions_api.get_region("r1")
+
+    gets = [c for c in client.call_api._call_api.call_args_list if c.args[1] == "GET"]
+    assert len(gets) == 2
+
+
+def test_cache_file_error(tmp_path):
+    client = purefusion.ApiClient()
+    client.call_api = raw_call_api()
+    install_shared_cache(client, str(tmp_path / "missing" / "cache"), DEFAULT_TTLS)
+
+    for dummy in range(2):
+        assert purefusion.RegionsApi(client).get_region("r1").name == "r1"
+    assert client.call_api._call_api.call_count == 2
+
+
+def test_install_shared_cache_once(client, cache_file):
+    call_api = client.call_api
+
+    install_shared_cache(client, cache_file, DEFAULT_TTLS)
+
+    assert client.call_api is call_api
+    assert isinstance(call_api, SharedCache)
+
+
+def test_invalidated_when_operation_finishes(client, cache_file):
+    """A module run caching the old state while an operation of another run
+    is running must not serve it after the operation finished"""
+    operation = OperationMock("op1", OperationStatus.PENDING)
+    client.call_api._call_api.side_effect = None
+    client.call_api._call_api.return_value = operation
+    client.call_api("/regions/r1", "PATCH", _return_http_data_only=True)
+
+    # another module run reads the region before the operation finishes
+    other = purefusion.ApiClient(client.configuration)
+    other.call_api = raw_call_api(payload=dict(REGION, display_name="old"))
+    install_shared_cache(other, cache_file, dict(DEFAULT_TTLS))
+    assert purefusion.RegionsApi(other).get_region("r1").display_name == "old"
+
+    shared_cache.operation_finished(client, operation)
+
+    # the old state is not served any more
+    other.call_api._call_api = raw_call_api()
+    assert purefusion.RegionsApi(other).get_region("r1").display_name == "R1"
+    other.call_api._call_api.assert_called_once()
+    # the path is invalidated only once
+    shared_cache.operation_finished(client, operation)
+    purefusion.RegionsApi(other).get_region("r1")
+    other.call_api._call_api.assert_called_once()
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+from ansible_collections.purestorage.fusion.plugins.module_utils import (
+    operations,
+    snapshots,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.operation_mock import (
+    OperationMock,
+    OperationStatus,
+)
+
+current_module = (
+    "ansible_collections.purestorage.fusion.tests.unit.module_utils.test_snapshots"
+)
+
+
+def snapshot(name, destroyed=False):
+    snap = MagicMock()
+    snap.name = name
+    snap.tenant.name = "tenant1"
+    snap.tenant_space.name = "tenant_space1"
+    snap.destroyed = destroyed
+    return snap
+
+
+def snapshot_call(name):
+    return call(
+        tenant_name="tenant1",
+        tenant_space_name="tenant_space1",
+        snapshot_name=name,
+    )
+
+
+class TestDeleteSnapshots:
+    @patch(f"{current_module}.operations.await_operations")
+    def test_delete_snapshots(self, await_operations_mock):
+        """
+        Should destroy all snapshots first, then eradicate them
+        """
+        snaps = [snapshot("snap1"), snapshot("snap2"), snapshot("snap3", True)]
+        snapshots_api = MagicMock()
+        snapshots_api.update_snapshot = MagicMock(
+            side_effect=lambda **kwargs: OperationMock(
+                "destroy-" + kwargs["snapshot_name"], OperationStatus.PENDING
+            )
+        )
+        snapshots_api.delete_snapshot = MagicMock(
+            side_effect=lambda **kwargs: OperationMock(
+                "delete-" + kwargs["snapshot_name"], OperationStatus.PENDING
+            )
+        )
+        await_operations_mock.side_effect = lambda fusion, ops, **kwargs: [
+            OperationMock(op.id, OperationStatus.SUCCEDED) for op in ops
+        ]
+
+        failures = snapshots.delete_snapshots(MagicMock(), snaps, snapshots_api)
+
+        assert failures == {}
+        patch_body = purefusion.SnapshotPatch(
+            destroyed=purefusion.NullableBoolean(True)
+        )
+        snapshots_api.update_snapshot.assert_has_calls(
+            [
+                call(
+                    body=patch_body,
+                    tenant_name="tenant1",
+                    tenant_space_name="tenant_space1",
+                    snapshot_name="snap1",
+                ),
+                call(
+                    body=patch_body,
+                    tenant_name="tenant1",
+                    tenant_space_name="tenant_space1",
+                    snapshot_name="snap2",
+                ),
+            ],
+            any_order=True,
+        )
+        # already destroyed snapshot is only eradicated
+        assert snapshots_api.update_snapshot.call_count == 2
+        snapshots_api.delete_snapshot.assert_has_calls(
+            [snapshot_call("snap1"), snapshot_call("snap2"), snapshot_call("snap3")],
+            any_order=True,
+        )
+        # operations of each phase are awaited together
+        assert await_operations_mock.call_count == 2
+        destroy_ops = await_operations_mock.call_args_list[0][0][1]
+        delete_ops = await_operations_mock.call_args_list[1][0][1]
+        assert sorted(op.id for op in destroy_ops) == ["destroy-snap1", "destroy-snap2"]
+        assert sorted(op.id for op in delete_ops) == [
+            "delete-snap1",
+            "delete-snap2",
+            "delete-snap3",
+        ]
+
+    @patch(f"{current_module}.operations.await_operations")
+    def test_delete_snapshots_failures(self, await_operations_mock):
+        """
+        Should report failures per snapshot and not eradicate snapshots which
+        were not destroyed
+        """
+        snaps = [snapshot("snap1"), snapshot("snap2"), snapshot("snap3")]
+
+        def update_snapshot(**kwargs):
+            if kwargs["snapshot_name"] == "snap1":
+                raise ApiExceptionsMockGenerator.create_conflict()
+            return OperationMock(
+                "destroy-" + kwargs["snapshot_name"], OperationStatus.PENDING
+            )
+
+        snapshots_api = MagicMock()
+        snapshots_api.update_snapshot = MagicMock(side_effect=update_snapshot)
+        snapshots_api.delete_snapshot = MagicMock(
+            side_effect=lambda **kwargs: OperationMock(
+                "delete-" + kwargs["snapshot_name"], OperationStatus.PENDING
+            )
+        )
+
+        def await_operations(fusion, ops, **kwargs):
+            result = []
+            for op in ops:
+                status = (
+                    OperationStatus.FAILED
+                    if op.id == "destroy-snap2"
+                    else OperationStatus.SUCCEDED
+                )
+                finished = OperationMock(op.id, status)
+                finished.request_type = "UpdateSnapshot"
+                finished.error = MagicMock(
+                    message="snapshot is busy", pure_code=None, http_code=409
+                )
+                result.append(finished)
+            return result
+
+        await_operations_mock.side_effect = await_operations
+
+        failures = snapshots.delete_snapshots(MagicMock(), snaps, snapshots_api)
+
+        assert sorted(failures) == ["snap1", "snap2"]
+        assert "snapshot is busy" in failures["snap2"]
+        snapshots_api.delete_snapshot.assert_called_once_with(
+            tenant_name="tenant1",
+            tenant_space_name="tenant_space1",
+            snapshot_name="snap3",
+        )
+
+    @patch(f"{current_module}.operations.await_operations")
+    def test_delete_no_snapshots(self, await_operations_mock):
+        """
+        Should do nothing
+        """
+        snapshots_api = MagicMock()
+
+        assert snapshots.delete_snapshots(MagicMock(), [], snapshots_api) == {}
+
+        snapshots_api.update_snapshot.assert_not_called()
+        snapshots_api.delete_snapshot.assert_not_called()
+        await_operations_mock.assert_not_called()
+
+    def test_format_snapshot_failures(self):
+        msg = snapshots.format_snapshot_failures({"b": "error 2", "a": "error 1"})
+        assert msg == "Failed to delete 2 snapshot(s): 'a': error 1; 'b': error 2"
+
+
+class TestCreateSnapshots:
+    @patch(f"{current_module}.operations.await_operations")
+    def test_create_snapshots(self, await_operations_mock):
+        """
+        Should submit all snapshots before awaiting them together and report
+        failures by tenant, tenant space and name
+        """
+        specs = [
+            {
+                "tenant": "tenant1",
+                "tenant_space": "tenant_space1",
+                "name": "snap1",
+                "display_name": None,
+                "placement_group": "pg1",
+                "volumes": None,
+            },
+            {
+                "tenant": "tenant1",
+                "tenant_space": "tenant_space2",
+                "name": "snap1",
+                "display_name": "Snapshot 1",
+                "placement_group": None,
+                "volumes": ["volume1", "volume2"],
+            },
+        ]
+
+        def create_snapshot(body, tenant_name, tenant_space_name):
+            if tenant_space_name == "tenant_space2":
+                raise ApiExceptionsMockGenerator.create_conflict()
+            return OperationMock("create-" + body.name, OperationStatus.PENDING)
+
+        snapshots_api = MagicMock()
+        snapshots_api.create_snapshot = MagicMock(side_effect=create_snapshot)
+        await_operations_mock.side_effect = lambda fusion, ops, **kwargs: [
+            OperationMock(op.id, OperationStatus.SUCCEDED) for op in ops
+        ]
+
+        failures = snapshots.create_snapshots(MagicMock(), specs, snapshots_api)
+
+        assert list(failures) == [("tenant1", "tenant_space2", "snap1")]
+        snapshots_api.create_snapshot.assert_has_calls(
+            [
+                call(
+                    purefusion.SnapshotPost(
+                        name="snap1", display_name="snap1", placement_group="pg1"
+                    ),
+                    tenant_name="tenant1",
+                    tenant_space_name="tenant_space1",
+                ),
+                call(
+                    purefusion.SnapshotPost(
+                        name="snap1",
+                        display_name="Snapshot 1",
+                        volumes=["volume1", "volume2"],
+                    ),
+                    tenant_name="tenant1",
+                    tenant_space_name="tenant_space2",
+                ),
+            ],
+            any_order=True,
+        )
+        await_operations_mock.assert_called_once()
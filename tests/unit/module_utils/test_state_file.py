@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import patch
+
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils.state_file import (
+    get_state_file,
+    locked_state,
+    read_state,
+)
+
+
+def test_state_file_per_host():
+    host = "https://api.pure1.purestorage.com/fusion"
+    assert get_state_file("prefix-", host) == get_state_file("prefix-", host)
+    assert get_state_file("prefix-", "https://host1") != get_state_file(
+        "prefix-", "https://host2"
+    )
+    assert get_state_file("first-", host) != get_state_file("second-", host)
+
+
+def test_state_file_per_user():
+    host = "https://api.pure1.purestorage.com/fusion"
+    with patch("os.getuid", return_value=1000):
+        first = get_state_file("prefix-", host)
+    with patch("os.getuid", return_value=1001):
+        second = get_state_file("prefix-", host)
+
+    assert first != second
+
+
+def test_locked_state(tmp_path):
+    path = str(tmp_path / "state")
+
+    with locked_state(path) as state:
+        assert state == {}
+        state["counter"] = 1
+
+    with locked_state(path) as state:
+        state["counter"] += 1
+
+    with open(path) as f:
+        assert json.load(f) == {"counter": 2}
+
+
+def test_locked_state_not_written_on_error(tmp_path):
+    path = str(tmp_path / "state")
+    with locked_state(path) as state:
+        state["counter"] = 1
+
+    with pytest.raises(ValueError):
+        with locked_state(path) as state:
+            state["counter"] = 2
+            raise ValueError()
+
+    with locked_state(path) as state:
+        assert state == {"counter": 1}
+
+
+@pytest.mark.parametrize("content", ["garbage", "[1, 2]", ""])
+def test_locked_state_corrupted(tmp_path, content):
+    path = tmp_path / "state"
+    path.write_text(content)
+
+    with locked_state(str(path)) as state:
+        assert state == {}
+
+
+def test_locked_state_unchanged_not_rewritten(tmp_path):
+    path = tmp_path / "state"
+    path.write_text('{"counter": 1}')
+    mtime = path.stat().st_mtime_ns
+
+    with locked_state(str(path)) as state:
+        assert state == {"counter": 1}
+
+    assert path.stat().st_mtime_ns == mtime
+    assert path.read_text() == '{"counter": 1}'
+
+
+def test_locked_state_empty_not_rewritten(tmp_path):
+    path = tmp_path / "state"
+
+    with locked_state(str(path)) as state:
+        assert state == {}
+
+    assert path.read_text() == ""
+
+
+def test_locked_state_cannot_open(tmp_path):
+    """State of another user, or in a missing directory, is not shared"""
+    path = str(tmp_path / "missing" / "state")
+
+    with locked_state(path) as state:
+        state["counter"] = 1
+
+    with locked_state(path) as state:
+        assert state == {}
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [('{"counter": 1}', {"counter": 1}), ("garbage", {}), (None, {})],
+)
+def test_read_state(tmp_path, content, expected):
+    path = tmp_path / "state"
+    if content is not None:
+        path.write_text(content)
+
+    assert read_state(str(path)) == expected
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2024, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock
+
+import fusion as purefusion
+import pytest
+from ansible_collections.purestorage.fusion.plugins.module_utils.tracing import (
+    SPAN_AWAIT,
+    SPAN_REQUEST,
+    Tracer,
+    TracingCall,
+    get_trace_file,
+    get_tracer,
+    install_tracing,
+    trace_span,
+)
+
+
+def read_spans(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    return str(tmp_path / "trace.jsonl")
+
+
+@pytest.fixture
+def tracer(trace_file):
+    return Tracer(trace_file, "fusion_volume")
+
+
+def test_get_trace_file():
+    assert get_trace_file({}) is None
+    assert get_trace_file({"FUSION_TRACE_FILE": ""}) is None
+    assert get_trace_file({"FUSION_TRACE_FILE": "/tmp/t.jsonl"}) == "/tmp/t.jsonl"
+
+
+def test_tracer_invalid_file(tmp_path):
+    with pytest.raises(ValueError) as excinfo:
+        Tracer(str(tmp_path / "missing" / "trace.jsonl"))
+    assert "FUSION_TRACE_FILE" in str(excinfo.value)
+
+
+def test_nested_spans(tracer, trace_file):
+    with tracer.span(SPAN_AWAIT, "Await operation", operation_id="op1") as outer:
+        with tracer.span(SPAN_REQUEST, "Get operation") as inner:
+            inner["status"] = 200
+
+    inner, outer = read_spans(trace_file)
+    assert inner["parent_id"] == outer["span_id"]
+    assert outer["parent_id"] is None
+    assert inner["trace_id"] == outer["trace_id"] == tracer.trace_id
+    assert inner["status"] == 200
+    assert outer["operation_id"] == "op1"
+    assert outer["module"] == "fusion_volume"
+    assert outer["duration_ms"] >= inner["duration_ms"] >= 0
+
+
+def test_explicit_parent(tracer, trace_file):
+    with tracer.span(SPAN_AWAIT, "Await operations") as outer:
+        pass
+    with tracer.span(SPAN_REQUEST, "Get operation", parent=outer):
+        pass
+
+    outer, inner = read_spans(trace_file)
+    assert inner["parent_id"] == outer["span_id"]
+
+
+def test_span_error(tracer, trace_file):
+    with pytest.raises(KeyError):
+        with tracer.span(SPAN_REQUEST, "Get volume"):
+            raise KeyError("volume")
+
+    (span,) = read_spans(trace_file)
+    assert span["error"] == "KeyError"
+
+
+def test_spans_appended(trace_file):
+    for dummy in range(2):
+        with Tracer(trace_file).span(SPAN_REQUEST, "Get volume"):
+            pass
+
+    first, second = read_spans(trace_file)
+    assert first["trace_id"] != second["trace_id"]
+
+
+def test_trace_span_untraced_client():
+    client = MagicMock()
+
+    with trace_span(client, SPAN_AWAIT, "Await operation") as span:
+        span["operation_status"] = "Succeeded"
+
+    assert get_tracer(client) is None
+
+
+def test_tracing_call(tracer, trace_file):
+    operation = MagicMock(spec=purefusion.Operation)
+    operation.id = "op1"
+    call_api = MagicMock(return_value=(operation, 202, {}))
+    client = MagicMock(call_api=call_api)
+    install_tracing(client, tracer)
+    install_tracing(client, tracer)
+
+    result = client.call_api(
+        "/tenants/{tenant_name}",
+        "PATCH",
+        path_params={"tenant_name": "t1"},
+        _return_http_data_only=True,
+    )
+
+    assert result is operation
+    assert call_api.call_args.kwargs["_return_http_data_only"] is False
+    assert get_tracer(client) is tracer
+    assert isinstance(client.call_api._call_api, MagicMock)
+    (span,) = read_spans(trace_file)
+    assert span["kind"] == SPAN_REQUEST
+    assert span["name"] == "PATCH /tenants/{tenant_name}"
+    assert span["method"] == "PATCH"
+    assert span["path"] == "/tenants/t1"
+    assert span["status"] == 202
+    assert span["operation_id"] == "op1"
+
+
+def test_tracing_call_http_info(tracer):
+    response = ("data", 200, {"X-Request-ID": "1"})
+    call = TracingCall(MagicMock(return_value=response), tracer)
+
+    assert call("/tenants", "GET", _return_http_data_only=False) == response
+
+
+def test_tracing_call_api_exception(tracer, trace_file):
+    call = TracingCall(
+        MagicMock(side_effect=purefusion.rest.ApiException(status=404)), tracer
+    )
+
+    with pytest.raises(purefusion.rest.ApiException):
+        call("/tenants/t1", "GET")
+
+    (span,) = read_spans(trace_file)
+    assert span["status"] == 404
+    assert span["error"] == "ApiException"
+
+
+def test_tracing_call_site(tracer, trace_file):
+    client = purefusion.ApiClient()
+    client.call_api = TracingCall(MagicMock(return_value=(None, 200, {})), tracer)
+
+    purefusion.TenantsApi(client).get_tenant("t1")
+
+    (span,) = read_spans(trace_file)
+    assert span["name"] == "Get tenant"
+    assert span["path"] == "/tenants/t1"